@@ -33,12 +33,31 @@ __attribute__((noreturn)) void semihost_exit(uint32_t code) {
 __attribute__((weak)) const uint8_t eat_input[1] = {0};
 __attribute__((weak)) const uint32_t eat_input_len = 0;
 
+static uint32_t in_pos = 0; /* курсор общий у read_byte и read_span */
+
 int32_t eat_read_byte(void) {
-    static uint32_t pos = 0;
-    if (pos >= eat_input_len) {
+    if (in_pos >= eat_input_len) {
         return -1;
     }
-    return eat_input[pos++];
+    return eat_input[in_pos++];
+}
+
+int32_t eat_read_span(uint8_t *p, uint32_t max) {
+    if (max == 0) {
+        return 0;
+    }
+    if (in_pos >= eat_input_len) {
+        return -1;
+    }
+    uint32_t n = eat_input_len - in_pos;
+    if (n > max) {
+        n = max;
+    }
+    for (uint32_t i = 0; i < n; i++) {
+        p[i] = eat_input[in_pos + i];
+    }
+    in_pos += n;
+    return (int32_t)n;
 }
 
 void eat_write_byte(char b) {
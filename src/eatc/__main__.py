@@ -2,8 +2,23 @@
 
 python -m eatc check <файлы...>   — каждый файл отдельно: парсинг,
                                     проверки, типы, test-блоки
+                                    (`-j N` — блоки в N процессах)
 python -m eatc run <файлы...>     — check + запуск main интерпретатором
+                                    (`--engine tree` — эталонный
+                                    обходчик AST вместо замыканий,
+                                    `--engine py` — модуль Python;
+                                    `--profile PREFIX` — профиль
+                                    эталонным обходчиком, run и check;
+                                    `--record FILE` / `--replay FILE` —
+                                    трасса аксиом ОС, eatc/trace.py)
 python -m eatc build <файлы...> [-o out] — check + LLVM → бинарник
+                                    (`-j N` — кодоген частей модуля
+                                    до N процессов; части — по
+                                    содержимому, от ~2000 строк .ll,
+                                    малый модуль — одна часть;
+                                    `--pgo-train FILE`
+                                    — PGO-цикл с тренировкой на stdin
+                                    из FILE, eatc/pgo.py)
 python -m eatc lex <файл>         — эталонный дамп токенов (сверка
                                     с self-hosted лексером, selfhost/)
 python -m eatc parse <файл>       — эталонный дамп AST (сверка
@@ -28,15 +43,21 @@ python -m eatc ir <файл>          — эталонный текстовый
 бинарника). Эквивалент для self-host: cat файлов в stdin.
 """
 
+import json
 import sys
 from pathlib import Path
 
+from . import ast_nodes as ast
 from .checks import check_program
-from .driver import build_stream, has_imports
+from .closure import ClosureInterpreter
+from .driver import _RT_PATH, build_stream, has_imports
 from .errors import EatError
 from .interpreter import Interpreter
 from .lexer import Lexer
 from .parser import Parser, parse_file, parse_files
+from .profile import Profiler
+from .pygen import PyInterpreter
+from .trace import Recorder, Replayer
 from .typechecker import typecheck
 
 # --lib-корни драйвера (заполняет main из argv)
@@ -72,12 +93,19 @@ def _compile_many(paths: list):
     return program, stats, typed, main
 
 
-def cmd_check(paths: list[str]) -> int:
+def cmd_check(
+    paths: list[str], profile: str | None = None, jobs: int = 1
+) -> int:
+    if jobs > 1:
+        return _check_parallel(paths, jobs)
     failed = 0
+    prof = Profiler() if profile else None
     for path in paths:
         try:
             program, stats, typed = _compile(path)
-            tests = Interpreter(program, path).run_tests()
+            interp = Interpreter(program, path)
+            interp.profiler = prof
+            tests = interp.run_tests()
         except EatError as err:
             print(err, file=sys.stderr)
             failed += 1
@@ -88,25 +116,258 @@ def cmd_check(paths: list[str]) -> int:
             f"stack depth: {typed.stack_depth}, "
             f"tests passed: {len(tests)}"
         )
+    if prof is not None:
+        prof.write(profile)
+    if failed:
+        print(f"\nFAILED: {failed} из {len(paths)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_check_native(
+    paths: list[str], jobs: int = 1, trap_sites: bool = False,
+    elide: bool = False, tbaa: bool = True,
+) -> int:
+    """check --native: test-блоки файла — бинарником-раннером (Codegen
+    tests), собранным как build (verify снимает доказанные проверки).
+    Бинарник, а не JIT в процессе: trap и exit блока завершают раннер,
+    а не check — следующие файлы проверяются. Файл без рантайм-модуля
+    собирается с selfhost/Rt.eat впереди (как примеры в make verify);
+    исполняются только блоки самого файла."""
+    import subprocess
+    import tempfile
+
+    from .codegen import compile_binary
+    from .verifier import verify
+
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for k, path in enumerate(paths):
+            try:
+                program, stats, typed = _compile(path)
+                checker = typed.checker
+                skip = None
+                if "RtStr" not in checker.structs:
+                    skip = str(_RT_PATH)
+                    program, _, rt_typed, _ = _compile_many([skip, path])
+                    checker = rt_typed.checker
+                tests = [
+                    d for d in program.decls
+                    if isinstance(d, ast.TestBlock)
+                    and (skip is None or d.src_file != skip)
+                ]
+                verify(program, checker)
+                binary, _ = compile_binary(
+                    program, checker, path, str(Path(tmp) / f"t{k}"),
+                    jobs=jobs, trap_sites=trap_sites, elide=elide,
+                    tbaa=tbaa, tests=tests,
+                )
+            except EatError as err:
+                print(err, file=sys.stderr)
+                failed += 1
+                continue
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if subprocess.run([binary]).returncode != 0:
+                failed += 1
+                continue
+            print(
+                f"OK {path} — funcs: {stats['funcs']}, "
+                f"structs: {stats['structs']}, stmts: {stats['stmts']}, "
+                f"stack depth: {typed.stack_depth}, "
+                f"tests passed: {len(tests)}"
+            )
     if failed:
         print(f"\nFAILED: {failed} из {len(paths)}", file=sys.stderr)
         return 1
     return 0
 
 
-def cmd_run(paths: list, prog_args: list | None = None) -> int:
+# check -j: программы файлов, разобранные до fork — процессы пула
+# наследуют AST копией при записи; интерпретатор — свой на процесс
+_CHECK_PROGRAMS: list = []
+_CHECK_INTERPS: dict = {}
+
+
+def _check_unit(unit: tuple) -> tuple:
+    """Один test-блок в процессе пула: (ошибка | None, вывод блока,
+    код выхода | None, stderr блока). Trap шима и exit() поднимают
+    SystemExit — процесс пула ловит его и отдаёт код с сообщением
+    наверх (иначе воркер умирает, и imap ждёт вечно)."""
+    import io
+
+    i, j = unit
+    program, path, tests = _CHECK_PROGRAMS[i]
+    saved = sys.stdout, sys.stderr
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    sys.stderr = io.TextIOWrapper(io.BytesIO())
+    err = code = None
+    try:
+        interp = _CHECK_INTERPS.get(i)
+        if interp is None:
+            interp = _CHECK_INTERPS[i] = Interpreter(program, path)
+        interp.run_test(tests[j])
+    except EatError as e:
+        err = str(e)
+    except SystemExit as e:
+        code = e.code
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        out = sys.stdout.buffer.getvalue()
+        errout = sys.stderr.buffer.getvalue()
+        sys.stdout, sys.stderr = saved
+    return err, out, code, errout
+
+
+def _check_parallel(paths: list[str], jobs: int) -> int:
+    """check -j: файлы разбираются и типизируются здесь, test-блоки
+    всех файлов раздаются пулу (fork после типизации). Отчёт — в порядке
+    файлов и блоков, как у последовательного check: вывод блоков до
+    первого провала, затем его ошибка; блоки после провала исполнены,
+    но не видны. Блок, вышедший SystemExit (trap шима, exit), обрывает
+    прогон с тем же кодом — как последовательный check; выход — после
+    того, как пул доработает очередь (terminate посреди раздачи задач
+    виснет в multiprocessing)."""
+    import multiprocessing
+
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        return cmd_check(paths)  # нет fork — последовательно
+    results: list = []
+    units: list = []
+    for path in paths:
+        try:
+            program, stats, typed = _compile(path)
+        except EatError as err:
+            results.append((path, err, None, None))
+            continue
+        tests = [d for d in program.decls if isinstance(d, ast.TestBlock)]
+        i = len(_CHECK_PROGRAMS)
+        _CHECK_PROGRAMS.append((program, path, tests))
+        units.extend((i, j) for j in range(len(tests)))
+        results.append((path, None, stats, typed))
+    failed = 0
+    exit_code = None
+    with ctx.Pool(min(jobs, max(len(units), 1))) as pool:
+        outcomes = pool.imap(_check_unit, units)
+        i = 0
+        for path, error, stats, typed in results:
+            if error is not None:
+                print(error, file=sys.stderr)
+                failed += 1
+                continue
+            error = None
+            passed = 0
+            for _ in _CHECK_PROGRAMS[i][2]:
+                err, out, code, errout = next(outcomes)
+                if error is not None:
+                    continue
+                sys.stdout.flush()
+                sys.stdout.buffer.write(out)
+                sys.stdout.flush()
+                sys.stderr.buffer.write(errout)
+                sys.stderr.flush()
+                if code is not None:
+                    exit_code = code
+                    break
+                if err is not None:
+                    error = err
+                else:
+                    passed += 1
+            if exit_code is not None:
+                break
+            i += 1
+            sys.stdout.flush()
+            if error is not None:
+                print(error, file=sys.stderr)
+                failed += 1
+                continue
+            print(
+                f"OK {path} — funcs: {stats['funcs']}, "
+                f"structs: {stats['structs']}, stmts: {stats['stmts']}, "
+                f"stack depth: {typed.stack_depth}, "
+                f"tests passed: {passed}"
+            )
+        for _ in outcomes:
+            pass  # пул в покое — __exit__ гасит его без гонки
+    _CHECK_PROGRAMS.clear()
+    if exit_code is not None:
+        raise SystemExit(exit_code)
+    if failed:
+        print(f"\nFAILED: {failed} из {len(paths)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+# движки `eatc run`: замыкания (по умолчанию), модуль Python (py) и
+# эталонный обходчик AST
+ENGINES = {
+    "closure": ClosureInterpreter,
+    "py": PyInterpreter,
+    "tree": Interpreter,
+}
+
+
+def cmd_run(
+    paths: list,
+    prog_args: list | None = None,
+    engine: str = "closure",
+    profile: str | None = None,
+    record: str | None = None,
+    replay: str | None = None,
+    jit: bool = False,
+) -> int:
+    if jit:
+        return _run_jit(paths, prog_args or [])
+    prof = Profiler() if profile else None
+    trace = None
     try:
         program, _, _, main = _compile_many(paths)
         argv = [a.encode("utf-8") for a in (prog_args or [])]
-        interp = Interpreter(program, main, argv=argv)
+        interp = ENGINES[engine](program, main, argv=argv)
+        interp.profiler = prof
+        if record is not None:
+            trace = Recorder(record)
+        elif replay is not None:
+            trace = Replayer(replay)
+        if trace is not None:
+            trace.attach(interp)
         interp.run_tests()
+        if trace is not None:
+            trace.armed = True
         interp.run_main()
     except EatError as err:
         print(err, file=sys.stderr)
         return 1
+    finally:
+        # профиль пишется и при trap'е — до места падения
+        if prof is not None:
+            prof.write(profile)
+        if trace is not None:
+            trace.close()
     return 0
 
 
+def _run_jit(paths: list, prog_args: list) -> int:
+    """run --jit (eatc/jit.py): test-блоки — интерпретатором, как у
+    run и build; доказанные проверки сняты верификатором, как у build;
+    main — нативно в процессе."""
+    from . import jit
+    from .verifier import verify
+
+    try:
+        program, _, typed, main = _compile_many(paths)
+        Interpreter(program, main).run_tests()
+        verify(program, typed.checker)
+        argv = [a.encode("utf-8") for a in prog_args]
+        return jit.run(program, typed.checker, main, argv)
+    except EatError as err:
+        print(err, file=sys.stderr)
+        return 1
+
+
 def _esc_value(value: str) -> str:
     """Экранирование значения токена для построчного дампа."""
     return (
@@ -222,13 +483,14 @@ def cmd_ir(path: str, trap_codes: bool = False, opt: bool = False) -> int:
             from .verifier import verify
             fold_calls(program, typed.checker, path)
             verify(program, typed.checker)
-        text = emit_ir(
-            program, typed.checker, trap_codes=trap_codes, opt=opt
+        # потоково: текст функции уходит в stdout сразу после генерации
+        emit_ir(
+            program, typed.checker, trap_codes=trap_codes, opt=opt,
+            out=sys.stdout,
         )
     except (OSError, EatError) as err:
         print(err, file=sys.stderr)
         return 1
-    sys.stdout.write(text)
     return 0
 
 
@@ -247,9 +509,13 @@ _KIND_LABEL = {
 def cmd_build(
     paths: list, out: str | None, trap_codes: bool = False,
     link: bool = True, release: bool = False, fold: bool = False,
+    spec: bool = False, jobs: int = 1, pgo_opts: dict | None = None,
+    trap_sites: bool = False, elide: bool = False, tbaa: bool = True,
+    report_json: bool = False,
 ) -> int:
     from .codegen import compile_binary
     from .verifier import verify
+    from . import pgo
 
     if out is None:
         out = str(Path("build") / Path(paths[-1]).stem)
@@ -263,10 +529,36 @@ def cmd_build(
             # Только build-путь; `eatc ir` не сворачивает (канон IR цел)
             from .comptime import fold_calls
             folded = fold_calls(program, typed.checker, main)
+        spec_stats = (0, 0)
+        if spec:
+            # специализация по частично константным аргументам — после
+            # свёртки (полностью константные вызовы уже литералы), до
+            # verify: клоны с подставленными константами верифицируются
+            from .specialize import specialize_calls
+            spec_stats = specialize_calls(program, typed.checker, main)
         proofs = verify(program, typed.checker)
+        pgo_opts = dict(pgo_opts or {})
+        train = pgo_opts.pop("train", None)
+        if train is not None:
+            # PGO-цикл: инструментированный бинарник рядом, прогон на
+            # тренировочном stdin, merge, итоговая сборка с профилем;
+            # .profdata остаётся рядом с бинарником (для --pgo-use)
+            gen = str(Path(out).with_suffix(".pgo-gen"))
+            compile_binary(
+                program, typed.checker, main, gen,
+                trap_codes=trap_codes, release=release, pgo_gen=True,
+                trap_sites=trap_sites, elide=elide, tbaa=tbaa,
+            )
+            raw = str(Path(out).with_suffix(".profraw"))
+            pgo_opts["pgo_use"] = str(Path(out).with_suffix(".profdata"))
+            pgo.train(gen, train, raw)
+            pgo.merge([raw], pgo_opts["pgo_use"], main)
+            Path(gen).unlink()
+            Path(raw).unlink()
         binary, report = compile_binary(
             program, typed.checker, main, out, trap_codes=trap_codes,
-            link=link, release=release,
+            link=link, release=release, jobs=jobs, trap_sites=trap_sites,
+            elide=elide, tbaa=tbaa, functions=report_json, **pgo_opts,
         )
     except EatError as err:
         print(err, file=sys.stderr)
@@ -282,6 +574,11 @@ def cmd_build(
     )
     if fold:
         print(f"  ярус B: свёрнуто вызовов в литералы: {folded}")
+    if spec:
+        print(
+            f"  специализация: клонов {spec_stats[0]}, "
+            f"переписано вызовов {spec_stats[1]}"
+        )
     detail = ", ".join(
         f"{_KIND_LABEL[k]}: {v[0]}/{v[1]}"
         for k, v in sorted(proofs["by_kind"].items())
@@ -294,9 +591,56 @@ def cmd_build(
     )
     for key, size in sorted(report["frames"].items(), key=lambda kv: -kv[1]):
         print(f"    кадр {key}: {size} Б")
+    if "elided" in report:
+        print(f"  элизия копий агрегатов: {report['elided']}")
+    if "tbaa" in report:
+        print(f"  TBAA: тегов load/store {report['tbaa']}")
+    if "parts" in report:
+        print(
+            f"  кодоген: частей {report['parts'][0]}, "
+            f"из кэша {report['parts'][1]}"
+        )
+    if pgo_opts.get("pgo_gen"):
+        print("  PGO: инструментированный бинарник (профиль — в "
+              "LLVM_PROFILE_FILE, затем llvm-profdata merge)")
+    elif "pgo_use" in pgo_opts:
+        print(f"  PGO: профиль {pgo_opts['pgo_use']}")
+    if report_json:
+        path = Path(out).with_suffix(".report.json")
+        _write_report(path, binary, report, proofs)
+        print(f"  отчёт по функциям: {path}")
     return 0
 
 
+def _write_report(path: Path, binary: str, report: dict,
+                  proofs: dict) -> None:
+    """`build --report=json`: отчёт §8 и верификатора + разрез по
+    функциям; elided — проверок, снятых верификатором, по видам.
+    Сравнение двух отчётов — tests/bench/report_diff.py."""
+    by_func = proofs.get("by_func", {})
+    functions = {}
+    for key, entry in report["functions"].items():
+        elided = {k: v[0] for k, v in sorted(by_func.get(key, {}).items())
+                  if v[0]}
+        functions[key] = dict(entry, elided=elided)
+    data = {
+        "binary": binary,
+        "stack_bytes": report["stack_bytes"],
+        "globals_bytes": report["globals_bytes"],
+        "proofs": {
+            "proven": proofs["proven"],
+            "total": proofs["total"],
+            "by_kind": {k: list(v)
+                        for k, v in sorted(proofs["by_kind"].items())},
+        },
+        "functions": functions,
+    }
+    path.write_text(
+        json.dumps(data, ensure_ascii=False, indent=1) + "\n",
+        encoding="utf-8",
+    )
+
+
 def cmd_stream(path: str) -> int:
     """Печать потока драйвера: Rt + модули DAG с #module-директивами —
     вход для self-hosted компилятора (сверки Makefile)."""
@@ -314,6 +658,16 @@ def main(argv: list[str]) -> int:
     trap_codes = "--trap-codes" in argv
     if trap_codes:
         argv = [a for a in argv if a != "--trap-codes"]
+    # --trap-sites (build): общий холодный trap-блок на функцию, номер
+    # места вместо строки на проверку; stderr trap'а тот же, что без
+    # флага (текст собирает runtime.c из таблицы мест)
+    trap_sites = "--trap-sites" in argv
+    if trap_sites:
+        argv = [a for a in argv if a != "--trap-sites"]
+        if trap_codes:
+            print("--trap-sites несовместим с --trap-codes",
+                  file=sys.stderr)
+            return 2
     # --lib DIR (повторяемый): корни разрешения путей import
     while "--lib" in argv:
         i = argv.index("--lib")
@@ -339,6 +693,30 @@ def main(argv: list[str]) -> int:
     fold = "--fold" in argv
     if fold:
         argv = [a for a in argv if a != "--fold"]
+    # --spec (build): специализация функций по частично константным
+    # аргументам (клон на кортеж констант, бюджет роста кода) — как
+    # --fold, только build-путь; канон `eatc ir` не меняется
+    spec = "--spec" in argv
+    if spec:
+        argv = [a for a in argv if a != "--spec"]
+    # --elide (build): элизия копий агрегатов — свежий результат вызова
+    # или литерала строится прямо в слоте let, возврата, поля; канон
+    # `eatc ir` и наблюдаемое поведение не меняются
+    elide = "--elide" in argv
+    if elide:
+        argv = [a for a in argv if a != "--elide"]
+    # --no-tbaa (build): без TBAA-тегов load/store в тексте, который
+    # оптимизирует LLVM (по умолчанию теги есть; .ll рядом с бинарником
+    # и канон `eatc ir` их не несут в обоих режимах)
+    tbaa = "--no-tbaa" not in argv
+    if not tbaa:
+        argv = [a for a in argv if a != "--no-tbaa"]
+    # --report=json (build): рядом с бинарником <out>.report.json —
+    # по функциям инструкций IR до/после O2, оставшиеся и снятые
+    # верификатором проверки по видам, alwaysinline, кадр
+    report_json = "--report=json" in argv
+    if report_json:
+        argv = [a for a in argv if a != "--report=json"]
     # -O (ir/verify): оптимизированная ось (SELFHOST_OPT_PLAN) — канон +
     # конвейер проходов [fold, verify]; эталон сверки SelfIrOpt.
     # У verify — дамп решений под конвейером (fold перед verify).
@@ -346,8 +724,129 @@ def main(argv: list[str]) -> int:
     opt = "-O" in argv
     if opt:
         argv = [a for a in argv if a != "-O"]
+    # --engine NAME (run): closure — трансляция функций в замыкания
+    # (по умолчанию), py — модуль Python с дисковым кэшем (долгие
+    # прогоны), tree — эталонный обходчик AST (сверка движков)
+    engine = None
+    if "--engine" in argv:
+        i = argv.index("--engine")
+        if i + 1 >= len(argv) or argv[i + 1] not in ENGINES:
+            print(
+                "после --engine ожидается " + " | ".join(ENGINES),
+                file=sys.stderr,
+            )
+            return 2
+        engine = argv[i + 1]
+        del argv[i:i + 2]
+    # --profile PREFIX (run/check): вызовы, инклюзивное/эксклюзивное
+    # время функций и попадания строк → PREFIX.txt, свёрнутые стеки
+    # для flamegraph → PREFIX.folded. Инструментируется эталонный
+    # обходчик: run под профилем идёт движком tree
+    profile = None
+    if "--profile" in argv:
+        i = argv.index("--profile")
+        if i + 1 >= len(argv):
+            print("после --profile ожидается префикс файлов", file=sys.stderr)
+            return 2
+        profile = argv[i + 1]
+        del argv[i:i + 2]
+        if engine not in (None, "tree"):
+            print("--profile работает только с --engine tree", file=sys.stderr)
+            return 2
+        engine = "tree"
+    # --jit (run): main нативно в процессе (MCJIT, eatc/jit.py) —
+    # кодоген и конвейер build без линковки; runtime.c — разделяемой
+    # библиотекой из кэша рантайма
+    jit = "--jit" in argv
+    if jit:
+        argv = [a for a in argv if a != "--jit"]
+        if engine is not None:
+            print("--jit несовместим с --engine и --profile",
+                  file=sys.stderr)
+            return 2
+    if engine is None:
+        engine = "closure"
+    # --native (check): test-блоки исполняет бинарник-раннер сборки
+    # build (eatc/codegen.py, Codegen tests); отчёт и строка провала —
+    # как у интерпретатора, он остаётся эталоном (check без флага)
+    native = "--native" in argv
+    if native:
+        argv = [a for a in argv if a != "--native"]
+        if profile is not None:
+            print("--native несовместим с --profile", file=sys.stderr)
+            return 2
+    # -j N (check): test-блоки в N процессах (fork после типизации,
+    # отчёт в порядке файлов/блоков — как без -j); (build, check
+    # --native): кодоген частей модуля до N процессов (число частей —
+    # по содержимому, eatc/partition.py, от N не зависит), канон .ll
+    # тот же
+    jobs = 1
+    if "-j" in argv:
+        i = argv.index("-j")
+        n = argv[i + 1] if i + 1 < len(argv) else ""
+        if not n.isdigit() or int(n) < 1:
+            print("после -j ожидается число процессов", file=sys.stderr)
+            return 2
+        jobs = int(n)
+        del argv[i:i + 2]
+    if jobs > 1 and profile is not None:
+        print("--profile несовместим с -j", file=sys.stderr)
+        return 2
+    # --record FILE / --replay FILE (run): трасса недетерминированных
+    # аксиом (ввод, часы, argv, сокеты); бинарник — EAT_RECORD/EAT_REPLAY
+    traces = {}
+    for flag in ("--record", "--replay"):
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print(f"после {flag} ожидается файл трассы", file=sys.stderr)
+                return 2
+            traces[flag] = argv[i + 1]
+            del argv[i:i + 2]
+    if len(traces) > 1:
+        print("--record несовместим с --replay", file=sys.stderr)
+        return 2
+    if jit and traces:
+        print("--jit: трасса бинарника — EAT_RECORD/EAT_REPLAY",
+              file=sys.stderr)
+        return 2
+    # --pgo-gen | --pgo-use FILE | --pgo-train FILE (build, eatc/pgo.py):
+    # инструментированная сборка, сборка с профилем .profdata, полный
+    # цикл с тренировкой на stdin из FILE; --pgo-hints — inline_hints по
+    # частотам профиля. По умолчанию выключено
+    pgo_opts: dict = {}
+    if "--pgo-gen" in argv:
+        argv = [a for a in argv if a != "--pgo-gen"]
+        pgo_opts["pgo_gen"] = True
+    for flag, key in (("--pgo-use", "pgo_use"), ("--pgo-train", "train")):
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print(f"после {flag} ожидается файл", file=sys.stderr)
+                return 2
+            pgo_opts[key] = argv[i + 1]
+            del argv[i:i + 2]
+    if len(pgo_opts) > 1:
+        print("--pgo-gen, --pgo-use и --pgo-train взаимоисключающие",
+              file=sys.stderr)
+        return 2
+    if "--pgo-hints" in argv:
+        argv = [a for a in argv if a != "--pgo-hints"]
+        if not pgo_opts or "pgo_gen" in pgo_opts:
+            print("--pgo-hints — только с --pgo-use или --pgo-train",
+                  file=sys.stderr)
+            return 2
+        pgo_opts["pgo_hints"] = True
+    if pgo_opts and no_bin:
+        print("PGO-сборка несовместима с --no-bin", file=sys.stderr)
+        return 2
     if len(argv) >= 2 and argv[0] == "check":
-        return cmd_check(argv[1:])
+        if native:
+            return cmd_check_native(
+                argv[1:], jobs, trap_sites=trap_sites, elide=elide,
+                tbaa=tbaa,
+            )
+        return cmd_check(argv[1:], profile, jobs)
     if len(argv) >= 2 and argv[0] == "run":
         # `run FILE... -- ARG...`: всё после `--` — argv программы
         # (аксиомы arg_count/arg_len/arg_byte); имя программы не входит
@@ -357,7 +856,10 @@ def main(argv: list[str]) -> int:
             i = rest.index("--")
             rest, prog_args = rest[:i], rest[i + 1:]
         if rest:
-            return cmd_run(rest, prog_args)
+            return cmd_run(
+                rest, prog_args, engine, profile,
+                traces.get("--record"), traces.get("--replay"), jit,
+            )
     if len(argv) == 2 and argv[0] == "lex":
         return cmd_lex(argv[1])
     if len(argv) == 2 and argv[0] == "parse":
@@ -385,12 +887,20 @@ def main(argv: list[str]) -> int:
         if args:
             return cmd_build(
                 args, out, trap_codes=trap_codes, link=not no_bin,
-                release=release, fold=fold,
+                release=release, fold=fold, spec=spec, jobs=jobs,
+                pgo_opts=pgo_opts, trap_sites=trap_sites, elide=elide,
+                tbaa=tbaa, report_json=report_json,
             )
     print(
         "использование: python -m eatc "
-        "(check <файлы.eat...> | run <файлы...> [-- <арг>...] | "
-        "build <файлы...> [-o out] [--trap-codes] [--release|-r] [--fold] | "
+        "(check <файлы.eat...> [--native] | "
+        "run <файлы...> [--engine closure|py|tree | --jit] "
+        "[-- <арг>...] | "
+        "build <файлы...> [-o out] [--trap-codes | --trap-sites] "
+        "[--release|-r] [--fold] "
+        "[--spec] [--elide] [--no-tbaa] [--report=json] [-j N] "
+        "[--pgo-gen | --pgo-use F | --pgo-train F] "
+        "[--pgo-hints] | "
         "lex <файл> | "
         "parse <файл> | verify <файл> [-O] | "
         "ir <файл> [--trap-codes] [-O] | "
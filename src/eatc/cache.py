@@ -0,0 +1,83 @@
+"""Дисковый кэш артефактов компилятора по хэшу содержимого.
+
+Ключ — sha256 входа (текст, флаги, версия формата), значение — байты
+артефакта. Каталог — $EAT_CACHE, иначе $XDG_CACHE_HOME/eatc, иначе
+~/.cache/eatc; EAT_CACHE=0 выключает кэш (всё строится заново).
+Запись атомарна (временный файл + rename): параллельные прогоны не
+видят недописанный артефакт. Порча/недоступность кэша — не ошибка
+компиляции: промах и пересборка.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+
+def cache_dir(kind: str) -> Path | None:
+    """Подкаталог кэша для вида артефактов; None — кэш выключен."""
+    root = os.environ.get("EAT_CACHE")
+    if root == "0":
+        return None
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        root = os.path.join(xdg, "eatc") if xdg else os.path.join(
+            os.path.expanduser("~"), ".cache", "eatc"
+        )
+    return Path(root) / kind
+
+
+def key(*parts) -> str:
+    """Хэш-ключ из частей (str/bytes) — порядок значим."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def load(kind: str, k: str, suffix: str = "") -> bytes | None:
+    d = cache_dir(kind)
+    if d is None:
+        return None
+    try:
+        return (d / (k + suffix)).read_bytes()
+    except OSError:
+        return None
+
+
+def store(kind: str, k: str, data: bytes, suffix: str = "") -> None:
+    d = cache_dir(kind)
+    if d is None:
+        return
+    try:
+        d.mkdir(parents=True, exist_ok=True)
+        tmp = d / f".{k}{suffix}.{os.getpid()}"
+        tmp.write_bytes(data)
+        os.replace(tmp, d / (k + suffix))
+    except OSError:
+        pass
+
+
+def artifact(kind: str, k: str, suffix: str, build) -> Path | None:
+    """Артефакт-файл в кэше (его путь отдают внешнему инструменту, а не
+    байты). Промах — build(tmp) строит файл tmp и возвращает успех;
+    rename публикует его атомарно. None — кэш выключен/недоступен или
+    сборка не удалась (вызывающий строит по-старому)."""
+    d = cache_dir(kind)
+    if d is None:
+        return None
+    path = d / (k + suffix)
+    if path.exists():
+        return path
+    tmp = d / f".{k}.{os.getpid()}{suffix}"
+    try:
+        d.mkdir(parents=True, exist_ok=True)
+        if not build(tmp):
+            tmp.unlink(missing_ok=True)
+            return None
+        os.replace(tmp, path)
+    except OSError:
+        return None
+    return path
@@ -0,0 +1,730 @@
+"""Замыкающий движок `eatc run`: AST → дерево Python-замыканий.
+
+Эталонный обходчик (interpreter.Interpreter) на каждом узле ищет
+обработчик в _EVAL/_EXEC, а return/break — исключения. Здесь каждая
+FuncDecl переводится один раз (лениво, по первому вызову) в дерево
+специализированных замыканий:
+
+- переменные разрешены статически в индексы кадра (как _Resolver
+  обходчика), индекс вшит в замыкание; кадр — плоский список,
+  аллоцируется на входе в вызов;
+- kind/cap локала (проверка диапазона и ёмкости на присваивании) —
+  из типа объявления, без Slot на каждое связывание;
+- return/break — коды состояния, которые инструкции возвращают
+  вверх по блокам (значение return — в ячейке 0 кадра).
+
+Семантика — та же по построению: те же узлы в trap'ах (тексты и
+координаты), тот же порядок вычислений, те же встроенные/аксиомы
+(Interpreter._AXIOMS). Comptime (§5: бюджет шагов, запрет аксиом)
+остаётся на эталонном обходчике — движок только для прогона main и
+test-блоков; `eatc run --engine tree` возвращает эталон.
+"""
+
+from . import ast_nodes as ast
+from .interpreter import (
+    _BINOP_FNS,
+    Array,
+    EnumValue,
+    Interpreter,
+    StructValue,
+    Tagged,
+    _copy_value,
+    _src_name,
+    array_code,
+    fill_array,
+    new_array,
+)
+from .types import INT_RANGES, ArrayType
+
+# коды состояния инструкций: None — дальше по блоку
+BRK = 1
+RET = 2
+
+
+class _Scopes:
+    """Области видимости на время трансляции одной функции: имя →
+    индекс ячейки кадра. Ячейка 0 — значение return."""
+
+    def __init__(self):
+        self.stack: list[dict] = [{}]
+        self.size = 1
+        self.kinds: dict[int, tuple] = {}  # индекс -> (kind, cap)
+
+    def push(self) -> None:
+        self.stack.append({})
+
+    def pop(self) -> None:
+        self.stack.pop()
+
+    def declare(self, name: str, kind=None, cap=None) -> int | None:
+        if name == "_":
+            return None
+        idx = self.size
+        self.size += 1
+        self.stack[-1][name] = idx
+        self.kinds[idx] = (kind, cap)
+        return idx
+
+    def lookup(self, name: str) -> int | None:
+        for scope in reversed(self.stack):
+            idx = scope.get(name)
+            if idx is not None:
+                return idx
+        return None
+
+
+class ClosureInterpreter(Interpreter):
+    """Interpreter с тем же интерфейсом запуска (run_main/run_tests),
+    исполняющий функции оттранслированными замыканиями."""
+
+    def __init__(self, program, filename, argv=None):
+        super().__init__(program, filename, argv)
+        self._code: dict[int, object] = {}  # id(FuncDecl) -> вход
+
+    # --- запуск ---------------------------------------------------------
+
+    def run_main(self) -> None:
+        main = self.funcs["main"]
+        try:
+            self.function(main)([], None, main, False)
+        finally:
+            self.stdio.flush()
+
+    def run_tests(self) -> list[str]:
+        from .errors import EatError
+        passed = []
+        for decl in self.program.decls:
+            if not isinstance(decl, ast.TestBlock):
+                continue
+            sc = _Scopes()
+            body = self._block(decl.body, sc)
+            try:
+                body([None] * sc.size)
+            except EatError as err:
+                raise EatError(
+                    getattr(decl, "src_file", None) or self.filename,
+                    decl.line,
+                    decl.col,
+                    f"test {decl.name} провален: {err.message}",
+                ) from err
+            finally:
+                self.stdio.flush()
+            passed.append(decl.name)
+        return passed
+
+    # --- функции --------------------------------------------------------
+
+    def function(self, func: ast.FuncDecl):
+        """Вход оттранслированной функции: fn(args, self_value, site,
+        copy_args) -> результат. Трансляция — один раз на FuncDecl;
+        граф вызовов — DAG (правило 1), рекурсии трансляции нет."""
+        code = self._code.get(id(func))
+        if code is None:
+            code = self._translate(func)
+            self._code[id(func)] = code
+        return code
+
+    def _translate(self, func: ast.FuncDecl):
+        trap = self.trap
+        if func.is_extern:
+            def extern(args, self_value, site, copy_args):
+                raise trap(
+                    site,
+                    f"extern {func.name} доступен только в бинарнике "
+                    "(интерпретатор не линкует C)",
+                )
+            return extern
+        sc = _Scopes()
+        self_idx = None
+        params = []
+        for param in func.params:
+            if param.name == "self":
+                self_idx = sc.declare("self")
+                continue
+            kind, cap = self._meta(param.type)
+            params.append((sc.declare(param.name, kind, cap), kind, cap))
+        params = tuple(params)
+        req = func.requires
+        if req is not None and type(req) is ast.BoolLit and req.value:
+            req = None
+        req = self._expr(req, sc) if req is not None else None
+        body = self._block(func.body, sc)
+        ens = func.ensures
+        if ens is not None and type(ens) is ast.BoolLit and ens.value:
+            ens = None
+        res_idx = None
+        if ens is not None:
+            res_idx = sc.declare("result")
+            ens = self._expr(ens, sc)
+        size = sc.size
+        fit = self._fit
+        fit_cap = self._fit_cap
+        name = _src_name(func)
+
+        def call(args, self_value, site, copy_args):
+            env = [None] * size
+            if self_idx is not None:
+                env[self_idx] = self_value
+            for (idx, kind, cap), value in zip(params, args):
+                if copy_args:
+                    value = _copy_value(value)
+                if kind is not None:
+                    fit(site, kind, value)
+                if cap is not None:
+                    fit_cap(site, cap, value)
+                env[idx] = value
+            if req is not None and not req(env):
+                raise trap(site, f"нарушен requires функции {name}")
+            result = None
+            if body(env) == RET:
+                result = _copy_value(env[0])
+            if ens is not None:
+                env[res_idx] = result
+                if not ens(env):
+                    raise trap(site, f"нарушен ensures функции {name}")
+            return result
+
+        return call
+
+    # --- инструкции -----------------------------------------------------
+
+    def _block(self, block: ast.Block, sc: _Scopes):
+        sc.push()
+        try:
+            stmts = tuple(self._stmt(s, sc) for s in block.stmts)
+        finally:
+            sc.pop()
+        if not stmts:
+            return lambda env: None
+        if len(stmts) == 1:
+            return stmts[0]
+        if len(stmts) == 2:
+            s0, s1 = stmts
+
+            def block2(env):
+                return s0(env) or s1(env)
+            return block2
+
+        def block(env):
+            for s in stmts:
+                st = s(env)
+                if st:
+                    return st
+            return None
+        return block
+
+    def _stmt(self, stmt, sc: _Scopes):
+        handler = self._STMT.get(type(stmt))
+        if handler is None:
+            raise self.trap(stmt, "неизвестная инструкция")
+        return handler(self, stmt, sc)
+
+    def _c_let(self, stmt: ast.LocalDecl, sc: _Scopes):
+        value = self._expr(stmt.value, sc)
+        kind, cap = self._meta(stmt.type)
+        idx = sc.declare(stmt.name, kind, cap)
+        fit = self._fit
+        fit_cap = self._fit_cap
+        if idx is None:
+            def let_discard(env):
+                v = _copy_value(value(env))
+                if kind is not None:
+                    fit(stmt, kind, v)
+                if cap is not None:
+                    fit_cap(stmt, cap, v)
+            return let_discard
+        if kind is not None:
+            def let_int(env):
+                v = value(env)
+                fit(stmt, kind, v)
+                env[idx] = v
+            return let_int
+        if cap is not None:
+            def let_str(env):
+                v = value(env)
+                fit_cap(stmt, cap, v)
+                env[idx] = v
+            return let_str
+
+        def let(env):
+            env[idx] = _copy_value(value(env))
+        return let
+
+    def _c_assign(self, stmt: ast.AssignStmt, sc: _Scopes):
+        value = self._expr(stmt.value, sc)
+        target = stmt.target
+        fit = self._fit
+        fit_cap = self._fit_cap
+        if type(target) is ast.Name:
+            idx = sc.lookup(target.ident)
+            if idx is None:
+                # не локал (constexpr) — слот по имени, как в эталоне
+                global_slot = self.global_slot
+
+                def assign_global(env):
+                    v = _copy_value(value(env))
+                    slot = global_slot(target, target.ident)
+                    if slot.kind is not None:
+                        fit(stmt, slot.kind, v)
+                    if slot.cap is not None:
+                        fit_cap(stmt, slot.cap, v)
+                    slot.value = v
+                return assign_global
+            kind, cap = sc.kinds[idx]
+            if kind is not None:
+                def assign_int(env):
+                    v = value(env)
+                    fit(stmt, kind, v)
+                    env[idx] = v
+                return assign_int
+
+            def assign(env):
+                v = _copy_value(value(env))
+                if cap is not None:
+                    fit_cap(stmt, cap, v)
+                env[idx] = v
+            return assign
+        if isinstance(target, ast.FieldAccess):
+            obj_fn = self._place_fn(target.obj, sc)
+            fname = target.name
+            structs = self.structs
+
+            def assign_field(env):
+                v = _copy_value(value(env))
+                obj = obj_fn(env)
+                kind, cap = structs[obj.name].fields[fname]
+                fit(stmt, kind, v)
+                fit_cap(stmt, cap, v)
+                obj.fields[fname] = v
+            return assign_field
+        if isinstance(target, ast.Index):
+            obj_fn = self._place_fn(target.obj, sc)
+            index_fn = self._expr(target.index, sc)
+            trap = self.trap
+
+            def assign_index(env):
+                v = _copy_value(value(env))
+                obj = obj_fn(env)
+                index = index_fn(env)
+                if not 0 <= index < len(obj):
+                    raise trap(
+                        target,
+                        f"индекс {index} вне границ [0, {len(obj)})",
+                    )
+                obj.store(index, v)
+            return assign_index
+        raise self.trap(stmt, "некорректная цель присваивания")
+
+    def _place_fn(self, node, sc: _Scopes):
+        """Замыкание места для записи (см. Interpreter._place): разделённые
+        массивы по цепочке отделяются до записи."""
+        if type(node) is ast.Index:
+            obj_fn = self._place_fn(node.obj, sc)
+            index_fn = self._expr(node.index, sc)
+            trap = self.trap
+
+            def place_index(env):
+                obj = obj_fn(env)
+                i = index_fn(env)
+                if not 0 <= i < len(obj):
+                    raise trap(node, f"индекс {i} вне границ [0, {len(obj)})")
+                return obj.mut()[i]
+            return place_index
+        if type(node) is ast.FieldAccess:
+            obj_fn = self._place_fn(node.obj, sc)
+            fname = node.name
+            return lambda env: obj_fn(env).fields[fname]
+        return self._expr(node, sc)
+
+    def _c_if(self, stmt: ast.IfStmt, sc: _Scopes):
+        arms = [(self._expr(stmt.cond, sc), self._block(stmt.then, sc))]
+        for cond, blk in stmt.elifs:
+            arms.append((self._expr(cond, sc), self._block(blk, sc)))
+        els = self._block(stmt.els, sc) if stmt.els is not None else None
+        if len(arms) == 1:
+            cond, then = arms[0]
+            if els is None:
+                def if_(env):
+                    if cond(env):
+                        return then(env)
+                    return None
+                return if_
+
+            def if_else(env):
+                if cond(env):
+                    return then(env)
+                return els(env)
+            return if_else
+        arms = tuple(arms)
+
+        def if_chain(env):
+            for cond, blk in arms:
+                if cond(env):
+                    return blk(env)
+            if els is not None:
+                return els(env)
+            return None
+        return if_chain
+
+    def _c_loop(self, stmt: ast.LoopStmt, sc: _Scopes):
+        body = self._block(stmt.body, sc)
+
+        def loop(env):
+            while True:
+                st = body(env)
+                if st:
+                    return None if st == BRK else st
+        return loop
+
+    def _c_for(self, stmt: ast.ForStmt, sc: _Scopes):
+        sc.push()
+        try:
+            idx = sc.declare(stmt.target)
+            body = self._block(stmt.body, sc)
+        finally:
+            sc.pop()
+        iterable = stmt.iterable
+        if isinstance(iterable, ast.RangeExpr):
+            const = self._constexpr_eval
+            start, end = iterable.start, iterable.end
+
+            def for_range(env):
+                for item in range(const(start), const(end)):
+                    if idx is not None:
+                        env[idx] = item
+                    st = body(env)
+                    if st:
+                        return None if st == BRK else st
+                return None
+            return for_range
+        items_fn = self._expr(iterable, sc)
+
+        def for_items(env):
+            items = items_fn(env)
+            if type(items) is Array:
+                # живое чтение (см. эталон)
+                arr = items
+                items = (arr.data[i] for i in range(len(arr)))
+            for item in items:
+                if idx is not None:
+                    env[idx] = _copy_value(item)
+                st = body(env)
+                if st:
+                    return None if st == BRK else st
+            return None
+        return for_items
+
+    def _c_match(self, stmt: ast.MatchStmt, sc: _Scopes):
+        subject = self._expr(stmt.subject, sc)
+        arms: dict = {}
+        for arm in stmt.arms:
+            sc.push()
+            try:
+                idx = None
+                if arm.binding is not None:
+                    idx = sc.declare(arm.binding)
+                blk = self._block(arm.body, sc)
+            finally:
+                sc.pop()
+            # первая ветка с тегом — как линейный поиск эталона
+            arms.setdefault(arm.pattern, (idx, blk))
+        trap = self.trap
+
+        def match(env):
+            value = subject(env)
+            if type(value) is Tagged:
+                tag, payload = value.tag, value.payload
+            else:
+                tag, payload = value.variant, value.payload
+            arm = arms.get(tag)
+            if arm is None:
+                raise trap(stmt, f"нет ветки match для {tag}")
+            idx, blk = arm
+            if idx is not None:
+                env[idx] = _copy_value(payload)
+            return blk(env)
+        return match
+
+    def _c_return(self, stmt: ast.ReturnStmt, sc: _Scopes):
+        if stmt.value is None:
+            def ret_none(env):
+                env[0] = None
+                return RET
+            return ret_none
+        value = self._expr(stmt.value, sc)
+
+        def ret(env):
+            env[0] = value(env)
+            return RET
+        return ret
+
+    def _c_break(self, stmt: ast.BreakStmt, sc: _Scopes):
+        return lambda env: BRK
+
+    def _c_assert(self, stmt: ast.AssertStmt, sc: _Scopes):
+        cond = self._expr(stmt.cond, sc)
+        trap = self.trap
+
+        def assert_(env):
+            if not cond(env):
+                raise trap(stmt, "assert не выполнен")
+        return assert_
+
+    def _c_expr_stmt(self, stmt, sc: _Scopes):
+        expr = self._expr(stmt.expr, sc)
+
+        def expr_stmt(env):
+            expr(env)
+        return expr_stmt
+
+    # --- выражения ------------------------------------------------------
+
+    def _expr(self, node, sc: _Scopes):
+        handler = self._EXPR.get(type(node))
+        if handler is None:
+            raise self.trap(node, "неизвестное выражение")
+        return handler(self, node, sc)
+
+    def _c_lit(self, node, sc: _Scopes):
+        value = node.value
+        return lambda env: value
+
+    def _c_self(self, node: ast.SelfExpr, sc: _Scopes):
+        idx = sc.lookup("self")
+        if idx is None:
+            global_slot = self.global_slot
+            return lambda env: global_slot(node, "self").value
+        return lambda env: env[idx]
+
+    def _c_name(self, node: ast.Name, sc: _Scopes):
+        if getattr(node, "ctor", None) is not None:
+            none = Tagged("None", None)
+            return lambda env: none
+        idx = sc.lookup(node.ident)
+        if idx is not None:
+            return lambda env: env[idx]
+        # constexpr: comptime-значение — по первому чтению (как у
+        # эталона: порядок объявлений и trap'ы не сдвигаются)
+        global_slot = self.global_slot
+        ident = node.ident
+        return lambda env: global_slot(node, ident).value
+
+    def _c_str(self, node: ast.StrLit, sc: _Scopes):
+        parts = []
+        for seg in node.segments:
+            if isinstance(seg, str):
+                text = seg.encode("utf-8").decode("latin-1")
+                parts.append(lambda env, text=text: text)
+            else:
+                parts.append(self._expr(seg, sc))
+        parts = tuple(parts)
+        trap = self.trap
+
+        def string(env):
+            out = []
+            for part in parts:
+                value = part(env)
+                if value is True:
+                    out.append("true")
+                elif value is False:
+                    out.append("false")
+                else:
+                    out.append(str(value))
+            result = "".join(out)
+            if len(result) > 256:
+                raise trap(node, "строка длиннее ёмкости str<256>")
+            return result
+        return string
+
+    def _c_unary(self, node: ast.UnaryOp, sc: _Scopes):
+        operand = self._expr(node.operand, sc)
+        if node.op == "not":
+            return lambda env: not operand(env)
+        if node.op == "~":
+            mask = INT_RANGES[node.operand.ty.kind][1]
+            return lambda env: operand(env) ^ mask
+        kind = node.ty.kind
+        fit = self._fit
+
+        def neg(env):
+            result = -operand(env)
+            fit(node, kind, result)
+            return result
+        return neg
+
+    def _c_binop(self, node: ast.BinOp, sc: _Scopes):
+        op = node.op
+        left = self._expr(node.left, sc)
+        right = self._expr(node.right, sc)
+        if op == "and":
+            return lambda env: left(env) and right(env)
+        if op == "or":
+            return lambda env: left(env) or right(env)
+        fn = _BINOP_FNS.get(op)
+        if fn is not None:
+            if type(node.right) is ast.IntLit:
+                const = node.right.value
+                return lambda env: fn(left(env), const)
+            return lambda env: fn(left(env), right(env))
+        if op in ("<<", ">>"):
+            shift = self._shift
+            return lambda env: shift(node, op, left(env), right(env))
+        if op == "/":
+            div = self._trunc_div
+            return lambda env: div(node, left(env), right(env))
+        mod = self._trunc_mod
+        return lambda env: mod(node, left(env), right(env))
+
+    def _c_call(self, node: ast.Call, sc: _Scopes):
+        args = tuple(self._expr(a, sc) for a in node.args)
+        ctor = getattr(node, "ctor", None)
+        if ctor is not None:
+            arg = args[0]
+            return lambda env: Tagged(ctor, _copy_value(arg(env)))
+        name = node.name
+        axiom = self._AXIOMS.get(name)
+        if axiom is not None:
+            me = self
+
+            def builtin(env):
+                return axiom(me, node, [a(env) for a in args])
+            return builtin
+        if name in INT_RANGES:
+            cast = self._cast
+            arg = args[0]
+            return lambda env: cast(node, name, arg(env))
+        code = self.function(self.funcs[name])
+        if len(args) == 1:
+            a0 = args[0]
+            return lambda env: code([a0(env)], None, node, False)
+        if len(args) == 2:
+            a0, a1 = args
+            return lambda env: code([a0(env), a1(env)], None, node, False)
+
+        # у обычных функций все параметры немутабельны — без копий
+        def call(env):
+            return code([a(env) for a in args], None, node, False)
+        return call
+
+    def _c_methodcall(self, node: ast.MethodCall, sc: _Scopes):
+        # Enum.Variant(x) — конструктор варианта с нагрузкой
+        if isinstance(node.obj, ast.Name) and node.obj.ident in self.enums:
+            payload = self._expr(node.args[0], sc)
+            enum, variant = node.obj.ident, node.name
+            return lambda env: EnumValue(
+                enum, variant, _copy_value(payload(env))
+            )
+        method = self.structs[node.struct].methods[node.name]
+        # let self: получатель — место, аргументы копируются (см. эталон)
+        var_self = bool(method.params) and method.params[0].mutable
+        if var_self:
+            obj_fn = self._place_fn(node.obj, sc)
+        else:
+            obj_fn = self._expr(node.obj, sc)
+        args = tuple(self._expr(a, sc) for a in node.args)
+        function = self.function
+        entry: list = []  # вход метода — лениво (рекурсия трансляции)
+
+        def method_call(env):
+            obj = obj_fn(env)
+            if not entry:
+                entry.append(function(method))
+            return entry[0]([a(env) for a in args], obj, node, var_self)
+        return method_call
+
+    def _c_fieldaccess(self, node: ast.FieldAccess, sc: _Scopes):
+        if isinstance(node.obj, ast.Name) and node.obj.ident in self.enums:
+            value = EnumValue(node.obj.ident, node.name)
+            return lambda env: value
+        obj_fn = self._expr(node.obj, sc)
+        fname = node.name
+        return lambda env: obj_fn(env).fields[fname]
+
+    def _c_index(self, node: ast.Index, sc: _Scopes):
+        obj_fn = self._expr(node.obj, sc)
+        index_fn = self._expr(node.index, sc)
+        trap = self.trap
+
+        if not isinstance(node.obj.ty, ArrayType):
+            def index_str(env):
+                obj = obj_fn(env)
+                i = index_fn(env)
+                if not 0 <= i < len(obj):
+                    raise trap(node, f"индекс {i} вне границ [0, {len(obj)})")
+                return obj[i]
+            return index_str
+
+        def index(env):
+            obj = obj_fn(env)
+            i = index_fn(env)
+            if not 0 <= i < len(obj):
+                raise trap(node, f"индекс {i} вне границ [0, {len(obj)})")
+            return obj.data[i]
+        return index
+
+    def _c_structlit(self, node: ast.StructLit, sc: _Scopes):
+        rt = self.structs[node.name]
+        fields = tuple(
+            (fname, fexpr, self._expr(fexpr, sc), rt.fields[fname])
+            for fname, fexpr in node.fields
+        )
+        fit = self._fit
+        fit_cap = self._fit_cap
+        sname = node.name
+
+        def struct_lit(env):
+            out = {}
+            for fname, fexpr, fn, (kind, cap) in fields:
+                value = _copy_value(fn(env))
+                fit(fexpr, kind, value)
+                fit_cap(fexpr, cap, value)
+                out[fname] = value
+            return StructValue(sname, out)
+        return struct_lit
+
+    def _c_arraylit(self, node: ast.ArrayLit, sc: _Scopes):
+        elems = tuple(self._expr(e, sc) for e in node.elems)
+        code = array_code(node.ty)
+        return lambda env: new_array(
+            code, [_copy_value(e(env)) for e in elems]
+        )
+
+    def _c_arrayfill(self, node: ast.ArrayFill, sc: _Scopes):
+        value_fn = self._expr(node.value, sc)
+        size = node.size
+        code = array_code(node.ty)
+        return lambda env: fill_array(code, value_fn(env), size)
+
+    # --- таблицы трансляции (type(node) -> метод) -----------------------
+
+    _STMT = {
+        ast.LocalDecl: _c_let,
+        ast.AssignStmt: _c_assign,
+        ast.IfStmt: _c_if,
+        ast.ForStmt: _c_for,
+        ast.LoopStmt: _c_loop,
+        ast.MatchStmt: _c_match,
+        ast.ReturnStmt: _c_return,
+        ast.BreakStmt: _c_break,
+        ast.AssertStmt: _c_assert,
+        ast.ExprStmt: _c_expr_stmt,
+        ast.DiscardStmt: _c_expr_stmt,
+    }
+
+    _EXPR = {
+        ast.IntLit: _c_lit,
+        ast.BoolLit: _c_lit,
+        ast.CharLit: _c_lit,
+        ast.StrLit: _c_str,
+        ast.SelfExpr: _c_self,
+        ast.Name: _c_name,
+        ast.UnaryOp: _c_unary,
+        ast.BinOp: _c_binop,
+        ast.Call: _c_call,
+        ast.MethodCall: _c_methodcall,
+        ast.FieldAccess: _c_fieldaccess,
+        ast.Index: _c_index,
+        ast.StructLit: _c_structlit,
+        ast.ArrayLit: _c_arraylit,
+        ast.ArrayFill: _c_arrayfill,
+    }
@@ -12,28 +12,21 @@
 компилируются в проверку + вызов eat_trap из runtime.c.
 """
 
+import os
+import re
+import shutil
 import subprocess
 import sys
 from pathlib import Path
-from types import MappingProxyType
 
 import llvmlite.binding as llvm
-import llvmlite.ir as ir
-
-# readonly и nocapture — валидные LLVM-атрибуты указательного аргумента,
-# но их нет в whitelist'е llvmlite; расширяем (False — печать без типа,
-# порядок печати остаётся сортированным)
-if "readonly" not in ir.values.ArgumentAttributes._known:
-    ir.values.ArgumentAttributes._known = MappingProxyType(
-        dict(
-            ir.values.ArgumentAttributes._known,
-            readonly=False,
-            nocapture=False,
-        )
-    )
 
 from . import ast_nodes as ast
+from . import cache, partition, pgo
+from . import irtext as ir
 from .errors import EatError
+from .tbaa import Tbaa, strip_tbaa
+from .typechecker import FuncSig
 from .types import (
     INT_RANGES,
     ArrayType,
@@ -57,12 +50,19 @@ STR_CAP = 256
 STR_LL = ir.LiteralStructType([I32L, ir.ArrayType(I8L, STR_CAP)])
 I8P = ir.PointerType(I8L)
 STRP = ir.PointerType(STR_LL)
+# место trap'а режима --trap-sites: {файл, сообщение, строка, колонка};
+# файл и сообщение — смещения строк от начала таблицы (без
+# динамических релокаций PIE), struct eat_trap_site в runtime.c
+TRAP_SITE_LL = ir.LiteralStructType([I32L, I32L, I32L, I32L])
 
 # Аксиомы ОС — единственные внешние символы (шим runtime.c);
 # логика строк/разбора — EAT-методы RtStr (selfhost/Rt.eat).
 _RUNTIME = {
     "eat_trap": ir.FunctionType(ir.VoidType(), [I8P]),
     "eat_read_byte": ir.FunctionType(I32L, []),
+    # read_span: до max байт stdin в память, n >= 0 или -1 (Err(Eof));
+    # max <= 65 536 (размер массива, SPEC §6) — i32 хватает
+    "eat_read_span": ir.FunctionType(I32L, [I8P, I32L]),
     "eat_write_byte": ir.FunctionType(ir.VoidType(), [I8L]),
     "eat_write_err_byte": ir.FunctionType(ir.VoidType(), [I8L]),
     "eat_write_span": ir.FunctionType(ir.VoidType(), [I8P, I32L]),
@@ -88,6 +88,11 @@ _RUNTIME = {
     "eat_socket_read_byte": ir.FunctionType(I32L, [I32L]),
     "eat_socket_write_span": ir.FunctionType(I32L, [I32L, I8P, I32L]),
     "eat_socket_close": ir.FunctionType(ir.VoidType(), [I32L]),
+    # готовый fd или NO_CONN по таймауту (epoll в живом режиме)
+    "eat_socket_wait": ir.FunctionType(I32L, [I32L, I32L]),
+    # до max байт соединения в память: n (<= 65 536) или сентинелы
+    # 65 537 — Err(Eof), 65 538 — Err(Fail), как у socket_read_byte
+    "eat_socket_read_span": ir.FunctionType(I32L, [I32L, I8P, I32L]),
 }
 
 _SIGNED = {"i32", "i64"}
@@ -99,6 +104,50 @@ def _is_agg(t: Type) -> bool:
     )
 
 
+def _nrvo_name(body: ast.Block, params: list) -> str | None:
+    """NRVO (--elide): переменная, которую возвращают все return
+    функции, объявленная единственным let/const и не тенью параметра,
+    — живёт прямо в слоте возврата. None — если return разные."""
+    decls: dict[str, int] = {}
+    returned: set = set()
+
+    def scan(block: ast.Block) -> None:
+        for stmt in block.stmts:
+            if isinstance(stmt, ast.LocalDecl):
+                decls[stmt.name] = decls.get(stmt.name, 0) + 1
+            elif isinstance(stmt, ast.ReturnStmt):
+                value = stmt.value
+                returned.add(
+                    value.ident if isinstance(value, ast.Name) else None
+                )
+            elif isinstance(stmt, ast.IfStmt):
+                scan(stmt.then)
+                for _, blk in stmt.elifs:
+                    scan(blk)
+                if stmt.els is not None:
+                    scan(stmt.els)
+            elif isinstance(stmt, ast.ForStmt):
+                decls[stmt.target] = 2  # переменная цикла — не NRVO
+                scan(stmt.body)
+            elif isinstance(stmt, ast.LoopStmt):
+                scan(stmt.body)
+            elif isinstance(stmt, ast.MatchStmt):
+                for arm in stmt.arms:
+                    if arm.binding is not None:
+                        decls[arm.binding] = 2
+                    scan(arm.body)
+
+    scan(body)
+    if len(returned) != 1:
+        return None
+    name = returned.pop()
+    if name is None or decls.get(name) != 1:
+        return None
+    if any(pname == name for pname, _ in params):
+        return None
+    return name
+
+
 class Codegen:
     def __init__(
         self,
@@ -106,6 +155,10 @@ class Codegen:
         checker,
         filename: str,
         trap_codes: bool = False,
+        trap_sites: bool = False,
+        elide: bool = False,
+        tbaa: bool = False,
+        tests: list | None = None,
     ):
         self.program = program
         self.checker = checker
@@ -116,13 +169,46 @@ class Codegen:
         self.trap_codes = trap_codes
         self.trap_map: dict[str, int] = {}
         self.trap_list: list[tuple[int, str]] = []
+        # режим общих trap-блоков (--trap-sites, build): все проверки
+        # функции ведут в один холодный блок, номер места — phi; текст
+        # `файл:строка:колонка: error: trap: сообщение` собирает
+        # runtime.c из таблицы мест функции (сообщения и файлы —
+        # общие строки) — stderr тот же, что в строковом режиме
+        self.trap_sites = trap_sites
+        self.trap_bb = None
+        self.sites: list[tuple] = []
+        self.site_tables: list[int] = []  # мест в таблице функции
+        # элизия копий агрегатов (--elide, build): свежее значение
+        # (вызов, литерал, конструктор) строится прямо в слоте let,
+        # возврата, поля литерала, возвращаемая переменная — в слоте
+        # возврата; dest — слот, который заберёт первый result_slot,
+        # elided — число снятых копий (отчёт build)
+        self.elide = elide
+        self.dest = None
+        self.elided = 0
+        self.nrvo = None  # имя NRVO-переменной функции (_nrvo_name)
         self.module = ir.Module(name=filename)
         self.module.triple = llvm.get_process_triple()
+        # TBAA-теги load/store (build, eatc/tbaa.py): тело функции
+        # строит tbaa.Builder; None — канон без метаданных
+        self.tbaa = Tbaa(self.module) if tbaa else None
+        # test-блоки нативно (check --native): блок — internal-функция
+        # @"eat_test__ИМЯ", @main — раннер блоков по порядку вместо
+        # вызова main программы; None — обычный вход
+        self.tests = tests
         rt_decls = dict(_RUNTIME)
         if trap_codes:
             rt_decls["eat_trap_code"] = ir.FunctionType(
                 ir.VoidType(), [I32L]
             )
+        if tests is not None:
+            rt_decls["eat_test_begin"] = ir.FunctionType(
+                ir.VoidType(), [I8P]
+            )
+        if trap_sites:
+            rt_decls["eat_trap_site"] = ir.FunctionType(
+                ir.VoidType(), [I32L, ir.PointerType(TRAP_SITE_LL)]
+            )
         self.rt = {
             name: ir.Function(self.module, ftype, name=name)
             for name, ftype in rt_decls.items()
@@ -134,9 +220,10 @@ class Codegen:
         self.rt["eat_trap"].attributes.add("noreturn")
         self.rt["eat_trap"].attributes.add("cold")
         self.rt["eat_exit"].attributes.add("noreturn")
-        if trap_codes:
-            self.rt["eat_trap_code"].attributes.add("noreturn")
-            self.rt["eat_trap_code"].attributes.add("cold")
+        for name in ("eat_trap_code", "eat_trap_site"):
+            if name in self.rt:
+                self.rt[name].attributes.add("noreturn")
+                self.rt[name].attributes.add("cold")
         self.cstr_cache: dict[bytes, ir.GlobalVariable] = {}
         self.strlit_cache: dict[bytes, ir.GlobalVariable] = {}
         # comptime-константы-массивы (§5, ярус A2): readonly-глобал
@@ -156,6 +243,7 @@ class Codegen:
         self.enum_ll_cache: dict[str, ir.Type] = {}
         self.enum_slot: dict[str, dict] = {}
         self.frame_types: dict[str, list] = {}  # кадры для отчёта §8
+        self.trap_kinds: dict[str, dict] = {}  # ключ -> {вид: проверок}
         self.cur_key = ""
         self.struct_ll: dict[str, ir.Type] = {}
         self.field_index: dict[str, dict] = {}
@@ -221,6 +309,12 @@ class Codegen:
     # --- инфраструктура ---------------------------------------------------
 
     def cstr(self, text: str):
+        g = self.cstr_global(text)
+        ptr = self.b.gep(g, [I32L(0), I32L(0)], inbounds=True)
+        return ptr, g.value_type.count - 1
+
+    def cstr_global(self, text: str):
+        """Глобал C-строки (общий на одинаковые тексты)."""
         data = text.encode("utf-8") + b"\0"
         if data not in self.cstr_cache:
             arr = ir.Constant(ir.ArrayType(I8L, len(data)), bytearray(data))
@@ -232,8 +326,7 @@ class Codegen:
             g.global_constant = True
             g.linkage = "private"
             self.cstr_cache[data] = g
-        g = self.cstr_cache[data]
-        return self.b.gep(g, [I32L(0), I32L(0)], inbounds=True), len(data) - 1
+        return self.cstr_cache[data]
 
     def cstr_str(self, text: str):
         """Литеральный сегмент строки — глобал в layout'е str, но с
@@ -287,9 +380,25 @@ class Codegen:
             )
         return fn
 
-    def trap_if(self, bad, node: ast.Node, message: str) -> None:
-        """bad — i1: если истина, аварийная остановка."""
+    def trap_if(
+        self, bad, node: ast.Node, message: str, kind: str
+    ) -> None:
+        """bad — i1: если истина, аварийная остановка. kind — вид
+        проверки верификатора (overflow, bounds, div, …): счётчик
+        оставшихся в рантайме проверок функции для отчёта build."""
+        counts = self.trap_kinds.setdefault(self.cur_key, {})
+        counts[kind] = counts.get(kind, 0) + 1
         fname = getattr(node, "src_file", None) or self.filename
+        if self.trap_sites:
+            if self.trap_bb is None:
+                self.trap_bb = self.fn.append_basic_block("trap")
+            ok_bb = self.fn.append_basic_block("ok")
+            self.b.cbranch(bad, self.trap_bb, ok_bb)
+            self.sites.append(
+                (self.b.block, fname, node.line, node.col, message)
+            )
+            self.b.position_at_end(ok_bb)
+            return
         full = f"{fname}:{node.line}:{node.col}: error: trap: {message}"
         bad_bb = self.fn.append_basic_block("trap")
         ok_bb = self.fn.append_basic_block("ok")
@@ -311,6 +420,44 @@ class Codegen:
         self.b.unreachable()
         self.b.position_at_end(ok_bb)
 
+    def gen_trap_sites(self) -> None:
+        """Общий trap-блок функции (--trap-sites) — в конец тела: phi
+        номера места по блокам-источникам, вызов eat_trap_site с
+        private-таблицей мест функции."""
+        if self.trap_bb is None:
+            return
+        table_ll = ir.ArrayType(TRAP_SITE_LL, len(self.sites))
+        table = ir.GlobalVariable(
+            self.module, table_ll, name=f"trap.{self.fn.name}"
+        )
+        base = table.ptrtoint(I64L)
+
+        def offset(text: str):
+            g = self.cstr_global(text)
+            return g.ptrtoint(I64L).sub(base).trunc(I32L)
+
+        table.initializer = ir.Constant(table_ll, [
+            ir.Constant.literal_struct([
+                offset(fname), offset(message), I32L(line), I32L(col),
+            ])
+            for _, fname, line, col, message in self.sites
+        ])
+        table.global_constant = True
+        table.linkage = "private"
+        self.site_tables.append(len(self.sites))
+        self.fn.blocks.remove(self.trap_bb)
+        self.fn.blocks.append(self.trap_bb)
+        b = ir.IRBuilder(self.trap_bb)
+        site = b.phi(I32L)
+        for i, (pred, *_) in enumerate(self.sites):
+            site.add_incoming(I32L(i), pred)
+        b.call(self.rt["eat_trap_site"], [
+            site, b.gep(table, [I32L(0), I32L(0)], inbounds=True),
+        ])
+        b.unreachable()
+        self.trap_bb = None
+        self.sites = []
+
     def push(self) -> None:
         self.env.append({})
 
@@ -382,6 +529,58 @@ class Codegen:
         self.copy_into(ty, slot, src)
         return slot
 
+    def result_slot(self, llty: ir.Type, name: str = ""):
+        """Слот результата агрегатного выражения: назначение, выданное
+        expr_into (--elide), иначе свежий alloca. Забирается до
+        вычисления подвыражений — вложенным достаются свои слоты."""
+        dst, self.dest = self.dest, None
+        if dst is not None:
+            return dst
+        return self.alloca(llty, name=name)
+
+    def is_fresh(self, node: ast.Expr) -> bool:
+        """Агрегатное выражение строит значение в собственном слоте
+        (result_slot), которого никто больше не видит: его можно
+        построить прямо в назначении или отдать let без копии.
+        Имена, поля, элементы и ужатые глобалы литералов — чужая
+        память, их копия обязательна."""
+        if isinstance(node, (ast.StructLit, ast.ArrayLit, ast.ArrayFill)):
+            return True
+        if isinstance(node, ast.StrLit):
+            segs = node.segments
+            return not (len(segs) <= 1 and all(
+                isinstance(seg, str) for seg in segs
+            ))
+        if isinstance(node, ast.Call):
+            return (
+                getattr(node, "ctor", None) is not None
+                or node.name in self.checker.funcs
+            )
+        return isinstance(node, ast.MethodCall)
+
+    def can_elide(self, ty: Type, node: ast.Expr) -> bool:
+        return (
+            self.elide and self.is_agg(ty) and self.is_fresh(node)
+            and self.ll(node.ty) == self.ll(ty)
+        )
+
+    def expr_into(self, ty: Type, dst, node: ast.Expr) -> None:
+        """Значение node в слот dst. Свежее агрегатное значение под
+        --elide строится прямо в dst: вызов пишет в него как в слот
+        возврата, литерал — поля. Чтение dst в самом выражении
+        исключено: назначения — слот возврата и поля/элементы/нагрузка
+        ещё не связанного литерала, имён у них нет."""
+        if not self.can_elide(ty, node):
+            self.copy_into(ty, dst, self.expr(node))
+            return
+        self.dest = dst
+        value = self.expr(node)
+        self.dest = None
+        if value is dst:
+            self.elided += 1
+        else:
+            self.copy_into(ty, dst, value)
+
     def ensure_br(self, target) -> None:
         if not self.b.block.is_terminated:
             self.b.branch(target)
@@ -418,7 +617,13 @@ class Codegen:
         for func, key, sig, struct in decls:
             if not func.is_extern:
                 self.gen_func(func, key, sig, struct)
+                # потоковый режим (module.stream): текст функции готов —
+                # уходит в вывод, её инструкции отпускаются
+                self.module.flush(self.funcs[key])
+        if self.tests is not None:
+            self.gen_tests()
         self.gen_entry()
+        self.module.flush()
         return self.module
 
     def mangle(self, key: str) -> str:
@@ -520,11 +725,18 @@ class Codegen:
         entry_br = ir.IRBuilder(entry).branch(body_bb)
         self.ab = ir.IRBuilder(entry)
         self.ab.position_before(entry_br)
-        self.b = ir.IRBuilder(body_bb)
+        if self.tbaa is None:
+            self.b = ir.IRBuilder(body_bb)
+        else:
+            self.b = self.tbaa.builder(body_bb)
         self.env = [{}]
         self.loop_exits = []
         self.ret_ty = sig.ret
         agg_ret = sig.ret is not None and self.is_agg(sig.ret)
+        self.nrvo = (
+            _nrvo_name(func.body, sig.params)
+            if self.elide and agg_ret else None
+        )
 
         arg_i = 0
         if agg_ret:
@@ -552,6 +764,8 @@ class Codegen:
                 self.bind(pname, pty, slot)
 
         self.exit_block = fn.append_basic_block("exit")
+        # клон специализации (--spec) трапит текстом оригинала
+        fname = getattr(func, "spec_of", None) or func.name
         # доказанный requires не эмитится вовсе: llvm.assume-возврат
         # факта диапазона (слой 1а) снят по замеру crosslang §7.1 —
         # assume-вычисления в прологах горячих функций дороже, чем
@@ -563,7 +777,8 @@ class Codegen:
             self.trap_if(
                 self.b.not_(cond),
                 func,
-                f"нарушен requires функции {func.name}",
+                f"нарушен requires функции {fname}",
+                "requires",
             )
         self.gen_block(func.body)
         self.ensure_br(self.exit_block)
@@ -579,13 +794,35 @@ class Codegen:
             self.trap_if(
                 self.b.not_(cond),
                 func,
-                f"нарушен ensures функции {func.name}",
+                f"нарушен ensures функции {fname}",
+                "ensures",
             )
             self.pop()
         if sig.ret is None or agg_ret:
             self.b.ret_void()
         else:
             self.b.ret(self.b.load(self.ret_slot))
+        self.gen_trap_sites()
+
+    def gen_tests(self) -> None:
+        """Тела test-блоков (check --native): функция без параметров
+        и результата под ключом графа вызовов тайпчекера `test:ИМЯ`."""
+        fty = ir.FunctionType(ir.VoidType(), [])
+        for decl in self.tests:
+            key = f"test:{decl.name}"
+            fn = ir.Function(
+                self.module, fty, name=self.mangle(f"test.{decl.name}")
+            )
+            fn.linkage = "internal"
+            fn.attributes.add("norecurse")
+            fn.attributes.add("nounwind")
+            self.funcs[key] = fn
+            func = ast.FuncDecl(
+                decl.line, decl.col, f"test {decl.name}", [], None, None,
+                None, decl.body,
+            )
+            self.gen_func(func, key, FuncSig(func.name, [], None), None)
+            self.module.flush(fn)
 
     def gen_entry(self) -> None:
         # трамплин C-входа: принимает (argc, argv), отдаёт их шиму
@@ -597,7 +834,23 @@ class Codegen:
         fn.attributes.add("nounwind")
         b = ir.IRBuilder(fn.append_basic_block("entry"))
         b.call(self.rt["eat_args_set"], [fn.args[0], fn.args[1]])
-        b.call(self.funcs["main"], [])
+        if self.tests is None:
+            b.call(self.funcs["main"], [])
+            b.ret(I32L(0))
+            return
+        # раннер check --native: перед блоком шим получает префикс
+        # провала — trap внутри блока печатается строкой интерпретатора
+        # (координаты блока, «test ИМЯ провален: trap: …»)
+        for decl in self.tests:
+            fname = getattr(decl, "src_file", None) or self.filename
+            head = self.cstr_global(
+                f"{fname}:{decl.line}:{decl.col}: error: "
+                f"test {decl.name} провален: "
+            )
+            b.call(self.rt["eat_test_begin"], [
+                b.gep(head, [I32L(0), I32L(0)], inbounds=True),
+            ])
+            b.call(self.funcs[f"test:{decl.name}"], [])
         b.ret(I32L(0))
 
     # --- инструкции ---------------------------------------------------------
@@ -612,6 +865,21 @@ class Codegen:
 
     def gen_stmt(self, stmt: ast.Stmt) -> None:
         if isinstance(stmt, ast.LocalDecl):
+            if stmt.name == self.nrvo and (
+                self.ll(stmt.local_ty) == self.ll(self.ret_ty)
+            ):
+                # NRVO: возвращаемая переменная — сам слот возврата,
+                # `return имя` копии не делает
+                self.expr_into(stmt.local_ty, self.ret_slot, stmt.value)
+                self.bind(stmt.name, stmt.local_ty, self.ret_slot)
+                self.elided += 1
+                return
+            if self.can_elide(stmt.local_ty, stmt.value):
+                # слот свежего значения и есть переменная: при повторном
+                # исполнении let (цикл) прежняя привязка уже вне области
+                self.bind(stmt.name, stmt.local_ty, self.expr(stmt.value))
+                self.elided += 1
+                return
             value = self.expr(stmt.value)
             self.bind(
                 stmt.name, stmt.local_ty, self.materialize(stmt.local_ty, value)
@@ -643,9 +911,15 @@ class Codegen:
             self.gen_match(stmt)
             return
         if isinstance(stmt, ast.ReturnStmt):
-            if stmt.value is not None:
-                value = self.expr(stmt.value)
-                self.copy_into(self.ret_ty, self.ret_slot, value)
+            value = stmt.value
+            bound = (
+                self.find(value.ident)
+                if isinstance(value, ast.Name) else None
+            )
+            if value is not None and (
+                bound is None or bound[1] is not self.ret_slot
+            ):
+                self.expr_into(self.ret_ty, self.ret_slot, value)
             self.b.branch(self.exit_block)
             return
         if isinstance(stmt, ast.BreakStmt):
@@ -655,7 +929,9 @@ class Codegen:
             if getattr(stmt, "proven", False):
                 return  # доказан статически — проверка не нужна
             cond = self.expr(stmt.cond)
-            self.trap_if(self.b.not_(cond), stmt, "assert не выполнен")
+            self.trap_if(
+                self.b.not_(cond), stmt, "assert не выполнен", "assert"
+            )
             return
         if isinstance(stmt, (ast.ExprStmt, ast.DiscardStmt)):
             self.expr(stmt.expr, allow_void=True)
@@ -795,8 +1071,13 @@ class Codegen:
                     subject, [I32L(0), I32L(fidx)], inbounds=True
                 )
                 pty = arm.payload_ty
-                src = pptr if self.is_agg(pty) else self.b.load(pptr)
-                self.bind(arm.binding, pty, self.materialize(pty, src))
+                if self.can_elide(pty, stmt.subject):
+                    # нагрузка свежего субъекта больше никому не видна
+                    self.bind(arm.binding, pty, pptr)
+                    self.elided += 1
+                else:
+                    src = pptr if self.is_agg(pty) else self.b.load(pptr)
+                    self.bind(arm.binding, pty, self.materialize(pty, src))
             self.gen_block(arm.body)
             self.pop()
             self.ensure_br(merge)
@@ -840,7 +1121,8 @@ class Codegen:
             bad_low = self.b.icmp_signed("<", idx32, I32L(0))
             bad_high = self.b.icmp_signed(">=", idx32, size)
             self.trap_if(
-                self.b.or_(bad_low, bad_high), node, "индекс вне границ"
+                self.b.or_(bad_low, bad_high), node, "индекс вне границ",
+                "bounds",
             )
         return self.b.gep(base, path, inbounds=True)
 
@@ -863,7 +1145,8 @@ class Codegen:
             bad_low = self.b.icmp_signed("<", idx, I64L(0))
             bad_high = self.b.icmp_signed(">=", idx, size)
             self.trap_if(
-                self.b.or_(bad_low, bad_high), node, "индекс вне границ"
+                self.b.or_(bad_low, bad_high), node, "индекс вне границ",
+                "bounds",
             )
         idx32 = self.b.trunc(idx, I32L)
         path = (
@@ -948,7 +1231,7 @@ class Codegen:
             return self.cstr_str("")
         if len(segs) == 1 and isinstance(segs[0], str):
             return self.cstr_str(segs[0])
-        out = self.alloca(STR_LL, name="str")
+        out = self.result_slot(STR_LL, name="str")
         self.b.call(self.rtm("init"), [out])
         for seg in node.segments:
             if isinstance(seg, str):
@@ -1064,6 +1347,7 @@ class Codegen:
                 self.b.extract_value(pair, 1),
                 node,
                 f"переполнение {kind}",
+                "overflow",
             )
             return self.b.extract_value(pair, 0)
         # деление и остаток
@@ -1074,6 +1358,7 @@ class Codegen:
                 self.b.icmp_signed("==", right, zero),
                 node,
                 "деление на ноль",
+                "div",
             )
         if signed:
             if not safe:
@@ -1083,7 +1368,7 @@ class Codegen:
                     ),
                     self.b.icmp_signed("==", right, left.type(-1)),
                 )
-                self.trap_if(edge, node, f"переполнение {kind}")
+                self.trap_if(edge, node, f"переполнение {kind}", "div")
             return (
                 self.b.sdiv(left, right)
                 if op == "/"
@@ -1103,6 +1388,7 @@ class Codegen:
                 self.b.icmp_unsigned(">=", right, right.type(width)),
                 node,
                 f"сдвиг ≥ ширины {kind}",
+                "shift",
             )
         if op == ">>":
             return self.b.lshr(left, right)
@@ -1115,6 +1401,7 @@ class Codegen:
             self.b.icmp_unsigned("!=", back, left),
             node,
             f"переполнение {kind}",
+            "overflow",
         )
         return res
 
@@ -1137,6 +1424,8 @@ class Codegen:
             return None
         if name == "write_span":
             return self.gen_write_span(node)
+        if name == "read_span":
+            return self.gen_read_span(node)
         if name == "write_err_byte":
             self.b.call(
                 self.rt["eat_write_err_byte"], [self.expr(node.args[0])]
@@ -1169,11 +1458,17 @@ class Codegen:
             return self.gen_socket_read_byte(node)
         if name == "socket_write_span":
             return self.gen_socket_write_span(node)
+        if name == "socket_read_span":
+            return self.gen_socket_read_span(node)
         if name == "socket_close":
             self.b.call(
                 self.rt["eat_socket_close"], [self.expr(node.args[0])]
             )
             return None
+        if name == "socket_wait":
+            fd = self.expr(node.args[0])
+            ms = self.expr(node.args[1])
+            return self.b.call(self.rt["eat_socket_wait"], [fd, ms])
         if name == "len":
             return self.gen_len(node)
         if name in ("i32", "u32", "u16", "u8", "u64", "i64", "char"):
@@ -1186,14 +1481,18 @@ class Codegen:
             return self.gen_enum_ctor(node)
         sig = self.checker.structs[node.struct].methods[node.name]
         fn = self.funcs[f"{node.struct}.{node.name}"]
-        return self.emit_call(node, fn, sig, [self.expr(node.obj)])
+        # назначение (--elide) — слоту возврата, не получателю
+        dest, self.dest = self.dest, None
+        recv = self.expr(node.obj)
+        self.dest = dest
+        return self.emit_call(node, fn, sig, [recv])
 
     def gen_tagged_ctor(self, node: ast.Call):
         """Конструкторы Ok/Err/Some: {tag, payload в своём слоте} —
         тот же лейаут, которым read_byte/gen_enum_ctor собирают
         Result/Option (Ok/Some — tag 0 слот 1, Err — tag 1 слот 2)."""
         name = node.ctor
-        out = self.alloca(self.ll(node.ty), name=f"{name.lower()}.res")
+        out = self.result_slot(self.ll(node.ty), name=f"{name.lower()}.res")
         tag = I32L(1 if name == "Err" else 0)
         self.b.store(tag, self.b.gep(out, [I32L(0), I32L(0)], inbounds=True))
         if name == "Err":
@@ -1203,12 +1502,12 @@ class Codegen:
         else:
             pty, slot = node.ty.inner, 1
         dst = self.b.gep(out, [I32L(0), I32L(slot)], inbounds=True)
-        self.copy_into(pty, dst, self.expr(node.args[0]))
+        self.expr_into(pty, dst, node.args[0])
         return out
 
     def gen_enum_ctor(self, node: ast.MethodCall):
         ename = node.enum_ctor
-        out = self.alloca(
+        out = self.result_slot(
             self.enum_ll_of(ename), name=f"{ename}.{node.name}"
         )
         tag = I32L(self.checker.enums[ename].index(node.name))
@@ -1216,7 +1515,7 @@ class Codegen:
         pty = self.checker.enum_payloads[ename][node.name]
         slot = self.enum_slot[ename][node.name]
         dst = self.b.gep(out, [I32L(0), I32L(slot)], inbounds=True)
-        self.copy_into(pty, dst, self.expr(node.args[0]))
+        self.expr_into(pty, dst, node.args[0])
         return out
 
     def lvalue_root(self, node: ast.Expr) -> str | None:
@@ -1234,7 +1533,7 @@ class Codegen:
         agg_ret = sig.ret is not None and self.is_agg(sig.ret)
         out = None
         if agg_ret:
-            out = self.alloca(self.ll(sig.ret), name="call.ret")
+            out = self.result_slot(self.ll(sig.ret), name="call.ret")
             args.insert(0, out)
         # агрегаты передаются по ссылке без копии; перекрытие аргумента
         # с let self-получателем (общий корень lvalue-пути) страхует
@@ -1271,18 +1570,48 @@ class Codegen:
                 self.b.icmp_unsigned(">", off, size),
                 self.b.icmp_unsigned(">", ln, rem),
             )
-            self.trap_if(bad, node, "write_span вне границ массива")
+            self.trap_if(bad, node, "write_span вне границ массива", "bounds")
         ptr = self.b.gep(arr, [I32L(0), off], inbounds=True)
         self.b.call(self.rt["eat_write_span"], [ptr, ln])
         return None
 
+    def gen_read_span(self, node: ast.Call):
+        """read_span(a, off, max) -> Result<u32, IoError>: границы — как
+        write_span (то же обязательство bounds верификатора); сырой i32
+        шима (n или -1) собирается в Result по лейауту gen_read_byte."""
+        arr = self.expr(node.args[0])
+        off = self.expr(node.args[1])
+        mx = self.expr(node.args[2])
+        size = I32L(node.arr_size)
+        if not getattr(node, "in_bounds", False):
+            rem = self.b.sub(size, off)
+            bad = self.b.or_(
+                self.b.icmp_unsigned(">", off, size),
+                self.b.icmp_unsigned(">", mx, rem),
+            )
+            self.trap_if(bad, node, "read_span вне границ массива", "bounds")
+        ptr = self.b.gep(arr, [I32L(0), off], inbounds=True)
+        raw = self.b.call(self.rt["eat_read_span"], [ptr, mx])
+        res = self.alloca(self.ll(node.ty), name="rs.res")
+        ok = self.b.icmp_signed(">=", raw, I32L(0))
+        tag = self.b.select(ok, I32L(0), I32L(1))
+        self.b.store(tag, self.b.gep(res, [I32L(0), I32L(0)], inbounds=True))
+        n = self.b.select(ok, raw, I32L(0))
+        self.b.store(n, self.b.gep(res, [I32L(0), I32L(1)], inbounds=True))
+        # Err(Eof) — индекс варианта 0
+        self.b.store(
+            I32L(0), self.b.gep(res, [I32L(0), I32L(2)], inbounds=True)
+        )
+        return res
+
     def gen_arg_len(self, node: ast.Call):
         """arg_len(i): длина i-го аргумента; i >= arg_count() — trap
         (как индекс массива с рантайм-индексом)."""
         i = self.expr(node.args[0])
         cnt = self.b.call(self.rt["eat_arg_count"], [])
         self.trap_if(
-            self.b.icmp_unsigned(">=", i, cnt), node, "arg_len вне границ argv"
+            self.b.icmp_unsigned(">=", i, cnt), node,
+            "arg_len вне границ argv", "bounds",
         )
         return self.b.call(self.rt["eat_arg_len"], [i])
 
@@ -1293,13 +1622,15 @@ class Codegen:
         j = self.expr(node.args[1])
         cnt = self.b.call(self.rt["eat_arg_count"], [])
         self.trap_if(
-            self.b.icmp_unsigned(">=", i, cnt), node, "arg_byte вне границ argv"
+            self.b.icmp_unsigned(">=", i, cnt), node,
+            "arg_byte вне границ argv", "bounds",
         )
         ln = self.b.call(self.rt["eat_arg_len"], [i])
         self.trap_if(
             self.b.icmp_unsigned(">=", j, ln),
             node,
             "arg_byte вне границ аргумента",
+            "bounds",
         )
         return self.b.call(self.rt["eat_arg_byte"], [i, j])
 
@@ -1371,10 +1702,44 @@ class Codegen:
             self.b.icmp_unsigned(">", off, size),
             self.b.icmp_unsigned(">", ln, rem),
         )
-        self.trap_if(bad, node, "socket_write_span вне границ массива")
+        self.trap_if(
+            bad, node, "socket_write_span вне границ массива", "bounds"
+        )
         ptr = self.b.gep(arr, [I32L(0), off], inbounds=True)
         return self.b.call(self.rt["eat_socket_write_span"], [fd, ptr, ln])
 
+    def gen_socket_read_span(self, node: ast.Call):
+        """socket_read_span(fd, a, off, max) -> Result<u32, IoError>:
+        границы — как gen_socket_write_span (всегда в рантайме); сырой
+        i32 шима (n, 65 537 — Eof, 65 538 — Fail) собирается в Result
+        по лейауту gen_socket_read_byte."""
+        fd = self.expr(node.args[0])
+        arr = self.expr(node.args[1])
+        off = self.expr(node.args[2])
+        mx = self.expr(node.args[3])
+        size = I32L(node.arr_size)
+        rem = self.b.sub(size, off)
+        bad = self.b.or_(
+            self.b.icmp_unsigned(">", off, size),
+            self.b.icmp_unsigned(">", mx, rem),
+        )
+        self.trap_if(
+            bad, node, "socket_read_span вне границ массива", "bounds"
+        )
+        ptr = self.b.gep(arr, [I32L(0), off], inbounds=True)
+        raw = self.b.call(self.rt["eat_socket_read_span"], [fd, ptr, mx])
+        res = self.alloca(self.ll(node.ty), name="srs.res")
+        ok = self.b.icmp_unsigned("<", raw, I32L(65537))
+        tag = self.b.select(ok, I32L(0), I32L(1))
+        self.b.store(tag, self.b.gep(res, [I32L(0), I32L(0)], inbounds=True))
+        n = self.b.select(ok, raw, I32L(0))
+        self.b.store(n, self.b.gep(res, [I32L(0), I32L(1)], inbounds=True))
+        # 65 537 — Err(Eof) (вариант 0), 65 538 — Err(Fail) (вариант 1)
+        fail = self.b.icmp_unsigned("==", raw, I32L(65538))
+        err = self.b.select(fail, I32L(1), I32L(0))
+        self.b.store(err, self.b.gep(res, [I32L(0), I32L(2)], inbounds=True))
+        return res
+
     def gen_len(self, node: ast.Call):
         aty = node.args[0].ty
         if isinstance(aty, ArrayType):
@@ -1405,7 +1770,7 @@ class Codegen:
             if target == "u8":
                 if not proven:
                     bad = self.b.icmp_unsigned(">", value, I16L(255))
-                    self.trap_if(bad, node, "переполнение при u8()")
+                    self.trap_if(bad, node, "переполнение при u8()", "cast")
                 return self.b.trunc(value, I8L)
             if target in ("u64", "i64"):
                 return self.b.zext(value, I64L)
@@ -1418,18 +1783,18 @@ class Codegen:
             if src == "i32":
                 if target == "u64" and not proven:
                     bad = self.b.icmp_signed("<", value, I32L(0))
-                    self.trap_if(bad, node, "переполнение при u64()")
+                    self.trap_if(bad, node, "переполнение при u64()", "cast")
                 return self.b.sext(value, I64L)
             return self.b.zext(value, I64L)
         # src — i32 или u32 (регистр i32)
         if target == "i32" and src == "u32":
             if not proven:
                 bad = self.b.icmp_unsigned(">", value, I32L(2**31 - 1))
-                self.trap_if(bad, node, "переполнение при i32()")
+                self.trap_if(bad, node, "переполнение при i32()", "cast")
         elif target == "u32" and src == "i32":
             if not proven:
                 bad = self.b.icmp_signed("<", value, I32L(0))
-                self.trap_if(bad, node, "переполнение при u32()")
+                self.trap_if(bad, node, "переполнение при u32()", "cast")
         elif target == "u16":
             if not proven:
                 if src == "i32":
@@ -1438,7 +1803,7 @@ class Codegen:
                     bad = self.b.or_(low, high)
                 else:
                     bad = self.b.icmp_unsigned(">", value, I32L(65535))
-                self.trap_if(bad, node, "переполнение при u16()")
+                self.trap_if(bad, node, "переполнение при u16()", "cast")
             return self.b.trunc(value, I16L)
         elif target == "u8":
             if not proven:
@@ -1448,7 +1813,7 @@ class Codegen:
                     bad = self.b.or_(low, high)
                 else:
                     bad = self.b.icmp_unsigned(">", value, I32L(255))
-                self.trap_if(bad, node, "переполнение при u8()")
+                self.trap_if(bad, node, "переполнение при u8()", "cast")
             return self.b.trunc(value, I8L)
         return value
 
@@ -1461,7 +1826,7 @@ class Codegen:
         if src == "u64":
             if not proven:
                 bad = self.b.icmp_unsigned(">", value, I64L(hi))
-                self.trap_if(bad, node, f"переполнение при {target}()")
+                self.trap_if(bad, node, f"переполнение при {target}()", "cast")
             if target == "i64":
                 return value
         else:  # i64
@@ -1473,7 +1838,7 @@ class Codegen:
                         self.b.icmp_signed("<", value, I64L(lo)),
                         self.b.icmp_signed(">", value, I64L(hi)),
                     )
-                self.trap_if(bad, node, f"переполнение при {target}()")
+                self.trap_if(bad, node, f"переполнение при {target}()", "cast")
             if target == "u64":
                 return value
         wide = {"u8": I8L, "u16": I16L}.get(target, I32L)
@@ -1506,27 +1871,27 @@ class Codegen:
         return ptr if self.is_agg(node.ty) else self.b.load(ptr)
 
     def gen_struct_lit(self, node: ast.StructLit):
-        out = self.alloca(self.struct_ll[node.name], name=node.name)
+        out = self.result_slot(self.struct_ll[node.name], name=node.name)
         fields = self.checker.structs[node.name].fields
         for fname, fexpr in node.fields:
             fidx = self.field_index[node.name][fname]
             ptr = self.b.gep(out, [I32L(0), I32L(fidx)], inbounds=True)
-            self.copy_into(fields[fname], ptr, self.expr(fexpr))
+            self.expr_into(fields[fname], ptr, fexpr)
         return out
 
     def gen_array_lit(self, node: ast.ArrayLit):
         aty = node.ty
-        out = self.alloca(self.ll(aty), name="arr")
+        out = self.result_slot(self.ll(aty), name="arr")
         for i, elem in enumerate(node.elems):
             ptr = self.b.gep(out, [I32L(0), I32L(i)], inbounds=True)
-            self.copy_into(aty.elem, ptr, self.expr(elem))
+            self.expr_into(aty.elem, ptr, elem)
         return out
 
     def gen_array_fill(self, node: ast.ArrayFill):
         """[значение; N]: значение вычисляется один раз, заполнение —
         циклом (N бывает большим, разворачивать нельзя)."""
         aty = node.ty
-        out = self.alloca(self.ll(aty), name="arr.fill")
+        out = self.result_slot(self.ll(aty), name="arr.fill")
         value = self.expr(node.value)
         idx = self.alloca(I32L, name="fill.i")
         self.b.store(I32L(0), idx)
@@ -1575,6 +1940,9 @@ def _memory_report(cg: Codegen, checker, machine) -> dict:
     globals_bytes = sum(len(data) for data in cg.cstr_cache) + (
         4 + STR_CAP
     ) * len(cg.strlit_cache)
+    # таблицы мест trap'ов (--trap-sites): запись на непроверенную
+    # проверку вместо уникальной строки
+    globals_bytes += sum(cg.site_tables) * TRAP_SITE_LL.get_abi_size(td)
     # константы-массивы (A2): count * ширина элемента в байтах —
     # ровно эти данные лежат в `__const` (флеш)
     for g in cg.constexpr_globals.values():
@@ -1587,6 +1955,48 @@ def _memory_report(cg: Codegen, checker, machine) -> dict:
     }
 
 
+_DEFINE = re.compile(r'define [^@]*@"?([\w.$]+)"?\(')
+
+
+def _instr_counts(text: str) -> dict[str, int]:
+    """Инструкций в телах функций текста модуля — строк с отступом
+    между `define` и `}` — по LLVM-имени (кавычки у имени ставит наш
+    писатель, у принтера LLVM их нет)."""
+    counts: dict[str, int] = {}
+    name = None
+    for line in text.split("\n"):
+        if name is None:
+            m = _DEFINE.match(line)
+            if m is not None:
+                name = m.group(1)
+                counts[name] = 0
+        elif line == "}":
+            name = None
+        elif line.startswith("  "):
+            counts[name] += 1
+    return counts
+
+
+def _functions_report(cg: Codegen, frames: dict, before: dict,
+                      after: dict | None, tagged) -> dict:
+    """Разрез отчёта build по функциям (`--report=json`): инструкций IR
+    до и после O2 (0 — функция целиком встроена и удалена; None — O2
+    не в этом процессе: части -j, clang-пути), оставшиеся в рантайме
+    проверки по видам, alwaysinline от inline_hints, кадр §8."""
+    out: dict[str, dict] = {}
+    for key, fn in cg.funcs.items():
+        if fn.name not in before:
+            continue  # extern — тела нет
+        out[key] = {
+            "frame": frames.get(key, 0),
+            "ir": before[fn.name],
+            "ir_o2": None if after is None else after.get(fn.name, 0),
+            "inline": fn.name in tagged,
+            "traps": dict(sorted(cg.trap_kinds.get(key, {}).items())),
+        }
+    return out
+
+
 def _trap_map_text(cg: Codegen) -> str:
     """Таблица код -> сообщение режима trap-кодов: комментарии в хвосте
     .ll (валидный IR; во флеш не попадают)."""
@@ -1596,7 +2006,7 @@ def _trap_map_text(cg: Codegen) -> str:
 
 
 def emit_ir(program: ast.Program, checker, trap_codes: bool = False,
-            opt: bool = False) -> str:
+            opt: bool = False, out=None) -> str:
     """Текстовый LLVM IR — канон дифф-сверки фазы 4 self-host
     (`eatc ir`, selfhost/Ir.eat). Без верификатора: все проверки
     остаются в рантайме. Имя модуля и файл в trap-сообщениях —
@@ -1604,14 +2014,30 @@ def emit_ir(program: ast.Program, checker, trap_codes: bool = False,
     файла (self-hosted эмиттер читает исходник со stdin).
     opt: ось `-O` — инлайн-хинты малым листовым функциям в тексте
     (`axis_inline_hints`, эталон SelfIrOpt); канон (opt=False) не
-    трогается."""
+    трогается.
+    Потоково (module.stream): текст функции готов сразу после её
+    генерации, объекты инструкций отпускаются. out — поток вывода
+    (`eatc ir`): текст пишется в него по мере генерации, пик памяти —
+    самая большая функция, а не вся программа; возвращается "".
+    Копится целиком только с opt (постпроходу нужен весь текст) и без
+    рантайм-модуля: rtm может упасть посреди кодогена — половина .ll
+    в выводе не остаётся."""
     cg = Codegen(program, checker, "stdin", trap_codes=trap_codes)
-    module = cg.generate()
-    module.triple = ""
-    text = str(module) + _trap_map_text(cg)
+    cg.module.triple = ""
+    direct = out is not None and not opt and "RtStr" in checker.structs
+    chunks: list[str] = []
+    cg.module.stream(out.write if direct else chunks.append)
+    cg.generate()
+    if direct:
+        out.write(_trap_map_text(cg))
+        return ""
+    text = "".join(chunks) + _trap_map_text(cg)
     if opt:
         text = axis_inline_hints(text)
-    return text
+    if out is None:
+        return text
+    out.write(text)
+    return ""
 
 
 # Инлайн-хинты build-конвейера (OPTIMIZATIONS_PLAN §7.6, кандидат 2,
@@ -1625,14 +2051,19 @@ INLINE_BUDGET = 768
 
 
 def inline_hints(ref, limit: int = INLINE_LIMIT,
-                 budget: int = INLINE_BUDGET) -> list:
+                 budget: int = INLINE_BUDGET,
+                 counts: dict | None = None) -> list:
     """`alwaysinline` малым листовым функциям распарсенного модуля:
     тело ≤ limit инструкций, рост ≤ budget, и каждый вызов ведёт либо
     в декларацию (аксиома ОС, интринсик, trap), либо в уже помеченную
     функцию — та стянется инлайном, и функция станет листом
     (замыкание снизу вверх; граф вызовов — DAG, рекурсии в языке
     нет). `main` (си-обёртка входа) не помечается. Возвращает имена
-    помеченных (для тестов/разведки)."""
+    помеченных (для тестов/разведки).
+    counts — частоты функций из PGO-профиля (pgo.func_counts,
+    `--pgo-hints`): не исполнявшиеся в тренировке не помечаются,
+    горячим (не реже 1/HOT_SHARE самой частой) порог и бюджет
+    умножаются на HOT_SCALE."""
     size, callees, sites = {}, {}, {}
     for f in ref.functions:
         if f.is_declaration:
@@ -1649,14 +2080,22 @@ def inline_hints(ref, limit: int = INLINE_LIMIT,
                             sites.get(ops[-1].name, 0) + 1
         size[f.name], callees[f.name] = n, cd
     defined, tagged = set(size), set()
+    hottest = max(counts.values(), default=0) if counts else 0
     changed = True
     while changed:
         changed = False
         for name in defined:
+            lim, bud = limit, budget
+            if counts is not None:
+                count = counts.get(name, 0)
+                if count == 0:
+                    continue
+                if count * pgo.HOT_SHARE >= hottest:
+                    lim, bud = lim * pgo.HOT_SCALE, bud * pgo.HOT_SCALE
             if (name in tagged or name == "main"
-                    or size[name] > limit
+                    or size[name] > lim
                     or size[name] * max(0, sites.get(name, 0) - 1)
-                    > budget):
+                    > bud):
                 continue
             if all(c not in defined or c in tagged
                    for c in callees[name]):
@@ -1758,22 +2197,120 @@ def axis_inline_hints(text: str, limit: int = INLINE_LIMIT,
     return "\n".join(lines)
 
 
+def _clang_id() -> str:
+    """Идентичность хостового clang для ключа кэша: путь и (mtime,
+    размер) бинарника — обновление тулчейна сбрасывает кэш рантайма."""
+    path = shutil.which("clang")
+    if path is None:
+        return ""
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def optimize(ref, machine) -> None:
+    """Конвейер O2 мид-энда llvmlite (NewPM speed_level=2) над
+    разобранным модулем — путь build и `run --jit`."""
+    pto = llvm.create_pipeline_tuning_options(speed_level=2)
+    pb = llvm.create_pass_builder(machine, pto)
+    pb.getModulePassManager().run(ref, pb)
+
+
+def _clang_runtime(flags: list, out: Path) -> bool:
+    """clang над runtime.c с флагами -> out; успех сборки."""
+    runtime = Path(__file__).parent / "runtime.c"
+    try:
+        proc = subprocess.run(
+            ["clang", *flags, str(runtime), "-o", str(out)],
+            capture_output=True,
+        )
+    except OSError:
+        return False
+    return proc.returncode == 0
+
+
+def _runtime_artifact(flags: list, suffix: str) -> Path | None:
+    """Сборка runtime.c в дисковом кэше по (триплет, флаги, clang, хэш
+    runtime.c); None — кэш выключен или сборка не удалась."""
+    runtime = Path(__file__).parent / "runtime.c"
+    k = cache.key(
+        llvm.get_default_triple(), " ".join(flags), _clang_id(),
+        runtime.read_bytes(),
+    )
+    return cache.artifact(
+        "runtime", k, suffix, lambda tmp: _clang_runtime(flags, tmp)
+    )
+
+
+def runtime_object(lto: bool = False) -> Path:
+    """runtime.c, собранный заранее: объект `-O2` либо LTO-биткод
+    (`-O2 -flto`, путь --release) в дисковом кэше. clang компилирует
+    шим один раз на тулчейн, а не на каждый build; линковка берёт
+    готовый файл. Кэш выключен или сборка не удалась — исходник: clang
+    соберёт его на линковке, как раньше (и сам доложит ошибку)."""
+    flags = ["-O2", "-flto", "-c"] if lto else ["-O2", "-c"]
+    path = _runtime_artifact(flags, ".bc" if lto else ".o")
+    return Path(__file__).parent / "runtime.c" if path is None else path
+
+
+def runtime_library(tmp_dir: str) -> Path | None:
+    """runtime.c разделяемой библиотекой для `run --jit` (eatc/jit.py):
+    аксиомы — символы процесса, JIT-код зовёт их напрямую. EAT_JIT
+    выключает re-exec ради стека (стек даёт поток JIT). Кэш выключен —
+    сборка в tmp_dir; None — clang нет или сборка не удалась."""
+    flags = ["-O2", "-fPIC", "-shared", "-DEAT_JIT"]
+    path = _runtime_artifact(flags, ".so")
+    if path is None:
+        path = Path(tmp_dir) / "runtime.so"
+        if not _clang_runtime(flags, path):
+            return None
+    return path
+
+
 def compile_binary(
     program: ast.Program, checker, filename: str, out_path: str,
     trap_codes: bool = False, link: bool = True, release: bool = False,
+    jobs: int = 1, pgo_gen: bool = False, pgo_use: str | None = None,
+    pgo_hints: bool = False, trap_sites: bool = False, elide: bool = False,
+    tbaa: bool = True, tests: list | None = None, functions: bool = False,
 ) -> tuple[str, dict]:
     """AST → LLVM IR → объектный файл → clang → бинарник + отчёт §8.
     release: LTO на линковке (`clang -flto` над .ll программы и
     runtime.c вместе — аксиомы инлайнятся) — меньше размер ценой
-    времени линковки; семантика и канон .ll не меняются."""
-    cg = Codegen(program, checker, filename, trap_codes=trap_codes)
-    module = cg.generate()
+    времени линковки; семантика и канон .ll не меняются. jobs > 1 —
+    модуль режется на части по графу вызовов с границами по
+    содержимому (eatc/partition.py; число частей от jobs не зависит,
+    малый модуль — одна часть), оптимизация и эмиссия частей — до jobs
+    процессов, объекты частей кэшируются (report["parts"] — частей
+    всего и из кэша).
+    pgo_gen / pgo_use (.profdata) — PGO-сборка clang'ом (eatc/pgo.py):
+    инструментированная либо с профилем; pgo_hints — inline_hints по
+    частотам профиля. Как и release, части -j не использует.
+    trap_sites — общий холодный trap-блок на функцию (Codegen);
+    elide — элизия копий агрегатов (report["elided"] — снятых копий);
+    tbaa — TBAA-теги load/store для мид-энда (eatc/tbaa.py; report
+    ["tbaa"] — тегов): их несёт текст, который оптимизируется, .ll
+    рядом с бинарником пишется без них. tests — бинарник-раннер этих
+    test-блоков вместо main (check --native). functions —
+    report["functions"], разрез по функциям (_functions_report)."""
+    cg = Codegen(
+        program, checker, filename, trap_codes=trap_codes,
+        trap_sites=trap_sites, elide=elide, tbaa=tbaa, tests=tests,
+    )
+    chunks: list[str] = []
+    cg.module.stream(chunks.append)
+    cg.generate()
+    text = "".join(chunks)
+    del chunks
     try:
         llvm.initialize_native_target()
         llvm.initialize_native_asmprinter()
     except RuntimeError:
         pass  # новые llvmlite инициализируются сами
-    ref = llvm.parse_assembly(str(module))
+    ref = llvm.parse_assembly(text)
     ref.verify()
     # reloc='pic': llvmlite по умолчанию (reloc='default', abs/small code
     # model) эмитит на aarch64 абсолютные релокации R_AARCH64_MOVW_UABS_G0_NC;
@@ -1781,24 +2318,29 @@ def compile_binary(
     # Debian) отвергает абсолютные MOVW против локальных символов. PIC-объект
     # линкуется дефолтным PIE и не меняет поведения на macOS (там код и так
     # PIC). Затрагивает только путь emit_object ниже: канонный .ll (пишется из
-    # str(module) выше), §8-отчёт (target_data) и clang-прямые пути (--release
+    # текст модуля выше), §8-отчёт (target_data) и clang-прямые пути (--release
     # LTO, MCU --no-bin, bootstrap) не зависят от модели релокаций.
     machine = llvm.Target.from_default_triple().create_target_machine(
         opt=2, reloc="pic"
     )
     report = _memory_report(cg, checker, machine)
+    before = _instr_counts(text) if functions else None
+    if elide:
+        report["elided"] = cg.elided
+    canon = text
+    if tbaa:
+        report["tbaa"] = cg.tbaa.tagged
+        canon = strip_tbaa(text)
     out = Path(out_path)
     out.parent.mkdir(parents=True, exist_ok=True)
     ll_path = out.with_suffix(".ll")
-    ll_path.write_text(
-        str(module) + _trap_map_text(cg), encoding="utf-8"
-    )
+    ll_path.write_text(canon + _trap_map_text(cg), encoding="utf-8")
+    del canon
     if trap_codes and cg.trap_list:
         # таблица код -> сообщение отдельным файлом рядом с бинарником
         out.with_suffix(".trapmap").write_text(
             _trap_map_text(cg), encoding="utf-8"
         )
-    runtime = Path(__file__).parent / "runtime.c"
     # стек 128 МБ: у программ без кучи пулы живут в кадре main,
     # и кадры компилятора (§8) выходят за умолчание ОС (8 МБ);
     # кадр main самого self-hosted компилятора — ~85 МБ (фаза 5)
@@ -1806,19 +2348,44 @@ def compile_binary(
         stack_flags = ["-Wl,-stack_size,0x10000000"]
     else:
         stack_flags = ["-Wl,-z,stacksize=268435456"]
-    if release:
+    if release or pgo_gen or pgo_use is not None:
         # LTO: clang оптимизирует .ll программы и runtime.c вместе,
         # инлайня аксиомы через границу — меньше размер, дольше линковка.
         # llvmlite-пасс и emit_object не нужны (clang делает кодоген);
         # trap-map комментарии в .ll clang игнорирует.
+        # PGO: тот же путь через clang; runtime.c — исходником с теми же
+        # флагами профиля (его аксиомы тоже в профиле), не из кэша
+        if functions:
+            report["functions"] = _functions_report(
+                cg, report["frames"], before, None, ()
+            )
         if not link:
             return str(ll_path), report
+        src = ll_path
+        if tbaa:
+            # clang получает текст с тегами, канон .ll — без них
+            src = out.with_suffix(".tbaa.ll")
+            src.write_text(text, encoding="utf-8")
+        if pgo_hints and pgo_use is not None:
+            counts = pgo.func_counts(pgo_use, filename)
+            if inline_hints(ref, counts=counts):
+                if src != ll_path:
+                    src.unlink()
+                src = out.with_suffix(".pgo.ll")
+                src.write_text(str(ref), encoding="utf-8")
+        if pgo_gen or pgo_use is not None:
+            runtime = Path(__file__).parent / "runtime.c"
+        else:
+            runtime = runtime_object(lto=True)
+        flags = ["-O2"] + (["-flto"] if release else [])
         proc = subprocess.run(
-            ["clang", "-O2", "-flto", str(ll_path), str(runtime),
-             "-o", str(out)] + stack_flags,
+            ["clang", *flags, *pgo.clang_flags(pgo_gen, pgo_use),
+             str(src), str(runtime), "-o", str(out)] + stack_flags,
             capture_output=True,
             text=True,
         )
+        if src != ll_path:
+            src.unlink()
         if proc.returncode != 0:
             raise EatError(filename, 1, 1, f"clang: {proc.stderr.strip()}")
         return str(out), report
@@ -1827,28 +2394,53 @@ def compile_binary(
     # текстовую эмиссию `eatc ir` фикспойнт бутстрапа требует
     # байт-в-байт — её не трогаем. Инлайн-хинты — post-parse по той
     # же причине: атрибут живёт только в распарсенном модуле.
-    inline_hints(ref)
-    pto = llvm.create_pipeline_tuning_options(speed_level=2)
-    pb = llvm.create_pass_builder(machine, pto)
-    mpm = pb.getModulePassManager()
-    mpm.run(ref, pb)
-    if not link:
-        # --no-bin: только .ll + отчёт §8 — хостовая линковка не нужна
-        # (extern-программы линкуются с драйверами на стороне МК-сборки)
-        return str(ll_path), report
-    obj_path = out.with_suffix(".o")
-    obj_path.write_bytes(machine.emit_object(ref))
-    # -O2 нужен runtime.c, который компилируется здесь же на лету:
-    # без него каждая аксиома ввода/вывода — неоптимизированная
-    # обёртка libc (наш .o уже оптимизирован конвейером выше, ему
-    # флаг безразличен). Канон .ll не меняется.
+    tagged = inline_hints(ref)
+    if functions and jobs > 1:
+        report["functions"] = _functions_report(
+            cg, report["frames"], before, None, tagged
+        )
+    if jobs > 1:
+        if not link:
+            return str(ll_path), report
+        # решение об инлайне — по целому модулю: internal-листья с
+        # alwaysinline копируются в части, остальное режется
+        shared = {
+            n for n in tagged
+            if ref.get_function(n).linkage == llvm.Linkage.internal
+        }
+        parts = partition.split(text, shared)
+        objs, reused = partition.emit_objects(parts, jobs)
+        report["parts"] = (len(parts), reused)
+        obj_paths = [out.with_suffix(f".{k}.o") for k in range(len(objs))]
+        for path, obj in zip(obj_paths, objs):
+            path.write_bytes(obj)
+    else:
+        optimize(ref, machine)
+        if functions:
+            report["functions"] = _functions_report(
+                cg, report["frames"], before, _instr_counts(str(ref)),
+                tagged,
+            )
+        if not link:
+            # --no-bin: только .ll + отчёт §8 — хостовая линковка не
+            # нужна (extern-программы линкуются с драйверами на стороне
+            # МК-сборки)
+            return str(ll_path), report
+        obj_paths = [out.with_suffix(".o")]
+        obj_paths[0].write_bytes(machine.emit_object(ref))
+    # -O2 нужен runtime.c (собран заранее, runtime_object): без него
+    # каждая аксиома ввода/вывода — неоптимизированная обёртка libc
+    # (наш .o уже оптимизирован конвейером выше, ему флаг безразличен).
+    # Канон .ll не меняется.
     proc = subprocess.run(
-        ["clang", "-O2", str(obj_path), str(runtime), "-o", str(out)]
+        ["clang", "-O2", *map(str, obj_paths), str(runtime_object()),
+         "-o", str(out)]
         + stack_flags,
         capture_output=True,
         text=True,
     )
     if proc.returncode != 0:
         raise EatError(filename, 1, 1, f"clang: {proc.stderr.strip()}")
-    obj_path.unlink()
+    for path in obj_paths:
+        path.unlink()
     return str(out), report
@@ -20,18 +20,25 @@ selfhost/Eval.eat. Определение «шага» (один eval/exec_stmt)
 
 from . import ast_nodes as ast
 from .errors import EatError
-from .interpreter import ComptimeBudget, ComptimeDepth, Interpreter, Trap
+from .interpreter import (
+    Array,
+    ComptimeBudget,
+    ComptimeDepth,
+    Interpreter,
+    Trap,
+)
 from .limits import MAX_COMPTIME_CALL_DEPTH, MAX_COMPTIME_STEPS
 from .types import INT_RANGES, ArrayType, BoolType, IntType
 
 # Нечистые встроенные: аксиомы ОС и обёртки вывода. Функция,
 # достигающая любой из них по графу вызовов, не comptime-годна.
 IMPURE_BUILTINS = frozenset({
-    "read_byte", "write_byte", "write_span", "write_err_byte", "exit",
-    "arg_count", "arg_len", "arg_byte", "print", "write",
+    "read_byte", "read_span", "write_byte", "write_span", "write_err_byte",
+    "exit", "arg_count", "arg_len", "arg_byte", "print", "write",
     "in_avail", "ticks",
     "socket_listen", "socket_accept", "socket_avail",
     "socket_read_byte", "socket_write_span", "socket_close",
+    "socket_wait", "socket_read_span",
 })
 
 
@@ -272,7 +279,12 @@ class Comptime:
             if decl.name in interp._constexpr_pending:
                 interp._resolve_pending_constexpr(decl.name)
             slot = interp.constexprs.get(decl.name)
-            return slot.value if slot is not None else None
+            if slot is None:
+                return None
+            if type(slot.value) is Array:
+                # компилятору — список (COW-массив — форма интерпретатора)
+                return list(slot.value.data)
+            return slot.value
         except ComptimeBudget:
             raise EatError(
                 getattr(site, "src_file", None) or self.filename,
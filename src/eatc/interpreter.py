@@ -6,15 +6,17 @@
 связывания (аргумент, const, присваивание, return).
 """
 
+import dataclasses
 import operator
 import os
 import sys
 import time
+from array import array
 from dataclasses import dataclass
 
 from . import ast_nodes as ast
 from .errors import EatError
-from .types import INT_RANGES
+from .types import INT_RANGES, IntType
 
 
 class Trap(EatError):
@@ -74,6 +76,108 @@ class StructRT:
     methods: dict  # имя -> ast.FuncDecl
 
 
+class Array:
+    """Массив EATLang. By-value с copy-on-write: копия на точке
+    связывания — O(1) (новая обёртка над теми же данными, обе стороны
+    помечены разделёнными), данные копируются при первой записи в
+    разделённую обёртку. Обёртка всегда принадлежит одному владельцу
+    (слот, поле, элемент); разделяются только данные. Целые элементы —
+    компактно: u8 — bytearray, прочие ширины — array.array; bool/char/
+    составные — список (вложенный массив-пул — список обёрток-строк,
+    копируемых тем же COW)."""
+
+    __slots__ = ("data", "owned")
+
+    def __init__(self, data, owned: bool = True):
+        self.data = data
+        self.owned = owned
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not Array:
+            return NotImplemented
+        return list(self.data) == list(other.data)
+
+    __hash__ = None
+
+    def copy(self) -> "Array":
+        self.owned = False
+        return Array(self.data, False)
+
+    def mut(self):
+        """Данные для записи: разделённые — копируются; строки и struct'ы
+        вложенного массива — COW-копиями (владелец каждой — новый)."""
+        if not self.owned:
+            d = self.data
+            if type(d) is list and d and type(d[0]) in (Array, StructValue):
+                d = [_copy_value(x) for x in d]
+            else:
+                d = d[:]
+            self.data = d
+            self.owned = True
+        return self.data
+
+    def store(self, index: int, value) -> None:
+        d = self.mut()
+        try:
+            d[index] = value
+        except (OverflowError, ValueError, TypeError):
+            # значение вне ширины элемента (обходчик проверяет диапазон
+            # только на точках связывания) — вырождение в список, как
+            # было бы у list-представления
+            d = self.data = list(d)
+            d[index] = value
+
+
+# компактные представления целых элементов: u8 — bytearray ("B"),
+# прочие — array.array с кодом нужной ширины
+_TYPECODES = {
+    "u8": "B",
+    "u16": "H",
+    "u32": "I" if array("I").itemsize == 4 else "L",
+    "i32": "i" if array("i").itemsize == 4 else "l",
+    "u64": "Q",
+    "i64": "q",
+}
+
+
+def array_code(ty) -> str | None:
+    """Код компактного представления массива типа ty (None — список)."""
+    elem = getattr(ty, "elem", None)
+    if isinstance(elem, IntType):
+        return _TYPECODES.get(elem.kind)
+    return None
+
+
+def new_array(code: str | None, items: list) -> Array:
+    """Массив из уже скопированных элементов."""
+    if code is not None:
+        try:
+            if code == "B":
+                return Array(bytearray(items))
+            return Array(array(code, items))
+        except (OverflowError, ValueError, TypeError):
+            pass  # значение вне ширины — список (см. Array.store)
+    return Array(items)
+
+
+def fill_array(code: str | None, value, size: int) -> Array:
+    """[value; size]: целые — компактно, неизменяемые — повтором ссылки,
+    составные — COW-копиями (строки пула делят данные до записи)."""
+    if code is not None and type(value) is int:
+        try:
+            if code == "B":
+                return Array(bytearray([value]) * size)
+            return Array(array(code, [value]) * size)
+        except (OverflowError, ValueError):
+            pass
+    if type(value) in (int, bool, str):
+        return Array([value] * size)
+    return Array([_copy_value(value) for _ in range(size)])
+
+
 # Бинарные операции без trap-путей — прямые C-функции operator.*;
 # and/or (ленивость), сдвиги и деление (trap) остаются в _eval_binop.
 _BINOP_FNS = {
@@ -96,11 +200,12 @@ _BINOP_FNS = {
 # (§5) их вызов — trap, а не побочный эффект. Зеркало множества —
 # comptime.IMPURE_BUILTINS (статическая годность) и selfhost Eval.eat.
 IMPURE_AXIOMS = frozenset({
-    "read_byte", "write_byte", "write_span", "write_err_byte", "exit",
-    "arg_count", "arg_len", "arg_byte", "print", "write",
+    "read_byte", "read_span", "write_byte", "write_span", "write_err_byte",
+    "exit", "arg_count", "arg_len", "arg_byte", "print", "write",
     "in_avail", "ticks",
     "socket_listen", "socket_accept", "socket_avail",
     "socket_read_byte", "socket_write_span", "socket_close",
+    "socket_wait", "socket_read_span",
 })
 
 
@@ -122,13 +227,133 @@ def _expr_has_call(node) -> bool:
     return False
 
 
+def _src_name(func: ast.FuncDecl) -> str:
+    """Имя функции в trap-текстах: клон специализации (build --spec)
+    трапит именем оригинала."""
+    return getattr(func, "spec_of", None) or func.name
+
+
+class _Resolver:
+    """Статическое разрешение локалов в индексы кадра. Затенение
+    запрещено (правило 6): область каждого имени известна до исполнения,
+    поэтому чтение имени — индекс в плоском кадре, а не поиск по цепочке
+    dict-областей. Индекс пишется на узел (Name/SelfExpr: slot_ix и
+    slot_type — тип объявления для проверок присваивания; LocalDecl,
+    ForStmt, MatchArm: slot_ix объявляемого имени); None — не локал
+    (constexpr либо trap «нет переменной»)."""
+
+    def __init__(self):
+        self.scopes: list[dict] = [{}]
+        self.size = 0
+
+    def declare(self, name: str, tnode=None) -> int | None:
+        if name == "_":
+            return None
+        ix = self.size
+        self.size += 1
+        self.scopes[-1][name] = (ix, tnode)
+        return ix
+
+    def block(self, block: ast.Block) -> None:
+        self.scopes.append({})
+        for stmt in block.stmts:
+            self.stmt(stmt)
+        self.scopes.pop()
+
+    def stmt(self, stmt) -> None:
+        t = type(stmt)
+        if t is ast.LocalDecl:
+            self.expr(stmt.value)
+            stmt.slot_ix = self.declare(stmt.name, stmt.type)
+        elif t is ast.ForStmt:
+            self.expr(stmt.iterable)
+            self.scopes.append({})
+            stmt.slot_ix = self.declare(stmt.target)
+            self.block(stmt.body)
+            self.scopes.pop()
+        elif t is ast.MatchStmt:
+            self.expr(stmt.subject)
+            for arm in stmt.arms:
+                self.scopes.append({})
+                arm.slot_ix = None
+                if arm.binding is not None:
+                    arm.slot_ix = self.declare(arm.binding)
+                self.block(arm.body)
+                self.scopes.pop()
+        elif t is ast.IfStmt:
+            self.expr(stmt.cond)
+            self.block(stmt.then)
+            for cond, blk in stmt.elifs:
+                self.expr(cond)
+                self.block(blk)
+            if stmt.els is not None:
+                self.block(stmt.els)
+        elif t is ast.LoopStmt:
+            self.block(stmt.body)
+        else:
+            # присваивание, return, assert, выражение-инструкция
+            self.expr(stmt)
+
+    def expr(self, node) -> None:
+        if isinstance(node, (ast.Name, ast.SelfExpr)):
+            name = "self" if type(node) is ast.SelfExpr else node.ident
+            for scope in reversed(self.scopes):
+                hit = scope.get(name)
+                if hit is not None:
+                    node.slot_ix, node.slot_type = hit
+                    return
+            node.slot_ix, node.slot_type = None, None
+            return
+        if not isinstance(node, ast.Node):
+            return
+        for f in dataclasses.fields(node):
+            child = getattr(node, f.name)
+            if isinstance(child, ast.Node):
+                self.expr(child)
+            elif isinstance(child, (list, tuple)):
+                for c in child:
+                    if isinstance(c, tuple):
+                        for x in c:
+                            self.expr(x)
+                    else:
+                        self.expr(c)
+
+
+def _layout(func) -> tuple:
+    """Раскладка кадра функции/test-блока: (размер, индекс self,
+    индексы параметров без self, индекс result)."""
+    r = _Resolver()
+    self_ix = None
+    params = []
+    result_ix = None
+    if isinstance(func, ast.FuncDecl):
+        for param in func.params:
+            if param.name == "self":
+                self_ix = r.declare("self")
+            else:
+                params.append(r.declare(param.name, param.type))
+        if func.requires is not None:
+            r.expr(func.requires)
+    if func.body is not None:
+        r.block(func.body)
+    if isinstance(func, ast.FuncDecl) and func.ensures is not None:
+        result_ix = r.declare("result")
+        r.expr(func.ensures)
+    return (r.size, self_ix, tuple(params), result_ix)
+
+
+# результаты read_byte: Ok(байт) на каждый байт и Err(Eof)
+_READ_OK = tuple(Tagged("Ok", b) for b in range(256))
+_READ_EOF = Tagged("Err", EnumValue("IoError", "Eof"))
+
+
 def _copy_value(v):
     """Копия by-value. int/bool/str неизменяемы в Python — как есть;
-    рекурсивно копируются только составные (list, struct и обёртки
-    с потенциально составной нагрузкой)."""
+    массив — O(1) copy-on-write (Array.copy), struct и обёртки с
+    потенциально составной нагрузкой — рекурсивно."""
     t = type(v)
-    if t is list:
-        return [_copy_value(x) for x in v]
+    if t is Array:
+        return v.copy()
     if t is StructValue:
         return StructValue(
             v.name, {k: _copy_value(x) for k, x in v.fields.items()}
@@ -167,12 +392,20 @@ class Interpreter:
             "IoError": ["Eof", "Fail"],
             "ParseError": ["Empty", "BadChar", "Overflow"],
         }
-        self.frames: list[list[dict]] = []
+        # кадры вызовов — плоские списки значений, индексы локалов
+        # разрешены статически (_Resolver); раскладка — по id(FuncDecl)
+        self.frames: list[list] = []
+        self._layouts: dict[int, tuple] = {}
         # бюджет comptime (§5): None — обычный прогон без счёта; иначе
         # каждый eval/exec_stmt инкрементит steps, превышение —
         # ComptimeBudget. Шаг фиксирован в SPEC §6 (паритет с Eval.eat).
         self.step_budget: int | None = None
         self.steps: int = 0
+        # профиль (--profile, eatc.profile.Profiler): None — выключен,
+        # иначе call_func/exec_stmt/run_tests отмечают вход и строки
+        self.profiler = None
+        # буферы stdin/stdout (_Stdio): сброс в конце run_main/run_tests
+        self.stdio = _Stdio()
         # comptime-режим: аксиомы ОС недоступны (trap); ставится вокруг
         # вычисления constexpr-из-вызовов (§5). _constexpr_pending — comptime-
         # константы (значение содержит вызов): вычисляются лениво по
@@ -390,25 +623,20 @@ class Interpreter:
         if len(value) > cap:
             raise self.trap(node, f"строка длиннее ёмкости str<{cap}>")
 
-    @staticmethod
-    def _write_bytes(value: str) -> None:
-        sys.stdout.buffer.write(value.encode("latin-1"))
-        sys.stdout.buffer.flush()
-
-    def push_scope(self) -> None:
-        self.frames[-1].append({})
+    def _write_bytes(self, value: str) -> None:
+        self.stdio.write(value.encode("latin-1"))
 
-    def pop_scope(self) -> None:
-        self.frames[-1].pop()
+    def layout(self, func) -> tuple:
+        """Раскладка кадра (разрешение локалов — один раз на функцию)."""
+        lay = self._layouts.get(id(func))
+        if lay is None:
+            lay = _layout(func)
+            self._layouts[id(func)] = lay
+        return lay
 
-    def declare(self, name: str, slot: Slot) -> None:
-        if name != "_":
-            self.frames[-1][-1][name] = slot
-
-    def slot(self, node: ast.Node, name: str) -> Slot:
-        for scope in reversed(self.frames[-1]):
-            if name in scope:
-                return scope[name]
+    def global_slot(self, node: ast.Node, name: str) -> Slot:
+        """Слот вне локальных областей: constexpr (comptime — по
+        первому доступу) либо trap «нет переменной»."""
         if name in self._constexpr_resolving:
             raise self.trap(node, f"цикл в comptime-константе {name}")
         if name not in self.constexprs and name in self._constexpr_pending:
@@ -420,28 +648,46 @@ class Interpreter:
     # --- запуск -----------------------------------------------------------
 
     def run_main(self) -> None:
-        self.call_func(self.funcs["main"], [], None, self.funcs["main"])
+        try:
+            self.call_func(self.funcs["main"], [], None, self.funcs["main"])
+        finally:
+            self.stdio.flush()
 
     def run_tests(self) -> list[str]:
         passed = []
         for decl in self.program.decls:
-            if not isinstance(decl, ast.TestBlock):
-                continue
-            self.frames.append([{}])
-            try:
-                self.exec_block(decl.body)
-            except EatError as err:
-                raise EatError(
-                    getattr(decl, "src_file", None) or self.filename,
-                    decl.line,
-                    decl.col,
-                    f"test {decl.name} провален: {err.message}",
-                ) from err
-            finally:
-                self.frames.pop()
-            passed.append(decl.name)
+            if isinstance(decl, ast.TestBlock):
+                self.run_test(decl)
+                passed.append(decl.name)
         return passed
 
+    def run_test(self, decl: ast.TestBlock) -> None:
+        """Один test-блок (check -j раздаёт блоки по процессам: кроме
+        собственного кадра, блок ничего не меняет)."""
+        self.frames.append([None] * self.layout(decl)[0])
+        prof = self.profiler
+        if prof is not None:
+            # test-блок — корневой кадр профиля (медленные тесты видны)
+            src = getattr(decl, "src_file", None) or self.filename
+            prof.enter(
+                "test " + decl.name.replace(";", ","),
+                f"{src}:{decl.line}",
+            )
+        try:
+            self.exec_block(decl.body)
+        except EatError as err:
+            raise EatError(
+                getattr(decl, "src_file", None) or self.filename,
+                decl.line,
+                decl.col,
+                f"test {decl.name} провален: {err.message}",
+            ) from err
+        finally:
+            self.frames.pop()
+            if prof is not None:
+                prof.leave()
+            self.stdio.flush()
+
     # --- вызов функции -------------------------------------------------------
 
     def call_func(
@@ -458,7 +704,12 @@ class Interpreter:
                 f"extern {func.name} доступен только в бинарнике "
                 "(интерпретатор не линкует C)",
             )
-        self.frames.append([{}])
+        size, self_ix, param_ixs, result_ix = self.layout(func)
+        frame = [None] * size
+        prof = self.profiler
+        if prof is not None:
+            prof.enter_func(func, self.filename)
+        self.frames.append(frame)
         try:
             if self._comptime_mode:
                 from .limits import MAX_COMPTIME_CALL_DEPTH
@@ -466,19 +717,19 @@ class Interpreter:
                 if self._comptime_depth > MAX_COMPTIME_CALL_DEPTH:
                     raise ComptimeDepth()
             if self_value is not None:
-                self.declare("self", Slot(self_value))
+                frame[self_ix] = self_value
             arg_i = 0
             for param in func.params:
                 if param.name == "self":
                     continue
                 value = _copy_value(args[arg_i]) if copy_args else args[arg_i]
-                arg_i += 1
                 kind, cap = self._meta(param.type)
                 if kind is not None:
                     self._fit(site, kind, value)
                 if cap is not None:
                     self._fit_cap(site, cap, value)
-                self.declare(param.name, Slot(value, kind, cap))
+                frame[param_ixs[arg_i]] = value
+                arg_i += 1
             req = func.requires
             # `requires true` — тривиальный контракт, не тратим eval
             if req is not None and not (
@@ -486,7 +737,8 @@ class Interpreter:
             ):
                 if not self.eval(req):
                     raise self.trap(
-                        site, f"нарушен requires функции {func.name}"
+                        site,
+                        f"нарушен requires функции {_src_name(func)}",
                     )
             result = None
             try:
@@ -497,34 +749,35 @@ class Interpreter:
             if ens is not None and not (
                 type(ens) is ast.BoolLit and ens.value
             ):
-                self.declare("result", Slot(result))
+                frame[result_ix] = result
                 if not self.eval(ens):
                     raise self.trap(
-                        site, f"нарушен ensures функции {func.name}"
+                        site,
+                        f"нарушен ensures функции {_src_name(func)}",
                     )
             return result
         finally:
             # кадр снимается и при trap'е: иначе внешние finally
             # чистили бы чужие области видимости
             self.frames.pop()
+            if prof is not None:
+                prof.leave()
             if self._comptime_mode:
                 self._comptime_depth -= 1
 
     # --- инструкции --------------------------------------------------------
 
     def exec_block(self, block: ast.Block) -> None:
-        self.push_scope()
-        try:
-            for stmt in block.stmts:
-                self.exec_stmt(stmt)
-        finally:
-            self.pop_scope()
+        for stmt in block.stmts:
+            self.exec_stmt(stmt)
 
     def exec_stmt(self, stmt: ast.Stmt) -> None:
         if self.step_budget is not None:
             self.steps += 1
             if self.steps > self.step_budget:
                 raise ComptimeBudget()
+        if self.profiler is not None:
+            self.profiler.line(stmt, self.filename)
         handler = self._EXEC.get(type(stmt))
         if handler is None:
             raise self.trap(stmt, "неизвестная инструкция")
@@ -537,7 +790,8 @@ class Interpreter:
             self._fit(stmt, kind, value)
         if cap is not None:
             self._fit_cap(stmt, cap, value)
-        self.declare(stmt.name, Slot(value, kind, cap))
+        if stmt.slot_ix is not None:
+            self.frames[-1][stmt.slot_ix] = value
 
     def _exec_if(self, stmt: ast.IfStmt) -> None:
         if self.eval(stmt.cond):
@@ -579,15 +833,23 @@ class Interpreter:
         value = _copy_value(self.eval(stmt.value))
         target = stmt.target
         if type(target) is ast.Name:
-            slot = self.slot(target, target.ident)
-            if slot.kind is not None:
-                self._fit(stmt, slot.kind, value)
-            if slot.cap is not None:
-                self._fit_cap(stmt, slot.cap, value)
-            slot.value = value
+            ix = target.slot_ix
+            if ix is None:
+                slot = self.global_slot(target, target.ident)
+                kind, cap = slot.kind, slot.cap
+            else:
+                kind, cap = self._meta(target.slot_type)
+            if kind is not None:
+                self._fit(stmt, kind, value)
+            if cap is not None:
+                self._fit_cap(stmt, cap, value)
+            if ix is None:
+                slot.value = value
+            else:
+                self.frames[-1][ix] = value
             return
         if isinstance(target, ast.FieldAccess):
-            obj = self.eval(target.obj)
+            obj = self._place(target.obj)
             assert isinstance(obj, StructValue)
             kind, cap = self.structs[obj.name].fields[target.name]
             self._fit(stmt, kind, value)
@@ -595,13 +857,35 @@ class Interpreter:
             obj.fields[target.name] = value
             return
         if isinstance(target, ast.Index):
-            obj = self.eval(target.obj)
+            obj = self._place(target.obj)
             index = self.eval(target.index)
             self._check_bounds(target, obj, index)
-            obj[index] = value
+            obj.store(index, value)
             return
         raise self.trap(stmt, "некорректная цель присваивания")
 
+    def _place(self, node):
+        """Значение-место для записи (цель присваивания, получатель
+        let self): цепочка FieldAccess/Index от переменной (тайпчекер).
+        Разделённые массивы по пути отделяются (Array.mut) — запись не
+        видна другим владельцам. Шаги comptime и trap'ы — как у eval."""
+        if type(node) is ast.Index:
+            if self.step_budget is not None:
+                self.steps += 1
+                if self.steps > self.step_budget:
+                    raise ComptimeBudget()
+            obj = self._place(node.obj)
+            index = self.eval(node.index)
+            self._check_bounds(node, obj, index)
+            return obj.mut()[index]
+        if type(node) is ast.FieldAccess:
+            if self.step_budget is not None:
+                self.steps += 1
+                if self.steps > self.step_budget:
+                    raise ComptimeBudget()
+            return self._place(node.obj).fields[node.name]
+        return self.eval(node)
+
     def exec_for(self, stmt: ast.ForStmt) -> None:
         if isinstance(stmt.iterable, ast.RangeExpr):
             start = self._constexpr_eval(stmt.iterable.start)
@@ -609,20 +893,15 @@ class Interpreter:
             items = range(start, end)
         else:
             items = self.eval(stmt.iterable)
-        # скоупы витка (переменная цикла + тело) создаются один раз
-        # и переиспользуются: не 2 dict-аллокации на каждый виток
+            if type(items) is Array:
+                # живое чтение: запись в массив из тела видна следующим
+                # виткам (данные могут смениться при отделении COW)
+                arr = items
+                items = (arr.data[i] for i in range(len(arr)))
         frame = self.frames[-1]
-        loop_scope: dict = {}
-        body_scope: dict = {}
-        frame.append(loop_scope)
-        frame.append(body_scope)
-        target = stmt.target
+        ix = stmt.slot_ix
         stmts = stmt.body.stmts
         exec_stmt = self.exec_stmt
-        tslot = None
-        if target != "_":
-            tslot = Slot(None)
-            loop_scope[target] = tslot
         try:
             for item in items:
                 # виток цикла — шаг comptime: иначе тугой цикл с
@@ -631,16 +910,12 @@ class Interpreter:
                     self.steps += 1
                     if self.steps > self.step_budget:
                         raise ComptimeBudget()
-                if tslot is not None:
-                    tslot.value = _copy_value(item)
-                body_scope.clear()
+                if ix is not None:
+                    frame[ix] = _copy_value(item)
                 for s in stmts:
                     exec_stmt(s)
         except BreakSignal:
             pass  # break привязан к внутреннему циклу — этому
-        finally:
-            frame.pop()
-            frame.pop()
 
     def exec_match(self, stmt: ast.MatchStmt) -> None:
         subject = self.eval(stmt.subject)
@@ -652,13 +927,9 @@ class Interpreter:
         for arm in stmt.arms:
             if arm.pattern != tag:
                 continue
-            self.push_scope()
-            if arm.binding is not None:
-                self.declare(arm.binding, Slot(_copy_value(payload)))
-            try:
-                self.exec_block(arm.body)
-            finally:
-                self.pop_scope()
+            if arm.slot_ix is not None:
+                self.frames[-1][arm.slot_ix] = _copy_value(payload)
+            self.exec_block(arm.body)
             return
         raise self.trap(stmt, f"нет ветки match для {tag}")
 
@@ -678,28 +949,34 @@ class Interpreter:
         return node.value
 
     def _eval_self(self, node: ast.SelfExpr):
-        return self.slot(node, "self").value
+        if node.slot_ix is not None:
+            return self.frames[-1][node.slot_ix]
+        return self.global_slot(node, "self").value
 
     def _eval_name(self, node: ast.Name):
+        ix = node.slot_ix
+        if ix is not None:
+            return self.frames[-1][ix]
         if getattr(node, "ctor", None) is not None:
             return Tagged("None", None)
-        return self.slot(node, node.ident).value
+        return self.global_slot(node, node.ident).value
 
     def _eval_methodcall(self, node: ast.MethodCall):
         # Enum.Variant(x) — конструктор варианта с нагрузкой
         if isinstance(node.obj, ast.Name) and node.obj.ident in self.enums:
             payload = _copy_value(self.eval(node.args[0]))
             return EnumValue(node.obj.ident, node.name, payload)
-        obj = self.eval(node.obj)
-        assert isinstance(obj, StructValue)
-        method = self.structs[obj.name].methods[node.name]
-        args = [self.eval(a) for a in node.args]
+        method = self.structs[node.struct].methods[node.name]
         # получатель без копии: без let self тайпчекер запрещает мутацию
         # self и параметров — на время вызова вся достижимая память
         # вызывающего заморожена, копия ненаблюдаема. При let self
-        # аргументы копируются: аргумент может алиасить внутренности
-        # мутируемого self (s.m(s.arr))
+        # получатель — место (_place: отделение COW по пути), аргументы
+        # копируются: аргумент может алиасить внутренности мутируемого
+        # self (s.m(s.arr))
         var_self = bool(method.params) and method.params[0].mutable
+        obj = self._place(node.obj) if var_self else self.eval(node.obj)
+        assert isinstance(obj, StructValue)
+        args = [self.eval(a) for a in node.args]
         return self.call_func(method, args, obj, node, copy_args=var_self)
 
     def _eval_fieldaccess(self, node: ast.FieldAccess):
@@ -713,6 +990,8 @@ class Interpreter:
         obj = self.eval(node.obj)
         index = self.eval(node.index)
         self._check_bounds(node, obj, index)
+        if type(obj) is Array:
+            return obj.data[index]
         return obj[index]
 
     def _eval_structlit(self, node: ast.StructLit):
@@ -727,11 +1006,12 @@ class Interpreter:
         return StructValue(node.name, fields)
 
     def _eval_arraylit(self, node: ast.ArrayLit):
-        return [_copy_value(self.eval(e)) for e in node.elems]
+        items = [_copy_value(self.eval(e)) for e in node.elems]
+        return new_array(array_code(node.ty), items)
 
     def _eval_arrayfill(self, node: ast.ArrayFill):
         value = self.eval(node.value)
-        return [_copy_value(value) for _ in range(node.size)]
+        return fill_array(array_code(node.ty), value, node.size)
 
     def _eval_str(self, node: ast.StrLit) -> str:
         # Строка — байты (как в рантайме): литерал из исходника
@@ -850,114 +1130,167 @@ class Interpreter:
             return Tagged(node.ctor, _copy_value(self.eval(node.args[0])))
         args = [self.eval(a) for a in node.args]
         name = node.name
-        if self._comptime_mode and name in IMPURE_AXIOMS:
-            # защита: даже при обходе годности аксиома не даёт побочного
-            # эффекта на компиляции — trap → ошибка компиляции (§5)
-            raise self.trap(
-                node, f"аксиома {name} недоступна в comptime"
-            )
-        if name == "print":
-            self._write_bytes(args[0] + "\n")
-            return None
-        if name == "write":
-            self._write_bytes(args[0])
-            return None
-        if name == "read_byte":
-            data = sys.stdin.buffer.read(1)
-            if not data:
-                return Tagged("Err", EnumValue("IoError", "Eof"))
-            return Tagged("Ok", data[0])
-        if name == "write_byte":
-            self._write_bytes(chr(args[0]))
-            return None
-        if name == "write_span":
-            obj, off, ln = args
-            if off + ln > len(obj):
-                raise self.trap(node, "write_span вне границ массива")
-            self._write_bytes("".join(chr(b) for b in obj[off:off + ln]))
-            return None
-        if name == "write_err_byte":
-            sys.stderr.buffer.write(bytes([args[0]]))
-            sys.stderr.buffer.flush()
-            return None
-        if name == "exit":
-            raise SystemExit(args[0])
-        if name == "arg_count":
-            return len(self.argv)
-        if name == "arg_len":
-            i = args[0]
-            if i >= len(self.argv):
-                raise self.trap(node, "arg_len вне границ argv")
-            return len(self.argv[i])
-        if name == "arg_byte":
-            i, j = args
-            if i >= len(self.argv):
-                raise self.trap(node, "arg_byte вне границ argv")
-            if j >= len(self.argv[i]):
-                raise self.trap(node, "arg_byte вне границ аргумента")
-            return self.argv[i][j]
-        if name == "in_avail":
-            return self._in_avail()
-        if name == "ticks":
-            return self._ticks()
-        if name == "socket_listen":
-            return self._net_ref().listen(args[0])
-        if name == "socket_accept":
-            return self._net_ref().accept(args[0])
-        if name == "socket_avail":
-            return self._net_ref().avail(args[0])
-        if name == "socket_read_byte":
-            return self._net_ref().read_byte(args[0])
-        if name == "socket_write_span":
-            fd, obj, off, ln = args
-            if off + ln > len(obj):
+        axiom = self._AXIOMS.get(name)
+        if axiom is not None:
+            if self._comptime_mode and name in IMPURE_AXIOMS:
+                # защита: даже при обходе годности аксиома не даёт
+                # побочного эффекта на компиляции — trap → ошибка
+                # компиляции (§5)
                 raise self.trap(
-                    node, "socket_write_span вне границ массива"
+                    node, f"аксиома {name} недоступна в comptime"
                 )
-            return self._net_ref().write_span(fd, obj[off:off + ln])
-        if name == "socket_close":
-            self._net_ref().close(args[0])
-            return None
-        if name == "len":
-            return len(args[0])
-        if name == "char":
-            return chr(args[0])
+            return axiom(self, node, args)
         if name in INT_RANGES:
-            if isinstance(args[0], str):  # u8(char): код байта
-                return ord(args[0])
-            if self._comptime_mode:  # текст кодогена (§9.1)
-                lo, hi = INT_RANGES[name]
-                if not lo <= args[0] <= hi:
-                    raise self.trap(node, f"переполнение при {name}()")
-                return args[0]
-            self._fit(node, name, args[0])
-            return args[0]
+            return self._cast(node, name, args[0])
         # у обычных функций все параметры немутабельны — аргументы без копий
         return self.call_func(self.funcs[name], args, None, node, copy_args=False)
 
+    def _cast(self, node, name: str, value):
+        if isinstance(value, str):  # u8(char): код байта
+            return ord(value)
+        if self._comptime_mode:  # текст кодогена (§9.1)
+            lo, hi = INT_RANGES[name]
+            if not lo <= value <= hi:
+                raise self.trap(node, f"переполнение при {name}()")
+            return value
+        self._fit(node, name, value)
+        return value
+
+    # --- встроенные и аксиомы ОС (имя -> метод, _AXIOMS ниже) --------------
+
+    def _ax_print(self, node, args):
+        self._write_bytes(args[0] + "\n")
+
+    def _ax_write(self, node, args):
+        self._write_bytes(args[0])
+
+    def _ax_read_byte(self, node, args):
+        # горячий путь ввода: байт из буфера без вызова _Stdio; Tagged
+        # неизменяем — результаты разделяются (_READ_OK/_READ_EOF)
+        io = self.stdio
+        pos = io.pos
+        if pos < len(io.inbuf):
+            io.pos = pos + 1
+            return _READ_OK[io.inbuf[pos]]
+        b = io.read_byte()
+        return _READ_EOF if b < 0 else _READ_OK[b]
+
+    def _ax_read_span(self, node, args):
+        obj, off, mx = args
+        if off + mx > len(obj):
+            raise self.trap(node, "read_span вне границ массива")
+        if mx == 0:
+            return Tagged("Ok", 0)
+        data = self.stdio.read_span(mx)
+        if not data:
+            return _READ_EOF
+        obj.mut()[off:off + len(data)] = data
+        return Tagged("Ok", len(data))
+
+    def _ax_write_byte(self, node, args):
+        self.stdio.put(args[0])
+
+    def _ax_write_span(self, node, args):
+        obj, off, ln = args
+        if off + ln > len(obj):
+            raise self.trap(node, "write_span вне границ массива")
+        data = obj.data[off:off + ln]
+        self.stdio.write(data if type(data) is bytearray else bytes(data))
+
+    def _ax_write_err_byte(self, node, args):
+        sys.stderr.buffer.write(bytes([args[0]]))
+        sys.stderr.buffer.flush()
+
+    def _ax_exit(self, node, args):
+        self.stdio.flush()
+        raise SystemExit(args[0])
+
+    def _ax_arg_count(self, node, args):
+        return len(self.argv)
+
+    def _ax_arg_len(self, node, args):
+        i = args[0]
+        if i >= len(self.argv):
+            raise self.trap(node, "arg_len вне границ argv")
+        return len(self.argv[i])
+
+    def _ax_arg_byte(self, node, args):
+        i, j = args
+        if i >= len(self.argv):
+            raise self.trap(node, "arg_byte вне границ argv")
+        if j >= len(self.argv[i]):
+            raise self.trap(node, "arg_byte вне границ аргумента")
+        return self.argv[i][j]
+
+    def _ax_in_avail(self, node, args):
+        return self._in_avail()
+
+    def _ax_ticks(self, node, args):
+        return self._ticks()
+
+    def _ax_socket_listen(self, node, args):
+        return self._net_ref().listen(args[0])
+
+    def _ax_socket_accept(self, node, args):
+        return self._net_ref().accept(args[0])
+
+    def _ax_socket_avail(self, node, args):
+        return self._net_ref().avail(args[0])
+
+    def _ax_socket_read_byte(self, node, args):
+        return self._net_ref().read_byte(args[0])
+
+    def _ax_socket_write_span(self, node, args):
+        fd, obj, off, ln = args
+        if off + ln > len(obj):
+            raise self.trap(node, "socket_write_span вне границ массива")
+        return self._net_ref().write_span(fd, obj.data[off:off + ln])
+
+    def _ax_socket_read_span(self, node, args):
+        fd, obj, off, mx = args
+        if off + mx > len(obj):
+            raise self.trap(node, "socket_read_span вне границ массива")
+        data = self._net_ref().read_span(fd, mx)
+        if type(data) is Tagged:
+            return data
+        obj.mut()[off:off + len(data)] = data
+        return Tagged("Ok", len(data))
+
+    def _ax_socket_close(self, node, args):
+        self._net_ref().close(args[0])
+
+    def _ax_socket_wait(self, node, args):
+        return self._net_ref().wait(args[0], args[1])
+
+    def _ax_len(self, node, args):
+        return len(args[0])
+
+    def _ax_char(self, node, args):
+        return chr(args[0])
+
     def _in_avail(self) -> int:
         """in_avail(): сколько байт stdin читается без блокировки.
         Файл — размер минус логическая позиция (зеркало ftello поверх
         stdio-буфера шима: детерминизм make verify); пайп/tty —
         FIONREAD, живой режим (недооценка на буфер допустима, SPEC §7).
-        Потолок — u32."""
+        Прочитанное в буфер _Stdio, но не отданное — в счёте. Потолок
+        — u32."""
         import fcntl
         import stat as stat_mod
         import struct
         import termios
         buf = sys.stdin.buffer
+        avail = self.stdio.buffered()
         try:
             fd = buf.fileno()
             st = os.fstat(fd)
             if stat_mod.S_ISREG(st.st_mode):
-                avail = st.st_size - buf.tell()
+                avail += max(st.st_size - buf.tell(), 0)
             else:
                 raw = fcntl.ioctl(fd, termios.FIONREAD, b"\x00" * 4)
-                avail = struct.unpack("i", raw)[0]
+                avail += max(struct.unpack("i", raw)[0], 0)
         except (OSError, ValueError):
-            return 0
-        if avail <= 0:
-            return 0
+            pass
         return min(avail, 0xFFFFFFFF)
 
     def _ticks(self) -> int:
@@ -1006,6 +1339,32 @@ class Interpreter:
         ast.ArrayFill: _eval_arrayfill,
     }
 
+    _AXIOMS = {
+        "print": _ax_print,
+        "write": _ax_write,
+        "read_byte": _ax_read_byte,
+        "read_span": _ax_read_span,
+        "write_byte": _ax_write_byte,
+        "write_span": _ax_write_span,
+        "write_err_byte": _ax_write_err_byte,
+        "exit": _ax_exit,
+        "arg_count": _ax_arg_count,
+        "arg_len": _ax_arg_len,
+        "arg_byte": _ax_arg_byte,
+        "in_avail": _ax_in_avail,
+        "ticks": _ax_ticks,
+        "socket_listen": _ax_socket_listen,
+        "socket_accept": _ax_socket_accept,
+        "socket_avail": _ax_socket_avail,
+        "socket_read_byte": _ax_socket_read_byte,
+        "socket_write_span": _ax_socket_write_span,
+        "socket_close": _ax_socket_close,
+        "socket_wait": _ax_socket_wait,
+        "socket_read_span": _ax_socket_read_span,
+        "len": _ax_len,
+        "char": _ax_char,
+    }
+
     _EXEC = {
         ast.LocalDecl: _exec_let,
         ast.AssignStmt: exec_assign,
@@ -1021,13 +1380,98 @@ class Interpreter:
     }
 
 
+def _isatty(stream) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+class _Stdio:
+    """Буферы stdin/stdout интерпретатора — зеркало stdio шима
+    (runtime.c): вход читается кусками до IN_CHUNK (read1 — сколько
+    готово, без ожидания полного куска), вывод копится в bytearray и
+    уходит в stdout кусками от OUT_CHUNK. Сброс — в конце run_main/
+    run_tests (нормальный выход, trap, exit), перед trap'ом шима и
+    перед чтением в диалоге: stdin или stdout — tty либо
+    EAT_INTERACTIVE=1 (ответ обязан дойти до собеседника прежде, чем
+    чтение заблокируется). tty-stdout сбрасывается по переводу строки,
+    как построчный буфер libc."""
+
+    IN_CHUNK = 1 << 16
+    OUT_CHUNK = 1 << 16
+
+    def __init__(self):
+        self.inbuf = b""
+        self.pos = 0
+        self.out = bytearray()
+        self.tty_out = _isatty(sys.stdout)
+        self.dialog = (
+            _isatty(sys.stdin)
+            or self.tty_out
+            or os.environ.get("EAT_INTERACTIVE", "")[:1] == "1"
+        )
+
+    def read_byte(self) -> int:
+        """Байт stdin; -1 — конец потока."""
+        pos = self.pos
+        if pos < len(self.inbuf):
+            self.pos = pos + 1
+            return self.inbuf[pos]
+        if self.dialog:
+            self.flush()
+        data = sys.stdin.buffer.read1(self.IN_CHUNK)
+        if not data:
+            return -1
+        self.inbuf = data
+        self.pos = 1
+        return data[0]
+
+    def read_span(self, mx: int) -> bytes:
+        """До mx байт stdin: что есть в буфере, иначе один read1
+        (блокируется до первого байта); b"" — конец потока."""
+        if self.pos >= len(self.inbuf):
+            if self.dialog:
+                self.flush()
+            self.inbuf = sys.stdin.buffer.read1(self.IN_CHUNK)
+            self.pos = 0
+        pos = self.pos
+        data = self.inbuf[pos:pos + mx]
+        self.pos = pos + len(data)
+        return data
+
+    def buffered(self) -> int:
+        """Прочитанные из stdin, но не отданные программе байты."""
+        return len(self.inbuf) - self.pos
+
+    def write(self, data) -> None:
+        """Байты (bytes/bytearray; список u8 — через bytes())."""
+        out = self.out
+        out += data
+        if len(out) >= self.OUT_CHUNK or (self.tty_out and 10 in data):
+            self.flush()
+
+    def put(self, b: int) -> None:
+        self.out.append(b)
+        if len(self.out) >= self.OUT_CHUNK or (self.tty_out and b == 10):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.out:
+            sys.stdout.buffer.write(self.out)
+            self.out.clear()
+        sys.stdout.buffer.flush()
+
+
 NO_CONN = 0xFFFFFFFF
 
 
-def _shim_trap(msg: str):
+def _shim_trap(msg: str, stdio: _Stdio | None = None):
     """Trap на границе аксиом (контракт fd, кривой сценарий): зеркало
-    eat_trap шима — сообщение без координат в stderr, код 1. Тексты —
-    байт-в-байт с runtime.c."""
+    eat_trap шима — вывод сброшен, сообщение без координат в stderr,
+    код 1. Тексты — байт-в-байт с runtime.c."""
+    if stdio is not None:
+        stdio.flush()
     sys.stdout.flush()
     sys.stderr.buffer.write((msg + "\n").encode("utf-8"))
     sys.stderr.flush()
@@ -1052,7 +1496,7 @@ class _NetTranscript:
         self._parse(path)
 
     def _fail(self):
-        _shim_trap("EAT_NET: неверный сценарий")
+        _shim_trap("EAT_NET: неверный сценарий", self.it.stdio)
 
     def _parse(self, path):
         try:
@@ -1147,7 +1591,7 @@ class _NetTranscript:
 
     def _slot(self, fd):
         if fd < 4 or fd - 4 >= len(self.conns) or self.conns[fd - 4][2]:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         return self.conns[fd - 4]
 
     def listen(self, port):
@@ -1156,7 +1600,7 @@ class _NetTranscript:
 
     def accept(self, fd):
         if fd != 3 or not self.listener_open:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         self._advance()
         if (
             self.ev_next < len(self.events)
@@ -1181,11 +1625,26 @@ class _NetTranscript:
             return Tagged("Ok", conn[0].pop(0))
         if conn[1]:
             return Tagged("Err", EnumValue("IoError", "Eof"))
-        _shim_trap("socket_read_byte без готовых данных")
+        _shim_trap("socket_read_byte без готовых данных", self.it.stdio)
+
+    def read_span(self, fd, mx):
+        """До mx готовых байт через границы событий сценария
+        (net_take); Err(Eof) — пир закрыл и данных нет."""
+        conn = self._slot(fd)
+        self._advance()
+        if mx == 0:
+            return b""
+        if conn[0]:
+            data = bytes(conn[0][:mx])
+            del conn[0][:mx]
+            return data
+        if conn[1]:
+            return Tagged("Err", EnumValue("IoError", "Eof"))
+        _shim_trap("socket_read_span без готовых данных", self.it.stdio)
 
     def write_span(self, fd, data):
         self._slot(fd)
-        self.it._write_bytes("".join(chr(b) for b in data))
+        self.it.stdio.write(data if type(data) is bytearray else bytes(data))
         return len(data)
 
     def close(self, fd):
@@ -1193,18 +1652,39 @@ class _NetTranscript:
             self.listener_open = False
             return
         if fd < 4 or fd - 4 >= len(self.conns):
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         # идемпотентно: повторный close слота — no-op
         self.conns[fd - 4][2] = True
 
+    def wait(self, fd, ms):
+        """Готовность по сценарию (net_wait_transcript): время
+        виртуально, таймаут — NO_CONN сразу; у слушателя первым —
+        соединение с меньшим fd, потом ждущий accept."""
+        if fd == 3:
+            if not self.listener_open:
+                _shim_trap("socket: неверный дескриптор", self.it.stdio)
+            self._advance()
+            for i, conn in enumerate(self.conns):
+                if not conn[2] and (conn[0] or conn[1]):
+                    return 4 + i
+            return 3 if self.ev_next < len(self.events) else NO_CONN
+        conn = self._slot(fd)
+        self._advance()
+        return fd if conn[0] or conn[1] else NO_CONN
+
 
 class _NetLive:
     """Живой режим (make serve, вне гейта сверки): реальные
-    неблокирующие сокеты — зеркало живой ветки runtime.c."""
+    неблокирующие сокеты — зеркало живой ветки runtime.c. Чтение —
+    через приёмный буфер соединения: один recv на RBUF байт."""
+
+    RBUF = 4096  # == EAT_NET_RBUF runtime.c
 
     def __init__(self, it):
         self.it = it
         self.socks = {}  # fd ядра -> socket
+        self.owner = {}  # fd ядра -> слушатель (у слушателя — он сам)
+        self.rbuf = {}  # fd ядра -> принятые, но не отданные байты
 
     def listen(self, port):
         import socket as so
@@ -1217,20 +1697,23 @@ class _NetLive:
         except OSError:
             return Tagged("Err", EnumValue("IoError", "Fail"))
         self.socks[s.fileno()] = s
+        self.owner[s.fileno()] = s.fileno()
         return Tagged("Ok", s.fileno())
 
     def accept(self, fd):
         sock = self.socks.get(fd)
         if sock is None:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         try:
             conn, _ = sock.accept()
         except (BlockingIOError, InterruptedError):
             return NO_CONN
         except OSError:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         conn.setblocking(False)
+        self.rbuf.pop(conn.fileno(), None)
         self.socks[conn.fileno()] = conn
+        self.owner[conn.fileno()] = fd
         return conn.fileno()
 
     def avail(self, fd):
@@ -1245,33 +1728,58 @@ class _NetLive:
             n = struct.unpack("i", raw)[0]
         except OSError:
             n = 0
+        n = max(n, 0) + len(self.rbuf.get(fd, b""))
         if n > 0:
             return min(n, 0xFFFFFFFF)
         r, _, _ = select.select([fd], [], [], 0)
         return 1 if r else 0
 
-    def read_byte(self, fd):
+    def _recv(self, fd, n):
+        """recv с блокирующей семантикой чтения: байты (b"" — пир
+        закрыл) или None — ошибка."""
         import select
         sock = self.socks.get(fd)
         if sock is None:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         while True:
             try:
-                b = sock.recv(1)
+                return sock.recv(n)
             except (BlockingIOError, InterruptedError):
                 # страж avail не сработал — блокирующая семантика
                 select.select([fd], [], [])
-                continue
             except OSError:
-                return Tagged("Err", EnumValue("IoError", "Fail"))
-            if b:
-                return Tagged("Ok", b[0])
+                return None
+
+    def read_span(self, fd, mx):
+        """До mx байт: из буфера, иначе один recv на max(mx, RBUF)
+        байт — остаток сверх mx ложится в буфер."""
+        if mx == 0:
+            return b""
+        buf = self.rbuf.get(fd)
+        if buf:
+            data = bytes(buf[:mx])
+            del buf[:mx]
+            return data
+        data = self._recv(fd, max(mx, self.RBUF))
+        if data is None:
+            return Tagged("Err", EnumValue("IoError", "Fail"))
+        if not data:
             return Tagged("Err", EnumValue("IoError", "Eof"))
+        if len(data) > mx:
+            self.rbuf[fd] = bytearray(data[mx:])
+            data = data[:mx]
+        return data
+
+    def read_byte(self, fd):
+        data = self.read_span(fd, 1)
+        if type(data) is Tagged:
+            return data
+        return Tagged("Ok", data[0])
 
     def write_span(self, fd, data):
         sock = self.socks.get(fd)
         if sock is None:
-            _shim_trap("socket: неверный дескриптор")
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
         if not data:
             return 0
         try:
@@ -1285,5 +1793,26 @@ class _NetLive:
 
     def close(self, fd):
         sock = self.socks.pop(fd, None)
+        self.owner.pop(fd, None)
+        self.rbuf.pop(fd, None)
         if sock is not None:
             sock.close()
+
+    def wait(self, fd, ms):
+        """poll слушателя и его соединений (или одного соединения) —
+        зеркало os_socket_wait без пачки epoll."""
+        import select
+        if fd not in self.socks:
+            _shim_trap("socket: неверный дескриптор", self.it.stdio)
+        fds = [fd]
+        if self.owner.get(fd) == fd:
+            fds = sorted(f for f, o in self.owner.items() if o == fd)
+        # байты в приёмном буфере ядро не покажет
+        for f in fds:
+            if self.rbuf.get(f):
+                return f
+        p = select.poll()
+        for f in fds:
+            p.register(f, select.POLLIN)
+        ready = p.poll(min(ms, 0x7FFFFFFF))
+        return ready[0][0] if ready else NO_CONN
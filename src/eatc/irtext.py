@@ -0,0 +1,847 @@
+"""Текстовый писатель LLVM IR для кодогена: подмножество API
+llvmlite.ir (типы, константы, Module/Function/Block, IRBuilder),
+которым пользуется Codegen, но без графа объектов llvmlite.
+
+Инструкция форматируется в строку сразу при создании: операнды уже
+имеют имена (имена выдаются при создании, как у llvmlite), поэтому
+ссылку на значение достаточно запомнить строкой `%".N"`. Поздно
+дописываются только phi (входящие) и switch (ветки) — их строка
+собирается при печати. Печать модуля — склейка готовых строк.
+
+Текст байт-в-байт совпадает с принтером llvmlite (канон `eatc ir`,
+фикспойнт бутстрапа): та же модель имён (NameScope: безымянные
+значения `.1`, `.2`, … в пространстве функции, включая void-
+инструкции и слот возврата; дубликаты меток — `имя.N`), те же
+форматы инструкций (включая двойной пробел `phi  `/`select  ` от
+пустых флагов), тот же порядок глобалов — порядок создания.
+Сверка — gate/бутстрап по корпусу; расхождение с llvmlite — баг
+этого модуля.
+
+Бинарник собирается из того же текста: compile_binary отдаёт его
+llvm.parse_assembly (binding), llvmlite.ir в конвейере не участвует.
+"""
+
+import re
+
+# --- имена -------------------------------------------------------------
+
+_SIMPLE_IDENTIFIER_RE = re.compile(r"[-a-zA-Z$._][-a-zA-Z$._0-9]*$")
+
+_VALID_CHARS = frozenset(
+    b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    b" !#$%&'()*+,-./:;<=>?@[]^_`{|}~"
+)
+_ESCAPE = [chr(c) if c in _VALID_CHARS else "\\%02x" % c for c in range(256)]
+
+
+def _escape_string(data: bytes) -> str:
+    return "".join([_ESCAPE[c] for c in data])
+
+
+def _quote(name: str) -> str:
+    if "\\" in name or '"' in name:
+        name = name.replace("\\", "\\5c").replace('"', "\\22")
+    return '"' + name + '"'
+
+
+class NameScope:
+    """Пространство имён функции (или модуля) — как в llvmlite:
+    занятые имена и счётчик суффиксов на базовое имя."""
+
+    def __init__(self):
+        self._useset = {""}
+        self._basenamemap: dict[str, int] = {}
+
+    def register(self, name: str, deduplicate: bool = False) -> str:
+        if deduplicate:
+            basename = name
+            while name in self._useset:
+                ident = self._basenamemap.get(basename, 0) + 1
+                self._basenamemap[basename] = ident
+                name = f"{basename}.{ident}"
+        elif name in self._useset:
+            raise NameError(name)
+        self._useset.add(name)
+        return name
+
+
+# --- типы --------------------------------------------------------------
+
+class Type:
+    """Тип: равенство и хэш — по тексту (в подмножестве кодогена
+    одинаково печатающиеся типы — один тип LLVM)."""
+
+    null = "zeroinitializer"
+    _s = ""
+
+    def __str__(self) -> str:
+        return self._s
+
+    def __repr__(self) -> str:
+        return f"<irtext {self._s}>"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Type) and self._s == other._s
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(self._s)
+
+    def __call__(self, value) -> "Constant":
+        return Constant(self, value)
+
+    def as_pointer(self) -> "PointerType":
+        return PointerType(self)
+
+    def get_abi_size(self, target_data) -> int:
+        """ABI-размер по target data: тип разбирается LLVM через
+        внешний глобал (как у llvmlite), результат кэшируется по
+        тексту типа."""
+        size = _ABI_SIZES.get(self._s)
+        if size is None:
+            import llvmlite.binding as llvm
+
+            text = f'@"foo" = external global {self._s}'
+            with llvm.parse_assembly(text) as mod:
+                llty = mod.get_global_variable("foo").global_value_type
+                size = target_data.get_abi_size(llty)
+            _ABI_SIZES[self._s] = size
+        return size
+
+
+_ABI_SIZES: dict[str, int] = {}
+
+
+class VoidType(Type):
+    _s = "void"
+
+
+class LabelType(Type):
+    _s = "label"
+
+
+class IntType(Type):
+    null = "0"
+    _cache: dict[int, "IntType"] = {}
+
+    def __new__(cls, bits: int):
+        inst = cls._cache.get(bits)
+        if inst is None:
+            inst = super().__new__(cls)
+            inst.width = bits
+            inst._s = f"i{bits}"
+            cls._cache[bits] = inst
+        return inst
+
+    def __init__(self, bits: int):
+        pass
+
+    @property
+    def intrinsic_name(self) -> str:
+        return self._s
+
+
+class PointerType(Type):
+    """Типизированный указатель (`T*`), как у llvmlite с typed
+    pointers: канон печатает `i8*`, а не `ptr`."""
+
+    null = "null"
+
+    def __init__(self, pointee: Type):
+        self.pointee = pointee
+        self._s = f"{pointee}*"
+
+    @property
+    def intrinsic_name(self) -> str:
+        return "p0" + self.pointee.intrinsic_name
+
+    def gep(self, i) -> Type:
+        return self.pointee
+
+
+class ArrayType(Type):
+    def __init__(self, element: Type, count: int):
+        self.element = element
+        self.count = count
+        self._s = f"[{count} x {element}]"
+
+    @property
+    def elements(self) -> list:
+        return [self.element] * self.count
+
+    def gep(self, i) -> Type:
+        return self.element
+
+
+class LiteralStructType(Type):
+    def __init__(self, elems):
+        self.elements = tuple(elems)
+        self._s = "{" + ", ".join(str(t) for t in self.elements) + "}"
+
+    def gep(self, i) -> Type:
+        return self.elements[i.constant]
+
+
+class FunctionType(Type):
+    def __init__(self, return_type: Type, args):
+        self.return_type = return_type
+        self.args = tuple(args)
+        self._s = f"{return_type} ({', '.join(str(a) for a in self.args)})"
+
+
+I1 = IntType(1)
+_LABEL = LabelType()
+_VOID = VoidType()
+
+
+# --- значения ----------------------------------------------------------
+
+class Value:
+    """Значение: тип и готовая ссылка (`%".3"`, `@"str.0"`, `42`)."""
+
+    __slots__ = ("type", "ref")
+
+    def get_reference(self) -> str:
+        return self.ref
+
+    def __str__(self) -> str:
+        return f"{self.type} {self.ref}"
+
+    def bitcast(self, typ: Type) -> "Value":
+        """Константное приведение (глобал литерала к str*)."""
+        if typ == self.type:
+            return self
+        return _Formatted(typ, f"bitcast ({self.type} {self.ref} to {typ})")
+
+    # константные выражения (смещения в таблице мест --trap-sites)
+    def ptrtoint(self, typ: Type) -> "Value":
+        return _Formatted(typ, f"ptrtoint ({self.type} {self.ref} to {typ})")
+
+    def trunc(self, typ: Type) -> "Value":
+        return _Formatted(typ, f"trunc ({self.type} {self.ref} to {typ})")
+
+    def sub(self, other: "Value") -> "Value":
+        return _Formatted(
+            self.type,
+            f"sub ({self.type} {self.ref}, {other.type} {other.ref})",
+        )
+
+
+class _Formatted(Value):
+    __slots__ = ()
+
+    def __init__(self, typ: Type, text: str):
+        self.type = typ
+        self.ref = text
+
+
+class Constant(Value):
+    __slots__ = ("constant",)
+
+    def __init__(self, typ: Type, constant):
+        self.type = typ
+        self.constant = constant
+        if constant is None:
+            self.ref = typ.null
+        elif isinstance(constant, bytearray):
+            self.ref = 'c"' + _escape_string(constant) + '"'
+        elif isinstance(constant, (list, tuple)):
+            items = [
+                v if isinstance(v, Value) else Constant(t, v)
+                for t, v in zip(typ.elements, constant)
+            ]
+            body = ", ".join([f"{v.type} {v.ref}" for v in items])
+            self.constant = items
+            if isinstance(typ, ArrayType):
+                self.ref = "[" + body + "]"
+            else:
+                self.ref = "{" + body + "}"
+        elif isinstance(constant, bool):
+            self.ref = "true" if constant else "false"
+        else:
+            self.ref = str(constant)
+
+    @classmethod
+    def literal_struct(cls, elems) -> "Constant":
+        return cls(LiteralStructType([e.type for e in elems]), list(elems))
+
+
+class MDValue:
+    """Узел метаданных модуля (`!N`)."""
+
+    __slots__ = ("ref",)
+
+    def __init__(self, ref: str):
+        self.ref = ref
+
+
+# --- модуль ------------------------------------------------------------
+
+class Module:
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.triple = "unknown-unknown-unknown"
+        self.data_layout = ""
+        self.scope = NameScope()
+        self.globals: dict[str, "_Global"] = {}
+        self.order: list = []  # глобалы в порядке создания
+        # узлы метаданных: строки `!N = !{ ... }` в порядке создания,
+        # одинаковые операнды — один узел (как add_metadata llvmlite)
+        self.metadata: list[str] = []
+        self._md: dict[tuple, MDValue] = {}
+        # потоковая печать (stream/flush): куда и сколько уже выдано
+        self._write = None
+        self._flushed = 0
+        self._md_flushed = 0
+
+    def add_global(self, g: "_Global") -> None:
+        self.globals[g.name] = g
+        self.order.append(g)
+
+    @property
+    def functions(self) -> list:
+        return [g for g in self.globals.values() if isinstance(g, Function)]
+
+    def get_global(self, name: str) -> "_Global":
+        return self.globals[name]
+
+    def declare_intrinsic(self, intrinsic: str, tys=(), fnty=None):
+        """Подмножество llvmlite: явный fnty либо llvm.memcpy."""
+        name = ".".join([intrinsic] + [t.intrinsic_name for t in tys])
+        if name in self.globals:
+            return self.globals[name]
+        if fnty is None:
+            if intrinsic != "llvm.memcpy" or len(tys) != 3:
+                raise NotImplementedError(intrinsic)
+            fnty = FunctionType(_VOID, list(tys) + [I1])
+        return Function(self, fnty, name=name)
+
+    def add_metadata(self, operands) -> MDValue:
+        """Узел из операндов: строка — `!"..."`, список — вложенный
+        узел, MDValue — ссылка, константа — `тип значение`."""
+        ops = tuple([self._md_operand(op) for op in operands])
+        md = self._md.get(ops)
+        if md is None:
+            md = MDValue(f"!{len(self.metadata)}")
+            self._md[ops] = md
+            self.metadata.append(f"{md.ref} = !{{ {', '.join(ops)} }}")
+        return md
+
+    def _md_operand(self, op) -> str:
+        if isinstance(op, str):
+            return '!"' + _escape_string(op.encode("utf-8")) + '"'
+        if isinstance(op, list):
+            return self.add_metadata(op).ref
+        if isinstance(op, MDValue):
+            return op.ref
+        return f"{op.type} {op.ref}"
+
+    def header(self) -> str:
+        return (
+            f'; ModuleID = "{self.name}"\n'
+            f'target triple = "{self.triple}"\n'
+            f'target datalayout = "{self.data_layout}"\n'
+        )
+
+    def __str__(self) -> str:
+        return "\n".join(
+            [self.header()] + [str(g) for g in self.order] + self.metadata
+        )
+
+    def stream(self, write) -> None:
+        """Потоковая печать: шапка сразу, глобалы — по flush. Склейка
+        всего, что ушло в write, равна str(module)."""
+        self._write = write
+        write(self.header())
+
+    def flush(self, upto: "_Global | None" = None) -> None:
+        """Выдаёт в write ещё не напечатанные глобалы по порядку
+        создания — до upto включительно (без upto — все, затем узлы
+        метаданных). Функция при этом отдаёт текст и отпускает блоки и
+        инструкции (текст живёт только у write). Звать, когда всё до
+        upto уже достроено; без stream — ничего."""
+        if self._write is None:
+            return
+        end = len(self.order)
+        if upto is not None:
+            end = self.order.index(upto, self._flushed) + 1
+        for g in self.order[self._flushed:end]:
+            self._write("\n")
+            self._write(g.finish())
+        self._flushed = max(self._flushed, end)
+        if upto is None:
+            for line in self.metadata[self._md_flushed:]:
+                self._write("\n")
+                self._write(line)
+            self._md_flushed = len(self.metadata)
+
+
+class _Global(Value):
+    __slots__ = ("parent", "name", "linkage")
+
+    def __init__(self, module: Module, typ: Type, name: str):
+        self.parent = module
+        self.name = module.scope.register(name)
+        self.type = typ
+        self.ref = "@" + _quote(self.name)
+        self.linkage = ""
+        module.add_global(self)
+
+    def finish(self) -> str:
+        return str(self)
+
+
+class GlobalVariable(_Global):
+    __slots__ = ("value_type", "initializer", "global_constant")
+
+    def __init__(self, module: Module, typ: Type, name: str):
+        self.value_type = typ
+        self.initializer = None
+        self.global_constant = False
+        super().__init__(module, typ.as_pointer(), name)
+
+    def __str__(self) -> str:
+        linkage = self.linkage
+        if not linkage and self.initializer is None:
+            linkage = "external"
+        kind = "constant" if self.global_constant else "global"
+        out = f"{self.ref} = "
+        if linkage:
+            out += linkage + " "
+        out += f"{kind} {self.value_type}"
+        if self.initializer is not None:
+            out += " " + self.initializer.ref
+        elif linkage not in ("external", "extern_weak"):
+            out += " undef"
+        return out
+
+
+class Argument(Value):
+    __slots__ = ("name", "attributes")
+
+    def __init__(self, fn: "Function", typ: Type):
+        self.type = typ
+        self.name = fn.scope.register("", deduplicate=True)
+        self.ref = "%" + _quote(self.name)
+        self.attributes: set = set()
+
+    def add_attribute(self, attr: str) -> None:
+        self.attributes.add(attr)
+
+    def __str__(self) -> str:
+        if self.attributes:
+            attrs = " ".join(sorted(self.attributes))
+            return f"{self.type} {attrs} {self.ref}"
+        return f"{self.type} {self.ref}"
+
+
+class Function(_Global):
+    __slots__ = ("ftype", "scope", "blocks", "attributes", "args", "done")
+
+    def __init__(self, module: Module, ftype: FunctionType, name: str):
+        self.ftype = ftype
+        self.scope = NameScope()
+        self.blocks: list = []
+        self.attributes: set = set()
+        self.args = tuple(Argument(self, t) for t in ftype.args)
+        # слот возврата llvmlite тоже занимает безымянное имя
+        self.scope.register("", deduplicate=True)
+        self.done = False  # тело напечатано flush'ем и отпущено
+        super().__init__(module, ftype.as_pointer(), name)
+
+    @property
+    def function_type(self) -> FunctionType:
+        return self.ftype
+
+    @property
+    def is_declaration(self) -> bool:
+        return not self.blocks and not self.done
+
+    def append_basic_block(self, name: str = "") -> "Block":
+        blk = Block(self, name)
+        self.blocks.append(blk)
+        return blk
+
+    def prototype(self) -> str:
+        state = "define" if self.blocks else "declare"
+        prefix = " ".join(
+            x for x in (state, self.linkage, str(self.ftype.return_type)) if x
+        )
+        args = ", ".join([str(a) for a in self.args])
+        attrs = ""
+        if self.attributes:
+            attrs = " " + " ".join(sorted(self.attributes))
+        return f"{prefix} {self.ref}({args}){attrs}\n"
+
+    def finish(self) -> str:
+        """Текст функции; блоки и пространство имён отпускаются
+        (ссылка на функцию для call остаётся рабочей)."""
+        text = str(self)
+        if self.blocks:
+            self.blocks = []
+            self.scope = None
+            self.done = True
+        return text
+
+    def __str__(self) -> str:
+        if not self.blocks:
+            return self.prototype()
+        parts = [self.prototype(), "{\n"]
+        for blk in self.blocks:
+            blk.render(parts)
+        parts.append("}\n")
+        return "".join(parts)
+
+
+class Block(Value):
+    __slots__ = ("parent", "name", "instructions", "terminator")
+
+    def __init__(self, fn: Function, name: str = ""):
+        self.parent = fn
+        self.type = _LABEL
+        self.name = fn.scope.register(name, deduplicate=True)
+        self.ref = "%" + _quote(self.name)
+        self.instructions: list = []
+        self.terminator = None
+
+    @property
+    def is_terminated(self) -> bool:
+        return self.terminator is not None
+
+    @property
+    def function(self) -> Function:
+        return self.parent
+
+    def render(self, parts: list) -> None:
+        name = self.name
+        if not _SIMPLE_IDENTIFIER_RE.match(name):
+            name = _quote(name)
+        parts.append(name + ":\n")
+        for instr in self.instructions:
+            parts.append("  " + str(instr) + "\n")
+
+
+# --- инструкции --------------------------------------------------------
+
+class Instruction(Value):
+    """Инструкция с готовой строкой (`%".4" = add i32 ...`)."""
+
+    __slots__ = ("parent", "name", "text")
+
+    def __init__(self, block: Block, typ: Type, name: str = ""):
+        self.parent = block
+        self.type = typ
+        self.name = block.parent.scope.register(name, deduplicate=True)
+        self.ref = "%" + _quote(self.name)
+
+    def set_text(self, descr: str) -> None:
+        if self.type is _VOID or isinstance(self.type, VoidType):
+            self.text = descr
+        else:
+            self.text = f"{self.ref} = {descr}"
+
+    def set_metadata(self, name: str, md: MDValue) -> None:
+        """Вложение `, !имя !N` в хвост инструкции."""
+        self.text += f", !{name} {md.ref}"
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class AllocaInstr(Instruction):
+    __slots__ = ("allocated_type",)
+
+
+class PhiInstr(Instruction):
+    __slots__ = ("incomings",)
+
+    def add_incoming(self, value: Value, block: Block) -> None:
+        self.incomings.append((value, block))
+
+    def __str__(self) -> str:
+        incs = ", ".join([f"[{v.ref}, {b.ref}]" for v, b in self.incomings])
+        return f"{self.ref} = phi  {self.type} {incs}"
+
+
+class SwitchInstr(Instruction):
+    __slots__ = ("value", "default", "cases")
+
+    def add_case(self, val, block: Block) -> None:
+        if not isinstance(val, Value):
+            val = Constant(self.value.type, val)
+        self.cases.append((val, block))
+
+    def __str__(self) -> str:
+        cases = " ".join(
+            [f"{v.type} {v.ref}, label {b.ref}" for v, b in self.cases]
+        )
+        return (
+            f"switch {self.value.type} {self.value.ref}, "
+            f"label {self.default.ref} [{cases}]"
+        )
+
+
+_CMP_MAP = {
+    ">": "gt", "<": "lt", "==": "eq", "!=": "ne", ">=": "ge", "<=": "le",
+}
+
+
+class IRBuilder:
+    def __init__(self, block: Block | None = None):
+        self._block = block
+        self._anchor = len(block.instructions) if block else 0
+
+    @property
+    def block(self) -> Block:
+        return self._block
+
+    @property
+    def function(self) -> Function:
+        return self._block.parent
+
+    @property
+    def module(self) -> Module:
+        return self._block.parent.parent
+
+    def position_before(self, instr: Instruction) -> None:
+        self._block = instr.parent
+        self._anchor = self._block.instructions.index(instr)
+
+    def position_at_start(self, block: Block) -> None:
+        self._block = block
+        self._anchor = 0
+
+    def position_at_end(self, block: Block) -> None:
+        self._block = block
+        self._anchor = len(block.instructions)
+
+    def append_basic_block(self, name: str = "") -> Block:
+        return self._block.parent.append_basic_block(name)
+
+    def _insert(self, instr: Instruction) -> Instruction:
+        self._block.instructions.insert(self._anchor, instr)
+        self._anchor += 1
+        return instr
+
+    def _emit(self, typ: Type, descr: str, name: str = "") -> Instruction:
+        instr = Instruction(self._block, typ, name)
+        instr.set_text(descr)
+        return self._insert(instr)
+
+    def _terminate(self, descr: str) -> Instruction:
+        assert self._block.terminator is None
+        instr = self._emit(_VOID, descr)
+        self._block.terminator = instr
+        return instr
+
+    # арифметика
+
+    def _binop(self, opname, lhs, rhs, name, flags) -> Instruction:
+        if lhs.type != rhs.type:
+            raise ValueError(
+                "Operands must be the same type, got (%s, %s)"
+                % (lhs.type, rhs.type)
+            )
+        if flags:
+            opname = " ".join([opname] + list(flags))
+        return self._emit(
+            lhs.type, f"{opname} {lhs.type} {lhs.ref}, {rhs.ref}", name
+        )
+
+    def add(self, lhs, rhs, name="", flags=()):
+        return self._binop("add", lhs, rhs, name, flags)
+
+    def sub(self, lhs, rhs, name="", flags=()):
+        return self._binop("sub", lhs, rhs, name, flags)
+
+    def mul(self, lhs, rhs, name="", flags=()):
+        return self._binop("mul", lhs, rhs, name, flags)
+
+    def udiv(self, lhs, rhs, name="", flags=()):
+        return self._binop("udiv", lhs, rhs, name, flags)
+
+    def sdiv(self, lhs, rhs, name="", flags=()):
+        return self._binop("sdiv", lhs, rhs, name, flags)
+
+    def urem(self, lhs, rhs, name="", flags=()):
+        return self._binop("urem", lhs, rhs, name, flags)
+
+    def srem(self, lhs, rhs, name="", flags=()):
+        return self._binop("srem", lhs, rhs, name, flags)
+
+    def shl(self, lhs, rhs, name="", flags=()):
+        return self._binop("shl", lhs, rhs, name, flags)
+
+    def lshr(self, lhs, rhs, name="", flags=()):
+        return self._binop("lshr", lhs, rhs, name, flags)
+
+    def ashr(self, lhs, rhs, name="", flags=()):
+        return self._binop("ashr", lhs, rhs, name, flags)
+
+    def and_(self, lhs, rhs, name="", flags=()):
+        return self._binop("and", lhs, rhs, name, flags)
+
+    def or_(self, lhs, rhs, name="", flags=()):
+        return self._binop("or", lhs, rhs, name, flags)
+
+    def xor(self, lhs, rhs, name="", flags=()):
+        return self._binop("xor", lhs, rhs, name, flags)
+
+    def not_(self, value, name=""):
+        return self.xor(value, Constant(value.type, -1), name=name)
+
+    def neg(self, value, name=""):
+        return self.sub(Constant(value.type, 0), value, name=name)
+
+    # сравнения и select
+
+    def _icmp(self, prefix, cmpop, lhs, rhs, name) -> Instruction:
+        op = _CMP_MAP[cmpop]
+        if cmpop not in ("==", "!="):
+            op = prefix + op
+        return self._emit(
+            I1, f"icmp {op} {lhs.type} {lhs.ref}, {rhs.ref}", name
+        )
+
+    def icmp_signed(self, cmpop, lhs, rhs, name=""):
+        return self._icmp("s", cmpop, lhs, rhs, name)
+
+    def icmp_unsigned(self, cmpop, lhs, rhs, name=""):
+        return self._icmp("u", cmpop, lhs, rhs, name)
+
+    def select(self, cond, lhs, rhs, name=""):
+        # двойной пробел — пустые флаги в формате llvmlite
+        return self._emit(
+            lhs.type,
+            f"select  {cond.type} {cond.ref}, {lhs.type} {lhs.ref}, "
+            f"{rhs.type} {rhs.ref}",
+            name,
+        )
+
+    # приведения
+
+    def _cast(self, op, value, typ, name) -> Value:
+        if value.type == typ:
+            return value
+        return self._emit(typ, f"{op} {value.type} {value.ref} to {typ}", name)
+
+    def trunc(self, value, typ, name=""):
+        return self._cast("trunc", value, typ, name)
+
+    def zext(self, value, typ, name=""):
+        return self._cast("zext", value, typ, name)
+
+    def sext(self, value, typ, name=""):
+        return self._cast("sext", value, typ, name)
+
+    def bitcast(self, value, typ, name=""):
+        return self._cast("bitcast", value, typ, name)
+
+    def ptrtoint(self, value, typ, name=""):
+        return self._cast("ptrtoint", value, typ, name)
+
+    def inttoptr(self, value, typ, name=""):
+        return self._cast("inttoptr", value, typ, name)
+
+    # память
+
+    def alloca(self, typ, name=""):
+        instr = AllocaInstr(self._block, typ.as_pointer(), name)
+        instr.allocated_type = typ
+        instr.text = f"{instr.ref} = alloca {typ}"
+        return self._insert(instr)
+
+    def load(self, ptr, name=""):
+        if isinstance(ptr, AllocaInstr):
+            typ = ptr.allocated_type
+        else:
+            typ = ptr.type.pointee
+        return self._emit(typ, f"load {typ}, {ptr.type} {ptr.ref}", name)
+
+    def store(self, value, ptr):
+        if ptr.type.pointee != value.type:
+            raise TypeError(
+                "cannot store %s to %s: mismatching types"
+                % (value.type, ptr.type)
+            )
+        return self._emit(
+            _VOID, f"store {value.type} {value.ref}, {ptr.type} {ptr.ref}"
+        )
+
+    def gep(self, ptr, indices, inbounds=False, name=""):
+        typ = ptr.type
+        lasttyp = None
+        for i in indices:
+            lasttyp, typ = typ, typ.gep(i)
+        if not isinstance(typ, PointerType) \
+                and isinstance(lasttyp, PointerType):
+            typ = lasttyp
+        else:
+            typ = typ.as_pointer()
+        op = "getelementptr inbounds" if inbounds else "getelementptr"
+        idx = ", ".join([f"{i.type} {i.ref}" for i in indices])
+        return self._emit(
+            typ, f"{op} {ptr.type.pointee}, {ptr.type} {ptr.ref}, {idx}", name
+        )
+
+    def extract_value(self, agg, idx, name=""):
+        if not isinstance(idx, (tuple, list)):
+            idx = [idx]
+        typ = agg.type
+        for i in idx:
+            typ = typ.elements[i]
+        return self._emit(
+            typ,
+            f"extractvalue {agg.type} {agg.ref}, "
+            + ", ".join(str(i) for i in idx),
+            name,
+        )
+
+    def phi(self, typ, name=""):
+        instr = PhiInstr(self._block, typ, name)
+        instr.incomings = []
+        return self._insert(instr)
+
+    # вызовы и терминаторы
+
+    def call(self, fn, args, name=""):
+        fnty = fn.function_type
+        for i, (arg, want) in enumerate(zip(args, fnty.args)):
+            if arg.type != want:
+                raise TypeError(
+                    "Type of #{0} arg mismatch: {1} != {2}"
+                    .format(1 + i, want, arg.type)
+                )
+        text = ", ".join([f"{a.type} {a.ref}" for a in args])
+        return self._emit(
+            fnty.return_type, f"call {fnty.return_type} {fn.ref}({text})", name
+        )
+
+    def branch(self, target):
+        return self._terminate(f"br label {target.ref}")
+
+    def cbranch(self, cond, truebr, falsebr):
+        return self._terminate(
+            f"br {cond.type} {cond.ref}, label {truebr.ref}, "
+            f"label {falsebr.ref}"
+        )
+
+    def switch(self, value, default):
+        assert self._block.terminator is None
+        instr = SwitchInstr(self._block, _VOID)
+        instr.value = value
+        instr.default = default
+        instr.cases = []
+        self._block.terminator = instr
+        return self._insert(instr)
+
+    def ret(self, value):
+        return self._terminate(f"ret {value.type} {value.ref}")
+
+    def ret_void(self):
+        return self._terminate("ret void")
+
+    def unreachable(self):
+        return self._emit(_VOID, "unreachable")
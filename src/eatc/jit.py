@@ -0,0 +1,90 @@
+"""`eatc run --jit`: программа исполняется нативно в процессе eatc.
+
+Тот же путь, что у build до эмиссии объекта: кодоген (TBAA-теги, как
+по умолчанию в build), разбор, inline_hints, конвейер O2 llvmlite. Вместо
+объекта и линковки — MCJIT: модуль компилируется в память процесса,
+аксиомы берутся из runtime.c, собранного разделяемой библиотекой
+(кэш рантайма, codegen.runtime_library) и загруженного в процесс.
+Трамплин `@main(argc, argv)` зовётся через ctypes — argv, stdin/stdout
+(fd процесса) и переменные окружения EAT_NET/EAT_TICKS/EAT_RECORD
+видит runtime.c так же, как в бинарнике.
+
+Стек: пулы программ живут в кадре main (у SelfIr ~85 МБ), главный
+поток Python столько не даёт — main идёт в потоке со стеком
+STACK_BYTES (= stacksize линковки build). exit и trap программы
+завершают процесс кодом программы, как у бинарника; обычный возврат
+сбрасывает буферы stdio libc.
+"""
+
+import ctypes
+import sys
+import tempfile
+import threading
+
+import llvmlite.binding as llvm
+
+from .codegen import Codegen, inline_hints, optimize, runtime_library
+from .errors import EatError
+
+STACK_BYTES = 1 << 28  # 256 МиБ, как -Wl,-z,stacksize у build
+
+_MAIN = ctypes.CFUNCTYPE(
+    ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_char_p)
+)
+
+
+def _engine(program, checker, filename: str):
+    """MCJIT с оптимизированным модулем программы."""
+    cg = Codegen(program, checker, filename, tbaa=True)
+    chunks: list[str] = []
+    cg.module.stream(chunks.append)
+    cg.generate()
+    text = "".join(chunks)
+    del chunks, cg
+    try:
+        llvm.initialize_native_target()
+        llvm.initialize_native_asmprinter()
+    except RuntimeError:
+        pass  # новые llvmlite инициализируются сами
+    ref = llvm.parse_assembly(text)
+    ref.verify()
+    machine = llvm.Target.from_default_triple().create_target_machine(
+        opt=2, jit=True
+    )
+    inline_hints(ref)
+    optimize(ref, machine)
+    engine = llvm.create_mcjit_compiler(ref, machine)
+    engine.finalize_object()
+    engine.run_static_constructors()
+    return engine
+
+
+def run(program, checker, filename: str, args: list) -> int:
+    """Исполнение main программы; код возврата — как у бинарника
+    (exit/trap до возврата сюда не доходят)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        lib = runtime_library(tmp)
+        if lib is None:
+            raise EatError(
+                filename, 1, 1,
+                "run --jit: runtime.c не собран (нужен clang в PATH)",
+            )
+        llvm.load_library_permanently(str(lib))
+    engine = _engine(program, checker, filename)
+    main = _MAIN(engine.get_function_address("main"))
+    argv = [filename.encode("utf-8")] + list(args)
+    c_argv = (ctypes.c_char_p * (len(argv) + 1))(*argv, None)
+    result: list = []
+    sys.stdout.flush()
+    sys.stderr.flush()
+    prev = threading.stack_size(STACK_BYTES)
+    try:
+        worker = threading.Thread(
+            target=lambda: result.append(main(len(argv), c_argv))
+        )
+        worker.start()
+    finally:
+        threading.stack_size(prev)
+    worker.join()
+    ctypes.CDLL(None).fflush(None)
+    return result[0] if result else 1
@@ -0,0 +1,270 @@
+"""Параллельный кодоген `eatc build -j N`: модуль программы режется на
+части — модули LLVM по графу вызовов, каждая оптимизируется и
+эмитится в объект в своём процессе (не больше N сразу), объекты
+линкуются вместе. Число частей от N не зависит: его задают границы
+по содержимому (ниже) — программа короче PART_MIN строк .ll остаётся
+одной частью и кодогенится в одном процессе, параллелизм -j — только
+у крупных модулей (SelfIr — 15 частей).
+
+Режется ТЕКСТ канонического .ll (тот же, что пишется рядом с
+бинарником и не меняется): шапка (ModuleID, triple, типы), глобалы и
+`declare` — в каждую часть; определения функций — по частям. Порядок —
+post-order обхода от main (вызываемые раньше вызывающих; граф — DAG,
+рекурсии в языке нет), части — отрезки этого порядка не короче
+PART_MIN строк: поддерево вызовов оседает в одной части. Малые листовые
+функции, помеченные inline_hints (alwaysinline), не делятся: копия
+`internal` — в каждую часть, где их зовут (инлайн внутри части цел).
+Остальное, вызываемое из чужой части, определяется `hidden` (видно
+линковщику, не наружу бинарника), в вызывающей — `declare`.
+
+Объекты частей кэшируются (ccache для инкрементальной сборки): ключ —
+текст части, т.е. IR её функций вместе с копиями листьев, которые в
+них инлайнятся. Чтобы правка одной функции не трогала чужие части,
+текст части от остального модуля не зависит:
+  - границы частей ставятся по содержимому, а не по счёту: отрезок
+    закрывается после функции, crc32 имени которой делится на
+    PART_SPACING, если в нём уже PART_MIN строк. Правка тела не
+    сдвигает границы, новая функция сдвигает лишь соседние;
+  - глобалы и декларации — только те, на которые ссылается часть, а
+    private-глобалы переименованы по порядку ссылок в части
+    (`part.N`): сквозная нумерация str.N всего модуля в ключ не
+    попадает; так же узлы метаданных (TBAA, eatc/tbaa.py) — только
+    достижимые из тел части, `!N` — по порядку ссылок.
+"""
+
+import multiprocessing
+import re
+import zlib
+
+import llvmlite
+import llvmlite.binding as llvm
+
+from . import cache
+
+_REF = re.compile(r'@"([^"]+)"')
+_MD = re.compile(r"!(\d+)")
+
+# границы частей: не короче PART_MIN строк .ll, закрывает отрезок
+# функция с crc32(имя) % PART_SPACING == 0 (в среднем раз в 16)
+PART_MIN = 2000
+PART_SPACING = 16
+
+
+class Unit:
+    """Разобранный .ll: шапка, глобалы, декларации и определения."""
+
+    def __init__(self, text: str):
+        self.head: list[str] = []
+        self.globals: dict[str, str] = {}
+        self.decls: dict[str, str] = {}
+        self.defs: dict[str, list[str]] = {}
+        self.meta: dict[str, str] = {}  # номер узла -> `!{ ... }`
+        self.callees: dict[str, list[str]] = {}
+        lines = text.split("\n")
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if line.startswith("define "):
+                j = lines.index("}", i)
+                name = _REF.search(line).group(1)
+                self.defs[name] = lines[i:j + 1]
+                i = j + 1
+                continue
+            if line.startswith("declare "):
+                self.decls[_REF.search(line).group(1)] = line
+            elif line.startswith("@"):
+                self.globals[_REF.match(line).group(1)] = line
+            elif line.startswith("!"):
+                num, _, node = line.partition(" = ")
+                self.meta[num[1:]] = node
+            elif line:
+                self.head.append(line)
+            i += 1
+        for name, body in self.defs.items():
+            seen: dict[str, None] = {}
+            for line in body[1:]:
+                for ref in _REF.findall(line):
+                    if ref in self.defs and ref != name:
+                        seen[ref] = None
+            self.callees[name] = list(seen)
+
+    def order(self) -> list[str]:
+        """Post-order от main (затем прочие корни в порядке текста)."""
+        out: list[str] = []
+        done: set = set()
+        roots = (["main"] if "main" in self.defs else []) + list(self.defs)
+        for root in roots:
+            if root in done:
+                continue
+            stack = [(root, iter(self.callees[root]))]
+            done.add(root)
+            while stack:
+                name, it = stack[-1]
+                nxt = next((c for c in it if c not in done), None)
+                if nxt is None:
+                    stack.pop()
+                    out.append(name)
+                else:
+                    done.add(nxt)
+                    stack.append((nxt, iter(self.callees[nxt])))
+        return out
+
+
+def _signature(header: str) -> str:
+    """define-строка без `define` и линковки."""
+    rest = header[len("define "):]
+    if rest.startswith("internal "):
+        rest = rest[len("internal "):]
+    return rest
+
+
+def split(text: str, shared: set) -> list[tuple]:
+    """Части модуля: (текст, имена alwaysinline-определений в нём).
+    shared — имена internal-листьев с alwaysinline: копируются в
+    каждую часть-потребителя."""
+    unit = Unit(text)
+    full = unit.order()
+    parts: list[list[str]] = [[]]
+    acc = 0
+    for name in full:
+        if name in shared:
+            continue
+        parts[-1].append(name)
+        acc += len(unit.defs[name])
+        if acc >= PART_MIN and \
+                zlib.crc32(name.encode("utf-8")) % PART_SPACING == 0:
+            parts.append([])
+            acc = 0
+    if not parts[-1]:
+        parts.pop()
+    home = {n: k for k, part in enumerate(parts) for n in part}
+    # кто вызывается из чужой части — тот hidden у себя
+    exported: set = set()
+    plans = []
+    for k, part in enumerate(parts):
+        copies: dict[str, None] = {}
+        work = list(part)
+        while work:
+            name = work.pop()
+            for c in unit.callees[name]:
+                if c in shared and c not in copies:
+                    copies[c] = None
+                    work.append(c)
+        external: dict[str, None] = {}
+        for name in list(part) + list(copies):
+            for c in unit.callees[name]:
+                if c not in shared and home[c] != k:
+                    external[c] = None
+                    exported.add(c)
+        plans.append((set(part), copies, external))
+    return [
+        (_render(unit, full, part, copies, external, exported),
+         frozenset(copies))
+        for part, copies, external in plans
+    ]
+
+
+def _render(unit: Unit, full: list, part: set, copies: dict,
+            external: dict, exported: set) -> str:
+    body: list[str] = []
+    for name in full:
+        lines = unit.defs[name]
+        if name in copies:
+            head = "define internal " + _signature(lines[0])
+            body += ["", head] + lines[1:]
+        elif name in part:
+            if name in exported and lines[0].startswith("define internal "):
+                lines = ["define hidden " + _signature(lines[0])] + lines[1:]
+            body += [""] + lines
+    # глобалы и декларации — по ссылкам части (глобал может ссылаться
+    # на глобал — замыкание)
+    used: dict[str, None] = {}
+    work = [ref for line in body for ref in _REF.findall(line)]
+    for ref in work:
+        if ref in used or ref not in unit.globals and ref not in unit.decls:
+            continue
+        used[ref] = None
+        if ref in unit.globals:
+            work.extend(_REF.findall(unit.globals[ref][len(ref) + 3:]))
+    rename = {}
+    for ref in used:
+        if " = private " in unit.globals.get(ref, ""):
+            rename[ref] = f"part.{len(rename)}"
+
+    def local(line: str) -> str:
+        return _REF.sub(
+            lambda m: '@"' + rename.get(m.group(1), m.group(1)) + '"', line
+        )
+
+    # узлы метаданных (теги TBAA тел) — замыкание по ссылкам, номера
+    # по порядку ссылок
+    mds: dict[str, str] = {}
+    work = [n for line in body for n in _MD.findall(line)]
+    for n in work:
+        if n not in mds:
+            mds[n] = f"!{len(mds)}"
+            work.extend(_MD.findall(unit.meta[n]))
+
+    def renum(line: str) -> str:
+        return _MD.sub(lambda m: mds[m.group(1)], line)
+
+    out = list(unit.head) + [""]
+    out += [local(unit.globals[g]) for g in used if g in unit.globals]
+    out += [unit.decls[d] for d in used if d in unit.decls]
+    out += ["declare " + _signature(unit.defs[c][0]) for c in external]
+    if mds:
+        body = [renum(line) if "!" in line else line for line in body]
+    out += [local(line) for line in body] if rename else body
+    if mds:
+        out += [""] + [f"{mds[n]} = {renum(unit.meta[n])}" for n in mds]
+    return "\n".join(out) + "\n"
+
+
+def emit_part(job: tuple) -> bytes:
+    """Объект части: разбор, alwaysinline по решению целого модуля,
+    конвейер O2, эмиссия (в процессе пула)."""
+    text, inline = job
+    try:
+        llvm.initialize_native_target()
+        llvm.initialize_native_asmprinter()
+    except RuntimeError:
+        pass  # новые llvmlite инициализируются сами
+    ref = llvm.parse_assembly(text)
+    ref.verify()
+    for name in sorted(inline):
+        ref.get_function(name).add_function_attribute("alwaysinline")
+    machine = llvm.Target.from_default_triple().create_target_machine(
+        opt=2, reloc="pic"
+    )
+    pto = llvm.create_pipeline_tuning_options(speed_level=2)
+    pb = llvm.create_pass_builder(machine, pto)
+    pb.getModulePassManager().run(ref, pb)
+    return machine.emit_object(ref)
+
+
+def _key(job: tuple) -> str:
+    text, inline = job
+    return cache.key(
+        "obj1", llvmlite.__version__, llvm.get_default_triple(), "O2 pic",
+        " ".join(sorted(inline)), text,
+    )
+
+
+def emit_objects(parts: list[tuple], jobs: int) -> tuple[list, int]:
+    """(объекты частей, сколько взято из кэша). Промахи — пул
+    fork-процессов (как check -j); один промах или jobs == 1 — в этом
+    процессе."""
+    keys = [_key(p) for p in parts]
+    objs = [cache.load("obj", k, ".o") for k in keys]
+    miss = [i for i, obj in enumerate(objs) if obj is None]
+    work = [parts[i] for i in miss]
+    if jobs <= 1 or len(work) <= 1:
+        built = [emit_part(w) for w in work]
+    else:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(min(jobs, len(work))) as pool:
+            built = pool.map(emit_part, work)
+    for i, obj in zip(miss, built):
+        objs[i] = obj
+        cache.store("obj", keys[i], obj, ".o")
+    return objs, len(parts) - len(miss)
@@ -0,0 +1,122 @@
+"""PGO-сборка `eatc build --pgo-gen / --pgo-use / --pgo-train`.
+
+Цикл: инструментированный бинарник (clang `-fprofile-generate` над
+.ll программы и runtime.c), тренировочный прогон на заданном stdin
+(транскрипт сокетов — как обычно, через EAT_NET в окружении), слияние
+сырого профиля `llvm-profdata merge`, пересборка с `-fprofile-use`:
+профиль получают инлайнер LLVM и раскладка блоков (горячие ветки —
+сквозным путём, холодные — в конец функции).
+
+Инструментированная и итоговая сборки идут из одного текста — канона
+.ll, что пишется рядом с бинарником, плюс TBAA-теги (без `--no-tbaa`);
+хэши CFG функций в профиле совпадают. Опционально (`--pgo-hints`)
+частоты функций из профиля уточняют inline_hints (eatc/codegen.py):
+функции, не исполнявшиеся в тренировке, не помечаются, горячим
+поднимаются порог и бюджет.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from .errors import EatError
+
+# горячая — не реже 1/HOT_SHARE самой частой функции; её порог размера
+# и бюджет роста кода в inline_hints умножаются на HOT_SCALE
+HOT_SHARE = 64
+HOT_SCALE = 4
+
+_FUNC = re.compile(r"^  (\S.*):$")
+_COUNTS = re.compile(r"^    Block counts: \[([\d, ]*)\]$")
+
+
+def profdata_tool() -> list | None:
+    """Команда llvm-profdata: из PATH, на macOS — через xcrun."""
+    path = shutil.which("llvm-profdata")
+    if path is not None:
+        return [path]
+    if sys.platform == "darwin" and shutil.which("xcrun"):
+        return ["xcrun", "llvm-profdata"]
+    return None
+
+
+def _tool(filename: str) -> list:
+    tool = profdata_tool()
+    if tool is None:
+        raise EatError(
+            filename, 1, 1, "PGO: не найден llvm-profdata (LLVM в PATH)"
+        )
+    return tool
+
+
+def clang_flags(gen: bool, use: str | None) -> list:
+    """Флаги clang для инструментированной (gen) либо итоговой (use —
+    путь к .profdata) сборки."""
+    if gen:
+        return ["-fprofile-generate"]
+    if use is not None:
+        # функции без профиля (новые с тренировки) — не ошибка
+        return [f"-fprofile-use={use}", "-Wno-profile-instr-unprofiled",
+                "-Wno-profile-instr-out-of-date"]
+    return []
+
+
+def train(binary: str, stdin_path: str, raw: str) -> None:
+    """Тренировочный прогон инструментированного бинарника: stdin из
+    файла, сырой профиль — в raw. Код выхода программы не важен (exit
+    с кодом, trap тоже пишут профиль); важен сам профиль."""
+    Path(raw).unlink(missing_ok=True)
+    env = dict(os.environ, LLVM_PROFILE_FILE=raw)
+    with open(stdin_path, "rb") as stdin:
+        subprocess.run(
+            [binary], stdin=stdin, env=env, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    if not Path(raw).exists():
+        raise EatError(
+            binary, 1, 1, "PGO: тренировочный прогон не записал профиль"
+        )
+
+
+def merge(raws: list, out: str, filename: str) -> None:
+    """llvm-profdata merge: сырые профили -> индексированный .profdata."""
+    proc = subprocess.run(
+        _tool(filename) + ["merge", "-o", out, *raws],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise EatError(
+            filename, 1, 1, f"llvm-profdata: {proc.stderr.strip()}"
+        )
+
+
+def func_counts(profdata: str, filename: str) -> dict[str, int]:
+    """Частоты функций профиля: символ -> максимум её счётчиков (IR-
+    профиль считает дуги остовного дерева CFG, отдельного счётчика
+    входа в нём нет; самый горячий блок — мера горячести функции).
+    Локальные (internal) функции профиль зовёт `файл;имя` — префикс
+    модуля отрезается."""
+    proc = subprocess.run(
+        _tool(filename) + ["show", "--all-functions", "--counts", profdata],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise EatError(
+            filename, 1, 1, f"llvm-profdata: {proc.stderr.strip()}"
+        )
+    counts: dict[str, int] = {}
+    name = None
+    for line in proc.stdout.splitlines():
+        m = _FUNC.match(line)
+        if m:
+            name = re.split("[;:]", m.group(1))[-1]
+            continue
+        m = _COUNTS.match(line)
+        if m and name is not None:
+            values = [int(v) for v in m.group(1).split(",") if v.strip()]
+            counts[name] = max(counts.get(name, 0), max(values, default=0))
+            name = None
+    return counts
@@ -0,0 +1,832 @@
+"""Python-бэкенд `eatc run`: типизированный AST → модуль Python.
+
+Второй ярус исполнения после замыканий (closure.py): программа
+переводится в текст Python-модуля — одна функция Python на функцию
+EATLang, локалы — локалы Python, проверки диапазона — инлайн-сравнения
+с константами границ, `for` по диапазону — родной цикл по range,
+return/break — родные. Текст компилируется compile() и кэшируется на
+диск по хэшу содержимого (cache.py): повторный прогон той же
+программы (длинные наборы test-блоков, self-host фазы под `eatc run`)
+не платит за компиляцию.
+
+Семантика — эталонного обходчика: trap-места (файл, строка, колонка)
+вшиты в модуль константами-сайтами, тексты — те же; встроенные и
+аксиомы ОС — методы Interpreter._AXIOMS; порядок вычислений — как у
+обходчика (аргументы слева направо, значение присваивания до цели).
+Проверки, которых у обходчика нет (переполнение +,-,* вне точек
+связывания), не добавляются. Comptime остаётся на обходчике.
+"""
+
+import functools
+import importlib.util
+import marshal
+
+from . import ast_nodes as ast
+from . import cache
+from .closure import ClosureInterpreter
+from .errors import EatError
+from .interpreter import (
+    Array,
+    EnumValue,
+    StructValue,
+    Tagged,
+    _copy_value,
+    _src_name,
+    array_code,
+    fill_array,
+    new_array,
+)
+from .types import (
+    ArrayType,
+    BoolType,
+    CharType,
+    EnumType,
+    IntType,
+    INT_RANGES,
+    OptionType,
+    ResultType,
+    StrType,
+    StructType,
+)
+
+# версия формата генерируемого модуля: часть ключа кэша
+PYGEN_VERSION = "2"
+
+_WIDTH = {"u8": 8, "u16": 16, "u64": 64, "i64": 64}
+
+
+class _Site:
+    """Место trap'а в модуле: то, что Interpreter.trap читает у узла."""
+
+    __slots__ = ("src_file", "line", "col")
+
+    def __init__(self, src_file: str, line: int, col: int):
+        self.src_file = src_file
+        self.line = line
+        self.col = col
+
+
+def _scalar(ty) -> bool:
+    """Значение типа неизменяемо в Python — копия by-value не нужна."""
+    return isinstance(ty, (IntType, BoolType, CharType, StrType))
+
+
+def _pure(node) -> bool:
+    """Выражение без побочных эффектов и trap'ов: можно вычислить
+    дважды (объект индексации в инлайн-проверке границ)."""
+    while isinstance(node, ast.FieldAccess):
+        node = node.obj
+    return isinstance(node, (ast.Name, ast.SelfExpr))
+
+
+class _Func:
+    """Состояние генерации одной функции: строки тела, области
+    видимости (имя -> (kind, cap)), счётчик временных."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.scopes: list[dict] = [{}]
+        self.tmp = 0
+
+    def temp(self) -> str:
+        self.tmp += 1
+        return f"_t{self.tmp}"
+
+    def emit(self, ind: int, text: str) -> None:
+        self.lines.append("    " * ind + text)
+
+    def declare(self, name: str, kind=None, cap=None) -> None:
+        self.scopes[-1][name] = (kind, cap)
+
+    def lookup(self, name: str):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+
+class PyGen:
+    """Генератор текста модуля. Детерминирован: один и тот же AST —
+    один и тот же текст (ключ кэша)."""
+
+    def __init__(self, interp):
+        self.it = interp
+        self.out: list[str] = []
+        self.sites: dict[tuple, str] = {}
+        self.site_list: list[tuple] = []
+        self.consts: dict = {}  # repr значения -> имя
+        self.const_list: list[tuple] = []
+        self.names: dict[int, str] = {}  # id(FuncDecl) -> имя Python
+        self.methods: dict[str, dict] = {}  # struct -> метод -> имя
+        self.tests: list[tuple] = []  # (TestBlock, имя Python)
+        self.fn: _Func | None = None
+
+    # --- модуль ---------------------------------------------------------
+
+    def module(self) -> str:
+        funcs = _funcs(self.it.program)
+        for n, func in enumerate(funcs):
+            self.names[id(func)] = f"F{n}"
+        for decl in self.it.program.decls:
+            if isinstance(decl, ast.StructDecl):
+                self.methods[decl.name] = {
+                    m.name: self.names[id(m)] for m in decl.methods
+                }
+        for func in funcs:
+            self.function(func)
+        for decl in self.it.program.decls:
+            if isinstance(decl, ast.TestBlock):
+                self.test(decl)
+        head = [f"# eatc pygen {PYGEN_VERSION}: {self.it.filename}"]
+        for key, name in zip(self.site_list, self.sites.values()):
+            head.append(f"{name} = _Site{key!r}")
+        for name, text in self.const_list:
+            head.append(f"{name} = {text}")
+        tail = ["_METHODS = {"]
+        for sname, table in self.methods.items():
+            items = ", ".join(f"{m!r}: {f}" for m, f in table.items())
+            tail.append(f"    {sname!r}: {{{items}}},")
+        tail.append("}")
+        tail.append(
+            "_TESTS = ["
+            + ", ".join(name for _, name in self.tests)
+            + "]"
+        )
+        return "\n".join(head + self.out + tail) + "\n"
+
+    def site(self, node) -> str:
+        key = (
+            getattr(node, "src_file", None) or self.it.filename,
+            node.line,
+            node.col,
+        )
+        name = self.sites.get(key)
+        if name is None:
+            name = f"S{len(self.sites)}"
+            self.sites[key] = name
+            self.site_list.append(key)
+        return name
+
+    def const(self, text: str) -> str:
+        """Разделяемая константа модуля (enum-вариант, None)."""
+        name = self.consts.get(text)
+        if name is None:
+            name = f"K{len(self.consts)}"
+            self.consts[text] = name
+            self.const_list.append((name, text))
+        return name
+
+    # --- функции --------------------------------------------------------
+
+    def function(self, func: ast.FuncDecl) -> None:
+        name = self.names[id(func)]
+        self.fn = fn = _Func()
+        params = []
+        for p in func.params:
+            params.append(f"v_{p.name}")
+        params.append("_s")
+        sig = ", ".join(params)
+        if func.is_extern:
+            fn.emit(0, f"def {name}({sig}):")
+            fn.emit(
+                1,
+                "raise _trap(_s, "
+                + repr(
+                    f"extern {func.name} доступен только в бинарнике "
+                    "(интерпретатор не линкует C)"
+                )
+                + ")",
+            )
+            self.out.extend(fn.lines)
+            return
+        var_self = bool(func.params) and func.params[0].mutable
+        fn.emit(0, f"def {name}({sig}):")
+        for p in func.params:
+            if p.name == "self":
+                fn.declare("self")
+                continue
+            kind, cap = self.it._meta(p.type)
+            fn.declare(p.name, kind, cap)
+            v = f"v_{p.name}"
+            if var_self and not _scalar(self._tyof(p.type)):
+                fn.emit(1, f"{v} = _copy({v})")
+            self.check(1, v, kind, cap, "_s")
+        req = func.requires
+        if req is not None and not (type(req) is ast.BoolLit and req.value):
+            msg = repr(f"нарушен requires функции {_src_name(func)}")
+            fn.emit(1, f"if not {self.expr(req)}:")
+            fn.emit(2, f"raise _trap(_s, {msg})")
+        ens = func.ensures
+        if ens is not None and type(ens) is ast.BoolLit and ens.value:
+            ens = None
+        copy_ret = func.ret is not None and not _scalar(
+            self._tyof(func.ret)
+        )
+        if ens is None:
+            self.block(func.body, 1, copy_ret)
+            self.out.extend(fn.lines)
+            return
+        # ensures: тело — отдельная функция, проверка — на выходе
+        body = fn.lines
+        self.fn = inner = _Func()
+        inner.scopes = [dict(fn.scopes[0])]
+        inner.tmp = fn.tmp
+        args = ", ".join(f"v_{p.name}" for p in func.params)
+        inner.emit(0, f"def {name}_body({args}):")
+        self.block(func.body, 1, copy_ret)
+        fn.tmp = inner.tmp
+        self.fn = fn
+        fn.lines = body
+        fn.emit(1, f"v_result = {name}_body({args})")
+        fn.declare("result")
+        msg = repr(f"нарушен ensures функции {_src_name(func)}")
+        fn.emit(1, f"if not {self.expr(ens)}:")
+        fn.emit(2, f"raise _trap(_s, {msg})")
+        fn.emit(1, "return v_result")
+        self.out.extend(inner.lines)
+        self.out.extend(fn.lines)
+
+    def test(self, decl: ast.TestBlock) -> None:
+        name = f"T{len(self.tests)}"
+        self.fn = fn = _Func()
+        fn.emit(0, f"def {name}():")
+        self.block(decl.body, 1, False)
+        self.out.extend(fn.lines)
+        self.tests.append((decl, name))
+
+    def _tyof(self, tnode):
+        """Тип-узел → тип для решения «копировать ли» (грубо: скаляр
+        или нет — остальное копируется)."""
+        if isinstance(tnode, ast.TypeName):
+            if tnode.name in INT_RANGES:
+                return IntType(tnode.name)
+            if tnode.name == "bool":
+                return BoolType()
+            if tnode.name == "char":
+                return CharType()
+            return None
+        if isinstance(tnode, ast.StrType):
+            return StrType(None)
+        return None
+
+    def check(self, ind: int, v: str, kind, cap, site: str) -> None:
+        """Проверки связывания (диапазон kind, ёмкость str<cap>)."""
+        if kind is not None:
+            lo, hi = INT_RANGES[kind]
+            self.fn.emit(ind, f"if not {lo} <= {v} <= {hi}:")
+            self.fn.emit(ind + 1, f"_ovf({site}, {v}, {kind!r})")
+        if cap is not None:
+            self.fn.emit(ind, f"if len({v}) > {cap}:")
+            self.fn.emit(ind + 1, f"_capx({site}, {cap})")
+
+    def copy(self, node, text: str) -> str:
+        ty = getattr(node, "ty", None)
+        return text if _scalar(ty) else f"_copy({text})"
+
+    # --- инструкции -----------------------------------------------------
+
+    def block(self, block: ast.Block, ind: int, copy_ret: bool) -> None:
+        fn = self.fn
+        fn.scopes.append({})
+        start = len(fn.lines)
+        for stmt in block.stmts:
+            self.stmt(stmt, ind, copy_ret)
+        if len(fn.lines) == start:
+            fn.emit(ind, "pass")
+        fn.scopes.pop()
+
+    def stmt(self, stmt, ind: int, copy_ret: bool) -> None:
+        fn = self.fn
+        t = type(stmt)
+        if t is ast.LocalDecl:
+            value = self.copy(stmt.value, self.expr(stmt.value))
+            kind, cap = self.it._meta(stmt.type)
+            if stmt.name == "_":
+                v = fn.temp()
+            else:
+                v = f"v_{stmt.name}"
+            fn.emit(ind, f"{v} = {value}")
+            self.check(ind, v, kind, cap, self.site(stmt))
+            if stmt.name != "_":
+                fn.declare(stmt.name, kind, cap)
+            return
+        if t is ast.AssignStmt:
+            self.assign(stmt, ind)
+            return
+        if t is ast.IfStmt:
+            fn.emit(ind, f"if {self.expr(stmt.cond)}:")
+            self.block(stmt.then, ind + 1, copy_ret)
+            for cond, blk in stmt.elifs:
+                # условие elif вычисляется только после ложного if:
+                # временные walrus'ы внутри — в своей ветке
+                fn.emit(ind, f"elif {self.expr(cond)}:")
+                self.block(blk, ind + 1, copy_ret)
+            if stmt.els is not None:
+                fn.emit(ind, "else:")
+                self.block(stmt.els, ind + 1, copy_ret)
+            return
+        if t is ast.LoopStmt:
+            fn.emit(ind, "while True:")
+            self.block(stmt.body, ind + 1, copy_ret)
+            return
+        if t is ast.ForStmt:
+            self.for_(stmt, ind, copy_ret)
+            return
+        if t is ast.MatchStmt:
+            self.match(stmt, ind, copy_ret)
+            return
+        if t is ast.ReturnStmt:
+            if stmt.value is None:
+                fn.emit(ind, "return None")
+            else:
+                value = self.expr(stmt.value)
+                fn.emit(
+                    ind,
+                    f"return _copy({value})" if copy_ret else f"return {value}",
+                )
+            return
+        if t is ast.BreakStmt:
+            fn.emit(ind, "break")
+            return
+        if t is ast.AssertStmt:
+            fn.emit(ind, f"if not {self.expr(stmt.cond)}:")
+            fn.emit(
+                ind + 1,
+                f"raise _trap({self.site(stmt)}, 'assert не выполнен')",
+            )
+            return
+        if t is ast.ExprStmt or t is ast.DiscardStmt:
+            fn.emit(ind, self.expr(stmt.expr))
+            return
+        raise self.it.trap(stmt, "неизвестная инструкция")
+
+    def assign(self, stmt: ast.AssignStmt, ind: int) -> None:
+        fn = self.fn
+        target = stmt.target
+        value = self.copy(stmt.value, self.expr(stmt.value))
+        site = self.site(stmt)
+        if type(target) is ast.Name:
+            meta = fn.lookup(target.ident)
+            if meta is None:
+                # не локал (constexpr) — слот по имени, как у обходчика
+                fn.emit(
+                    ind,
+                    f"_gset({self.site(target)}, {site}, "
+                    f"{target.ident!r}, {value})",
+                )
+                return
+            v = f"v_{target.ident}"
+            fn.emit(ind, f"{v} = {value}")
+            self.check(ind, v, meta[0], meta[1], site)
+            return
+        if isinstance(target, ast.FieldAccess):
+            val = fn.temp()
+            obj = fn.temp()
+            fn.emit(ind, f"{val} = {value}")
+            fn.emit(ind, f"{obj} = {self.place(target.obj)}")
+            sty = getattr(target.obj, "ty", None)
+            if isinstance(sty, StructType):
+                kind, cap = self.it.structs[sty.name].fields[target.name]
+                self.check(ind, val, kind, cap, site)
+            else:
+                fn.emit(ind, f"_fset({site}, {obj}, {target.name!r}, {val})")
+            fn.emit(ind, f"{obj}.fields[{target.name!r}] = {val}")
+            return
+        if isinstance(target, ast.Index):
+            val = fn.temp()
+            obj = fn.temp()
+            idx = fn.temp()
+            fn.emit(ind, f"{val} = {value}")
+            fn.emit(ind, f"{obj} = {self.place(target.obj)}")
+            fn.emit(ind, f"{idx} = {self.expr(target.index)}")
+            fn.emit(ind, f"if not 0 <= {idx} < len({obj}):")
+            fn.emit(ind + 1, f"_oob({self.site(target)}, {idx}, {obj})")
+            fn.emit(ind, f"{obj}.store({idx}, {val})")
+            return
+        raise self.it.trap(stmt, "некорректная цель присваивания")
+
+    def place(self, node) -> str:
+        """Место для записи (см. Interpreter._place): разделённые массивы
+        по цепочке отделяются (Array.mut) до записи."""
+        t = type(node)
+        if t is ast.Index:
+            obj = self.place(node.obj)
+            return f"_place({self.site(node)}, {obj}, {self.expr(node.index)})"
+        if t is ast.FieldAccess:
+            return f"{self.place(node.obj)}.fields[{node.name!r}]"
+        return self.expr(node)
+
+    def for_(self, stmt: ast.ForStmt, ind: int, copy_ret: bool) -> None:
+        fn = self.fn
+        fn.scopes.append({})
+        if stmt.target == "_":
+            v = fn.temp()
+        else:
+            v = f"v_{stmt.target}"
+            fn.declare(stmt.target)
+        it = stmt.iterable
+        if isinstance(it, ast.RangeExpr):
+            start = self.it._constexpr_eval(it.start)
+            end = self.it._constexpr_eval(it.end)
+            fn.emit(ind, f"for {v} in range({start}, {end}):")
+            self.block(stmt.body, ind + 1, copy_ret)
+        else:
+            ety = getattr(getattr(it, "ty", None), "elem", None)
+            if not isinstance(getattr(it, "ty", None), ArrayType):
+                fn.emit(ind, f"for {v} in {self.expr(it)}:")
+            else:
+                # живое чтение по индексу (см. эталон): данные массива
+                # могут смениться при отделении COW в теле
+                arr = fn.temp()
+                i = fn.temp()
+                fn.emit(ind, f"{arr} = {self.expr(it)}")
+                fn.emit(ind, f"for {i} in range(len({arr})):")
+                if _scalar(ety):
+                    fn.emit(ind + 1, f"{v} = {arr}.data[{i}]")
+                else:
+                    fn.emit(ind + 1, f"{v} = _copy({arr}.data[{i}])")
+            self.block(stmt.body, ind + 1, copy_ret)
+        fn.scopes.pop()
+
+    def match(self, stmt: ast.MatchStmt, ind: int, copy_ret: bool) -> None:
+        fn = self.fn
+        subj = fn.temp()
+        tag = fn.temp()
+        fn.emit(ind, f"{subj} = {self.expr(stmt.subject)}")
+        sty = getattr(stmt.subject, "ty", None)
+        if isinstance(sty, (ResultType, OptionType)):
+            fn.emit(ind, f"{tag} = {subj}.tag")
+        elif isinstance(sty, EnumType):
+            fn.emit(ind, f"{tag} = {subj}.variant")
+        else:
+            fn.emit(
+                ind,
+                f"{tag} = {subj}.tag if type({subj}) is _Tagged "
+                f"else {subj}.variant",
+            )
+        seen = set()
+        kw = "if"
+        for arm in stmt.arms:
+            if arm.pattern in seen:
+                continue  # первая ветка с тегом — как у обходчика
+            seen.add(arm.pattern)
+            fn.emit(ind, f"{kw} {tag} == {arm.pattern!r}:")
+            kw = "elif"
+            fn.scopes.append({})
+            if arm.binding is not None and arm.binding != "_":
+                fn.declare(arm.binding)
+                fn.emit(ind + 1, f"v_{arm.binding} = _copy({subj}.payload)")
+            self.block(arm.body, ind + 1, copy_ret)
+            fn.scopes.pop()
+        site = self.site(stmt)
+        if kw == "if":
+            fn.emit(ind, f"_nomatch({site}, {tag})")
+        else:
+            fn.emit(ind, "else:")
+            fn.emit(ind + 1, f"_nomatch({site}, {tag})")
+
+    # --- выражения (текст Python-выражения, всегда в скобках) -----------
+
+    def fit(self, node, text: str, kind, site: str) -> str:
+        """Значение с проверкой диапазона в контексте выражения."""
+        if kind is None:
+            return text
+        lo, hi = INT_RANGES[kind]
+        t = self.fn.temp()
+        return (
+            f"({t} if {lo} <= ({t} := {text}) <= {hi} "
+            f"else _ovf({site}, {t}, {kind!r}))"
+        )
+
+    def fit_cap(self, text: str, cap, site: str) -> str:
+        if cap is None:
+            return text
+        t = self.fn.temp()
+        return f"({t} if len({t} := {text}) <= {cap} else _capx({site}, {cap}))"
+
+    def expr(self, node) -> str:
+        t = type(node)
+        if t is ast.IntLit or t is ast.BoolLit or t is ast.CharLit:
+            if t is ast.IntLit and node.value < 0:
+                return f"({node.value!r})"
+            return repr(node.value)
+        if t is ast.Name:
+            return self.name(node)
+        if t is ast.SelfExpr:
+            if self.fn.lookup("self") is not None:
+                return "v_self"
+            return f"_cx({self.site(node)}, 'self')"
+        if t is ast.StrLit:
+            return self.string(node)
+        if t is ast.UnaryOp:
+            operand = self.expr(node.operand)
+            if node.op == "not":
+                return f"(not {operand})"
+            if node.op == "~":
+                mask = INT_RANGES[node.operand.ty.kind][1]
+                return f"({operand} ^ {mask})"
+            return self.fit(node, f"(-{operand})", node.ty.kind, self.site(node))
+        if t is ast.BinOp:
+            return self.binop(node)
+        if t is ast.Call:
+            return self.call(node)
+        if t is ast.MethodCall:
+            return self.method_call(node)
+        if t is ast.FieldAccess:
+            obj = node.obj
+            if isinstance(obj, ast.Name) and obj.ident in self.it.enums:
+                return self.const(
+                    f"_EnumValue({obj.ident!r}, {node.name!r})"
+                )
+            return f"{self.expr(obj)}.fields[{node.name!r}]"
+        if t is ast.Index:
+            site = self.site(node)
+            if _pure(node.obj):
+                obj = self.expr(node.obj)
+                i = self.fn.temp()
+                data = obj
+                if isinstance(getattr(node.obj, "ty", None), ArrayType):
+                    data = f"{obj}.data"
+                return (
+                    f"({data}[{i}] if 0 <= ({i} := {self.expr(node.index)})"
+                    f" < len({obj}) else _oob({site}, {i}, {obj}))"
+                )
+            return f"_at({site}, {self.expr(node.obj)}, {self.expr(node.index)})"
+        if t is ast.StructLit:
+            rt = self.it.structs[node.name]
+            items = []
+            for fname, fexpr in node.fields:
+                kind, cap = rt.fields[fname]
+                site = self.site(fexpr)
+                v = self.copy(fexpr, self.expr(fexpr))
+                v = self.fit_cap(self.fit(fexpr, v, kind, site), cap, site)
+                items.append(f"{fname!r}: {v}")
+            return f"_StructValue({node.name!r}, {{{', '.join(items)}}})"
+        if t is ast.ArrayLit:
+            elems = ", ".join(self.copy(e, self.expr(e)) for e in node.elems)
+            return f"_new({array_code(node.ty)!r}, [{elems}])"
+        if t is ast.ArrayFill:
+            value = self.expr(node.value)
+            code = array_code(node.ty)
+            return f"_fill({code!r}, {value}, {node.size})"
+        raise self.it.trap(node, "неизвестное выражение")
+
+    def name(self, node: ast.Name) -> str:
+        if getattr(node, "ctor", None) is not None:
+            return self.const("_Tagged('None', None)")
+        if self.fn.lookup(node.ident) is not None:
+            return f"v_{node.ident}"
+        slot = self.it.constexprs.get(node.ident)
+        if slot is not None and type(slot.value) in (int, bool):
+            return f"({slot.value!r})" if slot.value < 0 else repr(slot.value)
+        # comptime-constexpr — по первому чтению, как у обходчика
+        return f"_cx({self.site(node)}, {node.ident!r})"
+
+    def string(self, node: ast.StrLit) -> str:
+        parts = []
+        for seg in node.segments:
+            if isinstance(seg, str):
+                parts.append(repr(seg.encode("utf-8").decode("latin-1")))
+                continue
+            value = self.expr(seg)
+            ty = getattr(seg, "ty", None)
+            if isinstance(ty, IntType):
+                parts.append(f"str({value})")
+            elif isinstance(ty, (StrType, CharType)):
+                parts.append(value)
+            else:
+                parts.append(f"_fmt({value})")
+        if not parts:
+            return "''"
+        text = " + ".join(parts) if len(parts) > 1 else parts[0]
+        return f"_strcap({self.site(node)}, {text})"
+
+    def binop(self, node: ast.BinOp) -> str:
+        op = node.op
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        if op in ("and", "or"):
+            return f"({left} {op} {right})"
+        if op in ("==", "!=", "<", "<=", ">", ">=", "+", "-", "*",
+                  "&", "|", "^"):
+            return f"({left} {op} {right})"
+        site = self.site(node)
+        if op in ("<<", ">>"):
+            kind = node.left.ty.kind
+            width = _WIDTH.get(kind, 32)
+            fn = "_shl" if op == "<<" else "_shr"
+            return f"{fn}({site}, {kind!r}, {width}, {left}, {right})"
+        if op == "/":
+            return f"_div({site}, {left}, {right})"
+        return f"_mod({site}, {left}, {right})"
+
+    def call(self, node: ast.Call) -> str:
+        args = [self.expr(a) for a in node.args]
+        ctor = getattr(node, "ctor", None)
+        if ctor is not None:
+            return f"_Tagged({ctor!r}, {self.copy(node.args[0], args[0])})"
+        name = node.name
+        if name == "len":
+            return f"len({args[0]})"
+        if name == "char":
+            return f"chr({args[0]})"
+        site = self.site(node)
+        if name in self.it._AXIOMS:
+            return f"A_{name}({site}, [{', '.join(args)}])"
+        if name in INT_RANGES:
+            if isinstance(getattr(node.args[0], "ty", None), CharType):
+                return f"ord({args[0]})"
+            return self.fit(node, args[0], name, site)
+        fname = self.names[id(self.it.funcs[name])]
+        return f"{fname}({', '.join(args + [site])})"
+
+    def method_call(self, node: ast.MethodCall) -> str:
+        obj = node.obj
+        if isinstance(obj, ast.Name) and obj.ident in self.it.enums:
+            payload = self.copy(node.args[0], self.expr(node.args[0]))
+            return f"_EnumValue({obj.ident!r}, {node.name!r}, {payload})"
+        site = self.site(node)
+        method = self.it.structs[node.struct].methods[node.name]
+        if method.params and method.params[0].mutable:
+            recv = self.place(obj)  # let self — место (см. эталон)
+        else:
+            recv = self.expr(obj)
+        args = [self.expr(a) for a in node.args]
+        sty = getattr(obj, "ty", None)
+        if isinstance(sty, StructType) and node.name in self.methods.get(
+            sty.name, {}
+        ):
+            fname = self.methods[sty.name][node.name]
+            return f"{fname}({', '.join([recv] + args + [site])})"
+        return f"_meth({recv}, {node.name!r}, {', '.join(args + [site])})"
+
+
+def _runtime(interp) -> dict:
+    """Глобалы модуля: значения рантайма обходчика и trap-помощники,
+    привязанные к интерпретатору."""
+    trap = interp.trap
+
+    def _trap(site, msg):
+        return trap(site, msg)
+
+    def _ovf(site, value, kind):
+        lo, hi = INT_RANGES[kind]
+        raise trap(site, f"переполнение: {value} вне {kind} [{lo}, {hi}]")
+
+    def _capx(site, cap):
+        raise trap(site, f"строка длиннее ёмкости str<{cap}>")
+
+    def _oob(site, index, obj):
+        raise trap(site, f"индекс {index} вне границ [0, {len(obj)})")
+
+    def _at(site, obj, index):
+        if not 0 <= index < len(obj):
+            _oob(site, index, obj)
+        if type(obj) is Array:
+            return obj.data[index]
+        return obj[index]
+
+    def _place(site, obj, index):
+        if not 0 <= index < len(obj):
+            _oob(site, index, obj)
+        return obj.mut()[index]
+
+    def _nomatch(site, tag):
+        raise trap(site, f"нет ветки match для {tag}")
+
+    def _strcap(site, text):
+        if len(text) > 256:
+            raise trap(site, "строка длиннее ёмкости str<256>")
+        return text
+
+    def _fmt(value):
+        if value is True:
+            return "true"
+        if value is False:
+            return "false"
+        return str(value)
+
+    def _shl(site, kind, width, left, right):
+        if right >= width:
+            raise trap(site, f"сдвиг на {right} ≥ ширины {kind}")
+        return left << right
+
+    def _shr(site, kind, width, left, right):
+        if right >= width:
+            raise trap(site, f"сдвиг на {right} ≥ ширины {kind}")
+        return left >> right
+
+    def _cx(site, name):
+        return interp.global_slot(site, name).value
+
+    def _gset(tsite, site, name, value):
+        slot = interp.global_slot(tsite, name)
+        interp._fit(site, slot.kind, value)
+        interp._fit_cap(site, slot.cap, value)
+        slot.value = value
+
+    def _fset(site, obj, name, value):
+        kind, cap = interp.structs[obj.name].fields[name]
+        interp._fit(site, kind, value)
+        interp._fit_cap(site, cap, value)
+
+    glb: dict = {
+        "__builtins__": __builtins__,
+        "_Site": _Site,
+        "_Tagged": Tagged,
+        "_EnumValue": EnumValue,
+        "_StructValue": StructValue,
+        "_copy": _copy_value,
+        "_new": new_array,
+        "_fill": fill_array,
+        "_div": interp._trunc_div,
+        "_mod": interp._trunc_mod,
+    }
+    for name, fn in interp._AXIOMS.items():
+        glb[f"A_{name}"] = functools.partial(fn, interp)
+    for fn in (_trap, _ovf, _capx, _oob, _at, _place, _nomatch, _strcap,
+               _fmt, _shl, _shr, _cx, _gset, _fset):
+        glb[fn.__name__] = fn
+
+    def _meth(obj, name, *args):
+        return glb["_METHODS"][obj.name][name](obj, *args)
+
+    glb["_meth"] = _meth
+    return glb
+
+
+def compile_module(interp):
+    """(код модуля, генератор) — код из кэша по хэшу текста либо
+    compile(); генератор хранит имена функций модуля."""
+    gen = PyGen(interp)
+    source = gen.module()
+    k = cache.key(PYGEN_VERSION, importlib.util.MAGIC_NUMBER, source)
+    data = cache.load("py", k, ".code")
+    if data is not None:
+        try:
+            return marshal.loads(data), gen
+        except (EOFError, ValueError, TypeError):
+            pass  # битый артефакт — пересобрать
+    code = compile(source, f"<eatc-py {interp.filename}>", "exec")
+    cache.store("py", k, marshal.dumps(code), ".code")
+    return code, gen
+
+
+class PyInterpreter(ClosureInterpreter):
+    """Движок `eatc run --engine py`: программа целиком — модуль
+    Python. Интерфейс запуска — как у обходчика."""
+
+    def __init__(self, program, filename, argv=None):
+        super().__init__(program, filename, argv)
+        self._module: dict | None = None
+
+    def _load(self) -> dict:
+        if self._module is None:
+            code, self._gen = compile_module(self)
+            glb = _runtime(self)
+            exec(code, glb)
+            self._module = glb
+        return self._module
+
+    def run_main(self) -> None:
+        main = self.funcs["main"]
+        glb = self._load()
+        site = _Site(
+            getattr(main, "src_file", None) or self.filename,
+            main.line,
+            main.col,
+        )
+        try:
+            glb[self._gen.names[id(main)]](site)
+        finally:
+            self.stdio.flush()
+
+    def run_tests(self) -> list[str]:
+        glb = self._load()
+        passed = []
+        tests = [d for d in self.program.decls if isinstance(d, ast.TestBlock)]
+        for decl, fn in zip(tests, glb["_TESTS"]):
+            try:
+                fn()
+            except EatError as err:
+                raise EatError(
+                    getattr(decl, "src_file", None) or self.filename,
+                    decl.line,
+                    decl.col,
+                    f"test {decl.name} провален: {err.message}",
+                ) from err
+            finally:
+                self.stdio.flush()
+            passed.append(decl.name)
+        return passed
+
+
+def _funcs(program) -> list:
+    """Функции и методы в порядке нумерации генератора (F0, F1, ...)."""
+    out = []
+    for decl in program.decls:
+        if isinstance(decl, ast.FuncDecl):
+            out.append(decl)
+        elif isinstance(decl, ast.StructDecl):
+            out.extend(decl.methods)
+    return out
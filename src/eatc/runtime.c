@@ -1,8 +1,8 @@
-/* Шим EATLang: аксиомы ОС — байт из stdin, байт в stdout,
+/* Шим EATLang: аксиомы ОС — байт и диапазон байтов из stdin, байт и
  * диапазон байтов в stdout, байт в stderr, штатный выход с кодом, trap,
  * аргументы командной строки (arg_count/arg_len/arg_byte),
- * сокеты HTTP-трека (socket_listen/accept/avail/read_byte/
- * write_span/close, HTTP_PLAN §5: сверка — транскрипт EAT_NET,
+ * сокеты HTTP-трека (socket_listen/accept/avail/read_byte/read_span/
+ * write_span/close/wait, HTTP_PLAN §5: сверка — транскрипт EAT_NET,
  * живой режим — реальные неблокирующие сокеты).
  * Вся логика рантайма (строки, интерполяция, read_line, parse_i32)
  * написана на EATLang: selfhost/Rt.eat — первый модуль каждой
@@ -18,8 +18,12 @@
 #include <stdlib.h>
 #include <string.h>
 #include <sys/ioctl.h>
+#include <sys/mman.h>
 #include <sys/socket.h>
 #include <sys/stat.h>
+#ifdef __linux__
+#include <sys/epoll.h>
+#endif
 #include <time.h>
 #include <unistd.h>
 
@@ -40,8 +44,10 @@
  * провалился) тихо продолжаем с тем, что подняли. glibc зовёт
  * функции .init_array с (argc, argv, envp) — отсюда argv для execv;
  * до main ни ввода, ни вывода ещё не было, перезапуск невидим для
- * семантики программы. macOS не касается (#ifdef __linux__). */
-#ifdef __linux__
+ * семантики программы. macOS не касается (#ifdef __linux__). В
+ * разделяемой библиотеке `run --jit` (EAT_JIT) конструктора нет: там
+ * процесс — Python, стек программе даёт поток JIT (eatc/jit.py). */
+#if defined(__linux__) && !defined(EAT_JIT)
 #include <sys/resource.h>
 
 #define EAT_STACK_BYTES ((rlim_t)268435456) /* 256 МиБ = stacksize линковки */
@@ -88,20 +94,109 @@ eat_stack_provision(int argc, char **argv, char **envp) {
  * под VS Code: оба конца — пайпы, ответ initialize навсегда застревал
  * в буфере libc) — такой запускатель объявляет себя явно:
  * EAT_INTERACTIVE=1 в окружении (ставит editor/lsp/serve.sh). */
-int32_t eat_read_byte(void) {
+static int stdin_dialog(void) {
     static int interactive = -1;
     if (interactive < 0) {
         const char *e = getenv("EAT_INTERACTIVE");
         interactive = isatty(STDIN_FILENO) || isatty(STDOUT_FILENO) ||
                       (e != NULL && e[0] == '1');
     }
-    if (interactive) {
+    return interactive;
+}
+
+/* --- stdin-файл через mmap ----------------------------------------
+ * Обычный файл (SelfIr < поток.eat, ReadBench, гейты) отображается в
+ * память при первом чтении: read_byte/read_span/in_avail — сдвиг
+ * указателя по отображению, без stdio-буфера и ftello. Отображение —
+ * снимок размера на момент первого чтения (дописанное позже не видно;
+ * усечение файла во время работы — SIGBUS, как у любого mmap-читателя).
+ * Начало — текущая позиция дескриптора: stdin, сдвинутый родителем
+ * (`(head -c 5; prog) < f`), читается с того же места, что и через
+ * stdio. Пайп, tty, пустой остаток (файлы /proc сообщают размер 0),
+ * отказ mmap и EAT_NO_MMAP=1 — прежний путь stdio; выбор делается один
+ * раз, и FILE stdin в режиме mmap не трогается — курсор один. Конец
+ * отображения — тот же Err(Eof), что у stdio. Диалога с файлом не
+ * бывает (чтение не блокируется), поэтому и fflush перед чтением не
+ * нужен. Состояние — статики шима, как у argv. */
+static const uint8_t *in_map = 0;
+static size_t in_pos = 0;
+static size_t in_len = 0;
+static int in_mapped = -1; /* -1 — не выбран, 0 — stdio, 1 — mmap */
+
+static int stdin_mapped(void) {
+    if (in_mapped >= 0) {
+        return in_mapped;
+    }
+    in_mapped = 0;
+    const char *e = getenv("EAT_NO_MMAP");
+    if (e != 0 && e[0] == '1') {
+        return 0;
+    }
+    struct stat st;
+    if (fstat(STDIN_FILENO, &st) != 0 || !S_ISREG(st.st_mode)) {
+        return 0;
+    }
+    off_t pos = lseek(STDIN_FILENO, 0, SEEK_CUR);
+    if (pos < 0 || st.st_size <= pos ||
+        (uint64_t)st.st_size > (uint64_t)SIZE_MAX) {
+        return 0;
+    }
+    void *m = mmap(0, (size_t)st.st_size, PROT_READ, MAP_PRIVATE,
+                   STDIN_FILENO, 0);
+    if (m == MAP_FAILED) {
+        return 0;
+    }
+    (void)madvise(m, (size_t)st.st_size, MADV_SEQUENTIAL);
+    in_map = (const uint8_t *)m;
+    in_pos = (size_t)pos;
+    in_len = (size_t)st.st_size;
+    in_mapped = 1;
+    return 1;
+}
+
+static int32_t os_read_byte(void) {
+    if (stdin_mapped()) {
+        return in_pos < in_len ? in_map[in_pos++] : -1;
+    }
+    if (stdin_dialog()) {
         fflush(stdout);
     }
     int c = getc_unlocked(stdin);
     return c == EOF ? -1 : (c & 0xff);
 }
 
+/* До max байт stdin в p (read_span): тот же FILE, что у read_byte, —
+ * курсор общий. Батч — один fread (до max байт или конца потока);
+ * диалог — один байт: fread ждал бы ввода, который собеседник не
+ * пошлёт, пока не получит ответ. Результат — число байт, при max > 0
+ * не меньше 1; -1 — конец потока (Err(Eof)). max <= 65 536 (размер
+ * массива, SPEC §6) — int32_t хватает. */
+static int32_t os_read_span(uint8_t *p, uint32_t max) {
+    if (max == 0) {
+        return 0;
+    }
+    if (stdin_mapped()) {
+        if (in_pos >= in_len) {
+            return -1;
+        }
+        size_t n = in_len - in_pos < max ? in_len - in_pos : max;
+        memcpy(p, in_map + in_pos, n);
+        in_pos += n;
+        return (int32_t)n;
+    }
+    if (stdin_dialog()) {
+        fflush(stdout);
+        int c = getc_unlocked(stdin);
+        if (c == EOF) {
+            return -1;
+        }
+        p[0] = (uint8_t)c;
+        return 1;
+    }
+    size_t n = fread(p, 1, max, stdin);
+    return n == 0 ? -1 : (int32_t)n;
+}
+
 /* Байт в stdout (write_byte) — единственный примитив вывода;
  * буферизацию держит libc, нормальный выход из main сбрасывает её.
  * Программы EATLang однопоточны по построению, поэтому _unlocked:
@@ -142,10 +237,25 @@ void eat_exit(uint32_t code) {
     exit((int)code);
 }
 
+/* Раннер test-блоков (check --native): перед блоком @main отдаёт сюда
+ * префикс провала `файл:строка:колонка: error: test ИМЯ провален: `.
+ * Trap внутри блока печатается с ним вместо своих координат — строка
+ * та же, что у интерпретатора (Interpreter.run_test). */
+static const char *test_head = 0;
+
+void eat_test_begin(const char *head) {
+    test_head = head;
+}
+
 /* Аварийная остановка: сообщение в stderr, код 1. */
 void eat_trap(const char *msg) {
+    const char *tail = test_head ? strstr(msg, ": error: ") : 0;
     fflush(stdout);
-    fprintf(stderr, "%s\n", msg);
+    if (tail) {
+        fprintf(stderr, "%s%s\n", test_head, tail + 9);
+    } else {
+        fprintf(stderr, "%s\n", msg);
+    }
     exit(1);
 }
 
@@ -158,6 +268,31 @@ void eat_trap_code(uint32_t code) {
     exit(1);
 }
 
+/* Аварийная остановка в режиме общих trap-блоков (--trap-sites): все
+ * проверки функции ведут в один холодный блок, он передаёт номер места
+ * и таблицу мест функции. Файл и сообщение — смещения строк от начала
+ * таблицы. Текст собирается здесь — байт-в-байт тот же, что строка
+ * eat_trap строкового режима. */
+struct eat_trap_site {
+    int32_t file;
+    int32_t msg;
+    uint32_t line;
+    uint32_t col;
+};
+
+void eat_trap_site(uint32_t id, const struct eat_trap_site *sites) {
+    const struct eat_trap_site *s = &sites[id];
+    const char *base = (const char *)sites;
+    fflush(stdout);
+    if (test_head) {
+        fprintf(stderr, "%strap: %s\n", test_head, base + s->msg);
+    } else {
+        fprintf(stderr, "%s:%u:%u: error: trap: %s\n", base + s->file,
+                s->line, s->col, base + s->msg);
+    }
+    exit(1);
+}
+
 /* --- аргументы командной строки (argv без имени программы) ---------
  * Состояние argv — статики шима: у языка нет глобалов, argv живёт на
  * доверенной границе аксиом рядом с pos/interactive. Трамплин @main
@@ -173,13 +308,13 @@ void eat_args_set(int32_t argc, char **argv) {
     }
 }
 
-uint32_t eat_arg_count(void) {
+static uint32_t os_arg_count(void) {
     return (uint32_t)argv_n;
 }
 
 /* arg_len/arg_byte вызываются только после проверки границ в коде
  * программы (компилятор эмитит trap) — индексы здесь уже валидны. */
-uint32_t eat_arg_len(uint32_t i) {
+static uint32_t os_arg_len(uint32_t i) {
     uint32_t n = 0;
     const char *s = argv_p[i];
     while (s[n] != 0) {
@@ -188,17 +323,22 @@ uint32_t eat_arg_len(uint32_t i) {
     return n;
 }
 
-uint8_t eat_arg_byte(uint32_t i, uint32_t j) {
+static uint8_t os_arg_byte(uint32_t i, uint32_t j) {
     return (uint8_t)argv_p[i][j];
 }
 
 /* --- кооперативная асинхронность (ASYNC_PLAN, ярус 0) --------------
  * in_avail: сколько байт stdin прочитается read_byte без блокировки.
- * Файл — размер минус логическая позиция потока (ftello учитывает
- * stdio-буфер: детерминизм make verify — интерпретатор зеркалит
- * fstat+tell байт-в-байт); пайп/tty — FIONREAD, живой режим
+ * Отображённый файл — остаток отображения; иначе файл — размер минус
+ * логическая позиция потока (ftello учитывает stdio-буфер: детерминизм
+ * make verify — интерпретатор зеркалит fstat+tell байт-в-байт);
+ * пайп/tty — FIONREAD, живой режим
  * (недооценка на stdio-буфер допустима, SPEC §7). Потолок — u32. */
-uint32_t eat_in_avail(void) {
+static uint32_t os_in_avail(void) {
+    if (stdin_mapped()) {
+        size_t avail = in_len - in_pos;
+        return avail > 0xffffffffu ? 0xffffffffu : (uint32_t)avail;
+    }
     struct stat st;
     if (fstat(STDIN_FILENO, &st) == 0 && S_ISREG(st.st_mode)) {
         off_t pos = ftello(stdin);
@@ -219,7 +359,7 @@ uint32_t eat_in_avail(void) {
  * виртуальные часы (+1 на вызов, решение D2 ASYNC_PLAN): интерпретатор
  * и бинарник тикают одинаково без знания о витках loop. Состояние —
  * статики шима, как у argv (граница доверия аксиом). */
-uint64_t eat_ticks(void) {
+static uint64_t os_ticks(void) {
     static int virt = -1;
     static uint64_t vclock = 0;
     static uint64_t base = 0;
@@ -253,16 +393,39 @@ uint64_t eat_ticks(void) {
  *     сокеты ядра, в make verify* не участвует.
  * Контракты (оба режима, тексты trap байт-в-байт с интерпретатором):
  *   - операция на чужом/закрытом fd — trap "socket: неверный дескриптор";
- *   - socket_read_byte без готовых данных в сверке — trap
- *     "socket_read_byte без готовых данных" (детерминированный
- *     суррогат вечной блокировки; страж socket_avail(fd) > 0);
+ *   - socket_read_byte/socket_read_span без готовых данных в сверке —
+ *     trap "<имя> без готовых данных" (детерминированный суррогат
+ *     вечной блокировки; страж socket_avail(fd) > 0);
  *   - кривой сценарий — trap "EAT_NET: неверный сценарий".
- * Состояние — статики шима, как argv/ticks (граница доверия аксиом). */
+ * Состояние — статики шима, как argv/ticks (граница доверия аксиом).
+ *
+ * socket_wait(fd, ms) — ожидание готовности вместо опроса витком loop:
+ * fd — слушатель: он и принятые им соединения, fd — соединение: только
+ * оно. Готово соединение с данными или закрытое пиром, слушатель — с
+ * ждущим пиром. Результат — готовый fd, по таймауту — NO_CONN. В сверке
+ * время виртуально: готовность — по сценарию (net_advance), первым —
+ * соединение с меньшим fd, потом слушатель, иначе NO_CONN сразу. В
+ * живом режиме — epoll слушателя (Linux; на прочих — poll по таблице
+ * владельцев): события берутся пачкой и раздаются без системного
+ * вызова, пока не кончатся.
+ *
+ * Чтение в живом режиме — через приёмный буфер соединения: один recv
+ * на EAT_NET_RBUF байт, read_byte и read_span раздают его без
+ * системного вызова; socket_avail — буфер плюс очередь ядра;
+ * соединение с непустым буфером готово для socket_wait. В сверке
+ * буфер не нужен: данные уже в памяти (net_pool). */
 
 #define EAT_NET_EVENTS 8192
 #define EAT_NET_POOL (1u << 20)
 #define EAT_NET_CONNS 64
 #define EAT_NET_NO_CONN 0xffffffffu
+#define EAT_NET_FDS 1024   /* живой режим: дескрипторы под socket_wait */
+#define EAT_NET_READY 64   /* пачка событий одного epoll_wait */
+#define EAT_NET_RBUF 4096  /* приёмный буфер соединения (живой режим) */
+/* socket_read_span: n <= 65 536 (размер массива, SPEC §6) — Ok(n);
+ * сентинелы ошибок положительные, как у socket_read_byte */
+#define EAT_NET_SPAN_EOF 0x10001u
+#define EAT_NET_SPAN_FAIL 0x10002u
 
 /* События сценария: kind 0 accept, 1 data, 2 close. */
 static int net_mode = -1;            /* -1 не решено, 0 живой, 1 транскрипт */
@@ -283,6 +446,25 @@ static uint8_t c_peer_closed[EAT_NET_CONNS];
 static uint8_t c_prog_closed[EAT_NET_CONNS];
 static uint32_t nconn = 0;
 static uint8_t listener_open = 0;
+/* Живой режим: владелец дескриптора (слушатель + 1; 0 — не наш) и
+ * очередь готовых из последней пачки; закрытый fd из очереди
+ * пропускается по владельцу (переиспользованный — ложная готовность,
+ * как у epoll: страж socket_avail её отсеивает). */
+static int live_owner[EAT_NET_FDS];
+static int live_rq[EAT_NET_READY];
+static uint32_t live_rn = 0;
+static uint32_t live_ri = 0;
+static int live_rl = -1; /* слушатель, чья пачка в очереди */
+#ifdef __linux__
+static int live_ep[EAT_NET_FDS]; /* epoll слушателя + 1; 0 — нет */
+#endif
+/* Приёмный буфер соединения: [live_rp, live_re) принято ядром, но не
+ * отдано программе; live_nrb — соединений с непустым буфером (0 —
+ * socket_wait не сканирует таблицу). */
+static uint8_t live_rb[EAT_NET_FDS][EAT_NET_RBUF];
+static uint16_t live_rp[EAT_NET_FDS];
+static uint16_t live_re[EAT_NET_FDS];
+static uint32_t live_nrb = 0;
 
 static void net_scenario_fail(void) {
     eat_trap("EAT_NET: неверный сценарий");
@@ -451,7 +633,91 @@ static void net_advance(void) {
     }
 }
 
-int64_t eat_socket_listen(uint32_t port) {
+/* До max байт данных соединения s (сверка) в p — через границы событий
+ * сценария; результат — сколько скопировано. */
+static uint32_t net_take(uint32_t s, uint8_t *p, uint32_t max) {
+    uint32_t n = 0;
+    while (n < max && cq_first[s] != EAT_NET_NO_CONN) {
+        uint32_t e = cq_first[s];
+        uint32_t k = ev_len[e] - cq_cur[s];
+        if (k > max - n) {
+            k = max - n;
+        }
+        memcpy(p + n, net_pool + ev_off[e] + cq_cur[s], k);
+        n += k;
+        cq_cur[s] += k;
+        if (cq_cur[s] >= ev_len[e]) {
+            cq_first[s] = ev_link[e];
+            if (cq_first[s] == EAT_NET_NO_CONN) {
+                cq_last[s] = EAT_NET_NO_CONN;
+            }
+            cq_cur[s] = 0;
+        }
+    }
+    return n;
+}
+
+/* Живой режим: байты в приёмном буфере fd. */
+static uint32_t live_buffered(uint32_t fd) {
+    return fd < EAT_NET_FDS ? (uint32_t)(live_re[fd] - live_rp[fd]) : 0;
+}
+
+/* Сброс буфера fd: accept переиспользованного fd, close. */
+static void live_rb_drop(uint32_t fd) {
+    if (fd >= EAT_NET_FDS) {
+        return;
+    }
+    if (live_rp[fd] != live_re[fd]) {
+        live_nrb--;
+    }
+    live_rp[fd] = 0;
+    live_re[fd] = 0;
+}
+
+/* recv с блокирующей семантикой чтения: > 0 — принято, 0 — пир
+ * закрыл, -1 — ошибка (Err(Fail)); чужой fd — trap. */
+static ssize_t live_recv(int fd, uint8_t *p, size_t cap) {
+    for (;;) {
+        ssize_t r = recv(fd, p, cap, 0);
+        if (r >= 0) {
+            return r;
+        }
+        if (errno == EAGAIN || errno == EWOULDBLOCK) {
+            /* страж avail не сработал — блокирующая семантика чтения */
+            struct pollfd q = {fd, POLLIN, 0};
+            poll(&q, 1, -1);
+            continue;
+        }
+        if (errno == EBADF || errno == ENOTSOCK) {
+            eat_trap("socket: неверный дескриптор");
+        }
+        return -1;
+    }
+}
+
+/* Пустой буфер fd (< EAT_NET_FDS) — одним recv: 1 — есть байты,
+ * 0 — пир закрыл, -1 — ошибка. */
+static int live_fill(uint32_t fd) {
+    ssize_t r = live_recv((int)fd, live_rb[fd], EAT_NET_RBUF);
+    if (r <= 0) {
+        return (int)r;
+    }
+    live_rp[fd] = 0;
+    live_re[fd] = (uint16_t)r;
+    live_nrb++;
+    return 1;
+}
+
+/* n <= live_buffered(fd) байт из буфера fd в p. */
+static void live_take(uint32_t fd, uint8_t *p, uint32_t n) {
+    memcpy(p, live_rb[fd] + live_rp[fd], n);
+    live_rp[fd] = (uint16_t)(live_rp[fd] + n);
+    if (live_rp[fd] == live_re[fd]) {
+        live_nrb--;
+    }
+}
+
+static int64_t os_socket_listen(uint32_t port) {
     net_init();
     if (net_mode == 1) {
         listener_open = 1;
@@ -474,10 +740,25 @@ int64_t eat_socket_listen(uint32_t port) {
         close(fd);
         return -1;
     }
+    if (fd < EAT_NET_FDS) {
+        live_owner[fd] = fd + 1;
+#ifdef __linux__
+        int ep = epoll_create1(EPOLL_CLOEXEC);
+        struct epoll_event ev;
+        memset(&ev, 0, sizeof(ev));
+        ev.events = EPOLLIN;
+        ev.data.fd = fd;
+        if (ep >= 0 && epoll_ctl(ep, EPOLL_CTL_ADD, fd, &ev) == 0) {
+            live_ep[fd] = ep + 1;
+        } else if (ep >= 0) {
+            close(ep);
+        }
+#endif
+    }
     return fd;
 }
 
-uint32_t eat_socket_accept(uint32_t fd) {
+static uint32_t os_socket_accept(uint32_t fd) {
     net_init();
     if (net_mode == 1) {
         if (fd != 3 || !listener_open) {
@@ -507,10 +788,23 @@ uint32_t eat_socket_accept(uint32_t fd) {
         eat_trap("socket: неверный дескриптор");
     }
     fcntl(c, F_SETFL, fcntl(c, F_GETFL, 0) | O_NONBLOCK);
+    live_rb_drop((uint32_t)c);
+    if (c < EAT_NET_FDS && fd < EAT_NET_FDS) {
+        live_owner[c] = (int)fd + 1;
+#ifdef __linux__
+        if (live_ep[fd] != 0) {
+            struct epoll_event ev;
+            memset(&ev, 0, sizeof(ev));
+            ev.events = EPOLLIN;
+            ev.data.fd = c;
+            epoll_ctl(live_ep[fd] - 1, EPOLL_CTL_ADD, c, &ev);
+        }
+#endif
+    }
     return (uint32_t)c;
 }
 
-uint32_t eat_socket_avail(uint32_t fd) {
+static uint32_t os_socket_avail(uint32_t fd) {
     net_init();
     if (net_mode == 1) {
         uint32_t s = net_slot(fd);
@@ -528,9 +822,13 @@ uint32_t eat_socket_avail(uint32_t fd) {
         }
         return c_peer_closed[s] ? 1u : 0u;
     }
+    uint64_t have = live_buffered(fd);
     int n = 0;
     if (ioctl((int)fd, FIONREAD, &n) == 0 && n > 0) {
-        return (uint32_t)n;
+        have += (uint64_t)n;
+    }
+    if (have > 0) {
+        return have > 0xffffffffu ? 0xffffffffu : (uint32_t)have;
     }
     struct pollfd p = {(int)fd, POLLIN, 0};
     if (poll(&p, 1, 0) > 0 && (p.revents & (POLLIN | POLLHUP | POLLERR))) {
@@ -543,22 +841,13 @@ uint32_t eat_socket_avail(uint32_t fd) {
  * 257 — Fail. Сентинелы положительные (не -1, как у eat_read_byte):
  * кодоген собирает Result сравнениями с неотрицательными литералами —
  * паритет эмиттеров без отрицательных констант в IR. */
-int32_t eat_socket_read_byte(uint32_t fd) {
+static int32_t os_socket_read_byte(uint32_t fd) {
     net_init();
     if (net_mode == 1) {
         uint32_t s = net_slot(fd);
         net_advance();
-        uint32_t e = cq_first[s];
-        if (e != EAT_NET_NO_CONN) {
-            uint8_t b = net_pool[ev_off[e] + cq_cur[s]];
-            cq_cur[s]++;
-            if (cq_cur[s] >= ev_len[e]) {
-                cq_first[s] = ev_link[e];
-                if (cq_first[s] == EAT_NET_NO_CONN) {
-                    cq_last[s] = EAT_NET_NO_CONN;
-                }
-                cq_cur[s] = 0;
-            }
+        uint8_t b;
+        if (net_take(s, &b, 1) == 1) {
             return b;
         }
         if (c_peer_closed[s]) {
@@ -567,29 +856,69 @@ int32_t eat_socket_read_byte(uint32_t fd) {
         eat_trap("socket_read_byte без готовых данных");
         return 257; /* недостижимо: eat_trap завершает процесс */
     }
-    for (;;) {
-        uint8_t b;
-        ssize_t r = recv((int)fd, &b, 1, 0);
-        if (r == 1) {
-            return b;
+    uint8_t b;
+    if (fd < EAT_NET_FDS) {
+        if (live_rp[fd] == live_re[fd]) {
+            int r = live_fill(fd);
+            if (r <= 0) {
+                return r == 0 ? 256 : 257;
+            }
         }
-        if (r == 0) {
-            return 256;
+        live_take(fd, &b, 1);
+        return b;
+    }
+    ssize_t r = live_recv((int)fd, &b, 1);
+    return r == 1 ? b : (r == 0 ? 256 : 257);
+}
+
+/* До max байт соединения в p (socket_read_span): Ok(n) — n от 1 до
+ * max (max = 0 — Ok(0) без чтения), EAT_NET_SPAN_EOF — пир закрыл и
+ * данных нет, EAT_NET_SPAN_FAIL — ошибка. Сверка — все готовые байты
+ * сценария до max; живой режим — приёмный буфер, при пустом буфере и
+ * max >= EAT_NET_RBUF — recv прямо в массив (без копии). */
+static uint32_t os_socket_read_span(uint32_t fd, uint8_t *p, uint32_t max) {
+    net_init();
+    if (net_mode == 1) {
+        uint32_t s = net_slot(fd);
+        net_advance();
+        if (max == 0) {
+            return 0;
         }
-        if (errno == EAGAIN || errno == EWOULDBLOCK) {
-            /* страж avail не сработал — блокирующая семантика read_byte */
-            struct pollfd p = {(int)fd, POLLIN, 0};
-            poll(&p, 1, -1);
-            continue;
+        uint32_t n = net_take(s, p, max);
+        if (n > 0) {
+            return n;
         }
-        if (errno == EBADF || errno == ENOTSOCK) {
-            eat_trap("socket: неверный дескриптор");
+        if (c_peer_closed[s]) {
+            return EAT_NET_SPAN_EOF;
+        }
+        eat_trap("socket_read_span без готовых данных");
+        return EAT_NET_SPAN_FAIL; /* недостижимо */
+    }
+    if (max == 0) {
+        return 0;
+    }
+    uint32_t have = live_buffered(fd);
+    if (have == 0 && (fd >= EAT_NET_FDS || max >= EAT_NET_RBUF)) {
+        ssize_t r = live_recv((int)fd, p, max);
+        if (r <= 0) {
+            return r == 0 ? EAT_NET_SPAN_EOF : EAT_NET_SPAN_FAIL;
+        }
+        return (uint32_t)r;
+    }
+    if (have == 0) {
+        int r = live_fill(fd);
+        if (r <= 0) {
+            return r == 0 ? EAT_NET_SPAN_EOF : EAT_NET_SPAN_FAIL;
         }
-        return 257;
+        have = live_buffered(fd);
     }
+    uint32_t n = have < max ? have : max;
+    live_take(fd, p, n);
+    return n;
 }
 
-uint32_t eat_socket_write_span(uint32_t fd, const uint8_t *p, uint32_t n) {
+static uint32_t os_socket_write_span(uint32_t fd, const uint8_t *p,
+                                     uint32_t n) {
     net_init();
     if (net_mode == 1) {
         (void)net_slot(fd);
@@ -614,7 +943,7 @@ uint32_t eat_socket_write_span(uint32_t fd, const uint8_t *p, uint32_t n) {
     return n;
 }
 
-void eat_socket_close(uint32_t fd) {
+static void os_socket_close(uint32_t fd) {
     net_init();
     if (net_mode == 1) {
         if (fd == 3) {
@@ -628,5 +957,374 @@ void eat_socket_close(uint32_t fd) {
         c_prog_closed[fd - 4] = 1;
         return;
     }
+    if (fd < EAT_NET_FDS) {
+#ifdef __linux__
+        if (live_ep[fd] != 0) {
+            close(live_ep[fd] - 1);
+            live_ep[fd] = 0;
+        }
+#endif
+        live_owner[fd] = 0; /* закрытый fd epoll снимает сам */
+    }
+    live_rb_drop(fd);
     close((int)fd);
 }
+
+/* Сверка: готовность по сценарию, без времени (таймаут — сразу). */
+static uint32_t net_wait_transcript(uint32_t fd) {
+    if (fd == 3) {
+        if (!listener_open) {
+            eat_trap("socket: неверный дескриптор");
+        }
+        net_advance();
+        for (uint32_t s = 0; s < nconn; s++) {
+            if (!c_prog_closed[s] &&
+                (cq_first[s] != EAT_NET_NO_CONN || c_peer_closed[s])) {
+                return 4 + s;
+            }
+        }
+        return ev_next < nev ? 3 : EAT_NET_NO_CONN;
+    }
+    uint32_t s = net_slot(fd);
+    net_advance();
+    if (cq_first[s] != EAT_NET_NO_CONN || c_peer_closed[s]) {
+        return fd;
+    }
+    return EAT_NET_NO_CONN;
+}
+
+/* Пачка готовых дескрипторов слушателя lst в live_rq: epoll_wait или
+ * (без epoll) poll по таблице владельцев. */
+static void net_wait_batch(int lst, int ms) {
+    live_rn = 0;
+    live_ri = 0;
+    live_rl = lst;
+#ifdef __linux__
+    if (live_ep[lst] != 0) {
+        struct epoll_event evs[EAT_NET_READY];
+        int r = epoll_wait(live_ep[lst] - 1, evs, EAT_NET_READY, ms);
+        for (int i = 0; i < r; i++) {
+            live_rq[live_rn++] = evs[i].data.fd;
+        }
+        return;
+    }
+#endif
+    struct pollfd ps[EAT_NET_READY];
+    nfds_t n = 0;
+    for (int f = 0; f < EAT_NET_FDS && n < EAT_NET_READY; f++) {
+        if (live_owner[f] == lst + 1) {
+            ps[n].fd = f;
+            ps[n].events = POLLIN;
+            ps[n].revents = 0;
+            n++;
+        }
+    }
+    if (poll(ps, n, ms) <= 0) {
+        return;
+    }
+    for (nfds_t i = 0; i < n; i++) {
+        if (ps[i].revents != 0) {
+            live_rq[live_rn++] = ps[i].fd;
+        }
+    }
+}
+
+static uint32_t os_socket_wait(uint32_t fd, uint32_t ms) {
+    net_init();
+    if (net_mode == 1) {
+        return net_wait_transcript(fd);
+    }
+    int t = ms > 0x7fffffffu ? 0x7fffffff : (int)ms;
+    if (fd < EAT_NET_FDS && live_owner[fd] == (int)fd + 1) {
+        int lst = (int)fd;
+        /* байты в приёмном буфере ядро не покажет — скан таблицы */
+        for (int c = 0; live_nrb > 0 && c < EAT_NET_FDS; c++) {
+            if (c != lst && live_owner[c] == lst + 1 &&
+                live_rp[c] != live_re[c]) {
+                return (uint32_t)c;
+            }
+        }
+        for (int round = 0; round < 2; round++) {
+            while (live_rl == lst && live_ri < live_rn) {
+                int c = live_rq[live_ri++];
+                if (live_owner[c] == lst + 1) {
+                    return (uint32_t)c;
+                }
+            }
+            if (round == 0) {
+                net_wait_batch(lst, t);
+            }
+        }
+        return EAT_NET_NO_CONN;
+    }
+    if (live_buffered(fd) > 0) {
+        return fd;
+    }
+    struct pollfd p = {(int)fd, POLLIN, 0};
+    int r = poll(&p, 1, t);
+    if (r > 0 && (p.revents & POLLNVAL)) {
+        eat_trap("socket: неверный дескриптор");
+    }
+    return r > 0 ? fd : EAT_NET_NO_CONN;
+}
+
+/* --- трасса аксиом (eatc/trace.py) ---------------------------------
+ * EAT_RECORD=<файл> — запись результатов недетерминированных аксиом
+ * (ввод, часы, argv, сокеты) строками `имя [аргументы] = результат`;
+ * EAT_REPLAY=<файл> — воспроизведение: ОС не трогается (stdin не
+ * читается, сокеты не открываются), результат берётся из трассы, а
+ * вызов сверяется с событием — первое расхождение даёт trap с номером
+ * события. Формат и тексты trap — байт-в-байт с `eatc run --record/
+ * --replay`: трассы бинарника и интерпретатора взаимозаменяемы, и
+ * расхождение движков бисектится до первой аксиомы. Результат — сырое
+ * значение аксиомы шима (read_byte: -1 — Eof; socket_read_byte: 256/257;
+ * socket_read_span: 65537/65538; socket_listen: -1 — Fail;
+ * socket_close: 0). Без переменных — одна
+ * проверка статика на вызов. Состояние — статики шима, как у EAT_NET. */
+static int trace_mode = -1; /* -1 не решено, 0 выкл, 1 запись, 2 replay */
+static FILE *trace_f = 0;
+static uint64_t trace_n = 0; /* номер текущего события (с 1) */
+/* хвост события после результата (read_span: байты в hex) */
+static char trace_data[96];
+
+static void trace_init(void) {
+    if (trace_mode >= 0) {
+        return;
+    }
+    trace_mode = 0;
+    const char *rec = getenv("EAT_RECORD");
+    const char *rep = getenv("EAT_REPLAY");
+    if (rec != 0 && rep != 0) {
+        eat_trap("EAT_RECORD несовместим с EAT_REPLAY");
+    }
+    if (rep != 0) {
+        trace_f = fopen(rep, "r");
+        trace_mode = 2;
+    } else if (rec != 0) {
+        trace_f = fopen(rec, "w");
+        trace_mode = 1;
+        if (trace_f != 0) {
+            fputs("# eat trace 1\n", trace_f);
+        }
+    }
+    if (trace_mode != 0 && trace_f == 0) {
+        eat_trap("трасса: файл не открыт");
+    }
+}
+
+static void trace_call(char *buf, size_t cap, const char *name, int nargs,
+                       uint64_t a0, uint64_t a1) {
+    if (nargs == 0) {
+        snprintf(buf, cap, "%s", name);
+    } else if (nargs == 1) {
+        snprintf(buf, cap, "%s %llu", name, (unsigned long long)a0);
+    } else {
+        snprintf(buf, cap, "%s %llu %llu", name, (unsigned long long)a0,
+                 (unsigned long long)a1);
+    }
+}
+
+/* Запись: событие дописывается после вызова ОС; буфер libc сбросит
+ * exit() (штатный выход, eat_exit и eat_trap). */
+static void trace_put(const char *name, int nargs, uint64_t a0, uint64_t a1,
+                      int64_t r) {
+    char call[96];
+    trace_call(call, sizeof(call), name, nargs, a0, a1);
+    fprintf(trace_f, "%s = %lld\n", call, (long long)r);
+}
+
+/* Воспроизведение: следующее событие трассы (комментарии и пустые
+ * строки пропускаются) обязано совпасть с вызовом. */
+static int64_t trace_take(const char *name, int nargs, uint64_t a0,
+                          uint64_t a1) {
+    char call[96];
+    char line[160];
+    char msg[512];
+    trace_call(call, sizeof(call), name, nargs, a0, a1);
+    trace_n++;
+    for (;;) {
+        if (fgets(line, sizeof(line), trace_f) == 0) {
+            snprintf(msg, sizeof(msg),
+                     "replay: трасса исчерпана на событии %llu (вызов `%s`)",
+                     (unsigned long long)trace_n, call);
+            eat_trap(msg);
+        }
+        if (line[0] != '#' && line[0] != '\n' && line[0] != '\r') {
+            break;
+        }
+    }
+    char *eq = strstr(line, " = ");
+    if (eq == 0) {
+        eat_trap("replay: неверная строка трассы");
+    }
+    *eq = 0;
+    if (strcmp(line, call) != 0) {
+        snprintf(msg, sizeof(msg),
+                 "replay: расхождение на событии %llu: в трассе `%s`, "
+                 "вызов `%s`",
+                 (unsigned long long)trace_n, line, call);
+        eat_trap(msg);
+    }
+    char *end = 0;
+    int64_t r = strtoll(eq + 3, &end, 10);
+    snprintf(trace_data, sizeof(trace_data), "%s", end);
+    return r;
+}
+
+/* Span-чтение в трассе (read_span, socket_read_span): после
+ * результата — прочитанные байты в hex (`read_span MAX = n HEX`,
+ * `socket_read_span FD MAX = n HEX`); под записью чтение не длиннее
+ * EAT_TRACE_SPAN (== trace.SPAN_CAP): число байт программе не обещано,
+ * строка трассы остаётся в буфере trace_take. Байты пишутся, только
+ * если результат — их число (0 < r <= max; сентинелы ошибок — нет). */
+#define EAT_TRACE_SPAN 32u
+
+static void trace_put_span(const char *name, int nargs, uint64_t a0,
+                           uint32_t max, int64_t r, const uint8_t *p) {
+    char call[96];
+    trace_call(call, sizeof(call), name, nargs, a0, max);
+    fprintf(trace_f, "%s = %lld", call, (long long)r);
+    if (r > 0 && r <= (int64_t)max) {
+        fputc(' ', trace_f);
+        for (int64_t i = 0; i < r; i++) {
+            fprintf(trace_f, "%02x", p[i]);
+        }
+    }
+    fputc('\n', trace_f);
+}
+
+static int64_t trace_take_span(const char *name, int nargs, uint64_t a0,
+                               uint32_t max, uint8_t *p) {
+    int64_t r = trace_take(name, nargs, a0, max);
+    const char *h = trace_data;
+    if (*h == ' ') {
+        h++;
+    }
+    for (int64_t i = 0; r <= (int64_t)max && i < r; i++) {
+        unsigned v = 0;
+        if (sscanf(h + 2 * i, "%2x", &v) != 1) {
+            eat_trap("replay: неверная строка трассы");
+        }
+        p[i] = (uint8_t)v;
+    }
+    return r;
+}
+
+/* Точки входа аксиом: трасса вокруг os_* (реализаций выше). */
+#define EAT_TRACED(ty, name, nargs, a0, a1, os_call)                      \
+    trace_init();                                                         \
+    if (trace_mode == 2) {                                                \
+        return (ty)trace_take(name, nargs, a0, a1);                       \
+    }                                                                     \
+    ty r = os_call;                                                       \
+    if (trace_mode == 1) {                                                \
+        trace_put(name, nargs, a0, a1, (int64_t)r);                       \
+    }                                                                     \
+    return r
+
+int32_t eat_read_byte(void) {
+    EAT_TRACED(int32_t, "read_byte", 0, 0, 0, os_read_byte());
+}
+
+int32_t eat_read_span(uint8_t *p, uint32_t max) {
+    trace_init();
+    if (trace_mode == 2) {
+        return (int32_t)trace_take_span("read_span", 1, max, max, p);
+    }
+    uint32_t lim = max;
+    if (trace_mode == 1 && lim > EAT_TRACE_SPAN) {
+        lim = EAT_TRACE_SPAN;
+    }
+    int32_t r = os_read_span(p, lim);
+    if (trace_mode == 1) {
+        trace_put_span("read_span", 1, max, max, r, p);
+    }
+    return r;
+}
+
+uint32_t eat_arg_count(void) {
+    EAT_TRACED(uint32_t, "arg_count", 0, 0, 0, os_arg_count());
+}
+
+uint32_t eat_arg_len(uint32_t i) {
+    EAT_TRACED(uint32_t, "arg_len", 1, i, 0, os_arg_len(i));
+}
+
+uint8_t eat_arg_byte(uint32_t i, uint32_t j) {
+    EAT_TRACED(uint8_t, "arg_byte", 2, i, j, os_arg_byte(i, j));
+}
+
+uint32_t eat_in_avail(void) {
+    EAT_TRACED(uint32_t, "in_avail", 0, 0, 0, os_in_avail());
+}
+
+uint64_t eat_ticks(void) {
+    EAT_TRACED(uint64_t, "ticks", 0, 0, 0, os_ticks());
+}
+
+/* порт в IR — i16: старшие биты регистра не определены */
+int64_t eat_socket_listen(uint32_t port) {
+    EAT_TRACED(int64_t, "socket_listen", 1, (uint16_t)port, 0,
+               os_socket_listen(port));
+}
+
+uint32_t eat_socket_accept(uint32_t fd) {
+    EAT_TRACED(uint32_t, "socket_accept", 1, fd, 0, os_socket_accept(fd));
+}
+
+uint32_t eat_socket_avail(uint32_t fd) {
+    EAT_TRACED(uint32_t, "socket_avail", 1, fd, 0, os_socket_avail(fd));
+}
+
+int32_t eat_socket_read_byte(uint32_t fd) {
+    EAT_TRACED(int32_t, "socket_read_byte", 1, fd, 0,
+               os_socket_read_byte(fd));
+}
+
+/* replay: байты ответа уходят в stdout, как в транскрипте EAT_NET */
+uint32_t eat_socket_write_span(uint32_t fd, const uint8_t *p, uint32_t n) {
+    trace_init();
+    if (trace_mode == 2) {
+        uint32_t r = (uint32_t)trace_take("socket_write_span", 2, fd, n);
+        eat_write_span(p, n);
+        return r;
+    }
+    uint32_t r = os_socket_write_span(fd, p, n);
+    if (trace_mode == 1) {
+        trace_put("socket_write_span", 2, fd, n, r);
+    }
+    return r;
+}
+
+/* под записью — не длиннее EAT_TRACE_SPAN, как eat_read_span */
+uint32_t eat_socket_read_span(uint32_t fd, uint8_t *p, uint32_t max) {
+    trace_init();
+    if (trace_mode == 2) {
+        return (uint32_t)trace_take_span("socket_read_span", 2, fd, max, p);
+    }
+    uint32_t lim = max;
+    if (trace_mode == 1 && lim > EAT_TRACE_SPAN) {
+        lim = EAT_TRACE_SPAN;
+    }
+    uint32_t r = os_socket_read_span(fd, p, lim);
+    if (trace_mode == 1) {
+        trace_put_span("socket_read_span", 2, fd, max, r, p);
+    }
+    return r;
+}
+
+uint32_t eat_socket_wait(uint32_t fd, uint32_t ms) {
+    EAT_TRACED(uint32_t, "socket_wait", 2, fd, ms, os_socket_wait(fd, ms));
+}
+
+void eat_socket_close(uint32_t fd) {
+    trace_init();
+    if (trace_mode == 2) {
+        (void)trace_take("socket_close", 1, fd, 0);
+        return;
+    }
+    os_socket_close(fd);
+    if (trace_mode == 1) {
+        trace_put("socket_close", 1, fd, 0, 0);
+    }
+}
@@ -0,0 +1,277 @@
+"""Специализация функций по константным аргументам (build-путь).
+
+Ярус B (`--fold`) сворачивает вызов, только если константны ВСЕ
+аргументы. Вызов с частично константными аргументами (ширина/основание
+в lib/fmt, величина сдвига в U128) остаётся общим — хотя константа
+сужает интервалы в теле: верификатор не знает её значения, кодоген
+оставляет проверки и ветви. Этот проход клонирует такую функцию на
+каждый различный кортеж константных аргументов: параметр-константа
+уходит из сигнатуры клона, его чтения в теле/requires/ensures
+подменяются литералом, а место вызова переписывается на клон.
+
+Порядок в build: fold → specialize (свёртка внутри клонов) → verify —
+верификатор видит точки [v, v] вместо диапазона типа параметра и
+снимает trap-проверки уже в теле клона. Тексты trap'ов клона — как у
+оригинала (`spec_of`): наблюдаемое поведение не меняется.
+
+Рост кода ограничен бюджетом в узлах AST (размер тела ≈ размер IR):
+клонируются только небольшие функции, не больше SPEC_PER_FUNC клонов
+на функцию и SPEC_BUDGET узлов суммарно. Граф вызовов — DAG (правило 1),
+поэтому каскад клонов (клон зовёт клон) конечен. Канон `eatc ir`
+не трогается — проход вызывается только из `eatc build --spec`.
+"""
+
+import copy
+import dataclasses
+
+from . import ast_nodes as ast
+from .comptime import Comptime
+from .types import BoolType, IntType
+
+# Порог «малости» тела (узлов AST), клонов на функцию и суммарный
+# бюджет роста кода — по духу INLINE_LIMIT/INLINE_BUDGET кодогена
+SPEC_LIMIT = 256
+SPEC_PER_FUNC = 4
+SPEC_BUDGET = 4096
+
+
+def _children(node):
+    """(поле, значение) дочерних узлов: Node, список Node/кортежей."""
+    for f in dataclasses.fields(node):
+        yield f.name, getattr(node, f.name)
+
+
+def _size(node) -> int:
+    """Число узлов AST в поддереве (мера роста кода клона)."""
+    if not isinstance(node, ast.Node):
+        return 0
+    n = 1
+    for _, child in _children(node):
+        if isinstance(child, ast.Node):
+            n += _size(child)
+        elif isinstance(child, list):
+            for c in child:
+                if isinstance(c, tuple):
+                    n += sum(_size(x) for x in c)
+                else:
+                    n += _size(c)
+    return n
+
+
+def _subst(node, values: dict):
+    """Подмена чтений параметров-констант литералами в поддереве.
+    Затенение запрещено языком (правило 6), поэтому любое Name с
+    именем параметра — чтение этого параметра. Возвращает узел-замену
+    (для корня) — поля детей переписываются на месте."""
+    if isinstance(node, ast.Name) and node.ident in values:
+        return values[node.ident](node)
+    if not isinstance(node, ast.Node):
+        return node
+    for fname, child in _children(node):
+        if isinstance(child, ast.Node):
+            setattr(node, fname, _subst(child, values))
+        elif isinstance(child, list):
+            for i, c in enumerate(child):
+                if isinstance(c, tuple):
+                    child[i] = tuple(
+                        _subst(x, values) if isinstance(x, ast.Node) else x
+                        for x in c
+                    )
+                elif isinstance(c, ast.Node):
+                    child[i] = _subst(c, values)
+    return node
+
+
+def _literal(ty, value: int):
+    """Фабрика литерала на место чтения параметра: координаты —
+    исходного Name (trap-тексты и дамп верификатора не сдвигаются)."""
+    def make(at: ast.Name):
+        if isinstance(ty, BoolType):
+            lit = ast.BoolLit(at.line, at.col, bool(value))
+        else:
+            lit = ast.IntLit(at.line, at.col, value)
+        lit.ty = ty
+        src = getattr(at, "src_file", None)
+        if src is not None:
+            lit.src_file = src
+        return lit
+    return make
+
+
+class Specializer:
+    """Проход специализации над типизированной программой. Клоны
+    регистрируются в таблицах тайпчекера (funcs, edges, модуль
+    владельца) — верификатор и кодоген видят их как обычные функции."""
+
+    def __init__(self, program: ast.Program, checker, filename: str):
+        self.program = program
+        self.checker = checker
+        self.filename = filename
+        self.ct = Comptime(program, checker, filename)
+        self.clones: dict[tuple, str] = {}  # (имя, константы) -> клон
+        self.per_func: dict[str, int] = {}
+        self.spent = 0
+        self.sites = 0
+        self.new_decls: list = []
+        self._size_cache: dict[str, int] = {}
+
+    def _candidate(self, node: ast.Call):
+        """FuncDecl вызываемой, если вызов годен к специализации:
+        пользовательская функция с телом, не main, не свёрнута."""
+        if getattr(node, "ctor", None) or getattr(node, "folded", False):
+            return None
+        name = node.name
+        if name == "main" or name not in self.checker.funcs:
+            return None
+        func = self.ct.decls.get(name)
+        if not isinstance(func, ast.FuncDecl) or func.body is None:
+            return None
+        if func.is_extern or func.is_method:
+            return None
+        return func
+
+    def _body_size(self, func: ast.FuncDecl) -> int:
+        n = self._size_cache.get(func.name)
+        if n is None:
+            n = _size(func.body) + _size(func.requires) + _size(func.ensures)
+            self._size_cache[func.name] = n
+        return n
+
+    def _clone(self, func: ast.FuncDecl, consts: tuple) -> str | None:
+        """Клон func с параметрами-константами consts ((индекс,
+        значение), ...); None — бюджет исчерпан."""
+        key = (func.name, consts)
+        hit = self.clones.get(key)
+        if hit is not None:
+            return hit
+        size = self._body_size(func)
+        used = self.per_func.get(func.name, 0)
+        if (size > SPEC_LIMIT or used >= SPEC_PER_FUNC
+                or self.spent + size > SPEC_BUDGET):
+            return None
+        sig = self.checker.funcs[func.name]
+        fixed = dict(consts)
+        values = {
+            sig.params[i][0]: _literal(sig.params[i][1], v)
+            for i, v in consts
+        }
+        name = f"{func.name}$s{used}"
+        while name in self.checker.funcs:
+            used += 1
+            name = f"{func.name}$s{used}"
+        clone = copy.deepcopy(func)
+        clone.name = name
+        clone.spec_of = getattr(func, "spec_of", None) or func.name
+        clone.params = [
+            p for i, p in enumerate(clone.params) if i not in fixed
+        ]
+        clone.body = _subst(clone.body, values)
+        if clone.requires is not None:
+            clone.requires = _subst(clone.requires, values)
+        if clone.ensures is not None:
+            clone.ensures = _subst(clone.ensures, values)
+        self.checker.funcs[name] = dataclasses.replace(
+            sig,
+            name=name,
+            params=[p for i, p in enumerate(sig.params) if i not in fixed],
+            node=clone,
+        )
+        owner = self.checker.name_module.get(func.name)
+        if owner is not None:
+            self.checker.name_module[name] = owner
+        self.checker.decl_module[id(clone)] = self.checker.decl_module.get(
+            id(func), 0
+        )
+        for caller, callee in list(self.checker.edges):
+            if caller == func.name:
+                self.checker.edges.add((name, callee))
+        # вычислитель свёртки: граф годности и таблица функций знают клон
+        self.ct.graph[name] = set(self.ct.graph.get(func.name, ()))
+        self.ct.decls[name] = clone
+        self.ct.interp.funcs[name] = clone
+        self.clones[key] = name
+        self.per_func[func.name] = used + 1
+        self.spent += size
+        self.new_decls.append(clone)
+        return name
+
+    def _rewrite(self, node, owner: str) -> None:
+        """Post-order обход тела owner: константные аргументы вызовов
+        (после свёртки детей) — в клон, место вызова переписывается."""
+        if not isinstance(node, ast.Node):
+            return
+        for _, child in _children(node):
+            if isinstance(child, ast.Node):
+                self._rewrite(child, owner)
+            elif isinstance(child, list):
+                for c in child:
+                    if isinstance(c, tuple):
+                        for x in c:
+                            self._rewrite(x, owner)
+                    else:
+                        self._rewrite(c, owner)
+        if not isinstance(node, ast.Call):
+            return
+        func = self._candidate(node)
+        if func is None:
+            return
+        sig = self.checker.funcs[node.name]
+        consts = []
+        for i, arg in enumerate(node.args):
+            if not isinstance(sig.params[i][1], (IntType, BoolType)):
+                continue
+            value = self.ct._constexpr_of(arg)
+            if value is not None:
+                consts.append((i, value))
+        if not consts:
+            return
+        clone = self._clone(func, tuple(consts))
+        if clone is None:
+            return
+        fixed = {i for i, _ in consts}
+        node.name = clone
+        node.args = [a for i, a in enumerate(node.args) if i not in fixed]
+        self.checker.edges.add((owner, clone))
+        self.ct.graph.setdefault(owner, set()).add(clone)
+        self.sites += 1
+
+    def run(self) -> tuple[int, int]:
+        """Специализировать все тела; клоны обрабатываются той же
+        очередью (каскад), затем свёртка яруса B внутри клонов.
+        Возвращает (число клонов, переписанных мест вызова)."""
+        work: list = []
+        for decl in self.program.decls:
+            if isinstance(decl, ast.FuncDecl) and decl.body is not None:
+                work.append((decl.name, decl))
+            elif isinstance(decl, ast.StructDecl):
+                for m in decl.methods:
+                    work.append((f"{decl.name}.{m.name}", m))
+        i = 0
+        while i < len(work):
+            key, func = work[i]
+            i += 1
+            # свёртка до переписывания: вызов с ВСЕМИ константными
+            # аргументами уходит в литерал (ярус B), клон не нужен
+            self._fold(func)
+            start = len(self.new_decls)
+            self._rewrite(func.body, key)
+            for clone in self.new_decls[start:]:
+                work.append((clone.name, clone))
+        # клоны — после оригиналов в порядке создания: детерминированный
+        # порядок функций в модуле
+        self.program.decls.extend(self.new_decls)
+        return len(self.new_decls), self.sites
+
+    def _fold(self, func: ast.FuncDecl) -> None:
+        """Свёртка яруса B в теле клона: подставленные литералы делают
+        вызовы внутри тела константными. Оригиналы сворачивает
+        `--fold` (fold_calls) — здесь только клоны."""
+        if getattr(func, "spec_of", None) is not None:
+            self.ct._fold_node(func.body)
+
+
+def specialize_calls(program: ast.Program, checker, filename: str):
+    """Специализация вызовов с частично константными аргументами
+    (build-путь, `eatc build --spec`). Вызывается после типизации и
+    `--fold`, до verify. Возвращает (клонов, переписанных вызовов)."""
+    return Specializer(program, checker, filename).run()
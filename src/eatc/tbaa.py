@@ -0,0 +1,177 @@
+"""TBAA-метаданные сборки (`eatc build`; `--no-tbaa` — без них).
+
+Load/store целого получает тег struct-path TBAA `(база, доступ,
+смещение)`. База — самый внешний агрегат, до которого доступ дошёл
+цепочкой GEP по полям структур от корня (alloca, аргумент, глобал);
+шаг в элемент массива сбрасывает базу на тип элемента со смещением 0 —
+индекс массива в теге не выразить. Узлы типов: скаляр — по LLVM-типу
+(`i8`, `i32`, …) под общим корнем; структура — по тексту LLVM-типа
+(одинаково разложенные структуры языка делят узел — консервативно),
+члены — скаляры и вложенные структуры со смещениями; массивы в члены
+не идут (доступ через них уже сброшен на элемент).
+
+Так разные поля одной структуры и поля разных структур не алиасят, а
+поле, адрес которого ушёл аргументом (`T*` внутри `S`), — алиасит: LLVM
+находит T среди членов S по смещению. Корректность опирается на
+отсутствие каламбура типов в эмиссии: байт памяти читается и пишется
+одним LLVM-типом (enum с нагрузкой — слот на вариант, не union;
+bitcast — только у константных str-глобалов и операндов memcpy;
+memcpy тегов не несёт и алиасит всё). Смещения — своей естественной
+раскладкой: теги сравниваются только между собой, с DataLayout модуля
+не сверяются.
+
+Канон тегов не несёт: `eatc ir` их не строит, с текста сборки их
+снимает strip_tbaa (.ll рядом с бинарником — тот же, что без TBAA).
+"""
+
+import re
+
+from . import irtext as ir
+
+_I64 = ir.IntType(64)
+_TAG = re.compile(r", !tbaa !\d+$", re.M)
+
+
+def _layout(typ) -> tuple[int, int]:
+    """(размер, выравнивание) в байтах: целые — степень двойки (до 8
+    по выравниванию), указатели — 8, агрегаты — по членам."""
+    if isinstance(typ, ir.IntType):
+        size = 1
+        while size * 8 < typ.width:
+            size *= 2
+        return size, min(size, 8)
+    if isinstance(typ, ir.ArrayType):
+        size, align = _layout(typ.element)
+        return size * typ.count, align
+    if isinstance(typ, ir.LiteralStructType):
+        size, align = 0, 1
+        for e in typ.elements:
+            esize, ealign = _layout(e)
+            size = -(-size // ealign) * ealign + esize
+            align = max(align, ealign)
+        return -(-size // align) * align, align
+    return 8, 8
+
+
+def _zero(v) -> bool:
+    return isinstance(v, ir.Constant) and v.constant == 0
+
+
+def strip_tbaa(text: str) -> str:
+    """Текст модуля без вложений !tbaa и узлов метаданных (узлы —
+    хвост модуля, за последним глобалом)."""
+    end = text.find("\n!0 = ")
+    if end >= 0:
+        text = text[:end]
+    return _TAG.sub("", text)
+
+
+class Tbaa:
+    """Узлы типов модуля и пути GEP текущей функции."""
+
+    def __init__(self, module: ir.Module):
+        self.module = module
+        self.root = module.add_metadata(["eatlang tbaa"])
+        self.nodes: dict[str, ir.MDValue | None] = {}
+        self.offsets: dict[str, list[int]] = {}
+        self.tags: dict[tuple, ir.MDValue] = {}
+        # GEP -> (база, смещение), если доступ ушёл в поле структуры
+        self.paths: dict = {}
+        self.tagged = 0
+
+    def builder(self, block) -> "Builder":
+        """Builder тела новой функции: пути прошлой забываются."""
+        self.paths = {}
+        return Builder(self, block)
+
+    def field_offsets(self, typ) -> list[int]:
+        key = str(typ)
+        offs = self.offsets.get(key)
+        if offs is None:
+            offs, size = [], 0
+            for e in typ.elements:
+                esize, ealign = _layout(e)
+                size = -(-size // ealign) * ealign
+                offs.append(size)
+                size += esize
+            self.offsets[key] = offs
+        return offs
+
+    def node(self, typ) -> ir.MDValue | None:
+        """Узел типа; None — у структуры нет членов-скаляров вне
+        массивов (доступов с такой базой не бывает)."""
+        key = str(typ)
+        if key in self.nodes:
+            return self.nodes[key]
+        if isinstance(typ, ir.IntType):
+            md = self.module.add_metadata([key, self.root, _I64(0)])
+        else:
+            ops: list = [key]
+            for e, off in zip(typ.elements, self.field_offsets(typ)):
+                if isinstance(e, (ir.IntType, ir.LiteralStructType)):
+                    sub = self.node(e)
+                    if sub is not None:
+                        ops += [sub, _I64(off)]
+            md = self.module.add_metadata(ops) if len(ops) > 1 else None
+        self.nodes[key] = md
+        return md
+
+    def step(self, gep, ptr, indices) -> None:
+        """Путь GEP: база и смещение от пути ptr (ненулевой первый
+        индекс — соседний объект, путь начинается заново)."""
+        typ = ptr.type.pointee
+        path = self.paths.get(ptr)
+        if path is None or not _zero(indices[0]):
+            base, off, inner = typ, 0, False
+        else:
+            (base, off), inner = path, True
+        for i in indices[1:]:
+            if isinstance(typ, ir.ArrayType):
+                typ = typ.element
+                base, off, inner = typ, 0, False
+            else:
+                off += self.field_offsets(typ)[i.constant]
+                typ = typ.elements[i.constant]
+                inner = True
+        if inner:
+            self.paths[gep] = (base, off)
+
+    def tag(self, instr, ptr, typ) -> None:
+        if not isinstance(typ, ir.IntType):
+            return
+        base, off = self.paths.get(ptr, (typ, 0))
+        key = (str(base), str(typ), off)
+        md = self.tags.get(key)
+        if md is None:
+            access = self.node(typ)
+            base_node = self.node(base) or access
+            if base_node is access:
+                off = 0
+            md = self.module.add_metadata([base_node, access, _I64(off)])
+            self.tags[key] = md
+        instr.set_metadata("tbaa", md)
+        self.tagged += 1
+
+
+class Builder(ir.IRBuilder):
+    """IRBuilder тела функции: GEP запоминает путь, load/store целого
+    получают тег."""
+
+    def __init__(self, tbaa: Tbaa, block):
+        super().__init__(block)
+        self.tbaa = tbaa
+
+    def gep(self, ptr, indices, inbounds=False, name=""):
+        instr = super().gep(ptr, indices, inbounds=inbounds, name=name)
+        self.tbaa.step(instr, ptr, indices)
+        return instr
+
+    def load(self, ptr, name=""):
+        instr = super().load(ptr, name=name)
+        self.tbaa.tag(instr, ptr, instr.type)
+        return instr
+
+    def store(self, value, ptr):
+        instr = super().store(value, ptr)
+        self.tbaa.tag(instr, ptr, value.type)
+        return instr
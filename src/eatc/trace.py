@@ -0,0 +1,202 @@
+"""Трасса аксиом ОС: запись и воспроизведение (`eatc run --record FILE`
+/ `--replay FILE`; у бинарника — EAT_RECORD=FILE / EAT_REPLAY=FILE).
+
+Записываются результаты недетерминированных аксиом: ввод (read_byte,
+in_avail), часы (ticks), argv (arg_count/arg_len/arg_byte) и сокеты.
+Событие — строка `имя [аргументы] = результат`; результат — сырое
+значение шима runtime.c (read_byte: байт или -1; socket_read_byte:
+байт, 256 — Eof, 257 — Fail; socket_listen: fd или -1), поэтому
+трассу интерпретатора воспроизводит бинарник и наоборот. Аргументы
+(fd, индексы, длина записи) — для сверки: первое событие, на котором
+вызов разошёлся с трассой, — trap с его номером (бисекция
+расхождения интерпретатор/бинарник). При воспроизведении ОС не
+трогается: stdin не читается, часы и сеть — из трассы; байты
+socket_write_span уходят в stdout, как в режиме транскрипта EAT_NET.
+read_span пишет прочитанное после результата: `read_span MAX = n
+HEX` (socket_read_span — `socket_read_span FD MAX = n HEX`, сентинелы
+65537 — Eof, 65538 — Fail); под записью он читает не больше SPAN_CAP
+байт (число байт span-чтения программе не обещано — строка трассы
+остаётся короткой).
+"""
+
+from .interpreter import EnumValue, Tagged, _READ_EOF, _READ_OK
+
+HEADER = "# eat trace 1"
+SPAN_CAP = 32  # == EAT_TRACE_SPAN runtime.c
+
+# аксиомы под трассой
+TRACED = frozenset({
+    "read_byte", "read_span", "in_avail", "ticks",
+    "arg_count", "arg_len", "arg_byte",
+    "socket_listen", "socket_accept", "socket_avail",
+    "socket_read_byte", "socket_write_span", "socket_close",
+    "socket_wait", "socket_read_span",
+})
+
+_ERR_RAW = {"Eof": 256, "Fail": 257}
+_SPAN_ERR_RAW = {"Eof": 65537, "Fail": 65538}
+# span-чтения: индекс массива-приёмника в аргументах (за ним off, max)
+_SPANS = {"read_span": 0, "socket_read_span": 1}
+
+
+def _event_args(name: str, args: list) -> tuple:
+    """Аргументы события: числа вызова (у socket_write_span — fd и
+    длина, содержимое массива не пишется)."""
+    if name == "socket_write_span":
+        return (args[0], args[3])
+    if name == "read_span":
+        return (args[2],)
+    if name == "socket_read_span":
+        return (args[0], args[3])
+    return tuple(args)
+
+
+def to_raw(name: str, value) -> int:
+    if name in ("read_byte", "read_span"):
+        return value.payload if value.tag == "Ok" else -1
+    if name == "socket_read_byte":
+        if value.tag == "Ok":
+            return value.payload
+        return _ERR_RAW[value.payload.variant]
+    if name == "socket_read_span":
+        if value.tag == "Ok":
+            return value.payload
+        return _SPAN_ERR_RAW[value.payload.variant]
+    if name == "socket_listen":
+        return value.payload if value.tag == "Ok" else -1
+    if value is None:
+        return 0
+    return value
+
+
+def from_raw(name: str, raw: int):
+    if name == "read_byte":
+        return _READ_EOF if raw < 0 else _READ_OK[raw]
+    if name == "socket_read_byte":
+        if raw < 256:
+            return Tagged("Ok", raw)
+        variant = "Eof" if raw == 256 else "Fail"
+        return Tagged("Err", EnumValue("IoError", variant))
+    if name == "read_span":
+        return _READ_EOF if raw < 0 else Tagged("Ok", raw)
+    if name == "socket_read_span":
+        if raw <= 65536:
+            return Tagged("Ok", raw)
+        variant = "Eof" if raw == 65537 else "Fail"
+        return Tagged("Err", EnumValue("IoError", variant))
+    if name == "socket_listen":
+        if raw < 0:
+            return Tagged("Err", EnumValue("IoError", "Fail"))
+        return Tagged("Ok", raw)
+    if name == "socket_close":
+        return None
+    return raw
+
+
+def _fmt(name: str, args: tuple) -> str:
+    return " ".join([name] + [str(a) for a in args])
+
+
+class _Trace:
+    # test-блоки бинарник не исполняет: трасса взводится после
+    # run_tests, до того аксиомы идут в ОС мимо неё
+    armed = False
+
+    def attach(self, interp) -> None:
+        """Аксиомы TRACED экземпляра — через трассу: копия таблицы
+        _AXIOMS на экземпляре (все движки берут аксиомы оттуда)."""
+        interp._AXIOMS = {
+            name: self.wrap(name, fn) if name in TRACED else fn
+            for name, fn in type(interp)._AXIOMS.items()
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class Recorder(_Trace):
+    def __init__(self, path: str):
+        self.f = open(path, "w", encoding="ascii")
+        self.f.write(HEADER + "\n")
+
+    def wrap(self, name: str, fn):
+        write = self.f.write
+
+        def axiom(it, node, args):
+            if not self.armed:
+                return fn(it, node, args)
+            call = _fmt(name, _event_args(name, args))
+            if name in _SPANS:
+                k = _SPANS[name]
+                obj, off, mx = args[k:k + 3]
+                if off + mx > len(obj):
+                    # граница — по запрошенному max, не по урезанному
+                    raise it.trap(node, f"{name} вне границ массива")
+                capped = list(args)
+                capped[k + 2] = min(mx, SPAN_CAP)
+                value = fn(it, node, capped)
+                raw = to_raw(name, value)
+                n = value.payload if value.tag == "Ok" else 0
+                data = bytes(obj.data[off:off + n])
+                tail = f" {data.hex()}" if data else ""
+                write(f"{call} = {raw}{tail}\n")
+                return value
+            value = fn(it, node, args)
+            write(f"{call} = {to_raw(name, value)}\n")
+            return value
+        return axiom
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class Replayer(_Trace):
+    def __init__(self, path: str):
+        self.events: list = []
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                call, _, raw = line.partition(" = ")
+                name, *args = call.split()
+                raw, _, data = raw.partition(" ")
+                self.events.append((
+                    name, tuple(int(a) for a in args), int(raw),
+                    bytes.fromhex(data),
+                ))
+        self.n = 0
+
+    def wrap(self, name: str, fn):
+        def axiom(it, node, args):
+            if not self.armed:
+                return fn(it, node, args)
+            call = (name, _event_args(name, args))
+            if self.n >= len(self.events):
+                raise it.trap(
+                    node,
+                    f"replay: трасса исчерпана на событии {self.n + 1} "
+                    f"(вызов `{_fmt(*call)}`)",
+                )
+            event = self.events[self.n]
+            if event[:2] != call:
+                raise it.trap(
+                    node,
+                    f"replay: расхождение на событии {self.n + 1}: "
+                    f"в трассе `{_fmt(*event[:2])}`, вызов `{_fmt(*call)}`",
+                )
+            self.n += 1
+            if name == "socket_write_span":
+                _, obj, off, ln = args
+                if off + ln > len(obj):
+                    raise it.trap(node, "socket_write_span вне границ массива")
+                it.stdio.write(bytes(obj.data[off:off + ln]))
+            if name in _SPANS:
+                k = _SPANS[name]
+                obj, off, mx = args[k:k + 3]
+                if off + mx > len(obj):
+                    raise it.trap(node, f"{name} вне границ массива")
+                data = event[3][:mx]
+                obj.mut()[off:off + len(data)] = data
+            return from_raw(name, event[2])
+        return axiom
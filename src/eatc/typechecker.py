@@ -119,6 +119,13 @@ BUILTINS = {
         [("a", ArrayType(U8, 0)), ("off", U32), ("len", U32)],
         None,
     ),
+    # read_span: батч-ввод в массив (курсор stdin общий с read_byte);
+    # проверка — _read_span (массив — изменяемое lvalue)
+    "read_span": FuncSig(
+        "read_span",
+        [("a", ArrayType(U8, 0)), ("off", U32), ("max", U32)],
+        ResultType(U32, EnumType("IoError")),
+    ),
     "write_err_byte": FuncSig("write_err_byte", [("b", U8)], None),
     "exit": FuncSig("exit", [("code", U32)], None),
     # аргументы командной строки (argv без имени программы): байтовые
@@ -144,7 +151,19 @@ BUILTINS = {
     "socket_read_byte": FuncSig(
         "socket_read_byte", [("fd", U32)], ResultType(U8, EnumType("IoError"))
     ),
+    # пакетное чтение соединения в массив — спецпуть _socket_read_span
+    # (массив — изменяемое lvalue, как у read_span)
+    "socket_read_span": FuncSig(
+        "socket_read_span",
+        [("fd", U32), ("a", ArrayType(U8, 0)), ("off", U32), ("max", U32)],
+        ResultType(U32, EnumType("IoError")),
+    ),
     "socket_close": FuncSig("socket_close", [("fd", U32)], None),
+    # ожидание готовности (epoll): fd — слушатель (он и его соединения)
+    # или одно соединение; сентинел NO_CONN — таймаут
+    "socket_wait": FuncSig(
+        "socket_wait", [("fd", U32), ("timeout_ms", U32)], U32
+    ),
 }
 
 _FORMATTABLE = (IntType, BoolType, CharType, StrType)
@@ -1415,6 +1434,10 @@ class TypeChecker:
             return self._write_span(node)
         if node.name == "socket_write_span":
             return self._socket_write_span(node)
+        if node.name == "read_span":
+            return self._read_span(node)
+        if node.name == "socket_read_span":
+            return self._socket_read_span(node)
         if node.name == "exit":
             # завершение процесса: только из main (как loop) и один раз
             if self.current_key != "main":
@@ -1500,6 +1523,60 @@ class TypeChecker:
         node.arr_size = arr.size  # для кодогенерации: проверка границ
         return VOID
 
+    def _read_span(self, node: ast.Call) -> Type:
+        """read_span(a, off, max) -> Result<u32, IoError>: до max байт
+        stdin в a[off..); Ok(n) — прочитано n (0 < n <= max, при max
+        = 0 — Ok(0)), Err(Eof) — поток кончился. Границы — как у
+        write_span; аксиома ПИШЕТ в массив — он изменяемое lvalue."""
+        if len(node.args) != 3:
+            raise self.err(node, "read_span(): ровно три аргумента")
+        arr = self.expr(node.args[0])
+        if not (isinstance(arr, ArrayType) and arr.elem == U8):
+            raise self.err(
+                node,
+                "read_span() читает в массив u8, "
+                f"не в {show(arr)}",
+            )
+        self._check_mutable_array(node, node.args[0])
+        for i in (1, 2):
+            t = self.expr(node.args[i], expected=U32)
+            if t != U32:
+                raise self.err(
+                    node,
+                    f"read_span(): смещение и длина — u32, не {show(t)}",
+                )
+        node.arr_size = arr.size  # для кодогенерации: проверка границ
+        return ResultType(U32, EnumType("IoError"))
+
+    def _check_mutable_array(self, node: ast.Call, target) -> None:
+        """Массив-приёмник аксиомы (read_span, socket_read_span) —
+        изменяемое lvalue: let-переменная, её поле/элемент или поле
+        let self."""
+        base = target
+        while isinstance(base, (ast.FieldAccess, ast.Index)):
+            base = base.obj
+        if isinstance(base, ast.SelfExpr):
+            sinfo = self.lookup(base, "self")
+            if sinfo is not None and sinfo.mutable:
+                return
+            raise self.err(
+                node, f"{node.name}() пишет в поле немутирующего метода"
+            )
+        if isinstance(base, ast.Name):
+            info = self.lookup(base, base.ident)
+            if info is not None and info.mutable:
+                return
+            raise self.err(
+                node,
+                f"{node.name}() пишет в массив, а {base.ident} — const "
+                "(неизменяем)",
+            )
+        raise self.err(
+            node,
+            f"{node.name}() пишет в массив: приёмник обязан быть "
+            "изменяемой переменной, а не временным значением",
+        )
+
     def _socket_write_span(self, node: ast.Call) -> Type:
         """socket_write_span(fd, a, off, len) -> u32: батч-вывод в
         соединение (HTTP_PLAN §5); размер массива — свободный параметр,
@@ -1532,6 +1609,40 @@ class TypeChecker:
         node.arr_size = arr.size  # для кодогенерации: проверка границ
         return U32
 
+    def _socket_read_span(self, node: ast.Call) -> Type:
+        """socket_read_span(fd, a, off, max) -> Result<u32, IoError>:
+        до max готовых байт соединения в a[off..) (HTTP_PLAN §5); Ok(n)
+        — как у read_span, Err(Eof) — пир закрыл, данных нет. Границы
+        — как у socket_write_span; приёмник — изменяемое lvalue."""
+        if len(node.args) != 4:
+            raise self.err(
+                node, "socket_read_span(): ровно четыре аргумента"
+            )
+        t0 = self.expr(node.args[0], expected=U32)
+        if t0 != U32:
+            raise self.err(
+                node,
+                f"socket_read_span(): дескриптор — u32, не {show(t0)}",
+            )
+        arr = self.expr(node.args[1])
+        if not (isinstance(arr, ArrayType) and arr.elem == U8):
+            raise self.err(
+                node,
+                "socket_read_span() читает в массив u8, "
+                f"не в {show(arr)}",
+            )
+        self._check_mutable_array(node, node.args[1])
+        for i in (2, 3):
+            t = self.expr(node.args[i], expected=U32)
+            if t != U32:
+                raise self.err(
+                    node,
+                    "socket_read_span(): смещение и длина — u32, "
+                    f"не {show(t)}",
+                )
+        node.arr_size = arr.size  # для кодогенерации: проверка границ
+        return ResultType(U32, EnumType("IoError"))
+
     def _len(self, node: ast.Call) -> Type:
         if len(node.args) != 1:
             raise self.err(node, "len(): ровно один аргумент")
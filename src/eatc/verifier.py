@@ -310,6 +310,7 @@ class Verifier:
         self.req_sites: dict[str, list] = {}  # key -> [proven, total]
         # (kind, id(node)) -> [bool, node] c AND-слиянием повторных оценок
         self.checks: dict[tuple, list] = {}
+        self.owners: dict[tuple, str] = {}  # (вид, id узла) -> функция
         self.cur_func: ast.FuncDecl | None = None
         self.cur_sig = None
         self.cur_module = 0  # модуль анализируемой функции (SPARK-граница)
@@ -348,7 +349,7 @@ class Verifier:
 
     # --- отметки и статистика ---------------------------------------------
 
-    def _mark(self, kind: str, node, ok: bool) -> None:
+    def _mark(self, kind: str, node, ok: bool, owner: str = "") -> None:
         if self._probe:
             return
         key = (kind, id(node))
@@ -356,6 +357,9 @@ class Verifier:
             self.checks[key][0] = self.checks[key][0] and ok
         else:
             self.checks[key] = [ok, node]
+            # функция проверки (отчёт build --report=json); requires —
+            # проверка в прологе вызываемой, её ключ передаёт вызов
+            self.owners[key] = owner or self.cur_fn_key
         attr = {
             "overflow": "no_overflow",
             "div": "div_safe",
@@ -374,7 +378,20 @@ class Verifier:
             entry[0] += 1 if ok else 0
         proven = sum(v[0] for v in by_kind.values())
         total = sum(v[1] for v in by_kind.values())
-        return {"proven": proven, "total": total, "by_kind": by_kind}
+        # по функциям: ключ -> вид -> [доказано, всего]; test-блоки
+        # (":test:…") в бинарник не идут
+        by_func: dict[str, dict] = {}
+        for key, (ok, _node) in self.checks.items():
+            owner = self.owners[key]
+            if owner.startswith(":test:"):
+                continue
+            entry = by_func.setdefault(owner, {}).setdefault(key[0], [0, 0])
+            entry[1] += 1
+            entry[0] += 1 if ok else 0
+        return {
+            "proven": proven, "total": total, "by_kind": by_kind,
+            "by_func": by_func,
+        }
 
     # --- запуск --------------------------------------------------------------
 
@@ -402,6 +419,7 @@ class Verifier:
 
     def _begin_pass(self) -> None:
         self.checks = {}
+        self.owners = {}
         self.req_sites = {}
         self.summaries = {}
         self._ps_acc = {}
@@ -495,7 +513,7 @@ class Verifier:
             )
             ok = no_calls and (tautology or (total > 0 and proven == total))
             func.requires_proven = ok
-            self._mark("requires", func, ok)
+            self._mark("requires", func, ok, key)
 
     def _module_of(self, key: str) -> int:
         """Модуль-владелец функции/метода по ключу графа вызовов
@@ -2281,9 +2299,18 @@ class Verifier:
             if annotate:
                 self._mark("bounds", node, False)
             return self._ty_range(node.ty)
-        if name == "write_span":
+        if name in ("write_span", "read_span"):
             # граница вызова: off + len <= N — то же обязательство
-            # bounds, что у индексации (codegen: node.in_bounds)
+            # bounds, что у индексации (codegen: node.in_bounds).
+            # read_span пишет в массив произвольные u8: элементы пула
+            # получают полный интервал типа
+            if name == "read_span":
+                self._note_pool(
+                    self._pool_key(
+                        node.args[0], self.cur_fn_key, self.cur_struct
+                    ),
+                    (0, 255),
+                )
             off = self._iv(node.args[1], env, annotate=False)
             ln = self._iv(node.args[2], env, annotate=False)
             if annotate:
@@ -2298,6 +2325,15 @@ class Verifier:
                 )
                 self._mark("bounds", node, ok)
             return None
+        if name == "socket_read_span":
+            # пишет в массив произвольные u8, как read_span; граница
+            # вызова верификатором не сопровождается — проверка всегда
+            # в рантайме (как socket_write_span)
+            self._note_pool(
+                self._pool_key(node.args[1], self.cur_fn_key, self.cur_struct),
+                (0, 255),
+            )
+            return None
         if name in self.checker.funcs:
             func, _ = self._func_by_key(name)
             sig = self.checker.funcs[name]
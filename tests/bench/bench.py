@@ -4,7 +4,8 @@
   pipeline — скорость стадий eatc (lex/parse/typed/ir) на синтетических
              модулях ступенчатых размеров + многомодульный фронтенд;
   runtime  — бенчмарк-программы tests/bench/programs/: интерпретатор
-             против нативного бинарника, дифференциальная сверка вывода;
+             против нативного бинарника, дифференциальная сверка вывода,
+             колонка PGO (`build --pgo-train` на том же stdin);
   stress   — входы на лимитах SPEC.md §6 и за ними: принять или быстро
              упасть с внятной ошибкой, без зависаний;
   selfhost — self-hosted лексер/парсер (нативные бинарники) против
@@ -26,6 +27,7 @@
 import argparse
 import os
 import re
+import shutil
 import subprocess
 import sys
 import time
@@ -42,6 +44,7 @@ sys.path.insert(0, str(SRC))
 
 import genprog  # noqa: E402
 from eatc.lexer import Lexer  # noqa: E402
+from eatc.pgo import profdata_tool  # noqa: E402
 
 ENV = {**os.environ, "PYTHONPATH": str(SRC)}
 STRESS_TIMEOUT = 60  # секунд: дольше — считаем зависанием
@@ -89,7 +92,8 @@ RUNTIME_PROGRAMS = [
 ]
 RUNTIME_QUICK = {"ArithBench", "StrBench", "TrapBench"}
 
-# ReadBench — отдельный контур: нагрузку задаёт размер stdin, а не REPEAT.
+# ReadBench/ReadSpanBench — отдельный контур: нагрузку задаёт размер stdin,
+# а не REPEAT.
 # Базовый вход читает и интерпретатор; нативный замер — на входе x множитель.
 READ_BASE_BYTES = 256 * 1024
 READ_MULT_FULL, READ_MULT_QUICK = 256, 32
@@ -123,7 +127,7 @@ class Res:
 
 
 def run_timed(cmd, *, stdin_path=None, capture=False, stdout_path=None,
-              repeats=1) -> Res:
+              repeats=1, env=None) -> Res:
     """Минимум wall-time по repeats прогонам; RSS ребёнка через wait4."""
     best, rss, rc, out, err = None, 0.0, 0, b"", b""
     for _ in range(repeats):
@@ -136,7 +140,8 @@ def run_timed(cmd, *, stdin_path=None, capture=False, stdout_path=None,
             fout = subprocess.DEVNULL
         t0 = time.perf_counter()
         p = subprocess.Popen(cmd, stdin=fin, stdout=fout,
-                             stderr=subprocess.PIPE, cwd=ROOT, env=ENV)
+                             stderr=subprocess.PIPE, cwd=ROOT,
+                             env=env or ENV)
         if capture:
             out = p.stdout.read()
         err = p.stderr.read()
@@ -331,6 +336,10 @@ def bench_runtime(quick: bool):
 
         i_rate = base_ops / interp.secs
         n_rate = base_ops * rep / nat.secs
+        pgo = bench_pgo(name, [*head, *libs, str(xl_src)], os.devnull,
+                        os.devnull, base_ops * rep, n_rate)
+        elide = bench_elide(name, [*head, *libs, str(xl_src)], os.devnull,
+                            base_ops * rep, n_rate)
         rows.append([
             name,
             f"{base_ops / 1e6:.2f}M оп",
@@ -340,51 +349,129 @@ def bench_runtime(quick: bool):
             f"{fmt_s(nat.secs)} (x{rep})",
             fmt_rate(n_rate),
             f"x{n_rate / i_rate:,.0f}".replace(",", " "),
+            pgo,
+            elide,
             "да" if same else "НЕТ",
         ])
     bench_read(quick, rows)
     table(["программа", "порция", "интерп", "интерп оп/с", "сборка",
-           "бинарник", "бинарник оп/с", "ускорение", "вывод =="], rows)
+           "бинарник", "бинарник оп/с", "ускорение", "PGO оп/с",
+           "--elide оп/с", "вывод =="], rows)
+    bench_build()
+
+
+def bench_pgo(name, args, train_in, run_in, ops, n_rate) -> str:
+    """Колонка PGO: `build --pgo-train` (тренировка на train_in), замер
+    на run_in как у обычного бинарника; вывод — оп/с и выигрыш к
+    бинарнику без профиля. Без clang/llvm-profdata — "-"."""
+    if not shutil.which("clang") or profdata_tool() is None:
+        return "-"
+    bin_pgo = OUT / f"{name}PGO"
+    build = run_timed(eatc("build", *args, "--pgo-train", train_in,
+                           "-o", str(bin_pgo)))
+    if build.rc != 0:
+        fail(f"runtime {name} PGO build: {errtail(build.err)}")
+        return "-"
+    nat = run_timed([str(bin_pgo)], stdin_path=run_in, repeats=3)
+    if nat.rc != 0:
+        fail(f"runtime {name} PGO: rc={nat.rc} {errtail(nat.err)}")
+        return "-"
+    rate = ops / nat.secs
+    return f"{fmt_rate(rate)} (x{rate / n_rate:.2f})"
+
+
+def bench_elide(name, args, run_in, ops, n_rate) -> str:
+    """Колонка --elide: бинарник с элизией копий агрегатов, замер на
+    run_in; оп/с и выигрыш к обычной сборке."""
+    bin_el = OUT / f"{name}Elide"
+    build = run_timed(eatc("build", *args, "--elide", "-o", str(bin_el)))
+    if build.rc != 0:
+        fail(f"runtime {name} --elide build: {errtail(build.err)}")
+        return "-"
+    nat = run_timed([str(bin_el)], stdin_path=run_in, repeats=3)
+    if nat.rc != 0:
+        fail(f"runtime {name} --elide: rc={nat.rc} {errtail(nat.err)}")
+        return "-"
+    rate = ops / nat.secs
+    return f"{fmt_rate(rate)} (x{rate / n_rate:.2f})"
+
+
+def bench_build():
+    """Wall-time `eatc build` с холодным и тёплым кэшем рантайма
+    (runtime.c собран заранее, codegen.runtime_object): разница —
+    налог компиляции шима, который кэш снимает с каждой сборки."""
+    src = PROGRAMS / "ArithBench.eat"
+    cache_root = OUT / "build_cache"
+    rows = []
+    for release in (False, True):
+        flags = ["--release"] if release else []
+        # первый прогон — на пустом кэше, второй — на заполненном
+        for f in cache_root.glob("runtime/*"):
+            f.unlink()
+        times = []
+        for _ in range(2):
+            r = run_timed(eatc("build", *flags, str(RT), str(src), "-o",
+                               str(OUT / "BuildBench")),
+                          env={**ENV, "EAT_CACHE": str(cache_root)})
+            if r.rc != 0:
+                fail(f"build {' '.join(flags)}: {errtail(r.err)}")
+                return
+            times.append(r.secs)
+        cold, warm = times
+        rows.append(["ArithBench" + (" --release" if release else ""),
+                     fmt_s(cold), fmt_s(warm), fmt_s(cold - warm)])
+    table(["сборка", "холодный кэш", "тёплый кэш", "шим runtime.c"], rows)
 
 
 def bench_read(quick: bool, rows: list):
-    """ReadBench: путь ввода (read_byte/Result). Нагрузка — размер stdin."""
-    src = PROGRAMS / "ReadBench.eat"
+    """ReadBench (read_byte/Result) и ReadSpanBench (read_span кусками):
+    путь ввода. Нагрузка — размер stdin; вывод обоих одинаков."""
     base_in = OUT / "read_in_base.bin"
     if not base_in.exists() or base_in.stat().st_size != READ_BASE_BYTES:
         gen_read_input(base_in, READ_BASE_BYTES)
+    mult = READ_MULT_QUICK if quick else READ_MULT_FULL
+    xl_in = OUT / "read_in_xl.bin"
+    xl_size = READ_BASE_BYTES * mult
+    if not xl_in.exists() or xl_in.stat().st_size != xl_size:
+        gen_read_input(xl_in, xl_size)
+    for name in ("ReadBench", "ReadSpanBench"):
+        bench_read_one(name, base_in, xl_in, mult, rows)
+
 
+def bench_read_one(name: str, base_in, xl_in, mult: int, rows: list):
+    src = PROGRAMS / f"{name}.eat"
     interp = run_timed(eatc("run", str(RT), str(src)),
                        stdin_path=str(base_in), capture=True)
     if interp.rc != 0:
-        fail(f"runtime ReadBench interp: {errtail(interp.err)}")
+        fail(f"runtime {name} interp: {errtail(interp.err)}")
         return
-    bin_path = OUT / "ReadBench"
+    bin_path = OUT / name
     build = run_timed(eatc("build", str(RT), str(src), "-o", str(bin_path)))
     if build.rc != 0:
-        fail(f"runtime ReadBench build: {errtail(build.err)}")
+        fail(f"runtime {name} build: {errtail(build.err)}")
         return
     nat_base = run_timed([str(bin_path)], stdin_path=str(base_in),
                          capture=True, repeats=3)
     same = nat_base.out == interp.out
     if not same:
-        fail(f"runtime ReadBench: вывод расходится: "
+        fail(f"runtime {name}: вывод расходится: "
              f"{interp.out!r} != {nat_base.out!r}")
 
-    mult = READ_MULT_QUICK if quick else READ_MULT_FULL
-    xl_in = OUT / "read_in_xl.bin"
     xl_size = READ_BASE_BYTES * mult
-    if not xl_in.exists() or xl_in.stat().st_size != xl_size:
-        gen_read_input(xl_in, xl_size)
     nat = run_timed([str(bin_path)], stdin_path=str(xl_in), repeats=3)
     if nat.rc != 0:
-        fail(f"runtime ReadBench XL: rc={nat.rc} {errtail(nat.err)}")
+        fail(f"runtime {name} XL: rc={nat.rc} {errtail(nat.err)}")
         return
 
     i_rate = READ_BASE_BYTES / interp.secs
     n_rate = xl_size / nat.secs
+    # тренировка — на базовом входе, замер — на XL, как у бинарника
+    pgo = bench_pgo(name, [str(RT), str(src)], str(base_in),
+                    str(xl_in), xl_size, n_rate)
+    elide = bench_elide(name, [str(RT), str(src)], str(xl_in),
+                        xl_size, n_rate)
     rows.append([
-        "ReadBench",
+        name,
         f"{READ_BASE_BYTES / 1e6:.2f}M байт",
         fmt_s(interp.secs),
         fmt_rate(i_rate),
@@ -392,6 +479,8 @@ def bench_read(quick: bool, rows: list):
         f"{fmt_s(nat.secs)} (вход x{mult})",
         fmt_rate(n_rate),
         f"x{n_rate / i_rate:,.0f}".replace(",", " "),
+        pgo,
+        elide,
         "да" if same else "НЕТ",
     ])
 
@@ -1,31 +1,21 @@
-"""Эксперимент §8.3 OPTIMIZATIONS_PLAN: alias-инфа в эмиссии —
-TBAA-метаданные пост-проходом по llvmlite-модулю, строго build-only
-слоем ВНЕ канона (src/eatc не тронут ни байтом: патчится
-Codegen.generate в памяти этого процесса; `eatc ir`, гейты и
-фикспойнт не видят эксперимента).
-
-Гипотеза (дозамер 7.2, FINDINGS «HTTP-парсер»): разрыв EAT/C = 1,35
-живёт в самом эмитируемом IR — без alias-инфы ни мид-энд llvmlite,
-ни clang не промотируют поля 8,5-КБ Req через побайтовый цикл:
-store в raw[i] (индекс переменный) может алиасить n/state/ls.
-
-Схема тегов — скалярный TBAA: узел на идентичность (тип корня GEP,
-путь: поле структуры — индексом, шаг массива — общий "[]", т.е. все
-элементы одного массива делят узел). Тег ставится только на
-load/store, чей указатель — цепочка GEP с первым индексом 0 и
-константными индексами полей до корня (alloca/аргумент/глобал/
-bitcast); всё прочее (memcpy агрегатов, str-глобалы под bitcast,
-сам bitcast-корень) остаётся без тега = консервативный MayAlias.
-
-Почему это корректно в EATLang: указателей и union в языке нет,
-память двух разных путей полей не перекрывается никогда; enum с
-нагрузкой — слот на вариант, не union (codegen.enum_ll_of); str-
-литералы короче 256 читаются только через тип str (bitcast выдаёт
-STR*-указатель, корень тот же). Разные корневые типы никогда не
-смотрят в одну память (bitcast в эмиссии один — str-литералы).
+"""Замер TBAA-тегов сборки (§8.3 OPTIMIZATIONS_PLAN; eatc/tbaa.py):
+штатный `eatc build` (теги struct-path TBAA на load/store целых)
+против `eatc build --no-tbaa` на тех же исходниках.
+
+История: разведка §8.3 (2026-07-17) ставила скалярный TBAA пост-
+проходом по llvmlite-модулю в памяти этого скрипта и вердикт дала «не
+рычаг» (http −1,2 % инстр, 0 стены). Теги стали штатными в build —
+скрипт сравнивает флаг сборки, без патчей кодогена. Схема прототипа
+(узел на «корень GEP + путь полей») была некорректна для адреса поля,
+ушедшего аргументом (`T*` внутри `S` — разные узлы); штатная — struct-
+path, там T находится среди членов S.
+
+Варианты бенча: `build --no-tbaa`, `build`; сверка stdout, стена —
+медиана (методика backends.py). Контроль с C-стороны (http) — как в
+разведке: -fno-strict-aliasing и EAT-идиома сканов.
 
 Запуск: uv run python tests/bench/crosslang/tbaa.py
-        [--quick] [--only http,branch,sort,mos6502] [--json PATH]
+        [--quick] [--only sort,bank,todo,http,mos6502] [--json PATH]
 """
 
 import json
@@ -38,121 +28,7 @@ HERE = Path(__file__).resolve().parent
 sys.path.insert(0, str(HERE))
 import run as cl  # noqa: E402  — методика замера crosslang
 
-sys.path.insert(0, str(cl.ROOT / "src"))
-from llvmlite import ir  # noqa: E402
-import eatc.codegen as cgm  # noqa: E402
-from eatc import __main__ as em  # noqa: E402
-
-if sys.platform == "darwin":
-    STACK = ["-Wl,-stack_size,0x10000000"]
-else:
-    STACK = ["-Wl,-z,stacksize=268435456"]
-
-KEYS = ["http", "branch", "sort", "mos6502"]  # http + регресс-тройка
-
-
-# ---------------------------------------------------------------------------
-# Пост-проход: скалярные TBAA-теги по путям GEP
-
-def _access_path(ptr):
-    """Идентичность памяти под указателем: (repr корневого типа,
-    кортеж шагов). None — путь не разобран, тег не ставим."""
-    steps: list = []
-    while type(ptr).__name__ == "GEPInstr":
-        base = ptr.operands[0]
-        idxs = ptr.operands[1:]
-        bt = base.type
-        if not isinstance(bt, ir.PointerType):
-            return None
-        if getattr(idxs[0], "constant", None) != 0:
-            return None
-        t = bt.pointee
-        sub: list = []
-        for ix in idxs[1:]:
-            if isinstance(t, ir.ArrayType):
-                sub.append("[]")
-                t = t.element
-            elif hasattr(t, "elements") and t.elements is not None:
-                c = getattr(ix, "constant", None)
-                if not isinstance(c, int):
-                    return None
-                sub.append(f".{c}")
-                t = t.elements[c]
-            else:
-                return None
-        steps = sub + steps
-        ptr = base
-    bt = ptr.type
-    if not isinstance(bt, ir.PointerType):
-        return None
-    return (str(bt.pointee), tuple(steps))
-
-
-def annotate(module: ir.Module) -> dict:
-    """Навесить !tbaa на все разобранные load/store; вернуть счётчики."""
-    root = module.add_metadata(["eatlang tbaa"])
-    zero = ir.Constant(ir.IntType(64), 0)
-    tags: dict = {}
-    stats = {"tagged": 0, "skipped": 0, "nodes": 0}
-
-    def tag_of(ident):
-        tag = tags.get(ident)
-        if tag is None:
-            node = module.add_metadata(
-                [f"{ident[0]}|{'/'.join(ident[1])}", root, zero]
-            )
-            tag = module.add_metadata([node, node, zero])
-            tags[ident] = tag
-            stats["nodes"] += 1
-        return tag
-
-    for fn in module.functions:
-        for blk in fn.blocks:
-            for instr in blk.instructions:
-                kind = type(instr).__name__
-                if kind == "LoadInstr":
-                    ptr = instr.operands[0]
-                elif kind == "StoreInstr":
-                    ptr = instr.operands[1]
-                else:
-                    continue
-                ident = _access_path(ptr)
-                if ident is None:
-                    stats["skipped"] += 1
-                    continue
-                instr.set_metadata("tbaa", tag_of(ident))
-                stats["tagged"] += 1
-    return stats
-
-
-# Патч generate: тот же кодоген, плюс аннотация при включённом флаге
-_ORIG_GENERATE = cgm.Codegen.generate
-_PATCH = {"on": False, "stats": None}
-
-
-def _generate(self):
-    module = _ORIG_GENERATE(self)
-    if _PATCH["on"]:
-        _PATCH["stats"] = annotate(module)
-    return module
-
-
-cgm.Codegen.generate = _generate
-
-
-def build_tbaa(paths: list, bin_: Path, lib_root=None) -> dict:
-    """`eatc build` в этом процессе с TBAA-постпроходом; .ll с тегами
-    остаётся рядом с бинарником (вход clang-варианта)."""
-    em.LIB_ROOTS[:] = [str(lib_root)] if lib_root else []
-    _PATCH["on"] = True
-    try:
-        rc = em.cmd_build([str(p) for p in paths], str(bin_))
-    finally:
-        _PATCH["on"] = False
-        em.LIB_ROOTS[:] = []
-    if rc != 0:
-        raise RuntimeError(f"cmd_build rc={rc} для {bin_}")
-    return _PATCH["stats"]
+KEYS = ["sort", "bank", "todo", "http", "mos6502"]
 
 
 # ---------------------------------------------------------------------------
@@ -197,21 +73,16 @@ def measure_entries(rows, bench, runs, entries, op_unit,
               "IPC", "бинарник"], printed)
 
 
-def entries_for(paths, stem, rep, lib_root, base_cmd, base_bin):
-    """Тройка вариантов: штатный build, build+TBAA (llvmlite),
-    тот же теговый .ll через clang -O2."""
-    bin_t = cl.OUT / f"{stem}_tbaa_r{rep}"
-    stats = build_tbaa(paths, bin_t, lib_root)
-    print(f"  TBAA: тегов {stats['tagged']}, узлов {stats['nodes']}, "
-          f"без тега {stats['skipped']}")
-    ll_t = bin_t.with_suffix(".ll")
-    bin_c = cl.OUT / f"{stem}_tbaa_clang_r{rep}"
-    cl.sh(["clang", "-O2", ll_t, cl.RUNTIME_C, "-o", bin_c] + STACK)
-    return [
-        ("build (llvmlite)", base_cmd, base_bin),
-        ("build+TBAA (llvmlite)", [bin_t], bin_t),
-        (".ll+TBAA → clang -O2", [bin_c], bin_c),
-    ]
+def entries_for(paths, stem, rep, lib_root):
+    """Пара вариантов: build --no-tbaa и штатный build (с тегами)."""
+    lib = ["--lib", lib_root] if lib_root else []
+    entries = []
+    for label, flags, suffix in (("build --no-tbaa", ["--no-tbaa"], "nt"),
+                                 ("build (TBAA)", [], "tbaa")):
+        bin_ = cl.OUT / f"{stem}_{suffix}_r{rep}"
+        cl.sh(cl.eatc("build", *lib, *paths, *flags, "-o", bin_))
+        entries.append((label, [bin_], bin_))
+    return entries
 
 
 def bench_micro(key, quick, rows):
@@ -219,14 +90,13 @@ def bench_micro(key, quick, rows):
     rep = rep_quick if quick else rep_full
     runs = cl.RUNS_QUICK if quick else cl.RUNS_FULL
     print(f"\n=== {key} ({name}, REPEAT={rep}) ===")
-    cmd, bin_, _secs = cl.build_eat(name, key, libs, rep)
-    src = cl.OUT / f"{name}_eat_r{rep}.eat"
+    src = cl.scaled("eat", cl.PROGRAMS / f"{name}.eat", rep)
     if libs == "driver":
         paths, lib_root = [src], cl.ROOT
     else:
         paths = [cl.RT, *(cl.ROOT / lb for lb in libs), src]
         lib_root = None
-    entries = entries_for(paths, key, rep, lib_root, cmd, bin_)
+    entries = entries_for(paths, key, rep, lib_root)
     measure_entries(rows, key, runs, entries, "оп", None, None,
                     ops_static=base_ops * rep)
 
@@ -241,10 +111,7 @@ def bench_mos(quick, rows):
     heavy = roms["native_quick" if quick else "native"]
     print("\n=== mos6502 (нагрузка — ROM со stdin, метрика — нс/шаг) ===")
     eat_srcs = [cl.ROOT / p for p in cl.MOS_EAT_SRC]
-    bin_ = cl.OUT / "most_eat"
-    cl.sh(cl.eatc("build", cl.RT, *eat_srcs, "-o", bin_))
-    entries = entries_for([cl.RT, *eat_srcs], "most", 1, None,
-                          [bin_], bin_)
+    entries = entries_for([cl.RT, *eat_srcs], "most", 1, None)
     measure_entries(rows, "mos6502", runs, entries, "шаг",
                     roms["verify"], heavy)
 
@@ -28,8 +28,8 @@ def gen_func(idx: int) -> str:
         "    requires true",
         "    ensures true",
         "{",
-        "    var x0: u32 = a % 1024",
-        "    var x1: u32 = b % 1024",
+        "    let x0: u32 = a % 1024",
+        "    let x1: u32 = b % 1024",
     ]
     stmts = 2
     if idx % CALL_GROUP != 0:
@@ -51,7 +51,7 @@ def gen_func(idx: int) -> str:
 
 def gen_main(func_indexes) -> str:
     """main суммирует головы групп; ≤ 60 операторов."""
-    lines = ["func main() {", "    var acc: u32 = 0"]
+    lines = ["func main() {", "    let acc: u32 = 0"]
     for i in func_indexes:
         lines.append(f"    acc = (acc + {_fname(i)}(3, 5)) % 65536")
     lines.append('    print("checksum {acc}")')
@@ -123,7 +123,7 @@ def stress_funcs(n_funcs: int) -> str:
 
 def stress_stmts(n_stmts: int) -> str:
     """Одна функция с n_stmts операторами — предел 60."""
-    lines = ["func main() {", "    var x: u32 = 0"]
+    lines = ["func main() {", "    let x: u32 = 0"]
     for i in range(n_stmts - 1):
         lines.append(f"    x = (x + {i % 100}) % 65536")
     lines.append("}")
@@ -132,7 +132,7 @@ def stress_stmts(n_stmts: int) -> str:
 
 def stress_block_depth(depth: int) -> str:
     """Вложенные if — предел глубины блоков 8 (тело функции — уровень 1)."""
-    lines = ["func main() {", "    var x: u32 = 0"]
+    lines = ["func main() {", "    let x: u32 = 0"]
     pad = "    "
     for d in range(depth - 1):
         lines.append(pad * (d + 1) + "if true {")
@@ -148,7 +148,7 @@ def stress_expr_depth(parens: int) -> str:
     expr = "(" * parens + "1" + ")" * parens
     return (
         "func main() {\n"
-        f"    var x: u32 = {expr}\n"
+        f"    let x: u32 = {expr}\n"
         '    print("x {x}")\n'
         "}\n"
     )
@@ -0,0 +1,99 @@
+"""Сравнение двух отчётов `eatc build --report=json` (до/после правки).
+
+По каждой функции, что есть в обоих отчётах:
+  регрессии (код 1) — выросло число оставшихся в рантайме проверок
+             вида (traps) или упало число снятых верификатором
+             (elided), функция потеряла alwaysinline;
+  рост     — инструкций IR до O2 (ir) или после (ir_o2) больше, чем
+             на --growth процентов; регрессией считается только с
+             --strict (рост кода бывает законным — новая семантика);
+  прочее   — функции, появившиеся/исчезнувшие между отчётами, и итог
+             верификатора целиком.
+
+Запуск из корня репозитория:
+  uv run python -m eatc build P.eat -o build/old --report=json  # до
+  uv run python -m eatc build P.eat -o build/new --report=json  # после
+  uv run python tests/bench/report_diff.py build/old.report.json \\
+      build/new.report.json [--growth 10] [--strict]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _load(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _kinds(old: dict, new: dict) -> list:
+    return sorted(set(old) | set(new))
+
+
+def diff(old: dict, new: dict, growth: float) -> tuple[list, list, list]:
+    """(регрессии, рост, прочее) — строки отчёта."""
+    regress: list = []
+    grown: list = []
+    other: list = []
+    fo, fn = old["functions"], new["functions"]
+    for key in sorted(set(fo) & set(fn)):
+        a, b = fo[key], fn[key]
+        for kind in _kinds(a["traps"], b["traps"]):
+            was, now = a["traps"].get(kind, 0), b["traps"].get(kind, 0)
+            if now > was:
+                regress.append(f"{key}: проверок {kind} в рантайме "
+                               f"{was} -> {now}")
+        for kind in _kinds(a["elided"], b["elided"]):
+            was, now = a["elided"].get(kind, 0), b["elided"].get(kind, 0)
+            if now < was:
+                regress.append(f"{key}: снято верификатором {kind} "
+                               f"{was} -> {now}")
+        if a["inline"] and not b["inline"]:
+            regress.append(f"{key}: потерян alwaysinline")
+        for field in ("ir", "ir_o2"):
+            was, now = a[field], b[field]
+            if was is None or now is None:
+                continue  # O2 не в процессе eatc (-j, --release, PGO)
+            if now > was * (1 + growth / 100):
+                grown.append(f"{key}: {field} {was} -> {now}")
+    for key in sorted(set(fn) - set(fo)):
+        other.append(f"{key}: новая функция")
+    for key in sorted(set(fo) - set(fn)):
+        other.append(f"{key}: функции больше нет")
+    po, pn = old["proofs"], new["proofs"]
+    if (po["proven"], po["total"]) != (pn["proven"], pn["total"]):
+        other.append(f"верификатор: доказано {po['proven']}/{po['total']}"
+                     f" -> {pn['proven']}/{pn['total']}")
+    for field in ("stack_bytes", "globals_bytes"):
+        if old[field] != new[field]:
+            other.append(f"{field}: {old[field]} -> {new[field]}")
+    return regress, grown, other
+
+
+def main(argv: list | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--growth", type=float, default=10.0,
+                    help="порог роста инструкций, %% (по умолчанию 10)")
+    ap.add_argument("--strict", action="store_true",
+                    help="рост инструкций сверх порога — тоже регрессия")
+    args = ap.parse_args(argv)
+    regress, grown, other = diff(_load(args.old), _load(args.new),
+                                 args.growth)
+    for title, lines in (("РЕГРЕССИИ", regress),
+                         (f"РОСТ IR > {args.growth:g} %", grown),
+                         ("ПРОЧЕЕ", other)):
+        if lines:
+            print(f"== {title}")
+            for line in lines:
+                print(f"  {line}")
+    failed = len(regress) + (len(grown) if args.strict else 0)
+    print(f"== ИТОГО: регрессий {failed}, рост IR {len(grown)}, "
+          f"прочее {len(other)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Элизия копий агрегатов `eatc build --elide` (eatc/codegen.py).
+
+1. NRVO: переменная, которую возвращают все return функции, выбирается
+   только при единственном объявлении и без тени параметра.
+2. IR под --elide проходит верификатор LLVM, memcpy в нём меньше, чем
+   без флага: результат вызова и литерал строятся прямо в слоте let,
+   поля литерала и возврата, возвращаемая переменная — в слоте
+   возврата (в pair остаётся одна копия — присваивание p.y).
+3. С хостовым clang — бинарник --elide печатает то же, что
+   интерпретатор: let в цикле, мутация элидированной переменной,
+   match по свежему Option, перекрытие let self с аргументом.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc import ast_nodes as ast  # noqa: E402
+from eatc.codegen import Codegen, _nrvo_name  # noqa: E402
+from eatc.lexer import Lexer  # noqa: E402
+from eatc.parser import Parser  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+struct Inner {
+    a: u32
+    s: str<16>
+}
+
+struct Pair {
+    x: Inner
+    y: Inner
+    buf: [u8; 8]
+}
+
+func inner(a: u32) -> Inner {
+    return Inner { a: a, s: "i{a}" }
+}
+
+func pair(k: u32) -> Pair {
+    let p: Pair = Pair { x: inner(k), y: inner(k + 1), buf: [0; 8] }
+    if k > 5 {
+        p.buf[1] = 7
+        return p
+    }
+    p.y = inner(p.x.a * 10)
+    return p
+}
+
+func pick(k: u32) -> Inner {
+    if k % 2 == 0 {
+        return inner(k)
+    }
+    return Inner { a: k, s: "odd" }
+}
+
+func maybe(k: u32) -> Option<Inner> {
+    if k == 0 {
+        return None
+    }
+    return Some(inner(k))
+}
+
+extend Pair {
+    func first(self) -> Inner {
+        return self.x
+    }
+
+    func bump(let self, o: Inner) {
+        self.x.a = self.x.a + o.a
+        self.y = o
+    }
+}
+
+func main() {
+    let total: u32 = 0
+    for k in 0..8 {
+        let p: Pair = pair(k)
+        p.x.a = p.x.a + 1
+        const q: Inner = pick(k)
+        match maybe(k) {
+            Some(v) {
+                total = total + v.a + 100
+            }
+            None {
+                total = total + 1
+            }
+        }
+        const f: Inner = pair(k).first()
+        p.bump(p.y)
+        total = total + p.x.a + p.y.a + q.a + f.a + u32(p.buf[1])
+        print("{k} {p.x.s} {p.y.s} {q.s} {f.s} {total}")
+    }
+}
+"""
+
+NRVO = """\
+func a(k: u32) -> Inner {
+    let r: Inner = inner(k)
+    if k > 1 {
+        return r
+    }
+    return r
+}
+
+func b(k: u32) -> Inner {
+    let r: Inner = inner(k)
+    if k > 1 {
+        let r: Inner = inner(1)
+        return r
+    }
+    return r
+}
+
+func c(r: Inner) -> Inner {
+    return r
+}
+
+func d(k: u32) -> Inner {
+    let r: Inner = inner(k)
+    let t: Inner = inner(k)
+    if k > 1 {
+        return t
+    }
+    return r
+}
+"""
+
+
+def _memcpys(text: str, func: str | None = None) -> int:
+    if func is not None:
+        start = text.index(f'@"{func}"(')
+        text = text[start:text.index("\n}\n", start)]
+    return text.count('@"llvm.memcpy.')
+
+
+def run() -> list:
+    fails: list = []
+
+    # 1: выбор NRVO-переменной
+    tokens = Lexer(NRVO, "nrvo.eat").tokenize()
+    funcs = {
+        d.name: d for d in Parser(tokens, "nrvo.eat").parse_program().decls
+        if isinstance(d, ast.FuncDecl)
+    }
+    params = {"c": [("r", None)]}
+    got = {
+        name: _nrvo_name(f.body, params.get(name, []))
+        for name, f in funcs.items()
+    }
+    if got != {"a": "r", "b": None, "c": None, "d": None}:
+        fails.append(f"NRVO: {got}")
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Elide.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+
+        # 2: IR с элизией и без
+        texts = {}
+        for elide in (False, True):
+            program, _, typed, main = M._compile_many(paths)
+            cg = Codegen(program, typed.checker, main, elide=elide)
+            texts[elide] = str(cg.generate())
+            if elide and cg.elided == 0:
+                fails.append("--elide не сняло ни одной копии")
+        try:
+            llvm.parse_assembly(texts[True]).verify()
+        except RuntimeError as e:
+            fails.append(f"верификатор LLVM: {e}")
+        if _memcpys(texts[True]) >= _memcpys(texts[False]):
+            fails.append(
+                f"memcpy: {_memcpys(texts[True])} при --elide, "
+                f"{_memcpys(texts[False])} без"
+            )
+        if _memcpys(texts[True], "eat_pair") != 1:
+            fails.append(
+                f"pair: {_memcpys(texts[True], 'eat_pair')} копий при NRVO"
+            )
+
+        # 3: бинарник --elide == интерпретатор
+        if shutil.which("clang"):
+            binary = str(Path(tmp) / "Elide")
+            res = subprocess.run(
+                [sys.executable, "-m", "eatc", "build", *paths,
+                 "--elide", "-o", binary],
+                capture_output=True, cwd=ROOT, env=env,
+            )
+            if res.returncode != 0:
+                fails.append(f"build --elide: {res.stderr[-300:]!r}")
+            else:
+                native = subprocess.run(
+                    [binary], capture_output=True
+                ).stdout
+                interp = subprocess.run(
+                    [sys.executable, "-m", "eatc", "run", *paths],
+                    capture_output=True, cwd=ROOT, env=env,
+                ).stdout
+                if native != interp or not native:
+                    fails.append(f"--elide: {native!r} != {interp!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("ELIDE OK (выбор NRVO, меньше memcpy, верификатор LLVM); "
+              "пропущено: нет clang — бинарник --elide не собирался")
+        sys.exit(0)
+    print("ELIDE OK (выбор NRVO, меньше memcpy, верификатор LLVM, "
+          "бинарник == интерпретатор)")
@@ -0,0 +1,178 @@
+"""Текстовый писатель IR (eatc/irtext.py) против принтера llvmlite.
+
+Один и тот же сценарий построения модуля — все конструкции, которыми
+пользуется кодоген (декларации с атрибутами, private-глобалы строк и
+константных массивов, интринсики, alloca перед br entry-блока,
+дубликаты меток, phi, switch, приведения, константные bitcast и
+смещение глобала ptrtoint/sub/trunc, extractvalue, узлы TBAA и их
+вложения в load/store), — гоняется через llvmlite.ir и через irtext;
+тексты модулей должны совпасть байт-в-байт. Затем текст irtext разбирается
+и верифицируется LLVM. Потоковая печать (Module.stream/flush после
+каждой функции, как в Codegen.generate) даёт тот же текст и отпускает
+блоки напечатанных функций.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+import llvmlite.ir as llir  # noqa: E402
+
+from eatc import irtext  # noqa: E402
+
+
+def build(ir, chunks: list | None = None) -> str:
+    i1, i8, i32, i64 = (ir.IntType(w) for w in (1, 8, 32, 64))
+    i8p = ir.PointerType(i8)
+    strt = ir.LiteralStructType([i32, ir.ArrayType(i8, 16)])
+    m = ir.Module(name="stdin")
+    m.triple = ""
+    if chunks is not None:
+        m.stream(chunks.append)
+    trap = ir.Function(m, ir.FunctionType(ir.VoidType(), [i8p]), "eat_trap")
+    trap.attributes.add("noreturn")
+    trap.attributes.add("cold")
+    trap.attributes.add("nounwind")
+    arr = ir.Constant(ir.ArrayType(i8, 6), bytearray(b'a"\\\xd0\n\0'))
+    g = ir.GlobalVariable(m, arr.type, name="str.0")
+    g.initializer = arr
+    g.global_constant = True
+    g.linkage = "private"
+    tbl = ir.ArrayType(i32, 3)
+    c = ir.GlobalVariable(m, tbl, name="const.T")
+    c.global_constant = True
+    c.linkage = "private"
+    c.initializer = ir.Constant(tbl, [i32(v) for v in (1, -2, 3)])
+    lit = ir.Constant.literal_struct([i32(2), ir.Constant(
+        ir.ArrayType(i8, 2), bytearray(b"hi"))])
+    s = ir.GlobalVariable(m, lit.type, name="str.1")
+    s.initializer = lit
+    s.global_constant = True
+    s.linkage = "private"
+    rel = ir.GlobalVariable(m, i32, name="trap.f")
+    rel.initializer = g.ptrtoint(i64).sub(rel.ptrtoint(i64)).trunc(i32)
+    rel.global_constant = True
+    rel.linkage = "private"
+
+    fty = ir.FunctionType(i32, [ir.PointerType(strt), i32, i1])
+    fn = ir.Function(m, fty, name="eat_f")
+    fn.linkage = "internal"
+    for attr in ("norecurse", "nounwind"):
+        fn.attributes.add(attr)
+    for attr in ("nonnull", "noalias", "nofree"):
+        fn.args[0].add_attribute(attr)
+    entry = fn.append_basic_block("entry")
+    body = fn.append_basic_block("body")
+    br = ir.IRBuilder(entry).branch(body)
+    ab = ir.IRBuilder(entry)
+    ab.position_before(br)
+    b = ir.IRBuilder(body)
+    ret = ab.alloca(i32, name="ret")
+    slot = ab.alloca(i32, name="ret")
+    root = m.add_metadata(["eat tbaa"])
+    off = ir.Constant(i64, 0)
+    int_ = m.add_metadata(["i32", root, off])
+    node = m.add_metadata(["{i32, [16 x i8]}", int_, off])
+    tag = m.add_metadata([node, int_, off])
+    b.store(fn.args[1], slot).set_metadata("tbaa", tag)
+    x = b.load(slot)
+    x.set_metadata("tbaa", m.add_metadata([int_, int_, off]))
+    ov = m.declare_intrinsic(
+        "llvm.sadd.with.overflow", [i32],
+        fnty=ir.FunctionType(ir.LiteralStructType([i32, i1]), [i32, i32]),
+    )
+    pair = b.call(ov, [x, i32(7)])
+    sum_ = b.extract_value(pair, 0)
+    bad = b.extract_value(pair, 1)
+    trap_bb = fn.append_basic_block("trap")
+    ok_bb = fn.append_basic_block("ok")
+    b.cbranch(bad, trap_bb, ok_bb)
+    b.position_at_end(trap_bb)
+    b.call(trap, [b.gep(g, [i32(0), i32(0)], inbounds=True)])
+    b.unreachable()
+    b.position_at_end(ok_bb)
+    y = b.add(sum_, i32(1), flags=("nsw",))
+    z = b.mul(b.sdiv(y, i32(3)), b.urem(y, i32(5)))
+    w = b.select(b.icmp_signed("<", z, i32(0)), b.not_(z), z)
+    sh = b.lshr(b.shl(w, i32(2), flags=("nuw",)), i32(1))
+    wide = b.zext(b.trunc(sh, i8), i64)
+    narrow = b.trunc(b.sext(b.trunc(wide, i8), i32), i32)
+    elem = b.load(b.gep(c, [i32(0), narrow], inbounds=True))
+    ln = b.load(b.gep(fn.args[0], [i32(0), i32(0)], inbounds=True))
+    memcpy = m.declare_intrinsic("llvm.memcpy", [i8p, i8p, i64])
+    size = b.ptrtoint(
+        b.gep(ir.Constant(ir.PointerType(strt), None), [i32(1)]), i64
+    )
+    tmp = ab.alloca(strt)
+    b.call(memcpy, [b.bitcast(tmp, i8p),
+                    b.bitcast(s.bitcast(ir.PointerType(strt)), i8p),
+                    size, ir.Constant(i1, 0)])
+    end = fn.append_basic_block("ok")
+    rhs_bb = fn.append_basic_block("and")
+    start = b.block
+    b.cbranch(fn.args[2], rhs_bb, end)
+    b.position_at_end(rhs_bb)
+    r = b.icmp_unsigned(">=", elem, ln)
+    b.branch(end)
+    b.position_at_end(end)
+    phi = b.phi(i1)
+    phi.add_incoming(ir.Constant(i1, False), start)
+    phi.add_incoming(r, rhs_bb)
+    a1 = fn.append_basic_block("match.A")
+    a2 = fn.append_basic_block("match.dead")
+    sw = b.switch(b.zext(phi, i32), a2)
+    sw.add_case(i32(1), a1)
+    sw.add_case(0, a1)
+    for bb in (a1, a2):
+        b.position_at_end(bb)
+        b.store(b.sub(elem, b.udiv(elem, i32(2))), ret)
+        b.ret(b.load(ret))
+    if chunks is not None:
+        m.flush(fn)
+        if fn.blocks or not chunks[-1].startswith("define internal"):
+            chunks.append("<flush не отпустил eat_f>")
+
+    mainty = ir.FunctionType(i32, [i32, ir.PointerType(i8p)])
+    main = ir.Function(m, mainty, name="main")
+    mb = ir.IRBuilder(main.append_basic_block("entry"))
+    mb.call(fn, [ir.Constant(ir.PointerType(strt), None),
+                 main.args[0], ir.Constant(i1, True)])
+    mb.ret(i32(0))
+    if chunks is not None:
+        m.flush()
+        return "".join(chunks)
+    return str(m)
+
+
+def run() -> list:
+    fails: list = []
+    want, got = build(llir), build(irtext)
+    if got != want:
+        for k, (a, b) in enumerate(zip(want.split("\n"), got.split("\n"))):
+            if a != b:
+                fails.append(
+                    f"строка {k + 1}:\n  llvmlite {a!r}\n  irtext   {b!r}"
+                )
+                break
+        else:
+            fails.append(f"длина: {len(want)} != {len(got)}")
+    if build(irtext, []) != want:
+        fails.append("потоковая печать расходится с str(module)")
+    try:
+        llvm.parse_assembly(got).verify()
+    except RuntimeError as e:
+        fails.append(f"верификатор LLVM: {e}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print("IRTEXT OK (текст модуля == принтер llvmlite, верификатор LLVM)")
@@ -0,0 +1,126 @@
+"""Исполнение в процессе `eatc run --jit` (eatc/jit.py).
+
+1. Флаги: --jit вместе с --engine или --record — ошибка (код 2).
+2. С хостовым clang — на каждом входе (штатный выход, exit с кодом,
+   trap в другой функции) run --jit даёт тот же stdout, stderr и код
+   возврата, что бинарник build: argv после `--`, stdin и виртуальные
+   часы EAT_TICKS=virt; штатный вывод == интерпретатор.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+func div(a: u32, b: u32) -> u32 {
+    return a / b
+}
+
+func main() {
+    let i: u32 = 0
+    loop {
+        if i >= arg_count() {
+            break
+        }
+        print("arg {i}: {arg_len(i)} {arg_byte(i, 0)}")
+        i = i + 1
+    }
+    let sum: u32 = 0
+    let t0: u64 = ticks()
+    loop {
+        match read_byte() {
+            Ok(b) {
+                if b == 100 {
+                    sum = div(sum, u32(b) - 100)
+                }
+                if b == 101 {
+                    exit(sum % 7 + 2)
+                }
+                sum = sum + u32(b)
+            }
+            Err(_) {
+                break
+            }
+        }
+    }
+    print("sum {sum} ticks {ticks() - t0}")
+}
+"""
+
+INPUTS = [b"abc", b"abce", b"xd"]
+ARGS = ["--", "xy", "zzz"]
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"), EAT_TICKS="virt")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Jit.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+
+        # 1: флаги
+        for flags in (["--engine", "py"], ["--record", tmp + "/t"]):
+            with contextlib.redirect_stderr(io.StringIO()):
+                rc = M.main(["run", "--jit", *flags, *paths])
+            if rc != 2:
+                fails.append(f"--jit {flags}: код {rc}")
+
+        # 2: run --jit == бинарник
+        if shutil.which("clang"):
+            binary = str(Path(tmp) / "Jit")
+            res = subprocess.run(
+                [sys.executable, "-m", "eatc", "build", *paths,
+                 "-o", binary],
+                capture_output=True, cwd=ROOT, env=env,
+            )
+            if res.returncode != 0:
+                return fails + [f"build: {res.stderr[-300:]!r}"]
+            outs: dict = {}
+            for data in INPUTS:
+                native = subprocess.run(
+                    [binary, *ARGS[1:]], input=data, capture_output=True,
+                    env=env,
+                )
+                jit = subprocess.run(
+                    [sys.executable, "-m", "eatc", "run", "--jit", *paths,
+                     *ARGS],
+                    input=data, capture_output=True, cwd=ROOT, env=env,
+                )
+                outs[data] = jit.stdout
+                got = (jit.returncode, jit.stdout, jit.stderr)
+                want = (native.returncode, native.stdout, native.stderr)
+                if got != want:
+                    fails.append(f"{data!r}: {got} != {want}")
+            interp = subprocess.run(
+                [sys.executable, "-m", "eatc", "run", *paths, *ARGS],
+                input=INPUTS[0], capture_output=True, cwd=ROOT, env=env,
+            ).stdout
+            if not interp or outs[INPUTS[0]] != interp:
+                fails.append(f"вывод --jit != интерпретатор: {interp!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("JIT OK (флаги); пропущено: нет clang — паритет run --jit "
+              "с бинарником и интерпретатором не проверен")
+        sys.exit(0)
+    print("JIT OK (run --jit == бинарник: argv, stdin, exit, trap, "
+          "EAT_TICKS; вывод == интерпретатор)")
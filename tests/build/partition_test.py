@@ -0,0 +1,129 @@
+"""Параллельный кодоген `eatc build -j N` (eatc/partition.py).
+
+1. Части модуля эмулятора 6502 (мелкие — пороги понижены) разбираются
+   и проходят верификатор LLVM; каждое неразделяемое определение —
+   ровно в одной части, alwaysinline-листья — internal-копиями.
+2. Тексты частей не зависят от сквозной нумерации глобалов модуля
+   (перенумерованный str.N даёт те же части — ключи кэша целы).
+3. Кэш объектов: повторная эмиссия берёт все части из кэша.
+4. С хостовым clang — бинарник `build -j 3` на ROM mul13x11 печатает
+   то же, что интерпретатор.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc import partition  # noqa: E402
+from eatc.codegen import Codegen, inline_hints  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRCS = [
+    "selfhost/Rt.eat", "lib/fmt/Hex.eat", "examples/mos6502/Cpu6502.eat",
+    "examples/mos6502/Tests.eat", "examples/mos6502/Main.eat",
+]
+ROM = ROOT / "examples" / "mos6502" / "mul13x11.rom"
+
+
+def run() -> list:
+    fails: list = []
+    paths = [str(ROOT / p) for p in SRCS]
+    program, _, typed, main = M._compile_many(paths)
+    text = str(Codegen(program, typed.checker, main).generate())
+    ref = llvm.parse_assembly(text)
+    internal = {
+        f.name for f in ref.functions
+        if not f.is_declaration and f.linkage == llvm.Linkage.internal
+    }
+    defined = {f.name for f in ref.functions if not f.is_declaration}
+    shared = set(inline_hints(ref)) & internal
+
+    partition.PART_MIN, partition.PART_SPACING = 50, 2
+    parts = partition.split(text, shared)
+    if len(parts) < 3:
+        fails.append(f"частей {len(parts)}")
+    homes: dict = {}
+    for k, (part, inline) in enumerate(parts):
+        try:
+            pref = llvm.parse_assembly(part)
+            pref.verify()
+        except RuntimeError as e:
+            fails.append(f"часть {k}: {e}")
+            continue
+        for f in pref.functions:
+            if f.is_declaration:
+                continue
+            if f.name in shared:
+                if f.linkage != llvm.Linkage.internal or f.name not in inline:
+                    fails.append(f"часть {k}: копия {f.name}")
+                continue
+            homes.setdefault(f.name, []).append(k)
+    for name in defined - shared:
+        if len(homes.get(name, [])) != 1:
+            fails.append(f"{name} в частях {homes.get(name)}")
+
+    shifted = re.sub(
+        r'@"str\.(\d+)"', lambda m: f'@"str.{int(m.group(1)) + 7}"', text
+    )
+    if partition.split(shifted, shared) != parts:
+        fails.append("части зависят от нумерации глобалов модуля")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["EAT_CACHE"] = tmp
+        objs, reused = partition.emit_objects(parts, 2)
+        again, reused2 = partition.emit_objects(parts, 2)
+        del os.environ["EAT_CACHE"]
+    if reused != 0 or reused2 != len(parts) or objs != again \
+            or not all(objs):
+        fails.append(f"кэш объектов: {reused}, {reused2} из {len(parts)}")
+
+    if shutil.which("clang"):
+        env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+        with tempfile.TemporaryDirectory() as tmp:
+            binary = str(Path(tmp) / "Mos6502")
+            res = subprocess.run(
+                [sys.executable, "-m", "eatc", "build", *paths,
+                 "-o", binary, "-j", "3"],
+                capture_output=True, cwd=ROOT,
+                env=env,
+            )
+            if res.returncode != 0:
+                fails.append(f"build -j 3: {res.stderr[-300:]!r}")
+            else:
+                rom = ROM.read_bytes()
+                native = subprocess.run(
+                    [binary], input=rom, capture_output=True
+                ).stdout
+                interp = subprocess.run(
+                    [sys.executable, "-m", "eatc", "run", *paths],
+                    input=rom, capture_output=True, cwd=ROOT,
+                    env=env,
+                ).stdout
+                if native != interp or not native:
+                    fails.append(f"build -j 3: {native!r} != {interp!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("PARTITION OK (части верифицируются, определения по одному "
+              "разу, ключи стабильны, кэш); пропущено: нет clang — "
+              "бинарник -j не сверялся")
+        sys.exit(0)
+    print("PARTITION OK (части верифицируются, определения по одному "
+          "разу, ключи стабильны, кэш, бинарник == интерпретатор)")
@@ -0,0 +1,183 @@
+"""PGO-сборка `eatc build --pgo-gen / --pgo-use / --pgo-train`
+(eatc/pgo.py).
+
+1. Частоты функций из .profdata (llvm-profdata merge текстового
+   профиля): префикс модуля у internal-имён отрезан, частота — самый
+   горячий счётчик.
+2. inline_hints по частотам: не исполнявшаяся функция не помечается,
+   горячая проходит с порогом ×HOT_SCALE, где статический порог её
+   отсекает.
+3. Флаги: взаимоисключение режимов, --pgo-hints без профиля — ошибка.
+4. С хостовым clang и llvm-profdata — `build --pgo-train` (прогон на
+   тренировочном stdin) даёт бинарник, печатающий то же, что
+   интерпретатор, и .profdata рядом.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc import pgo  # noqa: E402
+from eatc.codegen import Codegen, inline_hints  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+func cold(x: u32) -> u32 {
+    return x + 1
+}
+
+func hot(x: u32) -> u32 {
+    let y: u32 = x % 7
+    if y > 3 {
+        y = y * 3 + 1
+    } else {
+        y = y + x % 5
+    }
+    return y
+}
+
+func main() {
+    let sum: u32 = 0
+    loop {
+        match read_byte() {
+            Ok(b) {
+                sum = sum + hot(u32(b))
+                if b == 0 {
+                    sum = cold(sum)
+                }
+            }
+            Err(_) {
+                break
+            }
+        }
+    }
+    print("sum {sum}")
+}
+"""
+
+PROFTEXT = """\
+# IR level Instrumentation Flag
+:ir
+{mod};eat_hot
+# Func Hash:
+1
+# Num Counters:
+3
+# Counter Values:
+4096
+7
+4000
+
+eat_cold
+# Func Hash:
+2
+# Num Counters:
+1
+# Counter Values:
+0
+
+"""
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Pgo.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+        program, _, typed, main = M._compile_many(paths)
+
+        # 1: частоты из профиля
+        counts = None
+        if pgo.profdata_tool() is not None:
+            text = Path(tmp) / "p.proftext"
+            text.write_text(PROFTEXT.format(mod=path), encoding="utf-8")
+            prof = str(Path(tmp) / "p.profdata")
+            pgo.merge([str(text)], prof, path)
+            counts = pgo.func_counts(prof, path)
+            if counts != {"eat_hot": 4096, "eat_cold": 0}:
+                fails.append(f"частоты: {counts}")
+        counts = {"eat_hot": 4096, "eat_cold": 0, "eat_main": 1}
+
+        # 2: inline_hints по частотам
+        ir = str(Codegen(program, typed.checker, main).generate())
+        ref = llvm.parse_assembly(ir)
+        size = {
+            f.name: sum(len(list(b.instructions)) for b in f.blocks)
+            for f in ref.functions if not f.is_declaration
+        }
+        limit = size["eat_hot"] - 1  # статически hot не проходит
+        static = inline_hints(llvm.parse_assembly(ir), limit=limit)
+        hinted = inline_hints(
+            llvm.parse_assembly(ir), limit=limit, counts=counts
+        )
+        if "eat_hot" in static or "eat_cold" not in static:
+            fails.append(f"статические хинты: {static}")
+        if "eat_hot" not in hinted or "eat_cold" in hinted:
+            fails.append(f"хинты по профилю: {hinted}")
+
+        # 3: флаги
+        for flags in (["--pgo-gen", "--pgo-use", "x"], ["--pgo-hints"],
+                      ["--pgo-gen", "--pgo-hints"]):
+            with contextlib.redirect_stderr(io.StringIO()):
+                rc = M.main(["build", *paths, *flags])
+            if rc != 2:
+                fails.append(f"{flags}: код {rc}")
+
+        # 4: полный цикл с тренировкой
+        if shutil.which("clang") and pgo.profdata_tool() is not None:
+            data = Path(tmp) / "train.bin"
+            data.write_bytes(bytes(range(256)) * 64)
+            binary = str(Path(tmp) / "Pgo")
+            res = subprocess.run(
+                [sys.executable, "-m", "eatc", "build", *paths,
+                 "--pgo-train", str(data), "--pgo-hints", "-o", binary],
+                capture_output=True, cwd=ROOT, env=env,
+            )
+            if res.returncode != 0:
+                fails.append(f"--pgo-train: {res.stderr[-300:]!r}")
+            else:
+                if not Path(binary).with_suffix(".profdata").exists():
+                    fails.append("--pgo-train: нет .profdata")
+                native = subprocess.run(
+                    [binary], input=data.read_bytes(), capture_output=True
+                ).stdout
+                interp = subprocess.run(
+                    [sys.executable, "-m", "eatc", "run", *paths],
+                    input=data.read_bytes(), capture_output=True,
+                    cwd=ROOT, env=env,
+                ).stdout
+                if native != interp or not native:
+                    fails.append(f"PGO: {native!r} != {interp!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if pgo.profdata_tool() is None:
+        print("PGO OK (хинты по профилю, флаги); пропущено: нет "
+              "llvm-profdata — частоты профиля и цикл --pgo-train "
+              "не проверены")
+        sys.exit(0)
+    if not shutil.which("clang"):
+        print("PGO OK (частоты профиля, хинты по профилю, флаги); "
+              "пропущено: нет clang — цикл --pgo-train не проверен")
+        sys.exit(0)
+    print("PGO OK (частоты профиля, хинты по профилю, флаги, "
+          "цикл --pgo-train)")
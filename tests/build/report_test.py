@@ -0,0 +1,140 @@
+"""Отчёт по функциям `eatc build --report=json` и его сравнение
+(tests/bench/report_diff.py).
+
+1. compile_binary(functions=True): по функции — инструкций IR до и
+   после O2 (листовая функция с alwaysinline встроена — после O2 0),
+   оставшиеся trap'ы по видам; кадр — тот же, что в frames §8.
+2. CLI: build --report=json пишет <out>.report.json, elided — снятые
+   верификатором проверки по видам; текстовый отчёт без флага — тот
+   же (плюс строка с путём JSON).
+3. report_diff: отчёт против себя — 0; недоказанный индекс вместо
+   доказанного — регрессия (код 1) с именем функции и вида.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests" / "bench"))
+
+from eatc.codegen import compile_binary  # noqa: E402
+from eatc.verifier import verify  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+import report_diff  # noqa: E402
+
+SRC = """\
+func pick(t: [u32; 8], i: u32) -> u32 {
+    return t[INDEX]
+}
+
+func mix(a: u32, b: u32) -> u32 {
+    return a / b + a * b
+}
+
+func main() {
+    let t: [u32; 8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    let acc: u32 = 0
+    for i in 0..100 {
+        acc = acc % 1000 + pick(t, u32(i)) + mix(u32(i), 3)
+    }
+    print("acc {acc}")
+}
+"""
+
+
+def _build(tmp: str, name: str, index: str, flags: list) -> tuple:
+    path = str(Path(tmp) / f"{name}.eat")
+    Path(path).write_text(SRC.replace("INDEX", index), encoding="utf-8")
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    res = subprocess.run(
+        [sys.executable, "-m", "eatc", "build",
+         str(ROOT / "selfhost" / "Rt.eat"), path, "--no-bin",
+         "-o", str(Path(tmp) / name), *flags],
+        capture_output=True, text=True, cwd=ROOT, env=env,
+    )
+    return res.returncode, res.stdout + res.stderr
+
+
+def run() -> list:
+    fails: list = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1: разрез compile_binary
+        path = str(Path(tmp) / "Fn.eat")
+        Path(path).write_text(SRC.replace("INDEX", "i"), encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+        program, _, typed, main = M._compile_many(paths)
+        verify(program, typed.checker)
+        _, report = compile_binary(
+            program, typed.checker, main, str(Path(tmp) / "Fn"),
+            link=False, functions=True,
+        )
+        funcs = report.get("functions", {})
+        pick, mix = funcs.get("pick"), funcs.get("mix")
+        if pick is None or mix is None:
+            return fails + [f"нет функций: {sorted(funcs)[:8]}"]
+        if pick["traps"] != {"bounds": 1}:
+            fails.append(f"trap'ы pick: {pick['traps']}")
+        if not pick["inline"] or pick["ir_o2"] != 0:
+            fails.append(f"pick не встроена: {pick}")
+        if mix["traps"].get("div") != 1 or mix["ir"] < 5:
+            fails.append(f"mix: {mix}")
+        if any(v["ir_o2"] is None for v in funcs.values()):
+            fails.append("нет счёта после O2")
+        if any(v["frame"] != report["frames"].get(k, 0)
+               for k, v in funcs.items()):
+            fails.append("кадры расходятся с frames")
+
+        # 2: CLI; имена входов одной длины — имя файла входит в
+        # строки trap'ов, то есть в статические данные отчёта
+        rc, plain = _build(tmp, "Raw", "i % 8", [])
+        rc2, text = _build(tmp, "Old", "i % 8", ["--report=json"])
+        lines = text.splitlines()
+        json_path = Path(tmp) / "Old.report.json"
+        if rc or rc2 or not json_path.exists():
+            return fails + [f"build: {rc} {rc2} {text[-300:]!r}"]
+        if lines[-1] != f"  отчёт по функциям: {json_path}":
+            fails.append(f"строка отчёта: {lines[-1]!r}")
+        norm = "\n".join(lines[:-1]).replace("Old", "Raw")
+        if norm != plain.rstrip("\n"):
+            fails.append("текстовый отчёт изменился")
+        old = json.loads(json_path.read_text(encoding="utf-8"))
+        opick = old["functions"]["pick"]
+        if opick["traps"] or opick["elided"].get("bounds") != 1:
+            fails.append(f"pick i % 8: {opick}")
+        if set(old) != {"binary", "stack_bytes", "globals_bytes",
+                        "proofs", "functions"}:
+            fails.append(f"ключи: {sorted(old)}")
+
+        # 3: report_diff
+        _build(tmp, "New", "i", ["--report=json"])
+        new_path = str(Path(tmp) / "New.report.json")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            same = report_diff.main([str(json_path), str(json_path)])
+            worse = report_diff.main([str(json_path), new_path])
+        shown = out.getvalue()
+        if same != 0 or worse != 1:
+            fails.append(f"коды report_diff: {same} {worse}")
+        for want in ("pick: проверок bounds в рантайме 0 -> 1",
+                     "pick: снято верификатором bounds 1 -> 0"):
+            if want not in shown:
+                fails.append(f"нет строки {want!r}: {shown!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print("REPORT OK (разрез по функциям, --report=json, report_diff "
+          "ловит регрессию элизии)")
@@ -0,0 +1,193 @@
+"""TBAA-теги сборки `eatc build` (eatc/tbaa.py; `--no-tbaa` — без них).
+
+1. IR с тегами проходит верификатор LLVM и без тегов (strip_tbaa)
+   совпадает с каноном байт-в-байт; узел структуры перечисляет
+   скалярные члены со смещениями, массив в члены не идёт, доступ к
+   элементу массива структур — с базой-элементом.
+2. Части `build -j` с тегами верифицируются, узлы в части — только
+   достижимые, нумерация с !0.
+3. build и build --no-tbaa пишут один и тот же .ll (без тегов).
+4. С хостовым clang — бинарник с тегами и без печатает то же, что
+   интерпретатор: поля структуры вперемешку с элементами массива,
+   поле, изменённое методом через указатель на вложенную структуру.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc import partition  # noqa: E402
+from eatc.codegen import Codegen, compile_binary  # noqa: E402
+from eatc.tbaa import strip_tbaa  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+struct Cell {
+    tag: u8
+    v: u32
+}
+
+struct Grid {
+    cells: [Cell; 4]
+    n: u32
+    acc: u64
+}
+
+struct Inner {
+    a: u32
+    b: u32
+}
+
+struct Outer {
+    k: u32
+    inner: Inner
+}
+
+extend Inner {
+    func add(let self, d: u32) {
+        self.a = self.a + d
+        self.b = self.a * 2
+    }
+}
+
+extend Grid {
+    func fill(let self, seed: u32) {
+        for i in 0..4 {
+            self.cells[i].v = seed + self.n
+            self.n = self.n + self.cells[i].v % 7
+            self.cells[i].tag = u8(i)
+            self.acc = self.acc + u64(self.cells[i].v)
+        }
+    }
+}
+
+func main() {
+    let g: Grid = Grid {
+        cells: [Cell { tag: 0, v: 0 }; 4], n: 1, acc: 0,
+    }
+    let o: Outer = Outer { k: 3, inner: Inner { a: 1, b: 0 } }
+    let total: u64 = 0
+    for r in 0..50 {
+        g.fill(r)
+        o.inner.add(o.k)
+        o.k = o.inner.a % 11 + o.inner.b % 5
+        total = total + g.acc + u64(o.k)
+    }
+    print("n {g.n} acc {g.acc} k {o.k} a {o.inner.a} total {total}")
+}
+"""
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Tbaa.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+        program, _, typed, main = M._compile_many(paths)
+
+        # 1: теги, канон без них, узлы типов
+        canon = str(Codegen(program, typed.checker, main).generate())
+        text = str(Codegen(
+            program, typed.checker, main, tbaa=True
+        ).generate())
+        try:
+            llvm.parse_assembly(text).verify()
+        except RuntimeError as e:
+            fails.append(f"верификатор LLVM: {e}")
+        if "!tbaa" in canon:
+            fails.append("теги в каноне")
+        if text.count(", !tbaa !") < 20:
+            fails.append(f"тегов {text.count(', !tbaa !')}")
+        if strip_tbaa(text) != canon:
+            fails.append("strip_tbaa(теги) != канон")
+        nodes = dict(re.findall(r"^(!\d+) = (.*)$", text, re.M))
+        grid = [
+            n for n in nodes.values()
+            if n.startswith('!{ !"{[4 x {i8, i32}], i32, i64}"')
+        ]
+        if len(grid) != 1 or not re.fullmatch(
+            r'!\{ !"[^"]+", !\d+, i64 32, !\d+, i64 40 \}', grid[0]
+        ):
+            fails.append(f"узел Grid: {grid}")
+        key = {n.split('"')[1]: k for k, n in nodes.items()
+               if n.startswith('!{ !"')}
+        want = f"!{{ {key.get('{i8, i32}')}, {key.get('i32')}, i64 4 }}"
+        if want not in nodes.values():
+            fails.append("нет тега Cell.v с базой-элементом массива")
+
+        # 2: части -j
+        partition.PART_MIN, partition.PART_SPACING = 20, 1
+        parts = partition.split(text, set())
+        for k, (part, _) in enumerate(parts):
+            try:
+                llvm.parse_assembly(part).verify()
+            except RuntimeError as e:
+                fails.append(f"часть {k}: {e}")
+            refs = {int(n) for n in re.findall(r"!(\d+)", part)}
+            if refs and refs != set(range(max(refs) + 1)):
+                fails.append(f"часть {k}: узлы {sorted(refs)}")
+        if len(parts) < 2:
+            fails.append(f"частей {len(parts)}")
+
+        # 3: .ll с тегами и без — один
+        lls = []
+        for tbaa in (True, False):
+            out = str(Path(tmp) / f"Tbaa-{tbaa}")
+            ll, report = compile_binary(
+                program, typed.checker, main, out, link=False, tbaa=tbaa,
+            )
+            lls.append(Path(ll).read_text(encoding="utf-8"))
+            if ("tbaa" in report) != tbaa:
+                fails.append(f"отчёт tbaa={tbaa}: {sorted(report)}")
+        if lls[0] != lls[1]:
+            fails.append(".ll build и build --no-tbaa расходятся")
+
+        # 4: бинарники == интерпретатор
+        if shutil.which("clang"):
+            interp = subprocess.run(
+                [sys.executable, "-m", "eatc", "run", *paths],
+                capture_output=True, cwd=ROOT, env=env,
+                stdin=subprocess.DEVNULL,
+            ).stdout
+            for flags in ([], ["--no-tbaa"], ["-j", "2"]):
+                binary = str(Path(tmp) / "Tbaa")
+                res = subprocess.run(
+                    [sys.executable, "-m", "eatc", "build", *paths,
+                     *flags, "-o", binary],
+                    capture_output=True, cwd=ROOT, env=env,
+                )
+                if res.returncode != 0:
+                    fails.append(f"build {flags}: {res.stderr[-300:]!r}")
+                    continue
+                native = subprocess.run(
+                    [binary], capture_output=True, stdin=subprocess.DEVNULL,
+                ).stdout
+                if native != interp or not native:
+                    fails.append(f"{flags}: {native!r} != {interp!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("TBAA OK (теги верифицируются, канон без них, части -j); "
+              "пропущено: нет clang — бинарники не сверялись")
+        sys.exit(0)
+    print("TBAA OK (теги верифицируются, канон без них, части -j, "
+          "бинарник == интерпретатор)")
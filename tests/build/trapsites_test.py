@@ -0,0 +1,149 @@
+"""Общий trap-блок функции `eatc build --trap-sites`.
+
+1. IR: в каждой функции с проверками — ровно один вызов eat_trap_site
+   (в конце тела, за phi номера места) и ни одного eat_trap; таблица
+   мест функции — private-константа из смещений строк (без указателей
+   — без динамических релокаций PIE); модуль проходит верификатор.
+2. Флаги: --trap-sites вместе с --trap-codes — ошибка.
+3. С хостовым clang — бинарники строкового режима и --trap-sites на
+   каждом входе (штатный и три разных trap'а, в том числе в другой
+   функции) дают тот же stdout, stderr и код возврата.
+"""
+
+import contextlib
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc.codegen import Codegen  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+func div(a: u32, b: u32) -> u32 {
+    return a / b
+}
+
+func main() {
+    let t: [u32; 4] = [1, 2, 3, 4]
+    let n: u32 = 0
+    let x: u32 = 0
+    loop {
+        match read_byte() {
+            Ok(b) {
+                if b == 100 {
+                    x = div(7, u32(b) - 100)
+                }
+                if b == 105 {
+                    x = t[u32(b) - 100]
+                }
+                if b == 111 {
+                    x = 4294967295 + u32(b)
+                }
+                n = n + 1
+            }
+            Err(_) {
+                break
+            }
+        }
+    }
+    print("ok {n} {x}")
+}
+"""
+
+INPUTS = [b"abc", b"xd", b"xi", b"xo"]
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Traps.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), path]
+        program, _, typed, main = M._compile_many(paths)
+
+        # 1: один вызов на функцию, таблица из смещений
+        text = str(Codegen(
+            program, typed.checker, main, trap_sites=True
+        ).generate())
+        try:
+            llvm.parse_assembly(text).verify()
+        except RuntimeError as e:
+            fails.append(f"верификатор LLVM: {e}")
+        bodies = re.findall(r"^define .*?^}$", text, re.M | re.S)
+        with_traps = 0
+        for body in bodies:
+            name = re.match(r'define [^@]*@"?([\w.]+)', body).group(1)
+            calls = body.count("@\"eat_trap_site\"(")
+            if "call void @\"eat_trap\"(" in body:
+                fails.append(f"{name}: строковый eat_trap")
+            if calls > 1:
+                fails.append(f"{name}: eat_trap_site {calls} раз")
+            with_traps += calls
+        if with_traps < 2:
+            fails.append(f"функций с общим trap-блоком: {with_traps}")
+        if "i8* bitcast" in "".join(
+            re.findall(r'^@"trap\..*$', text, re.M)
+        ):
+            fails.append("указатели в таблице мест")
+
+        # 2: флаги
+        with contextlib.redirect_stderr(io.StringIO()):
+            rc = M.main(["build", *paths, "--trap-sites", "--trap-codes"])
+        if rc != 2:
+            fails.append(f"--trap-sites --trap-codes: код {rc}")
+
+        # 3: бинарники двух режимов
+        if shutil.which("clang"):
+            outs: dict = {}
+            for mode, flags in (("str", []), ("sites", ["--trap-sites"])):
+                binary = str(Path(tmp) / f"Traps-{mode}")
+                res = subprocess.run(
+                    [sys.executable, "-m", "eatc", "build", *paths,
+                     *flags, "-o", binary],
+                    capture_output=True, cwd=ROOT, env=env,
+                )
+                if res.returncode != 0:
+                    fails.append(f"build {flags}: {res.stderr[-300:]!r}")
+                    continue
+                outs[mode] = [
+                    subprocess.run(
+                        [binary], input=data, capture_output=True
+                    )
+                    for data in INPUTS
+                ]
+            if len(outs) == 2:
+                for data, a, b in zip(INPUTS, outs["str"], outs["sites"]):
+                    got = (b.returncode, b.stdout, b.stderr)
+                    want = (a.returncode, a.stdout, a.stderr)
+                    if got != want:
+                        fails.append(f"{data!r}: {got} != {want}")
+                traps = {r.stderr for r in outs["sites"][1:]}
+                if len(traps) != 3 or b"" in traps:
+                    fails.append(f"сообщения trap'ов: {traps}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("TRAPSITES OK (один trap-блок на функцию, таблица смещений); "
+              "пропущено: нет clang — вывод бинарников не сверялся")
+        sys.exit(0)
+    print("TRAPSITES OK (один trap-блок на функцию, таблица смещений, "
+          "вывод == строковый режим)")
@@ -0,0 +1,137 @@
+"""`eatc check -j N` == `eatc check`: test-блоки в пуле процессов.
+
+Набор файлов: зелёный с выводом из блоков, красный (провал в середине —
+видны блоки до него и ошибка, блоки после — нет) и файл с ошибкой
+типизации. stdout и stderr параллельного прогона байт-в-байт равны
+последовательному при любом N, код возврата тот же. Trap шима в блоке
+(SystemExit в процессе пула) обрывает прогон так же, как
+последовательный check, — без зависания пула.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+GREEN = """\
+func sq(x: u32) -> u32 {
+    return x * x
+}
+test t0 {
+    print("t0 {sq(2)}")
+}
+test t1 {
+    assert sq(3) == 9
+    print("t1")
+}
+test t2 {
+    for i in 0..2000 {
+        assert sq(u32(i)) >= u32(i)
+    }
+    print("t2")
+}
+test t3 {
+    print("t3")
+}
+func main() {
+}
+"""
+
+RED = """\
+test a {
+    print("a")
+}
+test b {
+    print("b")
+}
+test c {
+    let x: u32 = 2
+    assert x == 3
+}
+test d {
+    print("d")
+}
+func main() {
+}
+"""
+
+BAD = """\
+func main() {
+    let x: u32 = true
+}
+"""
+
+# trap шима (неверный дескриптор сокета) во втором блоке: вывод первого
+# виден, сообщение шима в stderr, код 1, следующие файлы не проверяются
+TRAP = """\
+test a {
+    print("a")
+}
+test b {
+    print("b")
+    discard socket_read_byte(99)
+}
+test c {
+    print("c")
+}
+func main() {
+}
+"""
+
+
+def _check(args: list) -> tuple:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    try:
+        res = subprocess.run(
+            [sys.executable, "-m", "eatc", "check"] + args,
+            capture_output=True, env=env, timeout=120,
+        )
+    except subprocess.TimeoutExpired:
+        return None, b"", b"timeout"
+    return res.returncode, res.stdout, res.stderr
+
+
+def run() -> list:
+    fails: list = []
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name, src in (("Green", GREEN), ("Red", RED), ("Bad", BAD),
+                          ("Green2", GREEN)):
+            path = Path(tmp) / f"{name}.eat"
+            path.write_text(src, encoding="utf-8")
+            files.append(str(path))
+        want = _check(files)
+        if want[0] != 1 or b"test c" not in want[2] or b"d\n" in want[1]:
+            fails.append(f"последовательный check: {want!r}")
+        for jobs in ("2", "3", "8"):
+            got = _check(["-j", jobs] + files)
+            if got != want:
+                fails.append(f"-j {jobs}: {got!r} != {want!r}")
+        trap = Path(tmp) / "Trap.eat"
+        trap.write_text(TRAP, encoding="utf-8")
+        files = [files[0], str(trap), files[3]]
+        want = _check(files)
+        if want[0] != 1 or b"socket" not in want[2] or \
+                not want[1].endswith(b"a\nb\n"):
+            fails.append(f"последовательный check, trap: {want!r}")
+        for jobs in ("2", "8"):
+            got = _check(["-j", jobs] + files)
+            if got != want:
+                fails.append(f"-j {jobs}, trap: {got!r} != {want!r}")
+        if _check(["-j", "0"] + files)[0] != 2:
+            fails.append("-j 0 не отвергнут")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print("CHECK -j OK (-j 2/3/8 == последовательный: вывод, ошибки, код, "
+          "trap шима)")
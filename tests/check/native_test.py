@@ -0,0 +1,165 @@
+"""`eatc check --native` == `eatc check`: test-блоки бинарником.
+
+1. IR раннера: блок — internal-функция @"eat_test__ИМЯ", @main зовёт
+   eat_test_begin и блоки по порядку, не main программы; модуль
+   проходит верификатор LLVM.
+2. Флаги: --native вместе с --profile — ошибка (код 2).
+3. С хостовым clang — набор файлов (зелёный с выводом и тяжёлым
+   циклом, красный с trap'ом во вложенной функции и assert'ом, файл с
+   ошибкой типизации): stdout, stderr и код возврата --native,
+   --native --trap-sites и --native -j 2 байт-в-байт равны check.
+   Trap'ы — с одинаковым текстом у обоих (сообщения бинарника о
+   границах и переполнении не несут значений, как и у build).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+import llvmlite.binding as llvm  # noqa: E402
+
+from eatc.codegen import Codegen  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+GREEN = """\
+func sq(x: u32) -> u32 {
+    return x * x
+}
+test t0 {
+    print("t0 {sq(2)}")
+}
+test t1 {
+    let acc: u64 = 0
+    for i in 0..200000 {
+        acc = acc + u64(sq(u32(i % 60000)) % 977)
+    }
+    print("t1 {acc}")
+}
+test t2 {
+    assert sq(3) == 9
+    print("t2")
+}
+func main() {
+}
+"""
+
+RED = """\
+func pick(t: [u32; 4], i: u32) -> u32 {
+    return t[i % 4] / (3 - i)
+}
+test a {
+    print("a")
+}
+test b {
+    let t: [u32; 4] = [1, 2, 3, 4]
+    for i in 0..8 {
+        print("b {pick(t, u32(i))}")
+    }
+}
+test c {
+    let x: u32 = 2
+    assert x == 3
+}
+func main() {
+}
+"""
+
+ASSERT = """\
+test first {
+    print("first")
+}
+test second {
+    let x: u32 = 2
+    assert x == 3
+}
+func main() {
+}
+"""
+
+BAD = """\
+func main() {
+    let x: u32 = true
+}
+"""
+
+
+def _check(args: list) -> tuple:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    res = subprocess.run(
+        [sys.executable, "-m", "eatc", "check"] + args,
+        capture_output=True, env=env, timeout=300,
+    )
+    return res.returncode, res.stdout, res.stderr
+
+
+def run() -> list:
+    fails: list = []
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name, src in (("Green", GREEN), ("Red", RED),
+                          ("Assert", ASSERT), ("Bad", BAD)):
+            path = Path(tmp) / f"{name}.eat"
+            path.write_text(src, encoding="utf-8")
+            files.append(str(path))
+
+        # 1: IR раннера
+        paths = [str(ROOT / "selfhost" / "Rt.eat"), files[0]]
+        program, _, typed, main = M._compile_many(paths)
+        tests = [d for d in program.decls if d.src_file == files[0]
+                 and type(d).__name__ == "TestBlock"]
+        text = str(Codegen(
+            program, typed.checker, main, tests=tests
+        ).generate())
+        try:
+            llvm.parse_assembly(text).verify()
+        except RuntimeError as e:
+            fails.append(f"верификатор LLVM: {e}")
+        entry = text[text.index('define i32 @"main"'):]
+        entry = entry[:entry.index("\n}")]
+        calls = [ln.split("@")[1].split("(")[0] for ln in entry.split("\n")
+                 if "call " in ln]
+        want = ['"eat_args_set"'] + [
+            c for t in ("t0", "t1", "t2")
+            for c in ('"eat_test_begin"', f'"eat_test__{t}"')
+        ]
+        if calls != want:
+            fails.append(f"вызовы раннера: {calls}")
+        if 'define internal void @"eat_test__t1"()' not in text:
+            fails.append("блок t1 не internal-функция")
+
+        # 2: флаги
+        if _check(["--native", "--profile", tmp + "/p", files[0]])[0] != 2:
+            fails.append("--native --profile не отвергнут")
+
+        # 3: вывод == интерпретатор
+        if shutil.which("clang"):
+            want = _check(files)
+            if want[0] != 1 or b"test b" not in want[2]:
+                fails.append(f"check: {want!r}")
+            for flags in (["--native"], ["--native", "--trap-sites"],
+                          ["--native", "-j", "2"]):
+                got = _check(flags + files)
+                if got != want:
+                    fails.append(f"{flags}: {got!r} != {want!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("CHECK --native OK (IR раннера, флаги); пропущено: нет clang "
+              "— check --native не запускался")
+        sys.exit(0)
+    print("CHECK --native OK (раннер блоков, вывод, ошибки и код == "
+          "интерпретатор)")
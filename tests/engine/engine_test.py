@@ -0,0 +1,235 @@
+"""Паритет движков `eatc run`: замыкания (closure) и модуль Python (py)
+== эталонный обходчик.
+
+Все движки исполняют одну программу; сверяются stdout и trap (текст с
+координатами). Корпус — курируемые кейсы верификатора (tests/verify:
+массивы, struct, enum, let self, break/return из циклов) плюс малые
+trap-программы: каждая ловушка должна сработать на том же узле; плюс
+программы с закреплённым выводом (семантика by-value массивов).
+Сокетные кейсы корпуса исполняются по транскрипту EAT_NET (NET ниже):
+живой сокет сверке не нужен, а без слушателя шим завершил бы прогон.
+"""
+
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+from eatc.closure import ClosureInterpreter  # noqa: E402
+from eatc.errors import EatError  # noqa: E402
+from eatc.interpreter import Interpreter  # noqa: E402
+from eatc.pygen import PyInterpreter  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+# транскрипт сокетов на весь прогон (слушатель 3, соединение 4): один
+# accept, 64 байта данных, закрытие пиром
+NET = "accept\ndata 4 " + "abcdefgh" * 8 + "\nclose 4\n"
+
+# trap-программы: (имя, исходник); каждая завершается ловушкой
+TRAPS = [
+    ("bounds", """
+func at(a: [u32; 4], i: u32) -> u32 {
+    return a[i]
+}
+func main() {
+    const a: [u32; 4] = [1, 2, 3, 4]
+    for i in 0..6 {
+        print("{at(a, u32(i))}")
+    }
+}
+"""),
+    ("overflow", """
+func main() {
+    let x: u8 = 250
+    loop {
+        x = x + 3
+        print("{x}")
+    }
+}
+"""),
+    ("div", """
+func q(a: i32, b: i32) -> i32 {
+    return a % b
+}
+func main() {
+    print("{q(7, 2)}")
+    print("{q(7, 0)}")
+}
+"""),
+    ("requires", """
+func half(n: u32) -> u32
+    requires n % 2 == 0
+{
+    return n / 2
+}
+func main() {
+    print("{half(8)}")
+    print("{half(7)}")
+}
+"""),
+    ("ensures", """
+func inc(n: u32) -> u32
+    requires n < 100
+    ensures result > n
+{
+    if n == 5 {
+        return n
+    }
+    return n + 1
+}
+func main() {
+    for i in 0..10 {
+        print("{inc(u32(i))}")
+    }
+}
+"""),
+    ("assert_shift", """
+func main() {
+    let s: u32 = 0
+    loop {
+        assert s < 40
+        print("{u32(1) << s}")
+        s = s + 8
+    }
+}
+"""),
+    ("let_self", """
+struct Acc {
+    vals: [i32; 3]
+    n: u32
+
+    func add(let self, v: i32) {
+        self.vals[self.n] = v
+        self.n = self.n + 1
+    }
+}
+func main() {
+    let a: Acc = Acc { vals: [0, 0, 0], n: 0 }
+    for i in 0..5 {
+        a.add(0 - i32(i))
+        print("{a.n} {a.vals[0]}")
+    }
+}
+"""),
+]
+
+# программы с эталонным выводом: (имя, исходник, stdout). cow —
+# copy-on-write массивов: копия по значению не видит записи оригинала
+# (в т.ч. вложенный пул внутри struct и строка пула), for видит запись
+# в итерируемый массив, u8-массив вырождается в список на значении вне
+# ширины элемента (точки связывания не фитят запись по индексу)
+OUTPUTS = [
+    ("cow", """
+struct Pool {
+    rows: [[u8; 4]; 3]
+    n: u32
+
+    func put(let self, r: u32, v: u8) {
+        self.rows[r][0] = v
+        self.n = self.n + 1
+    }
+}
+func main() {
+    let a: [u8; 4] = [1, 2, 3, 4]
+    let b: [u8; 4] = a
+    b[0] = 9
+    print("{a[0]} {b[0]}")
+    let p: Pool = Pool { rows: [[0; 4]; 3], n: 0 }
+    let q: Pool = p
+    q.put(1, 7)
+    q.rows[2][3] = 5
+    print("{p.rows[1][0]} {p.rows[2][3]} {q.rows[1][0]} {q.rows[2][3]} {p.n} {q.n}")
+    let r: [u8; 4] = q.rows[1]
+    q.rows[1][0] = 8
+    print("{r[0]} {q.rows[1][0]}")
+    let s: u32 = 0
+    for x in a {
+        a[3] = 40
+        s = s + u32(x)
+    }
+    print("{s}")
+    let c: [u8; 2] = [255, 0]
+    let h: u8 = c[0]
+    c[1] = h + 1
+    print("{c[1]} {c[0]}")
+    let w: [i64; 2] = [0 - 5, 7]
+    w[1] = w[0] * 3
+    print("{w[0]} {w[1]}")
+}
+""", b"1 9\n0 0 7 5 0 1\n7 8\n46\n256 255\n-5 -15\n"),
+]
+
+
+def _run(cls, paths: list) -> tuple:
+    """(stdout, текст ошибки | None) прогона движком cls."""
+    saved_out, saved_in = sys.stdout, sys.stdin
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    sys.stdin = io.TextIOWrapper(io.BytesIO(b""))
+    err = None
+    try:
+        program, _, _, main = M._compile_many(paths)
+        interp = cls(program, main)
+        interp.run_tests()
+        interp.run_main()
+    except EatError as e:
+        err = str(e)
+    finally:
+        sys.stdout.flush()
+        out = sys.stdout.buffer.getvalue()
+        sys.stdout, sys.stdin = saved_out, saved_in
+    return out, err
+
+
+def run() -> tuple:
+    M.LIB_ROOTS.append(str(ROOT))
+    fails: list = []
+    cases = sorted((ROOT / "tests" / "verify").glob("*.eat"))
+    runs = [(c.stem, [str(c)], False) for c in cases]
+    with tempfile.TemporaryDirectory() as tmp:
+        net = Path(tmp) / "net.txt"
+        net.write_text(NET, encoding="utf-8")
+        for name, src in TRAPS:
+            path = Path(tmp) / f"{name}.eat"
+            path.write_text(src, encoding="utf-8")
+            runs.append((name, [str(path)], True))
+        pinned = {}
+        for name, src, out in OUTPUTS:
+            path = Path(tmp) / f"{name}.eat"
+            path.write_text(src, encoding="utf-8")
+            runs.append((name, [str(path)], False))
+            pinned[name] = (out, None)
+        saved = os.environ.get("EAT_NET")
+        os.environ["EAT_NET"] = str(net)
+        try:
+            for name, paths, must_trap in runs:
+                want = _run(Interpreter, paths)
+                if name in pinned and want != pinned[name]:
+                    fails.append(f"{name} Interpreter: {want!r}")
+                for cls in (ClosureInterpreter, PyInterpreter):
+                    got = _run(cls, paths)
+                    if got != want:
+                        fails.append(
+                            f"{name} {cls.__name__}: {got!r} != {want!r}"
+                        )
+                if must_trap and want[1] is None:
+                    fails.append(f"{name}: ожидался trap")
+        finally:
+            if saved is None:
+                del os.environ["EAT_NET"]
+            else:
+                os.environ["EAT_NET"] = saved
+    return fails, len(runs)
+
+
+if __name__ == "__main__":
+    problems, total = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print(f"ENGINE OK ({total}/{total}: closure == py == tree, stdout + trap)")
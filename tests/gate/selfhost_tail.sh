@@ -1,7 +1,7 @@
 #!/bin/sh
 # Хвост verify_selfhost: поток драйвера, конкатенации, самоприменение
 # и interp == native. Блоки независимы — исполняются параллельно,
-# каждый со своим mktemp-каталогом. EATC/RT/STACK_FLAGS и списки
+# каждый со своим mktemp-каталогом. EATC/RT/STACK_FLAGS/RUNTIME_O и списки
 # модулей фаз передаёт Makefile переменными окружения.
 set -u
 
@@ -55,7 +55,7 @@ typed_ir_job() {
 		&& echo "IR OK (самоприменение: IR всего фронтенда байт-в-байт)" || exit 1
 	cat lib/fmt/Ascii.eat examples/lexer/LexUtil.eat examples/lexer/LexMain.eat \
 		> "$d/probe.eat"
-	clang "$d/self.ll" src/eatc/runtime.c -o "$d/typed_bin" \
+	clang "$d/self.ll" "$RUNTIME_O" -o "$d/typed_bin" \
 		$STACK_FLAGS 2>/dev/null || exit 1
 	"$d/typed_bin" < "$d/probe.eat" > "$d/e2e.txt"
 	env $EATC typed "$d/probe.eat" > "$d/ref.txt" || exit 1
@@ -0,0 +1,394 @@
+"""Аксиома пакетного приёма `socket_read_span(fd, a, off, max)` (SPEC §7).
+
+1. Сверка EAT_NET: спан собирается через границы событий data, max = 0
+   — Ok(0) без чтения, курсор общий с socket_read_byte; все движки run
+   и бинарник дают один вывод.
+2. Трасса: запись интерпретатора и бинарника совпадает байт-в-байт
+   (данные — hex после результата); каждый воспроизводит трассу
+   другого с тем же выводом.
+3. Границы и приёмник: off + max > N — trap с тем же текстом у
+   интерпретатора и бинарника; const-массив — ошибка компиляции.
+4. Живой режим: приём вперемешку байтами и спанами (буфер соединения и
+   прямой recv в массив) — счёт и сумма байт сходятся у бинарника и
+   интерпретатора; Hello на lib/http/Server.eat отвечает на запрос с
+   заголовками длиннее одного спана.
+5. By-value: копия приёмника, снятая до socket_read_span, принятых байт
+   не видит — движки, воспроизведение трассы и бинарник дают один вывод.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RT = str(ROOT / "selfhost" / "Rt.eat")
+ENGINES = ("tree", "closure", "py")
+
+SRC = """\
+func main() {
+    match socket_listen(8080) {
+        Ok(lst) {
+            const c: u32 = socket_accept(lst)
+            let buf: [u8; 16] = [0; 16]
+            match socket_read_span(c, buf, 0, 0) {
+                Ok(z) {
+                    print("z {z}")
+                }
+                Err(_) {
+                    print("zero err")
+                }
+            }
+            match socket_read_byte(c) {
+                Ok(b) {
+                    write_byte(b)
+                }
+                Err(_) {
+                    print("eof")
+                }
+            }
+            for _ in 0..8 {
+                match socket_read_span(c, buf, 2, 5) {
+                    Ok(n) {
+                        write_span(buf, 2, n)
+                        print(" n {n}")
+                    }
+                    Err(_) {
+                        print("eof")
+                        break
+                    }
+                }
+            }
+            socket_close(c)
+            socket_close(lst)
+        }
+        Err(_) {
+            print("fail")
+        }
+    }
+}
+"""
+
+NET = b"accept\ndata 4 >hello\ndata 4 wor\ndata 4 ld!\nclose 4\n"
+WANT = b"z 0\n>hello n 5\nworld n 5\n! n 1\neof\n"
+
+TRAP = """\
+func main() {
+    match socket_listen(8080) {
+        Ok(lst) {
+            const c: u32 = socket_accept(lst)
+            let buf: [u8; 16] = [0; 16]
+            const off: u32 = arg_count() + 8
+            match socket_read_span(c, buf, off, 9) {
+                Ok(n) {
+                    print("n {n}")
+                }
+                Err(_) {
+                    print("eof")
+                }
+            }
+        }
+        Err(_) {
+            print("fail")
+        }
+    }
+}
+"""
+
+ALIAS = """\
+func main() {
+    match socket_listen(8080) {
+        Ok(lst) {
+            const c: u32 = socket_accept(lst)
+            let a: [u8; 8] = [0; 8]
+            const b: [u8; 8] = a
+            match socket_read_span(c, a, 0, 5) {
+                Ok(n) {
+                    print("n {n} a {a[0]} b {b[0]}")
+                }
+                Err(_) {
+                    print("eof")
+                }
+            }
+        }
+        Err(_) {
+            print("fail")
+        }
+    }
+}
+"""
+ALIAS_WANT = b"n 5 a 62 b 0\n"
+
+BAD = """\
+func main() {
+    const buf: [u8; 8] = [0; 8]
+    discard socket_read_span(0, buf, 0, 8)
+}
+"""
+
+# Живой приём: порт — argv[0]; на каждое из двух соединений — байт,
+# затем спан по 1000 (из буфера соединения) и по 8192 (прямой recv),
+# до конца потока; ответ — счёт и сумма байт по модулю 65536.
+LIVE = """\
+func main() {
+    let port: u32 = 0
+    for j in 0..6 {
+        if u32(j) >= arg_len(0) {
+            break
+        }
+        port = port * 10 + u32(arg_byte(0, u32(j))) - 48
+    }
+    let buf: [u8; 8192] = [0; 8192]
+    match socket_listen(u16(port % 65536)) {
+        Ok(lst) {
+            for _ in 0..2 {
+                discard socket_wait(lst, 10000)
+                const c: u32 = socket_accept(lst)
+                let total: u32 = 0
+                let sum: u32 = 0
+                for k in 0..100000 {
+                    let ok: bool = false
+                    if k % 3 == 0 {
+                        match socket_read_byte(c) {
+                            Ok(b) {
+                                total = total + 1
+                                sum = (sum + u32(b)) % 65536
+                                ok = true
+                            }
+                            Err(_) {}
+                        }
+                    } else {
+                        let mx: u32 = 1000
+                        if k % 3 == 2 {
+                            mx = 8192
+                        }
+                        match socket_read_span(c, buf, 0, mx) {
+                            Ok(n) {
+                                for i in 0..8192 {
+                                    if u32(i) >= n {
+                                        break
+                                    }
+                                    sum = (sum + u32(buf[i])) % 65536
+                                }
+                                total = total + n
+                                ok = true
+                            }
+                            Err(_) {}
+                        }
+                    }
+                    if not ok {
+                        break
+                    }
+                }
+                print("n {total} sum {sum}")
+                socket_close(c)
+            }
+            socket_close(lst)
+        }
+        Err(_) {
+            print("fail")
+        }
+    }
+}
+"""
+
+PAYLOAD = bytes((i * 7 + 3) % 256 for i in range(50000))
+LIVE_WANT = (f"n {len(PAYLOAD)} sum {sum(PAYLOAD) % 65536}\n" * 2).encode()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _connect(port: int) -> socket.socket:
+    for _ in range(100):
+        try:
+            return socket.create_connection(("127.0.0.1", port), timeout=10)
+        except OSError:
+            time.sleep(0.1)
+    raise OSError(f"порт {port} не открылся")
+
+
+def _send(port: int, data: bytes) -> bytes:
+    """Отправить data частями, закрыть запись, вернуть ответ целиком."""
+    s = _connect(port)
+    for i in range(0, len(data), 3000):
+        s.sendall(data[i:i + 3000])
+        time.sleep(0.001)
+    s.shutdown(socket.SHUT_WR)
+    got = b""
+    while True:
+        d = s.recv(4096)
+        if not d:
+            break
+        got += d
+    s.close()
+    return got
+
+
+def _live(cmd: list, env: dict) -> str:
+    port = _free_port()
+    p = subprocess.Popen(cmd + [str(port)], stdout=subprocess.PIPE,
+                         env=env, cwd=ROOT)
+    try:
+        for _ in range(2):
+            _send(port, PAYLOAD)
+        out = p.communicate(timeout=120)[0]
+    finally:
+        p.kill()
+    return "" if out == LIVE_WANT else f"вывод: {out!r}"
+
+
+def _hello(binary: str, env: dict) -> str:
+    """Hello: запрос с заголовками ~6 КБ (больше спана RX_CAP)."""
+    port = _free_port()
+    p = subprocess.Popen([binary, str(port)], stdout=subprocess.DEVNULL,
+                         env=env, cwd=ROOT)
+    pad = b"".join(b"X-Pad-%d: %s\r\n" % (i, b"v" * 90)
+                   for i in range(60))
+    try:
+        got = _send(port, b"GET / HTTP/1.1\r\nHost: x\r\n" + pad + b"\r\n")
+    finally:
+        p.kill()
+    return "" if got.startswith(b"HTTP/1.1 200 OK") else f"ответ: {got!r}"
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    eatc = [sys.executable, "-m", "eatc"]
+    with tempfile.TemporaryDirectory() as tmp:
+        srcs = {}
+        for name, text in (("Span", SRC), ("Trap", TRAP), ("Bad", BAD),
+                           ("Live", LIVE), ("Alias", ALIAS)):
+            srcs[name] = str(Path(tmp) / f"{name}.eat")
+            Path(srcs[name]).write_text(text, encoding="utf-8")
+        net = Path(tmp) / "net.txt"
+        net.write_bytes(NET)
+        tenv = dict(env, EAT_NET=str(net))
+        path = srcs["Span"]
+
+        # 1: движки интерпретатора
+        for engine in ENGINES:
+            res = subprocess.run(
+                eatc + ["run", "--engine", engine, RT, path],
+                capture_output=True, env=tenv, timeout=120,
+            )
+            if (res.returncode, res.stdout) != (0, WANT):
+                fails.append(f"{engine}: {res.stdout!r} {res.stderr!r}")
+        ref = subprocess.run(eatc + ["run", RT, srcs["Trap"]],
+                             capture_output=True, env=tenv, timeout=120)
+
+        # 5: копия приёмника — движки и воспроизведение трассы
+        t_alias = str(Path(tmp) / "alias.trace")
+        for engine in ENGINES:
+            res = subprocess.run(
+                eatc + ["run", "--engine", engine, RT, srcs["Alias"]],
+                capture_output=True, env=tenv, timeout=120,
+            )
+            if (res.returncode, res.stdout) != (0, ALIAS_WANT):
+                fails.append(f"копия приёмника, {engine}: {res.stdout!r}")
+        subprocess.run(eatc + ["run", "--record", t_alias, RT, srcs["Alias"]],
+                       capture_output=True, env=tenv, timeout=120)
+        res = subprocess.run(
+            eatc + ["run", "--replay", t_alias, RT, srcs["Alias"]],
+            capture_output=True, env=env, timeout=120,
+        )
+        if (res.returncode, res.stdout) != (0, ALIAS_WANT):
+            fails.append(f"копия приёмника, replay: {res.stdout!r}")
+
+        # 3: приёмник
+        res = subprocess.run(eatc + ["check", srcs["Bad"]],
+                             capture_output=True, env=env, timeout=120)
+        if res.returncode == 0 or "а buf — const" not in \
+                res.stderr.decode("utf-8"):
+            fails.append(f"приёмник: {res.returncode} {res.stderr!r}")
+
+        # 4: живой интерпретатор
+        problem = _live(eatc + ["run", RT, srcs["Live"], "--"], env)
+        if problem:
+            fails.append(f"живой интерпретатор: {problem}")
+
+        if not shutil.which("clang"):
+            return fails
+        bins = {}
+        for name, args in (("Span", [RT, path]), ("Trap", [RT, srcs["Trap"]]),
+                           ("Live", [RT, srcs["Live"]]),
+                           ("Alias", [RT, srcs["Alias"]]),
+                           ("Hello", ["--lib", ".",
+                                      "examples/http/Hello.eat"])):
+            bins[name] = str(Path(tmp) / f"{name}.bin")
+            res = subprocess.run(eatc + ["build"] + args + ["-o", bins[name]],
+                                 capture_output=True, env=env, cwd=ROOT)
+            if res.returncode != 0:
+                return fails + [f"build {name}: {res.stderr[-300:]!r}"]
+
+        # 1: бинарник
+        res = subprocess.run([bins["Span"]], capture_output=True, env=tenv)
+        if (res.returncode, res.stdout) != (0, WANT):
+            fails.append(f"бинарник: {res.stdout!r}")
+
+        # 5: копия приёмника — бинарник
+        res = subprocess.run([bins["Alias"]], capture_output=True, env=tenv)
+        if (res.returncode, res.stdout) != (0, ALIAS_WANT):
+            fails.append(f"копия приёмника, бинарник: {res.stdout!r}")
+
+        # 2: трассы
+        t_int = str(Path(tmp) / "int.trace")
+        t_nat = str(Path(tmp) / "nat.trace")
+        subprocess.run(eatc + ["run", "--record", t_int, RT, path],
+                       capture_output=True, env=tenv, timeout=120)
+        subprocess.run([bins["Span"]], capture_output=True,
+                       env=dict(tenv, EAT_RECORD=t_nat))
+        text = Path(t_int).read_bytes()
+        if text != Path(t_nat).read_bytes() or \
+                b"socket_read_span 4 5 = 5 68656c6c6f" not in text:
+            fails.append(f"трассы расходятся: {text[:200]!r}")
+        back = subprocess.run([bins["Span"]], capture_output=True,
+                              env=dict(env, EAT_REPLAY=t_int))
+        again = subprocess.run(
+            eatc + ["run", "--replay", t_nat, RT, path],
+            capture_output=True, env=env, timeout=120,
+        )
+        if (back.returncode, back.stdout) != (0, WANT) or \
+                (again.returncode, again.stdout) != (0, WANT):
+            fails.append(f"replay: {back.stdout!r} {again.stdout!r}")
+
+        # 3: граница
+        nat = subprocess.run([bins["Trap"]], capture_output=True, env=tenv)
+        if ref.returncode == 0 or b"socket_read_span" not in ref.stderr or \
+                (nat.returncode, nat.stdout, nat.stderr) != \
+                (ref.returncode, ref.stdout, ref.stderr):
+            fails.append(f"trap: {nat.stderr!r} != {ref.stderr!r}")
+
+        # 4: живой бинарник и Hello
+        problem = _live([bins["Live"]], env)
+        if problem:
+            fails.append(f"живой бинарник: {problem}")
+        problem = _hello(bins["Hello"], env)
+        if problem:
+            fails.append(f"Hello: {problem}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("SOCKET_READ_SPAN OK (движки, приёмник, копия приёмника, "
+              "живой приём интерпретатора); пропущено: нет clang — "
+              "бинарник, трасса, граница и Hello не проверены")
+        sys.exit(0)
+    print("SOCKET_READ_SPAN OK (сверка: движки == бинарник, трасса "
+          "interp <-> binary, граница, приёмник; живой приём, Hello; копия "
+          "приёмника)")
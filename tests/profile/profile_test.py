@@ -0,0 +1,137 @@
+"""Профиль обходчика (`eatc run/check --profile`).
+
+Часы профайлера подменены счётчиком (тик на каждое чтение) — времена
+детерминированы. Сверяются: число вызовов, инклюзивное и эксклюзивное
+время (инклюзивное = эксклюзивное + дети), попадания строк, свёрнутые
+стеки (формат Brendan Gregg) и test-блок корневым кадром. Плюс паритет: под профилем вывод программы
+тот же, что без него.
+"""
+
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+from eatc.interpreter import Interpreter  # noqa: E402
+from eatc.profile import Profiler  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+SRC = """\
+func leaf(x: u32) -> u32 {
+    return x + 1
+}
+func twice(x: u32) -> u32 {
+    return leaf(leaf(x))
+}
+test twice_small {
+    assert twice(3) == 5
+}
+func main() {
+    for i in 0..3 {
+        print("{leaf(u32(i))}")
+    }
+    print("{twice(4)}")
+}
+"""
+
+
+class Tick:
+    """Часы: каждое чтение — +1000 нс (1 мкс)."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        self.now += 1000
+        return self.now
+
+
+def _run(path: str, prof) -> bytes:
+    saved = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    try:
+        program, _, _, main = M._compile_many([path])
+        interp = Interpreter(program, main)
+        interp.profiler = prof
+        interp.run_tests()
+        interp.run_main()
+        sys.stdout.flush()
+        return sys.stdout.buffer.getvalue()
+    finally:
+        sys.stdout = saved
+
+
+def run() -> list:
+    fails: list = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Prof.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        want = _run(path, None)
+        prof = Profiler(clock=Tick())
+        got = _run(path, prof)
+        if got != want:
+            fails.append(f"паритет: {got!r} != {want!r}")
+
+        # 1. вызовы: twice — в тесте и в main, leaf — 3 из main + 2×2
+        calls = {k: prof.calls.get(k) for k in ("twice", "leaf", "main")}
+        if calls != {"twice": 2, "leaf": 7, "main": 1}:
+            fails.append(f"вызовы: {calls}")
+        if prof.calls.get("test twice_small") != 1:
+            fails.append("test-блок не корневой кадр профиля")
+
+        # 2. время: инклюзивное twice = эксклюзивное + его leaf'ы;
+        # эксклюзивные всех функций суммируются до инклюзивных корней
+        nested = prof.folded["main;twice;leaf"] + (
+            prof.folded["test twice_small;twice;leaf"]
+        )
+        if prof.incl["twice"] != prof.excl["twice"] + nested:
+            fails.append("инклюзивное twice != эксклюзивное + дети")
+        total_excl = sum(prof.excl.values())
+        roots = prof.incl["main"] + prof.incl["test twice_small"]
+        if total_excl != roots:
+            fails.append(f"эксклюзивные {total_excl} != корни {roots}")
+
+        # 3. строки: `return x + 1` у leaf — 7 попаданий
+        if prof.lines.get((path, 2)) != 7:
+            fails.append(f"строка 2: {prof.lines.get((path, 2))} попаданий")
+
+        # 4. свёрнутые стеки: `путь вес`, цепочки рекурсии и тест-корень
+        folded = dict(
+            line.rsplit(" ", 1) for line in prof.collapsed().splitlines()
+        )
+        for stack in ("main;leaf", "main;twice;leaf",
+                      "test twice_small;twice;leaf"):
+            if stack not in folded:
+                fails.append(f"нет стека {stack}")
+        if not all(w.isdigit() for w in folded.values()):
+            fails.append("вес стека не целое")
+
+        # 5. CLI: run --profile пишет PREFIX.txt (по эксклюзивному
+        # времени) и PREFIX.folded; --engine closure с профилем — ошибка
+        prefix = str(Path(tmp) / "out")
+        saved = sys.stdout
+        sys.stdout = io.TextIOWrapper(io.BytesIO())
+        try:
+            rc = M.main(["run", "--profile", prefix, path])
+            bad = M.main(["run", "--engine", "py", "--profile", prefix, path])
+        finally:
+            sys.stdout = saved
+        report = Path(prefix + ".txt").read_text(encoding="utf-8")
+        if rc != 0 or "twice (" not in report or bad != 2:
+            fails.append(f"CLI: rc={rc} bad={bad}")
+        if not Path(prefix + ".folded").read_text(encoding="utf-8"):
+            fails.append("CLI: пустой .folded")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print("PROFILE OK (5/5: вызовы, время, строки, стеки, CLI)")
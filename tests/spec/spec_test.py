@@ -0,0 +1,124 @@
+"""Регресс специализации по константным аргументам (`build --spec`).
+
+Клон на каждый различный кортеж констант (повтор — тот же клон),
+переписанное место вызова, каскад (клон зовёт клон/свёртку), бюджет
+роста кода и паритет поведения: интерпретатор на специализированной
+программе печатает то же, что на исходной. Плюс выигрыш верификатора:
+проверки, которые в общем теле остаются в рантайме, в клоне доказаны.
+Тест не линкует бинарники — работает на AST/аннотациях.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+from eatc import ast_nodes as ast  # noqa: E402
+from eatc import specialize as S  # noqa: E402
+from eatc.codegen import emit_ir  # noqa: E402
+from eatc.interpreter import Interpreter  # noqa: E402
+from eatc.verifier import verify  # noqa: E402
+import eatc.__main__ as M  # noqa: E402
+
+RT = str(ROOT / "selfhost" / "Rt.eat")
+SPEC = str(ROOT / "tests" / "spec" / "Spec.eat")
+
+
+def _compile():
+    program, _, typed, main = M._compile_many([RT, SPEC])
+    return program, typed.checker, main
+
+
+def _run(program, main) -> bytes:
+    """Вывод main интерпретатора (stdout перехвачен в буфер)."""
+    saved = sys.stdout
+    sys.stdout = io.TextIOWrapper(io.BytesIO())
+    try:
+        Interpreter(program, main).run_main()
+        sys.stdout.flush()
+        return sys.stdout.buffer.getvalue()
+    finally:
+        sys.stdout = saved
+
+
+def _clones(program) -> list:
+    return [
+        d for d in program.decls
+        if isinstance(d, ast.FuncDecl) and getattr(d, "spec_of", None)
+    ]
+
+
+def run() -> list:
+    fails: list = []
+
+    # 1. клоны: cell(7, _) из тела twice, cell(_, 5|9) из main, twice(_, 2)
+    # и каскадом cell(_, 2) из клона twice; cell(v, 5) дважды — один клон
+    program, checker, main = _compile()
+    want = _run(program, main)
+    program, checker, main = _compile()
+    clones, sites = S.specialize_calls(program, checker, main)
+    names = sorted(d.name for d in _clones(program))
+    want_names = ["cell$s0", "cell$s1", "cell$s2", "cell$s3", "twice$s0"]
+    if names != want_names:
+        fails.append(f"клоны: {names}")
+    if sites != 6:
+        fails.append(f"переписано вызовов {sites}, ожидалось 6")
+
+    # 2. каскад: в twice$s0 оба cell стали клоном, cell(7, 2) свёрнут
+    twice = [d for d in _clones(program) if d.name == "twice$s0"][0]
+    calls = []
+
+    def walk(node):
+        if isinstance(node, ast.Call):
+            calls.append(node)
+        if isinstance(node, ast.Node):
+            for f in S.dataclasses.fields(node):
+                child = getattr(node, f.name)
+                for c in child if isinstance(child, list) else [child]:
+                    walk(c)
+
+    walk(twice.body)
+    folded = [c for c in calls if getattr(c, "folded", False)]
+    if len(folded) != 1 or folded[0].fold_value != 13:
+        fails.append("каскад: cell(7, 2) в клоне не свёрнут в 13")
+
+    # 3. паритет поведения и выигрыш верификатора: buf[width] в общем
+    # теле — рантайм, в клоне cell(_, 5) — доказан
+    if _run(program, main) != want:
+        fails.append("паритет: вывод специализированной программы иной")
+    verify(program, checker)
+    generic = [d for d in program.decls if getattr(d, "name", "") == "cell"]
+    cell = [d for d in _clones(program) if d.name == "cell$s1"][0]
+    if getattr(generic[0].body.stmts[1].target, "in_bounds", False):
+        fails.append("верификатор: buf[width] в общем теле доказан?")
+    if not getattr(cell.body.stmts[1].target, "in_bounds", False):
+        fails.append("верификатор: buf[5] в клоне не доказан")
+
+    # 4. кодоген принимает клоны (имя трапа — оригинала)
+    text = emit_ir(program, checker)
+    if '@"eat_cell$s0"' not in text:
+        fails.append("кодоген: нет определения клона cell$s0")
+
+    # 5. бюджет: без места на клоны — ни одного переписанного вызова
+    saved = S.SPEC_BUDGET
+    S.SPEC_BUDGET = 0
+    try:
+        program, checker, main = _compile()
+        clones, sites = S.specialize_calls(program, checker, main)
+        if clones or sites:
+            fails.append("бюджет: клоны созданы при SPEC_BUDGET = 0")
+    finally:
+        S.SPEC_BUDGET = saved
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print("SPEC OK (5/5: клоны, каскад, паритет, кодоген, бюджет)")
@@ -0,0 +1,218 @@
+"""Аксиома пакетного ввода `read_span(a, off, max)` (SPEC §7).
+
+1. Вывод: программа, смешивающая read_byte и read_span (курсор общий,
+   max = 0 — Ok(0) без чтения), на всех движках run и бинарником
+   (stdin — файл и пайп) даёт один и тот же вывод.
+2. Границы: off + max > N — trap с тем же текстом и кодом у
+   интерпретатора и бинарника.
+3. Типизация: const-массив, временное значение и массив не u8 как
+   приёмник — ошибки компиляции.
+4. Трасса: запись интерпретатора и бинарника совпадает байт-в-байт
+   (данные — hex после результата, не длиннее 32 байт на событие);
+   каждый воспроизводит трассу другого с тем же выводом.
+5. By-value: копия приёмника, снятая до read_span, прочитанных байт не
+   видит — движки, воспроизведение трассы и бинарник дают один вывод.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RT = str(ROOT / "selfhost" / "Rt.eat")
+ENGINES = ("tree", "closure", "py")
+
+SRC = """\
+func main() {
+    let buf: [u8; 64] = [0; 64]
+    let total: u32 = 0
+    match read_byte() {
+        Ok(b) {
+            write_byte(b)
+        }
+        Err(_) {
+            return
+        }
+    }
+    match read_span(buf, 0, 0) {
+        Ok(z) {
+            print(" zero {z}")
+        }
+        Err(_) {
+            print(" eof")
+        }
+    }
+    loop {
+        match read_span(buf, 10, 50) {
+            Ok(n) {
+                write_span(buf, 10, n)
+                total = total + n
+            }
+            Err(_) {
+                break
+            }
+        }
+    }
+    print("total {total}")
+}
+"""
+
+TRAP = """\
+func main() {
+    let buf: [u8; 16] = [0; 16]
+    const off: u32 = arg_count() + 8
+    match read_span(buf, off, 9) {
+        Ok(n) {
+            print("n {n}")
+        }
+        Err(_) {
+            print("eof")
+        }
+    }
+}
+"""
+
+BAD = {
+    "const": ("const buf: [u8; 8] = [0; 8]\n"
+              "    discard read_span(buf, 0, 8)",
+              "а buf — const"),
+    "temp": ("discard read_span([u8(0); 8], 0, 8)",
+             "приёмник обязан быть изменяемой переменной"),
+    "u32": ("let buf: [u32; 8] = [0; 8]\n"
+            "    discard read_span(buf, 0, 8)",
+            "read_span() читает в массив u8"),
+}
+
+ALIAS = """\
+func main() {
+    let a: [u8; 8] = [0; 8]
+    const b: [u8; 8] = a
+    match read_span(a, 0, 8) {
+        Ok(n) {
+            print("n {n} a {a[0]} b {b[0]}")
+        }
+        Err(_) {
+            print("eof")
+        }
+    }
+}
+"""
+ALIAS_WANT = b"n 8 a 65 b 0\n"
+
+DATA = b"x" + b"hello world line\n" * 9
+
+
+def _run(cmd: list, env: dict, data: bytes) -> tuple:
+    res = subprocess.run(cmd, input=data, capture_output=True, env=env,
+                         timeout=120)
+    return res.returncode, res.stdout, res.stderr
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    eatc = [sys.executable, "-m", "eatc"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Span.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        trap = str(Path(tmp) / "Trap.eat")
+        Path(trap).write_text(TRAP, encoding="utf-8")
+        alias = str(Path(tmp) / "Alias.eat")
+        Path(alias).write_text(ALIAS, encoding="utf-8")
+        want = (b"x zero 0\n" + DATA[1:] + b"total 153\n")
+
+        # 1: движки интерпретатора
+        for engine in ENGINES:
+            got = _run(eatc + ["run", "--engine", engine, RT, path], env,
+                       DATA)
+            if got[:2] != (0, want):
+                fails.append(f"{engine}: {got!r}")
+
+        # 5: копия приёмника — движки и воспроизведение трассы
+        t_alias = str(Path(tmp) / "alias.trace")
+        for engine in ENGINES:
+            got = _run(eatc + ["run", "--engine", engine, RT, alias], env,
+                       b"ABCDEFGH")
+            if got[:2] != (0, ALIAS_WANT):
+                fails.append(f"копия приёмника, {engine}: {got!r}")
+        _run(eatc + ["run", "--record", t_alias, RT, alias], env,
+             b"ABCDEFGH")
+        got = _run(eatc + ["run", "--replay", t_alias, RT, alias], env, b"")
+        if got[:2] != (0, ALIAS_WANT):
+            fails.append(f"копия приёмника, replay: {got!r}")
+
+        # 3: приёмник
+        for name, (body, msg) in BAD.items():
+            bad = Path(tmp) / f"Bad{name}.eat"
+            bad.write_text(f"func main() {{\n    {body}\n}}\n",
+                           encoding="utf-8")
+            rc, _, err = _run(eatc + ["check", str(bad)], env, b"")
+            if rc == 0 or msg not in err.decode("utf-8"):
+                fails.append(f"приёмник {name}: {rc} {err!r}")
+
+        if not shutil.which("clang"):
+            return fails
+        binary = str(Path(tmp) / "Span")
+        tbin = str(Path(tmp) / "Trap")
+        abin = str(Path(tmp) / "Alias")
+        for src, out in ((path, binary), (trap, tbin), (alias, abin)):
+            res = subprocess.run(eatc + ["build", RT, src, "-o", out],
+                                 capture_output=True, env=env, cwd=ROOT)
+            if res.returncode != 0:
+                return fails + [f"build: {res.stderr[-300:]!r}"]
+
+        # 1: бинарник — файл и пайп (fread отдаёт куски иначе, вывод тот же)
+        data = Path(tmp) / "in.txt"
+        data.write_bytes(DATA)
+        with open(data, "rb") as stdin:
+            res = subprocess.run([binary], stdin=stdin, capture_output=True)
+        if (res.returncode, res.stdout) != (0, want):
+            fails.append(f"бинарник (файл): {res.stdout!r}")
+        got = _run([binary], env, DATA)
+        if got[:2] != (0, want):
+            fails.append(f"бинарник (пайп): {got!r}")
+
+        # 5: копия приёмника — бинарник
+        got = _run([abin], env, b"ABCDEFGH")
+        if got[:2] != (0, ALIAS_WANT):
+            fails.append(f"копия приёмника, бинарник: {got!r}")
+
+        # 2: граница
+        ref = _run(eatc + ["run", RT, trap], env, b"abc")
+        nat = _run([tbin], env, b"abc")
+        if ref[0] == 0 or b"read_span" not in ref[2] or nat != ref:
+            fails.append(f"trap: {nat!r} != {ref!r}")
+
+        # 4: трасса
+        t_int = str(Path(tmp) / "int.trace")
+        t_nat = str(Path(tmp) / "nat.trace")
+        _run(eatc + ["run", "--record", t_int, RT, path], env, DATA)
+        _run([binary], dict(env, EAT_RECORD=t_nat), DATA)
+        text = Path(t_int).read_bytes()
+        if text != Path(t_nat).read_bytes() or b"read_span 50 = 32 " \
+                not in text:
+            fails.append(f"трассы расходятся: {text[:200]!r}")
+        back = _run([binary], dict(env, EAT_REPLAY=t_int), b"")
+        again = _run(eatc + ["run", "--replay", t_nat, RT, path], env, b"")
+        if back[:2] != (0, want) or again[:2] != (0, want):
+            fails.append(f"replay: {back!r} {again!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("READ_SPAN OK (движки, приёмник, копия приёмника); "
+              "пропущено: нет clang — бинарник, граница и трасса "
+              "interp <-> binary не проверены")
+        sys.exit(0)
+    print("READ_SPAN OK (движки == бинарник, граница, приёмник, трасса "
+          "interp <-> binary, копия приёмника)")
@@ -0,0 +1,131 @@
+"""Быстрый путь stdin бинарника: обычный файл отображается mmap'ом.
+
+1. Вывод: read_byte, read_span и in_avail по файлу (mmap), по тому же
+   файлу с EAT_NO_MMAP=1 (stdio), по пайпу и у интерпретатора —
+   байт-в-байт один; конец потока — Err, как у stdio.
+2. Смещение: stdin, уже сдвинутый родителем (`(head -c 5; prog) < f`),
+   читается с текущей позиции, in_avail — остаток файла.
+3. Пустой файл — Err с первого чтения, in_avail 0 (mmap нулевой
+   длины не бывает — путь stdio).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RT = str(ROOT / "selfhost" / "Rt.eat")
+
+SRC = """\
+func main() {
+    let buf: [u8; 64] = [0; 64]
+    let total: u32 = 0
+    print("avail {in_avail()}")
+    match read_byte() {
+        Ok(b) {
+            write_byte(b)
+        }
+        Err(_) {
+            print("eof")
+            return
+        }
+    }
+    print(" avail {in_avail()}")
+    loop {
+        match read_span(buf, 0, 64) {
+            Ok(n) {
+                write_span(buf, 0, n)
+                total = total + n
+            }
+            Err(_) {
+                break
+            }
+        }
+    }
+    match read_byte() {
+        Ok(_) {
+            print("лишний байт")
+        }
+        Err(_) {
+            print("total {total} avail {in_avail()}")
+        }
+    }
+}
+"""
+
+DATA = b"m" + bytes(range(256)) * 40 + b"tail\n"
+
+
+def _stdin(cmd: list, env: dict, path: Path, skip: int = 0) -> tuple:
+    with open(path, "rb") as stdin:
+        stdin.seek(skip)
+        res = subprocess.run(cmd, stdin=stdin, capture_output=True,
+                             env=env, timeout=120)
+    return res.returncode, res.stdout
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    no_map = dict(env, EAT_NO_MMAP="1")
+    eatc = [sys.executable, "-m", "eatc"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Map.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        data = Path(tmp) / "in.bin"
+        data.write_bytes(DATA)
+        empty = Path(tmp) / "empty.bin"
+        empty.write_bytes(b"")
+        ref = eatc + ["run", RT, path]
+
+        if not shutil.which("clang"):
+            return fails
+        binary = str(Path(tmp) / "Map")
+        res = subprocess.run(eatc + ["build", RT, path, "-o", binary],
+                             capture_output=True, env=env, cwd=ROOT)
+        if res.returncode != 0:
+            return fails + [f"build: {res.stderr[-300:]!r}"]
+
+        # 1 + 2: файл (mmap), stdio, пайп и интерпретатор
+        for skip in (0, 5):
+            want = _stdin(ref, env, data, skip)
+            if want[0] != 0 or b"total" not in want[1]:
+                fails.append(f"интерпретатор, смещение {skip}: {want!r}")
+            for name, got in (
+                ("mmap", _stdin([binary], env, data, skip)),
+                ("stdio", _stdin([binary], no_map, data, skip)),
+            ):
+                if got != want:
+                    fails.append(f"{name}, смещение {skip}: {got[1][-80:]!r}"
+                                 f" != {want[1][-80:]!r}")
+        pipe = subprocess.run([binary], input=DATA, capture_output=True,
+                              env=env, timeout=120)
+        if b"total 10245 " not in pipe.stdout:
+            fails.append(f"пайп: {pipe.stdout[-80:]!r}")
+
+        # 3: пустой вход
+        want = (0, b"avail 0\neof\n")
+        for name, got in (("mmap", _stdin([binary], env, empty)),
+                          ("stdio", _stdin([binary], no_map, empty)),
+                          ("run", _stdin(ref, env, empty))):
+            if got != want:
+                fails.append(f"пустой файл, {name}: {got!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    if not shutil.which("clang"):
+        print("STDIN MMAP: пропущено — нет clang, путь mmap бинарника не "
+              "проверялся")
+        sys.exit(0)
+    print("STDIN MMAP OK (файл mmap == stdio == пайп == интерпретатор, "
+          "смещение, пустой вход)")
@@ -0,0 +1,97 @@
+"""Буферизованный stdio интерпретатора (_Stdio), все движки `eatc run`.
+
+1. in_avail учитывает прочитанное в буфер, но не отданное: stdin —
+   файл, после трёх read_byte — размер минус 3 (зеркало ftello шима).
+2. Диалог: при EAT_INTERACTIVE=1 вывод сбрасывается перед чтением —
+   подсказка видна до того, как собеседник ответит (пайпы с обеих
+   сторон, как у LSP под редактором).
+3. trap: накопленный вывод уходит в stdout раньше сообщения trap'а.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+ENGINES = ("tree", "closure", "py")
+
+SRC = """\
+func main() {
+    write("? ")
+    for _ in 0..3 {
+        match read_byte() {
+            Ok(b) {
+                write_byte(b)
+            }
+            Err(_) {
+                return
+            }
+        }
+    }
+    print(" {in_avail()}")
+    assert in_avail() == 0
+}
+"""
+
+
+def _eatc(engine: str, path: str) -> list:
+    return [sys.executable, "-m", "eatc", "run", "--engine", engine, path]
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Io.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        data = Path(tmp) / "in.txt"
+        data.write_bytes(b"abcdefghij")
+
+        for engine in ENGINES:
+            # 1 + 3: файл из 10 байт — после трёх чтений 7; assert
+            # падает, вывод до trap'а стоит раньше его сообщения
+            with open(data, "rb") as stdin:
+                res = subprocess.run(
+                    _eatc(engine, path), stdin=stdin, env=env,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    timeout=60,
+                )
+            out = res.stdout.decode("utf-8")
+            if not out.startswith("? abc 7\n") or "assert" not in out:
+                fails.append(f"{engine}: in_avail/trap: {out!r}")
+
+            # 2: подсказка приходит до ответа собеседника
+            proc = subprocess.Popen(
+                _eatc(engine, path), env=dict(env, EAT_INTERACTIVE="1"),
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            # без сброса подсказка не придёт никогда: сторож убивает
+            # процесс, чтение возвращает пусто — провал, а не зависание
+            guard = threading.Timer(30, proc.kill)
+            guard.start()
+            try:
+                prompt = proc.stdout.read(2)
+                proc.stdin.write(b"xyz")
+                proc.stdin.close()
+                rest = proc.stdout.read()
+                proc.wait(timeout=60)
+            finally:
+                guard.cancel()
+                proc.kill()
+            if prompt != b"? " or not rest.startswith(b"xyz 0\n"):
+                fails.append(f"{engine}: диалог: {prompt!r} {rest!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print(f"STDIO OK ({len(ENGINES)} движка: in_avail, диалог, trap)")
@@ -0,0 +1,134 @@
+"""Трасса аксиом ОС (`eatc run --record FILE` / `--replay FILE`).
+
+1. Запись: события ввода, in_avail, часов и argv — по строке на вызов
+   main (test-блоки мимо трассы), вывод программы тот же, что без неё.
+2. Воспроизведение каждым движком без stdin и argv — тот же stdout.
+3. Программа, разошедшаяся с трассой, — trap с номером первого
+   несовпавшего события; короче трассы не хватает — trap исчерпания.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+ENGINES = ("tree", "closure", "py")
+
+SRC = """\
+func main() {
+    let n: u32 = 0
+    loop {
+        match read_byte() {
+            Ok(b) {
+                write_byte(b)
+                n = n + 1
+            }
+            Err(_) {
+                break
+            }
+        }
+        if n == 3 {
+            print(" avail {in_avail()}")
+        }
+    }
+    const t: u64 = ticks()
+    print("n {n} args {arg_count()} t {t >= 0}")
+    if arg_count() > 0 {
+        print("a0 {arg_len(0)} {arg_byte(0, 0)}")
+    }
+}
+
+test clock_untraced {
+    assert ticks() >= 0
+}
+"""
+
+# та же программа, но argv спрашивается раньше ввода
+DIVERGED = SRC.replace(
+    "    let n: u32 = 0\n", "    let n: u32 = arg_count()\n    n = 0\n", 1
+)
+
+WANT_EVENTS = [
+    "read_byte = 104", "read_byte = 105", "read_byte = 33",
+    "in_avail = 1", "read_byte = 10", "read_byte = -1", "ticks = ",
+    "arg_count = 1", "arg_count = 1", "arg_len 0 = 2",
+    "arg_byte 0 0 = 45",
+]
+
+
+def _eatc(engine: str, path: str, *flags: str) -> list:
+    return [sys.executable, "-m", "eatc", "run", "--engine", engine,
+            *flags, path]
+
+
+def run() -> list:
+    fails: list = []
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Io.eat")
+        Path(path).write_text(SRC, encoding="utf-8")
+        diverged = str(Path(tmp) / "Diverged.eat")
+        Path(diverged).write_text(DIVERGED, encoding="utf-8")
+        data = Path(tmp) / "in.txt"
+        data.write_bytes(b"hi!\n")
+        trace = str(Path(tmp) / "io.trace")
+
+        # 1: запись; вывод — как без трассы
+        outs = []
+        for flags in ((), ("--record", trace)):
+            with open(data, "rb") as stdin:
+                res = subprocess.run(
+                    _eatc("tree", path, *flags) + ["--", "-x"],
+                    stdin=stdin, env=env, capture_output=True, timeout=60,
+                )
+            outs.append(res.stdout)
+        if outs[0] != outs[1] or not outs[0].startswith(b"hi! avail 1\n"):
+            fails.append(f"record: {outs!r}")
+        lines = Path(trace).read_text(encoding="ascii").splitlines()
+        events = lines[1:]
+        if lines[0] != "# eat trace 1" or len(events) != len(WANT_EVENTS) \
+                or not all(e.startswith(w) for e, w in zip(events, WANT_EVENTS)):
+            fails.append(f"record: события {lines!r}")
+
+        # 2: воспроизведение без stdin и argv
+        for engine in ENGINES:
+            res = subprocess.run(
+                _eatc(engine, path, "--replay", trace),
+                stdin=subprocess.DEVNULL, env=env, capture_output=True,
+                timeout=60,
+            )
+            if res.returncode != 0 or res.stdout != outs[1]:
+                fails.append(f"{engine}: replay: {res.stdout!r} {res.stderr!r}")
+
+        # 3: расхождение и исчерпание
+        res = subprocess.run(
+            _eatc("closure", diverged, "--replay", trace),
+            stdin=subprocess.DEVNULL, env=env, capture_output=True,
+            timeout=60,
+        )
+        want = ("replay: расхождение на событии 1: в трассе `read_byte`, "
+                "вызов `arg_count`")
+        if res.returncode != 1 or want not in res.stderr.decode("utf-8"):
+            fails.append(f"расхождение: {res.stderr!r}")
+        Path(trace).write_text("\n".join(lines[:4]) + "\n", encoding="ascii")
+        res = subprocess.run(
+            _eatc("py", path, "--replay", trace),
+            stdin=subprocess.DEVNULL, env=env, capture_output=True,
+            timeout=60,
+        )
+        want = "replay: трасса исчерпана на событии 4 (вызов `in_avail`)"
+        if res.stdout != b"hi!" or want not in res.stderr.decode("utf-8"):
+            fails.append(f"исчерпание: {res.stdout!r} {res.stderr!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    problems = run()
+    for p in problems:
+        print(f"FAIL {p}")
+    if problems:
+        print(f"\n{len(problems)} провалов")
+        sys.exit(1)
+    print(f"TRACE OK ({len(ENGINES)} движка: запись, replay, расхождение)")